@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+API cache micro-benchmark under concurrent load.
+Worker threads run a read-mostly, skewed (Zipf-like) key workload against
+TTLCache, as concurrent PubChem/translation lookups do, and the benchmark
+prints throughput, lookup latency percentiles, hit rate and evictions for
+each configuration: one lock (shards=1), lock striping (default shards)
+and, with --persistent, striping plus the SQLite tier.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.cache import SQLiteCacheBackend, TTLCache
+
+
+def make_keys(count: int, skew: float, seed: int) -> list[str]:
+    """Key sequence where the i-th most popular key is drawn with weight 1 / i**skew."""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) ** skew for i in range(count)]
+    return [f"cas:{k}" for k in rng.choices(range(count), weights=weights, k=20000)]
+
+
+def run_worker(
+    cache: TTLCache, keys: list[str], ops: int, write_ratio: float, seed: int, latencies: list[float]
+) -> None:
+    rng = random.Random(seed)
+    value = {"CID": 702, "MolecularFormula": "C2H6O", "IUPACName": "ethanol"}
+    for i in range(ops):
+        key = keys[(seed * 7919 + i) % len(keys)]
+        start = time.perf_counter()
+        if rng.random() < write_ratio or cache.get(key) is None:
+            cache.set(key, value)
+        latencies.append(time.perf_counter() - start)
+
+
+def benchmark(cache: TTLCache, args) -> dict:
+    keys = make_keys(args.keys, args.skew, args.seed)
+    latencies = [[] for _ in range(args.threads)]
+    threads = [
+        threading.Thread(
+            target=run_worker, args=(cache, keys, args.ops, args.write_ratio, args.seed + n, latencies[n])
+        )
+        for n in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    merged = sorted(lat for per_thread in latencies for lat in per_thread)
+    stats = cache.get_stats()
+    return {
+        "elapsed": elapsed,
+        "ops_per_second": len(merged) / elapsed,
+        "p50_us": merged[len(merged) // 2] * 1e6,
+        "p99_us": merged[int(len(merged) * 0.99)] * 1e6,
+        "hit_rate": stats["hit_rate"],
+        "evictions": stats["evictions"],
+        "shards": stats["shards"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50000, help="Operations per thread")
+    parser.add_argument("--keys", type=int, default=5000, help="Distinct keys")
+    parser.add_argument("--max-size", type=int, default=1000, help="Cache capacity (entries)")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of key popularity")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="Share of unconditional writes")
+    parser.add_argument("--persistent", action="store_true", help="Also run with the SQLite tier")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    configs = [
+        ("single lock", lambda _tmp: TTLCache(ttl_seconds=3600, max_size=args.max_size, shards=1)),
+        ("lock striped", lambda _tmp: TTLCache(ttl_seconds=3600, max_size=args.max_size)),
+    ]
+    if args.persistent:
+        configs.append(
+            (
+                "striped + SQLite",
+                lambda tmp: TTLCache(
+                    ttl_seconds=3600,
+                    max_size=args.max_size,
+                    backend=SQLiteCacheBackend(tmp / "api_cache.sqlite"),
+                    namespace="benchmark",
+                ),
+            )
+        )
+
+    print("=" * 80)
+    print("API CACHE BENCHMARK")
+    print("=" * 80)
+    print(
+        f"  Threads: {args.threads}  Ops/thread: {args.ops}  Keys: {args.keys}  "
+        f"Capacity: {args.max_size}  Skew: {args.skew}  Write ratio: {args.write_ratio}"
+    )
+    print("-" * 80)
+    print(f"  {'config':<18} {'shards':>6} {'ops/s':>11} {'p50':>9} {'p99':>9} {'hit rate':>9} {'evictions':>10}")
+    for name, factory in configs:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = benchmark(factory(Path(tmp)), args)
+        print(
+            f"  {name:<18} {result['shards']:>6} {result['ops_per_second']:>11,.0f} "
+            f"{result['p50_us']:>7.1f}us {result['p99_us']:>7.1f}us "
+            f"{result['hit_rate']:>8.1%} {result['evictions']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
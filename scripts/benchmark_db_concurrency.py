@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+DatabaseManager contention benchmark.
+Simulates a parallel batch load (workers registering documents and storing
+extractions) while dashboard readers poll fetch_results/get_statistics, then
+prints per-method wait and execution times from get_concurrency_stats().
+
+Run with --read-pool 1 --group-commit 1 to approximate the old fully
+serialized behaviour for comparison.
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.db_manager import DatabaseManager
+
+FIELDS = [f"field_{i}" for i in range(30)]
+
+
+def process_documents(db: DatabaseManager, files: list[Path]) -> None:
+    """Mimic the processor's per-document write pattern."""
+    for path in files:
+        doc_id = db.register_document(path.name, path, path.stat().st_size, ".pdf")
+        db.update_document_status(doc_id, "processing")
+        db.store_extractions_batch(
+            doc_id,
+            [(name, f"value-{doc_id}", 0.9, "", "valid", None, "heuristic") for name in FIELDS],
+        )
+        db.update_document_status(doc_id, "success", processing_time=0.1, completeness=1.0)
+
+
+def poll_dashboard(
+    db: DatabaseManager, stop: threading.Event, counter: list[int], interval: float
+) -> None:
+    while not stop.wait(interval):
+        db.fetch_results(limit=200)
+        db.get_statistics()
+        counter[0] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8, help="Writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Dashboard reader threads")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between reader polls")
+    parser.add_argument("--read-pool", type=int, default=None, help="Read cursor pool size")
+    parser.add_argument("--group-commit", type=int, default=None, help="Max writes per commit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        files = []
+        for i in range(args.documents):
+            path = tmp_dir / f"doc_{i:05d}.pdf"
+            path.write_bytes(f"%PDF-1.4 benchmark document {i}".encode())
+            files.append(path)
+
+        db = DatabaseManager(
+            db_path=tmp_dir / "benchmark.duckdb",
+            read_pool_size=args.read_pool,
+            group_commit_max=args.group_commit,
+        )
+
+        stop = threading.Event()
+        polls = [0]
+        readers = [
+            threading.Thread(target=poll_dashboard, args=(db, stop, polls, args.poll_interval))
+            for _ in range(args.readers)
+        ]
+        workers = [
+            threading.Thread(target=process_documents, args=(db, files[i :: args.workers]))
+            for i in range(args.workers)
+        ]
+
+        start = time.perf_counter()
+        for thread in readers + workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        stats = db.get_concurrency_stats()
+        db.close()
+
+    print("=" * 80)
+    print("DATABASE CONTENTION BENCHMARK")
+    print("=" * 80)
+    print(f"  Documents: {args.documents}  Writers: {args.workers}  Readers: {args.readers}")
+    print(f"  Read pool: {stats['read_pool']['size']}  Group commit max: {db._group_commit_max}")
+    print(f"  Elapsed: {elapsed:.2f}s  ({args.documents / elapsed:.1f} docs/s, {polls[0]} dashboard polls)")
+    writer = stats["writer"]
+    print(
+        f"  Writer: {writer['writes']} writes in {writer['groups']} commits "
+        f"(avg group {writer['avg_group_size']}, max {writer['max_group_size']})"
+    )
+    print("-" * 80)
+    print(f"  {'method':<32} {'kind':<6} {'calls':>7} {'avg wait':>11} {'max wait':>11} {'avg exec':>11}")
+    for name, method in sorted(stats["methods"].items(), key=lambda item: -item[1]["avg_wait_ms"]):
+        print(
+            f"  {name:<32} {method['kind']:<6} {method['calls']:>7} "
+            f"{method['avg_wait_ms']:>9.2f}ms {method['max_wait_ms']:>9.2f}ms {method['avg_exec_ms']:>9.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Ollama client throughput benchmark.
+Compares the old per-call httpx.Client pattern (new connection per request)
+with the shared pooled AsyncOllamaClient at the same concurrency.
+
+By default a local stub server with a fixed response latency is used so the
+numbers isolate client overhead; pass --live to hit the configured Ollama.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import get_settings
+from src.models.async_ollama import AsyncOllamaClient
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal /api/chat endpoint with keep-alive and a fixed latency."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.01
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        body = json.dumps({"message": {"content": "ok"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stub server on a free port and return it with its URL."""
+    _StubHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_payload(model: str, i: int) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": f"Reply with OK ({i})"}],
+        "stream": False,
+        "options": {"num_predict": 8},
+    }
+
+
+def benchmark_per_call(base_url: str, payloads: list[dict], concurrency: int, timeout: float) -> float:
+    """Old pattern: a fresh httpx.Client (and TCP connection) for every request."""
+
+    def request(payload):
+        with httpx.Client(timeout=timeout) as client:
+            response = client.post(f"{base_url}/api/chat", json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(request, payloads))
+    return time.perf_counter() - start
+
+
+def benchmark_pooled_sync(client: AsyncOllamaClient, payloads: list[dict], concurrency: int) -> float:
+    """Threaded callers sharing the pooled client through chat_sync()."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(client.chat_sync, payloads))
+    return time.perf_counter() - start
+
+
+def benchmark_pooled_async(client: AsyncOllamaClient, payloads: list[dict]) -> float:
+    """All requests issued as coroutines, bounded by the client's semaphore."""
+    start = time.perf_counter()
+    results = client.chat_many_sync(payloads)
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        print(f"  ⚠️  {len(errors)} requests failed: {errors[0]}")
+    return elapsed
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=settings.ollama.max_concurrency)
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub server latency (s)")
+    parser.add_argument("--live", action="store_true", help="Benchmark the configured Ollama server")
+    parser.add_argument("--model", default=settings.ollama.extraction_model, help="Model for --live")
+    args = parser.parse_args()
+
+    server = None
+    if args.live:
+        base_url = settings.ollama.base_url
+    else:
+        server, base_url = start_stub_server(args.latency)
+
+    payloads = [make_payload(args.model, i) for i in range(args.requests)]
+    timeout = float(settings.ollama.timeout)
+
+    print("=" * 80)
+    print("OLLAMA CLIENT THROUGHPUT BENCHMARK")
+    print("=" * 80)
+    print(f"  Server: {base_url} ({'live' if args.live else f'stub, {args.latency * 1000:.0f} ms latency'})")
+    print(f"  Requests: {args.requests}  Concurrency: {args.concurrency}")
+    print("-" * 80)
+
+    per_call = benchmark_per_call(base_url, payloads, args.concurrency, timeout)
+
+    client = AsyncOllamaClient(base_url=base_url, max_concurrency=args.concurrency, timeout=timeout)
+    pooled_sync = benchmark_pooled_sync(client, payloads, args.concurrency)
+    pooled_async = benchmark_pooled_async(client, payloads)
+    stats = client.get_stats()
+    client.close()
+
+    rows = [
+        ("Per-call httpx.Client", per_call),
+        ("Pooled client (sync wrappers)", pooled_sync),
+        ("Pooled client (asyncio gather)", pooled_async),
+    ]
+    for name, elapsed in rows:
+        rps = args.requests / elapsed if elapsed else 0.0
+        speedup = per_call / elapsed if elapsed else 0.0
+        print(f"  {name:<32} {elapsed:8.3f}s  {rps:9.1f} req/s  {speedup:5.2f}x")
+
+    print("-" * 80)
+    print(
+        f"  Pool: peak in-flight {stats['peak_in_flight']}, "
+        f"avg queue wait {stats['avg_queue_wait_s'] * 1000:.1f} ms, "
+        f"avg latency {stats['avg_latency_s'] * 1000:.1f} ms, errors {stats['errors']}"
+    )
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
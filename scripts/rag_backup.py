@@ -3,7 +3,9 @@
 Backup RAG ingested data to external folder.
 
 Exports all documents, incompatibilities, hazards, and metadata
-to JSON/CSV for archival and sharing.
+to JSON/CSV for archival and sharing, or (--format parquet) the whole
+extraction database as zstd-compressed Parquet that can be restored
+with --restore.
 """
 
 from __future__ import annotations
@@ -24,6 +26,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
+from src.database import parquet_backup
 from src.utils.logger import get_logger
 
 logger = get_logger("rag_backup")
@@ -343,6 +346,14 @@ class RAGBackupManager:
             logger.error(f"Backup failed: {e}")
             raise
 
+    def backup_parquet(self, backup_path: str | Path) -> dict:
+        """Create a Parquet backup of the extraction database tables."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        versioned_dir = Path(backup_path) / f"db_backup_{timestamp}"
+        logger.info(f"Starting Parquet backup to {versioned_dir}")
+        manifest = parquet_backup.export_tables(self.conn, versioned_dir)
+        return {"timestamp": timestamp, "backup_path": str(versioned_dir), "manifest": manifest}
+
     def close(self):
         """Close database connection."""
         if self.conn:
@@ -366,14 +377,28 @@ Examples:
 
   # Show what would be backed up
   python rag_backup.py --output ./backups --dry-run
+
+  # Columnar backup of the whole extraction database, and its restore
+  python rag_backup.py --output ./backups --format parquet
+  python rag_backup.py --restore ./backups/db_backup_20250101_120000
         """,
     )
     parser.add_argument(
         "--output",
         type=str,
-        required=True,
         help="Output directory for backup (creates versioned subdir)",
     )
+    parser.add_argument(
+        "--format",
+        choices=["json", "parquet"],
+        default="json",
+        help="json: RAG tables as JSON/CSV; parquet: all extraction tables via DuckDB COPY",
+    )
+    parser.add_argument(
+        "--restore",
+        type=str,
+        help="Restore a Parquet backup directory into the database (replaces its tables)",
+    )
     parser.add_argument(
         "--db",
         type=str,
@@ -387,8 +412,21 @@ Examples:
     )
 
     args = parser.parse_args()
+    if not args.output and not args.restore:
+        parser.error("--output or --restore is required")
 
     try:
+        if args.restore:
+            from src.database.db_manager import DatabaseManager
+
+            db = DatabaseManager(db_path=Path(args.db))
+            restored = db.import_parquet(args.restore)
+            db.close()
+            print(f"\n✅ Restored {sum(restored.values())} rows from {args.restore}")
+            for table, count in restored.items():
+                print(f"  {table}: {count}")
+            return 0
+
         if args.dry_run:
             logger.info("DRY RUN MODE - No files will be created")
             logger.info(f"Would backup to: {args.output}")
@@ -418,6 +456,14 @@ Examples:
             print(f"Error: Failed to create temporary DB copy: {exc}")
             return 1
 
+        if args.format == "parquet":
+            results = backup_manager.backup_parquet(args.output)
+            print(f"\n📦 Parquet backup complete: {results['backup_path']}")
+            for table, info in results["manifest"]["tables"].items():
+                print(f"  {table}: {info['rows']} rows")
+            backup_manager.close()
+            return 0
+
         # Preflight: required tables
         try:
             existing = set(
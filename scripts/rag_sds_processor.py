@@ -289,39 +289,24 @@ class RAGSDSProcessor:
             return {"warning_count": 0, "pairs": []}
 
         try:
-            # Check all pairs
-            for i, cas_a in enumerate(cas_list):
-                for cas_b in cas_list[i + 1 :]:
-                    # Query RAG for incompatibility
-                    try:
-                        result_a = self.db_manager.get_incompatibility_rule(
-                            cas_a=cas_a, cas_b=cas_b
-                        )
-                        result_b = self.db_manager.get_incompatibility_rule(
-                            cas_a=cas_b, cas_b=cas_a
-                        )
-
-                        if result_a:
-                            incomp_pairs.append(
-                                {
-                                    "cas_a": cas_a,
-                                    "cas_b": cas_b,
-                                    "rule": result_a.get("rule", "Unknown"),
-                                    "source": result_a.get("source", "Unknown"),
-                                }
-                            )
-                        elif result_b:
-                            incomp_pairs.append(
-                                {
-                                    "cas_a": cas_b,
-                                    "cas_b": cas_a,
-                                    "rule": result_b.get("rule", "Unknown"),
-                                    "source": result_b.get("source", "Unknown"),
-                                }
-                            )
-                    except Exception as e:
-                        msg = f"Error checking pair {cas_a}/{cas_b}: {e}"
-                        logger.debug(msg)
+            # Resolve every pair in one query (rules are stored order-insensitively)
+            pairs = [
+                (cas_a, cas_b)
+                for i, cas_a in enumerate(cas_list)
+                for cas_b in cas_list[i + 1 :]
+            ]
+            rules = self.db_manager.get_incompatibility_rules_for_pairs(pairs)
+            for cas_a, cas_b in pairs:
+                rule = rules.get(tuple(sorted([cas_a.strip(), cas_b.strip()])))
+                if rule:
+                    incomp_pairs.append(
+                        {
+                            "cas_a": cas_a,
+                            "cas_b": cas_b,
+                            "rule": rule.get("rule", "Unknown"),
+                            "source": rule.get("source", "Unknown"),
+                        }
+                    )
 
             return {
                 "warning_count": len(incomp_pairs),
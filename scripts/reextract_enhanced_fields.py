@@ -12,9 +12,15 @@ Processes all existing SDS PDFs to extract the 21 new Priority 1 fields:
 
 This will UPDATE the extractions table with new field data while preserving
 existing extraction data.
+
+With --run-heuristics the heuristic extractors are re-run over stored
+documents. Text and sections come from the persistent extraction cache, so
+PDFs are only parsed/OCR'd the first time.
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
@@ -26,28 +32,105 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+NEW_FIELDS = [
+    'ghs_pictograms', 'signal_word',
+    'exposure_limit_osha_pel', 'exposure_limit_acgih_tlv', 
+    'exposure_limit_niosh_rel', 'exposure_limit_idlh',
+    'flash_point', 'boiling_point', 'melting_point', 'ph', 'physical_state',
+    'toxicity_oral_ld50', 'toxicity_dermal_ld50', 'toxicity_inhalation_lc50',
+    'proper_shipping_name',
+    'tsca_status', 'sara_313', 'california_prop65'
+]
+
+
+def rerun_heuristics(db, fields: list[str], limit: int | None = None) -> None:
+    """Re-run heuristics for `fields` on processed documents using cached text."""
+    from src.sds.extractor import SDSExtractor
+    from src.sds.heuristics import HeuristicExtractor
+    from src.sds.profile_router import ProfileRouter
+
+    extractor = SDSExtractor()
+    heuristics = HeuristicExtractor()
+    router = ProfileRouter()
+    wanted = set(fields)
+
+    rows = db.conn.execute(
+        "SELECT id, file_path FROM documents WHERE status IN ('success', 'completed') ORDER BY id"
+    ).fetchall()
+    if limit:
+        rows = rows[:limit]
+
+    print(f"🔁 Re-running heuristics on {len(rows)} documents...")
+    start = time.time()
+    updated = 0
+    for doc_id, file_path in rows:
+        path = Path(file_path)
+        if not path.exists():
+            logger.warning("Skipping missing file: %s", path)
+            continue
+        try:
+            doc = extractor.extract_document(path)
+        except Exception as exc:
+            logger.warning("Extraction failed for %s: %s", path.name, exc)
+            continue
+
+        profile = router.identify_profile(doc["text"])
+        found = heuristics.extract_all_fields(doc["text"], doc.get("sections", {}), profile)
+        existing = db.get_extractions_by_document(doc_id)
+        batch = [
+            (
+                name,
+                result.get("value", ""),
+                result.get("confidence", 0.0),
+                result.get("context", ""),
+                result.get("validation_status", "pending"),
+                result.get("validation_message"),
+                "heuristic",
+            )
+            for name, result in found.items()
+            if name in wanted
+            and existing.get(name, {}).get("value") in (None, "", "NOT_FOUND")
+        ]
+        if batch:
+            db.store_extractions_batch(doc_id, batch)
+            updated += len(batch)
+
+    elapsed = time.time() - start
+    print(f"✓ Stored {updated} new field values in {elapsed:.1f}s")
+    cache = extractor.get_extraction_cache()
+    if cache:
+        stats = cache.get_stats()
+        print(
+            f"✓ Extraction cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['entries']} entries, {stats['size_bytes'] / 1e6:.1f} MB)"
+        )
+
 
 def main():
     """Re-extract Priority 1 fields from existing documents."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--run-heuristics",
+        action="store_true",
+        help="Re-run heuristics for the new fields using cached document text",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Max documents to process")
+    args = parser.parse_args()
     
     print("\n" + "="*80)
     print("🔄 RE-EXTRACTING ENHANCED FIELDS FROM EXISTING PDFs")
     print("="*80 + "\n")
     
     db = get_db_manager()
+
+    if args.run_heuristics:
+        rerun_heuristics(db, NEW_FIELDS, limit=args.limit)
+        return
     
     # Get list of new fields (those not currently in extractions table)
     print("📋 Checking which fields need extraction...")
     
-    new_fields = [
-        'ghs_pictograms', 'signal_word',
-        'exposure_limit_osha_pel', 'exposure_limit_acgih_tlv', 
-        'exposure_limit_niosh_rel', 'exposure_limit_idlh',
-        'flash_point', 'boiling_point', 'melting_point', 'ph', 'physical_state',
-        'toxicity_oral_ld50', 'toxicity_dermal_ld50', 'toxicity_inhalation_lc50',
-        'proper_shipping_name',
-        'tsca_status', 'sara_313', 'california_prop65'
-    ]
+    new_fields = NEW_FIELDS
     
     # Check how many of these fields already have data
     conn = db.conn
@@ -98,6 +181,9 @@ def main():
     print("    ./.venv/bin/python scripts/extract_new_fields_only.py")
     print("    (Note: This script needs to be created)")
     
+    print("\n  Option D: Re-run heuristics only (uses the extraction cache)")
+    print("    ./.venv/bin/python scripts/reextract_enhanced_fields.py --run-heuristics")
+    
     print("\\n⏱️  Estimated time:")
     print(f"  - Full pipeline: ~{doc_count * 30} seconds ({doc_count * 30 // 60} minutes)")
     print(f"  - LLM extraction: ~{doc_count * 21 * 2} seconds ({doc_count * 21 * 2 // 60} minutes)")
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import json
 import sys
 from collections import defaultdict
@@ -78,17 +77,18 @@ class SDSPipelineManager:
 
         return True
 
-    def _compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash of file content."""
+    def _compute_file_hashes(self, paths: list[Path]) -> dict[Path, str]:
+        """Compute SHA256 of file contents in parallel, reusing cached hashes."""
+        from src.sds.dedup_scan import DedupScanner
+
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
+            from src.database import get_db_manager
+
+            db = get_db_manager()
         except Exception as e:
-            logger.error(f"Error computing hash for {file_path}: {e}")
-            return ""
+            logger.warning(f"Hash cache unavailable, hashing every file: {e}")
+            db = None
+        return DedupScanner(db).hash_files(paths)
 
     def create_extraction_list(
         self,
@@ -106,6 +106,7 @@ class SDSPipelineManager:
             return []
 
         logger.info("Creating extraction list...")
+        hashes = self._compute_file_hashes([f["path"] for f in self.sds_files])
 
         if remove_duplicates:
             # Track files by hash and name+size
@@ -114,7 +115,7 @@ class SDSPipelineManager:
             duplicates = []
 
             for file_info in self.sds_files:
-                file_hash = self._compute_file_hash(file_info["path"])
+                file_hash = hashes.get(file_info["path"], "")
                 file_key = f"{file_info['name']}_{file_info['size']}"
 
                 # Check content hash
@@ -159,7 +160,7 @@ class SDSPipelineManager:
                     "path": str(f["path"]),
                     "name": f["name"],
                     "size": f["size"],
-                    "hash": self._compute_file_hash(f["path"]),
+                    "hash": hashes.get(f["path"], ""),
                     "status": "pending",
                 }
                 for f in self.sds_files
@@ -53,6 +53,27 @@ class OllamaConfig:
         default_factory=lambda: int(os.getenv("LLM_MAX_TOKENS", "2000"))
     )
     timeout: int = field(default_factory=lambda: int(os.getenv("LLM_TIMEOUT", "120")))
+    # Shared pooled HTTP client: max in-flight requests and idle keep-alive time
+    max_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("OLLAMA_MAX_CONCURRENCY", "8"))
+    )
+    keepalive_expiry: float = field(
+        default_factory=lambda: float(os.getenv("OLLAMA_KEEPALIVE_SECONDS", "60"))
+    )
+    # Embedding scheduler: texts/characters per /api/embed request, requests in
+    # flight (also bounded by max_concurrency) and retries before a batch is halved
+    embedding_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    )
+    embedding_batch_chars: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_BATCH_CHARS", "32000"))
+    )
+    embedding_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+    )
+    embedding_max_retries: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_MAX_RETRIES", "2"))
+    )
 
 
 @dataclass(frozen=True)
@@ -70,6 +91,40 @@ class ProcessingConfig:
         default_factory=lambda: int(os.getenv("MAX_FILE_SIZE_MB", "50"))
     )
     heuristic_confidence_threshold: float = 0.82  # Skip LLM if heuristics are confident
+    # Missing-field LLM extraction: "section" (one JSON-schema request per SDS section),
+    # "document" (one request per document) or "off" (one request per field)
+    llm_structured_mode: str = field(
+        default_factory=lambda: os.getenv("LLM_STRUCTURED_MODE", "section").lower()
+    )
+    # Per-field LLM prompt context budget (~4 chars/token; 750 ~ the old text[:3000])
+    llm_context_token_budget: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CONTEXT_TOKEN_BUDGET", "750"))
+    )
+    # Extraction workers process_batch uses when none are passed; 1 (default) processes
+    # files sequentially, more runs the staged pipeline below (each worker process
+    # loads its own extractor/OCR models)
+    batch_workers: int = field(
+        default_factory=lambda: int(os.getenv("BATCH_WORKERS", "1"))
+    )
+    # Staged batch pipeline (process_batch): extraction runs in batch_workers processes,
+    # the LLM / enrichment (PubChem + RAG) / indexing stages in their own thread pools.
+    batch_llm_workers: int = field(
+        default_factory=lambda: int(os.getenv("BATCH_LLM_WORKERS", "2"))
+    )
+    batch_enrich_workers: int = field(
+        default_factory=lambda: int(os.getenv("BATCH_ENRICH_WORKERS", "4"))
+    )
+    batch_index_workers: int = field(
+        default_factory=lambda: int(os.getenv("BATCH_INDEX_WORKERS", "2"))
+    )
+    # Capacity of the queue in front of each stage (0 = that stage's worker count)
+    batch_queue_size: int = field(
+        default_factory=lambda: int(os.getenv("BATCH_QUEUE_SIZE", "0"))
+    )
+    # Threads hashing files in the dedup pre-scan (I/O bound; more helps on network shares)
+    hash_workers: int = field(
+        default_factory=lambda: int(os.getenv("HASH_WORKERS", "8"))
+    )
     # OCR fallback thresholds
     ocr_min_avg_chars_per_page: int = field(
         default_factory=lambda: int(os.getenv("OCR_MIN_AVG_CHARS_PER_PAGE", "400"))
@@ -84,6 +139,78 @@ class ProcessingConfig:
     ocr_timeout_seconds: int = field(
         default_factory=lambda: int(os.getenv("OCR_TIMEOUT_SECONDS", "600"))
     )
+    # Page-selective OCR: score each page and OCR only the low-quality ones
+    # (replaces the whole-document fallback when enabled)
+    ocr_page_selective: bool = field(
+        default_factory=lambda: os.getenv("OCR_PAGE_SELECTIVE", "true").lower()
+        in ("true", "1", "yes")
+    )
+    ocr_page_min_chars: int = field(
+        default_factory=lambda: int(os.getenv("OCR_PAGE_MIN_CHARS", "80"))
+    )
+    ocr_page_image_coverage: float = field(
+        default_factory=lambda: float(os.getenv("OCR_PAGE_IMAGE_COVERAGE", "0.5"))
+    )
+    ocr_page_glyph_warnings: int = field(
+        default_factory=lambda: int(os.getenv("OCR_PAGE_GLYPH_WARNINGS", "10"))
+    )
+    # docTR batcher: pages per predictor call and max wait for a batch to fill
+    ocr_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("OCR_BATCH_SIZE", "8"))
+    )
+    ocr_batch_max_wait_ms: float = field(
+        default_factory=lambda: float(os.getenv("OCR_BATCH_MAX_WAIT_MS", "50"))
+    )
+    # On-disk cache of extracted PDF text/sections (keyed by SHA-256 + extractor version)
+    extraction_cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower()
+        in ("true", "1", "yes")
+    )
+    extraction_cache_max_mb: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_CACHE_MAX_MB", "512"))
+    )
+    # DatabaseManager: pooled read cursors and max writes per group commit
+    db_read_pool_size: int = field(
+        default_factory=lambda: int(os.getenv("DB_READ_POOL_SIZE", "4"))
+    )
+    db_group_commit_max: int = field(
+        default_factory=lambda: int(os.getenv("DB_GROUP_COMMIT_MAX", "64"))
+    )
+    # Persistent LLM response cache behind the in-memory LRU (shared across processes)
+    llm_cache_persistent: bool = field(
+        default_factory=lambda: os.getenv("LLM_CACHE_PERSISTENT", "true").lower()
+        in ("true", "1", "yes")
+    )
+    llm_cache_ttl_hours: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_TTL_HOURS", "720"))
+    )
+    llm_cache_max_mb: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+    )
+    # Persistent tier behind the in-memory PubChem/translation/structure caches (utils.cache)
+    api_cache_persistent: bool = field(
+        default_factory=lambda: os.getenv("API_CACHE_PERSISTENT", "false").lower()
+        in ("true", "1", "yes")
+    )
+    api_cache_max_mb: int = field(
+        default_factory=lambda: int(os.getenv("API_CACHE_MAX_MB", "128"))
+    )
+    # Persistent embedding cache consulted before the embedding model (see rag.embedding_cache)
+    embedding_cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower()
+        in ("true", "1", "yes")
+    )
+    # BM25 index fused with dense retrieval (see rag.lexical_index)
+    rag_hybrid_enabled: bool = field(
+        default_factory=lambda: os.getenv("RAG_HYBRID_ENABLED", "true").lower()
+        in ("true", "1", "yes")
+    )
+    # Phase 3 asks for all missing RAG fields in one JSON-schema request
+    # (false: one chat question per field)
+    rag_batch_fields: bool = field(
+        default_factory=lambda: os.getenv("RAG_BATCH_FIELDS", "true").lower()
+        in ("true", "1", "yes")
+    )
     # PDF handling
     pdf_preprocess_enabled: bool = field(
         default_factory=lambda: os.getenv("PDF_PREPROCESS_ENABLED", "false").lower()
@@ -122,6 +249,32 @@ class PathsConfig:
     input_dir: Path = field(default_factory=lambda: DATA_DIR / "input")
     output_dir: Path = field(default_factory=lambda: DATA_DIR / "output")
     logs_dir: Path = field(default_factory=lambda: DATA_DIR / "logs")
+    extraction_cache: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("EXTRACTION_CACHE_DIR", DATA_DIR / "cache" / "extraction")
+        )
+    )
+    llm_cache: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("LLM_CACHE_PATH", DATA_DIR / "cache" / "llm_cache.sqlite")
+        )
+    )
+    embedding_cache: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("EMBEDDING_CACHE_DIR", DATA_DIR / "cache" / "embeddings")
+        )
+    )
+    api_cache: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("API_CACHE_PATH", DATA_DIR / "cache" / "api_cache.sqlite")
+        )
+    )
+    # Last incompatibility matrix, reused by incremental rebuilds
+    matrix_snapshot: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("MATRIX_SNAPSHOT_PATH", DATA_DIR / "cache" / "matrix_snapshot.npz")
+        )
+    )
 
     def ensure_directories(self) -> None:
         """Create all required directories if they don't exist."""
@@ -225,6 +378,14 @@ class Settings:
     hazard_idlh_threshold: float = field(
         default_factory=lambda: float(os.getenv("HAZARD_IDLH_THRESHOLD", "50"))
     )
+    # Matrix builds whose decisions are kept in the audit log (0 = keep all)
+    matrix_keep_builds: int = field(
+        default_factory=lambda: int(os.getenv("MATRIX_KEEP_BUILDS", "0"))
+    )
+    # Rows evaluated per band by sparse matrix builds and streaming exports
+    matrix_block_rows: int = field(
+        default_factory=lambda: int(os.getenv("MATRIX_BLOCK_ROWS", "512"))
+    )
 
     def __post_init__(self) -> None:
         """Initialize directories after settings are loaded."""
@@ -1,21 +1,46 @@
-"""DuckDB database manager for SDS extraction persistence."""
+"""DuckDB database manager for SDS extraction persistence.
+
+Concurrency model: reads borrow a cursor from a small pool so dashboard
+queries, RAG indexing and the processing loop can read in parallel. All
+writes are queued to a single writer thread that drains the queue and
+commits whatever is waiting in one transaction (group commit); callers
+block until their write is committed, so read-your-writes still holds.
+If a grouped transaction fails, its writes are retried one by one so a
+bad write only fails its own caller. Per-method wait (cursor wait for
+reads, queue wait for writes) and execution times are available from
+``get_concurrency_stats``.
+
+Extractions are stored as one row per field; ``document_results`` keeps a
+wide, one-row-per-document copy that the write methods refresh in the same
+transaction, so ``fetch_results`` reads it without pivoting.
+
+``conn`` and ``_lock`` remain available for code that runs ad-hoc SQL
+(call ``rebuild_document_results`` after editing extractions that way).
+"""
 
 from __future__ import annotations
 
 import hashlib
 import os
 import json
+import mmap
+import queue
 import threading
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 import duckdb
 
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
+from . import parquet_backup
 
 logger = get_logger(__name__)
 
@@ -48,14 +73,105 @@ class ExtractionRecord:
     created_at: datetime
 
 
+@dataclass
+class _WriteOp:
+    """A write queued for the writer thread."""
+
+    method: str
+    fn: Callable[[duckdb.DuckDBPyConnection], Any]
+    enqueued: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+# Extraction fields materialized as columns of ``document_results``
+_RESULT_FIELDS = (
+    "product_name",
+    "manufacturer",
+    "cas_number",
+    "un_number",
+    "hazard_class",
+    "packing_group",
+    "h_statements",
+    "p_statements",
+    "incompatibilities",
+)
+
+_RESULT_COLUMNS = [
+    "id",
+    "filename",
+    "status",
+    "is_dangerous",
+    "processed_at",
+    "processing_time",
+    *_RESULT_FIELDS,
+    "completeness",
+    "avg_confidence",
+    "quality_tier",
+    "validated",
+]
+
+# rag_incompatibilities columns read by the rule lookups (see _rule_from_row)
+_RULE_COLUMNS = "r.cas_a, r.cas_b, r.rule, r.source, r.justification, r.group_a, r.group_b, r.metadata"
+
+# Rule cache bounds: cached CAS pairs (cleared when full) and cached CAS sets (LRU)
+_RULE_CACHE_MAX_PAIRS = 100_000
+_RULE_SET_CACHE_SIZE = 4
+
+# Read size of calculate_hash's buffered fallback (when mmap is unavailable)
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+# Default statuses shown by fetch_results (finished documents)
+_RESULT_STATUSES = ("success", "failed", "partial")
+
+# Pivot of the extractions EAV rows into one document_results row per document
+_DOCUMENT_RESULTS_PIVOT = """
+    SELECT
+        d.id,
+        d.filename,
+        d.status,
+        d.is_dangerous,
+        d.processed_at,
+        d.processing_time_seconds,
+        {fields},
+        COALESCE(MAX(d.completeness_score), 0),
+        COALESCE(MAX(d.avg_confidence), AVG(e.confidence)),
+        COALESCE(MAX(CASE WHEN e.field_name = 'product_name' THEN TRY_CAST(json_extract(e.metadata, '$.quality_tier') AS VARCHAR) END), 'unknown'),
+        COALESCE(MAX(CASE WHEN e.field_name = 'product_name' THEN TRY_CAST(json_extract(e.metadata, '$.external_validation.is_valid') AS BOOLEAN) END), FALSE)
+    FROM documents d
+    LEFT JOIN extractions e ON e.document_id = d.id
+    {{where}}
+    GROUP BY d.id, d.filename, d.status, d.is_dangerous, d.processed_at, d.processing_time_seconds
+""".format(
+    fields=",\n        ".join(
+        f"MAX(CASE WHEN e.field_name = '{name}' THEN e.value END)" for name in _RESULT_FIELDS
+    )
+)
+
+
+def _to_arrow(result: duckdb.DuckDBPyConnection) -> Any:
+    """Fetch a query result as a pyarrow Table (across DuckDB versions)."""
+    to_table = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+    return to_table()
+
+
 class DatabaseManager:
     """Thread-safe DuckDB manager for SDS extraction data."""
 
-    def __init__(self, db_path: Path | None = None) -> None:
+    _WRITER_IDLE_SECONDS = 5.0
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        read_pool_size: int | None = None,
+        group_commit_max: int | None = None,
+    ) -> None:
         """Initialize database connection.
 
         Args:
             db_path: Path to database file (uses settings default if None)
+            read_pool_size: Max pooled read cursors (default: ProcessingConfig.db_read_pool_size)
+            group_commit_max: Max writes committed per transaction
+                (default: ProcessingConfig.db_group_commit_max)
         """
         self.db_path = db_path or get_settings().paths.duckdb
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -81,6 +197,30 @@ class DatabaseManager:
                 raise
         self._lock = threading.Lock()
 
+        processing = get_settings().processing
+        self._read_pool_size = max(1, read_pool_size or processing.db_read_pool_size)
+        self._group_commit_max = max(1, group_commit_max or processing.db_group_commit_max)
+        self._read_pool: queue.LifoQueue[duckdb.DuckDBPyConnection] = queue.LifoQueue()
+        self._read_cursors: list[duckdb.DuckDBPyConnection] = []
+        self._pool_lock = threading.Lock()
+        self._write_queue: queue.Queue[_WriteOp | None] = queue.Queue()
+        self._writer_lock = threading.Lock()
+        self._writer_thread: threading.Thread | None = None
+        self._write_conn: duckdb.DuckDBPyConnection | None = None
+        self._stats_lock = threading.Lock()
+        self._op_stats: dict[str, dict[str, Any]] = {}
+        self._write_groups = 0
+        self._grouped_writes = 0
+        self._max_group = 0
+        self._harvest_table_ready = False
+        # Read-through cache of incompatibility rules, by CAS pair and by CAS set
+        self._rule_cache: dict[tuple[str, str], dict[str, Any] | None] = {}
+        self._rule_set_cache: OrderedDict[tuple[str, ...], dict[tuple[str, str], dict[str, Any]]] = OrderedDict()
+        self._rule_cache_lock = threading.Lock()
+        self._rule_cache_generation = 0
+        self._rule_cache_hits = 0
+        self._rule_cache_misses = 0
+
         logger.info("Connected to DuckDB: %s", self.db_path)
         self._initialize_schema()
 
@@ -165,6 +305,19 @@ class DatabaseManager:
             """
             )
 
+            # Content hashes of scanned files, valid while (size, mtime) match
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path VARCHAR PRIMARY KEY,
+                    size_bytes BIGINT NOT NULL,
+                    mtime_ns BIGINT NOT NULL,
+                    sha256 VARCHAR NOT NULL,
+                    hashed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """
+            )
+
             # Extractions table
             self.conn.execute(
                 """
@@ -317,6 +470,11 @@ class DatabaseManager:
                 );
             """
             )
+            self.conn.execute(
+                """
+                ALTER TABLE matrix_decisions ADD COLUMN IF NOT EXISTS build_id VARCHAR;
+            """
+            )
 
             # Manufacturer nodes table
             self.conn.execute(
@@ -330,6 +488,36 @@ class DatabaseManager:
             """
             )
 
+            # Materialized wide view of extractions (one row per document),
+            # kept current by the write methods so fetch_results needs no pivot
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS document_results (
+                    document_id BIGINT PRIMARY KEY,
+                    filename VARCHAR,
+                    status VARCHAR,
+                    is_dangerous BOOLEAN,
+                    processed_at TIMESTAMP,
+                    processing_time DOUBLE,
+                    product_name VARCHAR,
+                    manufacturer VARCHAR,
+                    cas_number VARCHAR,
+                    un_number VARCHAR,
+                    hazard_class VARCHAR,
+                    packing_group VARCHAR,
+                    h_statements VARCHAR,
+                    p_statements VARCHAR,
+                    incompatibilities VARCHAR,
+                    completeness DOUBLE,
+                    avg_confidence DOUBLE,
+                    quality_tier VARCHAR,
+                    validated BOOLEAN
+                );
+            """
+            )
+            # Catch up documents written before the table existed
+            self._refresh_document_results(self.conn, missing_only=True)
+
     def _create_indexes(self) -> None:
         """Create database indexes for frequently queried fields."""
         logger.debug("Creating database indexes")
@@ -445,17 +633,353 @@ class DatabaseManager:
             
             logger.info("Database indexes created successfully")
 
+    # === Concurrency ===
+
+    @contextmanager
+    def _read(self, method: str) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a pooled read cursor, recording how long the caller waited for it."""
+        requested = time.perf_counter()
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = len(self._read_cursors) < self._read_pool_size
+                if create:
+                    with self._lock:
+                        conn = self.conn.cursor()
+                    self._read_cursors.append(conn)
+            if not create:
+                conn = self._read_pool.get()
+        acquired = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+            self._record_op(method, "read", acquired - requested, time.perf_counter() - acquired)
+
+    def _write(self, method: str, fn: Callable[[duckdb.DuckDBPyConnection], Any]) -> Any:
+        """Queue a write for the writer thread and wait until its group commits.
+
+        Args:
+            method: Name reported in the concurrency stats
+            fn: Callable executing the write on the writer's connection
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        if threading.current_thread() is self._writer_thread:
+            # Nested write issued from inside a queued write
+            return fn(self._write_conn)
+
+        op = _WriteOp(method, fn)
+        with self._writer_lock:
+            self._write_queue.put(op)
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="duckdb-writer", daemon=True
+                )
+                self._writer_thread.start()
+        return op.future.result()
+
+    def _writer_loop(self) -> None:
+        if self._write_conn is None:
+            with self._lock:
+                self._write_conn = self.conn.cursor()
+
+        while True:
+            try:
+                op = self._write_queue.get(timeout=self._WRITER_IDLE_SECONDS)
+            except queue.Empty:
+                # Exit when idle; the next write starts a new thread
+                with self._writer_lock:
+                    if self._write_queue.empty():
+                        self._writer_thread = None
+                        return
+                continue
+
+            batch: list[_WriteOp] = []
+            while op is not None:
+                batch.append(op)
+                if len(batch) >= self._group_commit_max:
+                    break
+                try:
+                    op = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit_group(batch)
+            if op is None:  # close() requested
+                with self._writer_lock:
+                    self._writer_thread = None
+                return
+
+    def _commit_group(self, batch: list[_WriteOp]) -> None:
+        """Run queued writes in one transaction; isolate failures by retrying singly."""
+        conn = self._write_conn
+        started = time.perf_counter()
+        results: list[Any] = []
+        durations: list[float] = []
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            for op in batch:
+                op_start = time.perf_counter()
+                results.append(op.fn(conn))
+                durations.append(time.perf_counter() - op_start)
+            conn.execute("COMMIT")
+        except Exception as exc:
+            self._rollback(conn)
+            if len(batch) > 1:
+                logger.debug(
+                    "Group commit of %d writes failed (%s); retrying individually",
+                    len(batch),
+                    exc,
+                )
+            for op in batch:
+                self._commit_single(conn, op, started)
+            self._record_group(len(batch))
+            return
+
+        for op, result, duration in zip(batch, results, durations):
+            self._record_op(op.method, "write", started - op.enqueued, duration)
+            op.future.set_result(result)
+        self._record_group(len(batch))
+
+    def _commit_single(self, conn: duckdb.DuckDBPyConnection, op: _WriteOp, queued_until: float) -> None:
+        op_start = time.perf_counter()
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            result = op.fn(conn)
+            conn.execute("COMMIT")
+        except Exception as exc:
+            self._rollback(conn)
+            op.future.set_exception(exc)
+        else:
+            op.future.set_result(result)
+        self._record_op(op.method, "write", queued_until - op.enqueued, time.perf_counter() - op_start)
+
+    @staticmethod
+    def _rollback(conn: duckdb.DuckDBPyConnection) -> None:
+        try:
+            conn.execute("ROLLBACK")
+        except Exception:
+            pass  # no transaction open
+
+    def _record_op(self, method: str, kind: str, wait: float, elapsed: float) -> None:
+        with self._stats_lock:
+            stats = self._op_stats.setdefault(
+                method,
+                {"kind": kind, "calls": 0, "wait_total": 0.0, "wait_max": 0.0, "exec_total": 0.0},
+            )
+            stats["calls"] += 1
+            stats["wait_total"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            stats["exec_total"] += elapsed
+
+    def _record_group(self, size: int) -> None:
+        with self._stats_lock:
+            self._write_groups += 1
+            self._grouped_writes += size
+            self._max_group = max(self._max_group, size)
+
+    def get_concurrency_stats(self) -> dict[str, Any]:
+        """Per-method wait/execution timings and writer group-commit counters.
+
+        For reads ``wait`` is the time spent waiting for a pooled cursor; for
+        writes it is the time spent queued for the writer thread.
+
+        Returns:
+            Dictionary with ``methods``, ``writer`` and ``read_pool`` sections
+        """
+        with self._stats_lock:
+            methods = {
+                name: {
+                    "kind": stats["kind"],
+                    "calls": stats["calls"],
+                    "avg_wait_ms": round(stats["wait_total"] / stats["calls"] * 1000, 3),
+                    "max_wait_ms": round(stats["wait_max"] * 1000, 3),
+                    "avg_exec_ms": round(stats["exec_total"] / stats["calls"] * 1000, 3),
+                }
+                for name, stats in self._op_stats.items()
+            }
+            writer = {
+                "groups": self._write_groups,
+                "writes": self._grouped_writes,
+                "avg_group_size": (
+                    round(self._grouped_writes / self._write_groups, 2) if self._write_groups else 0.0
+                ),
+                "max_group_size": self._max_group,
+                "queued": self._write_queue.qsize(),
+            }
+        return {
+            "methods": methods,
+            "writer": writer,
+            "read_pool": {"size": self._read_pool_size, "open": len(self._read_cursors)},
+        }
+
+    def reset_concurrency_stats(self) -> None:
+        """Clear the per-method timings and writer counters."""
+        with self._stats_lock:
+            self._op_stats.clear()
+            self._write_groups = 0
+            self._grouped_writes = 0
+            self._max_group = 0
+
+    def close(self) -> None:
+        """Flush queued writes, stop the writer thread and close all connections."""
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is not None:
+                self._write_queue.put(None)
+        if thread is not None:
+            thread.join()
+
+        with self._pool_lock:
+            cursors, self._read_cursors = self._read_cursors, []
+        for cursor in [*cursors, self._write_conn]:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+        self._write_conn = None
+        self._read_pool = queue.LifoQueue()
+        with self._lock:
+            self.conn.close()
+
     # === Hash Utilities ===
 
     @staticmethod
     def calculate_hash(file_path: Path) -> str:
-        """Calculate SHA256 hash for file deduplication."""
+        """Calculate SHA256 hash for file deduplication.
+
+        The file is memory-mapped and digested in one call (hashlib releases
+        the GIL meanwhile, so threads hash in parallel); 1 MB buffered reads
+        are used where mmap is unavailable (empty files, some network shares).
+        """
         digest = hashlib.sha256()
-        with file_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                digest.update(chunk)
+        with Path(file_path).open("rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+            except (ValueError, OSError):
+                f.seek(0)
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                    digest.update(chunk)
         return digest.hexdigest()
 
+    @staticmethod
+    def file_signature(file_path: Path) -> tuple[str, int, int]:
+        """Return the ``(absolute path, size, mtime_ns)`` key of the hash cache."""
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def get_cached_file_hashes(self, signatures: Iterable[tuple[str, int, int]]) -> dict[str, str]:
+        """Look up cached content hashes for many files in one query.
+
+        Args:
+            signatures: ``file_signature`` tuples
+
+        Returns:
+            Dictionary mapping path -> SHA256 for files whose size and mtime
+            still match the cached entry
+        """
+        signatures = list(signatures)
+        if not signatures:
+            return {}
+        paths, sizes, mtimes = (list(column) for column in zip(*signatures))
+        with self._read("get_cached_file_hashes") as conn:
+            rows = conn.execute(
+                """
+                SELECT h.path, h.sha256
+                FROM (SELECT UNNEST(?::VARCHAR[]) AS path, UNNEST(?::BIGINT[]) AS size_bytes,
+                             UNNEST(?::BIGINT[]) AS mtime_ns) f
+                JOIN file_hashes h
+                  ON h.path = f.path AND h.size_bytes = f.size_bytes AND h.mtime_ns = f.mtime_ns
+                """,
+                [paths, sizes, mtimes],
+            ).fetchall()
+        return dict(rows)
+
+    def store_file_hashes(self, entries: Iterable[tuple[str, int, int, str]]) -> None:
+        """Cache content hashes, given as ``(path, size, mtime_ns, sha256)`` tuples."""
+        entries = list(entries)
+        if entries:
+            self._write("store_file_hashes", lambda conn: self._upsert_file_hashes(conn, entries))
+
+    def resolve_processed_files(
+        self, files: list[tuple[str, int, str | None]]
+    ) -> list[dict[str, Any] | None]:
+        """Resolve the already-processed status of many files in one query.
+
+        A file counts as processed when a completed document with extractions
+        has the same content hash, or (when the hash is unknown or unmatched)
+        the same name and size, as ``check_file_by_name_and_size``.
+
+        Args:
+            files: ``(filename, size_bytes, sha256 or None)`` per file
+
+        Returns:
+            One entry per input file: None, or a dict with ``document_id``,
+            ``processed_at`` and ``matched_by`` ("hash" or "name_size")
+        """
+        if not files:
+            return []
+        names, sizes, hashes = (list(column) for column in zip(*files))
+        with self._read("resolve_processed_files") as conn:
+            rows = conn.execute(
+                """
+                WITH files AS (
+                    SELECT UNNEST(range(?)) AS idx, UNNEST(?::VARCHAR[]) AS filename,
+                           UNNEST(?::BIGINT[]) AS size_bytes, UNNEST(?::VARCHAR[]) AS sha256
+                ),
+                processed AS (
+                    SELECT d.id, d.filename, d.file_size_bytes, d.file_hash, d.processed_at
+                    FROM documents d
+                    WHERE d.status IN ('completed', 'success')
+                      AND EXISTS (SELECT 1 FROM extractions e WHERE e.document_id = d.id)
+                ),
+                by_name AS (
+                    SELECT filename, file_size_bytes, arg_min(id, id) AS id,
+                           arg_min(processed_at, id) AS processed_at
+                    FROM processed GROUP BY filename, file_size_bytes
+                )
+                SELECT f.idx,
+                       COALESCE(h.id, n.id),
+                       CASE WHEN h.id IS NOT NULL THEN h.processed_at ELSE n.processed_at END,
+                       CASE WHEN h.id IS NOT NULL THEN 'hash' ELSE 'name_size' END
+                FROM files f
+                LEFT JOIN processed h ON h.file_hash = f.sha256
+                LEFT JOIN by_name n ON n.filename = f.filename AND n.file_size_bytes = f.size_bytes
+                WHERE h.id IS NOT NULL OR n.id IS NOT NULL
+                """,
+                [len(files), names, sizes, hashes],
+            ).fetchall()
+
+        resolved: list[dict[str, Any] | None] = [None] * len(files)
+        for idx, document_id, processed_at, matched_by in rows:
+            resolved[idx] = {
+                "document_id": document_id,
+                "processed_at": processed_at,
+                "matched_by": matched_by,
+            }
+        return resolved
+
+    @staticmethod
+    def _upsert_file_hashes(conn: duckdb.DuckDBPyConnection, entries: list[tuple[str, int, int, str]]) -> None:
+        paths, sizes, mtimes, hashes = (list(column) for column in zip(*entries))
+        conn.execute(
+            """
+            INSERT INTO file_hashes (path, size_bytes, mtime_ns, sha256)
+            SELECT UNNEST(?::VARCHAR[]), UNNEST(?::BIGINT[]), UNNEST(?::BIGINT[]), UNNEST(?::VARCHAR[])
+            ON CONFLICT (path) DO UPDATE SET
+                size_bytes = excluded.size_bytes,
+                mtime_ns = excluded.mtime_ns,
+                sha256 = excluded.sha256,
+                hashed_at = now()
+            """,
+            [paths, sizes, mtimes, hashes],
+        )
+
     # === Document Operations ===
 
     def register_document(
@@ -465,13 +989,25 @@ class DatabaseManager:
         file_size: int,
         file_type: str,
         num_pages: int | None = None,
+        file_hash: str | None = None,
     ) -> int:
-        """Register a document, returning existing ID if duplicate."""
-        file_hash = self.calculate_hash(file_path)
+        """Register a document, returning existing ID if duplicate.
+
+        The content hash is taken from ``file_hash`` when the caller already
+        has it, then from the ``file_hashes`` cache; the file is only read on
+        a miss.
+        """
+        signature = self.file_signature(file_path)
+        if file_hash is None:
+            file_hash = self.get_cached_file_hashes([signature]).get(signature[0])
+        if file_hash is None:
+            file_hash = self.calculate_hash(file_path)
+
+        def write(conn):
+            self._upsert_file_hashes(conn, [(*signature, file_hash)])
 
-        with self._lock:
             # Check for existing document
-            existing = self.conn.execute(
+            existing = conn.execute(
                 "SELECT id FROM documents WHERE file_hash = ?",
                 [file_hash],
             ).fetchone()
@@ -483,7 +1019,7 @@ class DatabaseManager:
                 return existing[0]
 
             # Insert new document
-            result = self.conn.execute(
+            result = conn.execute(
                 """
                 INSERT INTO documents (filename, file_path, file_hash, file_size_bytes, file_type, num_pages, status)
                 VALUES (?, ?, ?, ?, ?, ?, 'pending')
@@ -495,9 +1031,12 @@ class DatabaseManager:
             if not result:
                 raise RuntimeError("Failed to register document")
 
+            self._refresh_document_results(conn, [result[0]])
             logger.info("Registered document: %s (id=%d)", filename, result[0])
             return result[0]
 
+        return self._write("register_document", write)
+
     def update_document_status(
         self,
         document_id: int,
@@ -509,8 +1048,8 @@ class DatabaseManager:
         avg_confidence: float | None = None,
     ) -> None:
         """Update document processing status."""
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 UPDATE documents
                 SET status = ?,
@@ -532,11 +1071,14 @@ class DatabaseManager:
                     document_id,
                 ],
             )
+            self._refresh_document_results(conn, [document_id])
+
+        self._write("update_document_status", write)
 
     def get_document(self, document_id: int) -> DocumentRecord | None:
         """Get document by ID."""
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("get_document") as conn:
+            row = conn.execute(
                 """SELECT id, filename, file_path, file_hash, status, processed_at, error_message
                    FROM documents WHERE id = ?""",
                 [document_id],
@@ -548,8 +1090,8 @@ class DatabaseManager:
 
     def get_document_by_path(self, file_path: Path) -> DocumentRecord | None:
         """Get document by file path."""
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("get_document_by_path") as conn:
+            row = conn.execute(
                 """SELECT id, filename, file_path, file_hash, status, processed_at, error_message
                    FROM documents WHERE file_path = ?""",
                 [str(file_path)],
@@ -561,8 +1103,8 @@ class DatabaseManager:
 
     def get_document_by_hash(self, file_hash: str) -> DocumentRecord | None:
         """Get document by file hash (for deduplication)."""
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("get_document_by_hash") as conn:
+            row = conn.execute(
                 """SELECT id, filename, file_path, file_hash, status, processed_at, error_message
                    FROM documents WHERE file_hash = ?""",
                 [file_hash],
@@ -578,8 +1120,8 @@ class DatabaseManager:
         Returns:
             Set of file paths with status='completed'/'success' that have extractions
         """
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_processed_file_paths") as conn:
+            rows = conn.execute(
                 """SELECT DISTINCT d.file_path
                    FROM documents d
                    INNER JOIN extractions e ON d.id = e.document_id
@@ -589,8 +1131,8 @@ class DatabaseManager:
 
     def is_document_already_processed(self, document_id: int) -> bool:
         """Check if a document has already been successfully processed."""
-        with self._lock:
-            result = self.conn.execute(
+        with self._read("is_document_already_processed") as conn:
+            result = conn.execute(
                 """SELECT status, COUNT(*) as extraction_count
                    FROM documents d
                    LEFT JOIN extractions e ON d.id = e.document_id
@@ -608,8 +1150,8 @@ class DatabaseManager:
 
     def get_document_status(self, document_id: int) -> dict[str, Any]:
         """Get document processing status and metrics."""
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("get_document_status") as conn:
+            row = conn.execute(
                 """SELECT status, is_dangerous, completeness_score, avg_confidence,
                           processing_time_seconds, error_message
                    FROM documents WHERE id = ?""",
@@ -634,8 +1176,8 @@ class DatabaseManager:
         Returns:
             Dictionary mapping (filename, size_bytes) -> document_id for processed files
         """
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_processed_files_metadata") as conn:
+            rows = conn.execute(
                 """SELECT d.filename, d.file_size_bytes, d.id
                    FROM documents d
                    INNER JOIN extractions e ON d.id = e.document_id
@@ -651,8 +1193,8 @@ class DatabaseManager:
         Returns:
             Dictionary mapping filename -> formatted datetime string (e.g., "2025-12-10 14:30:45")
         """
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_processed_files_with_timestamps") as conn:
+            rows = conn.execute(
                 """SELECT d.filename, d.processed_at
                    FROM documents d
                    INNER JOIN extractions e ON d.id = e.document_id
@@ -683,8 +1225,8 @@ class DatabaseManager:
         Returns:
             Document ID if already processed, None otherwise
         """
-        with self._lock:
-            result = self.conn.execute(
+        with self._read("check_file_by_name_and_size") as conn:
+            result = conn.execute(
                 """SELECT d.id
                    FROM documents d
                    INNER JOIN extractions e ON d.id = e.document_id
@@ -699,8 +1241,8 @@ class DatabaseManager:
 
     def get_extractions_by_document(self, document_id: int) -> dict[str, dict[str, Any]]:
         """Get all extractions for a document in the format expected by ProcessingResult."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_extractions_by_document") as conn:
+            rows = conn.execute(
                 """SELECT field_name, value, confidence, context, validation_status,
                           validation_message, source
                    FROM extractions WHERE document_id = ?""",
@@ -735,9 +1277,9 @@ class DatabaseManager:
         source: str = "heuristic",
     ) -> None:
         """Store or update a field extraction result."""
-        with self._lock:
+        def write(conn):
             # Upsert extraction
-            self.conn.execute(
+            conn.execute(
                 """
                 INSERT INTO extractions (document_id, field_name, value, confidence, context,
                                          validation_status, validation_message, source, created_at)
@@ -762,6 +1304,9 @@ class DatabaseManager:
                     source,
                 ],
             )
+            self._refresh_document_results(conn, [document_id])
+
+        self._write("store_extraction", write)
 
     def store_extractions_batch(
         self,
@@ -781,19 +1326,22 @@ class DatabaseManager:
         if not extractions:
             return
 
-        with self._lock:
-            # Prepare batch data
-            batch_data = [
-                (document_id, field_name, value, confidence, context, validation_status, validation_message, source)
-                for field_name, value, confidence, context, validation_status, validation_message, source in extractions
-            ]
+        # One multi-row statement is far cheaper than executemany's per-row
+        # upserts; duplicate field names keep their last value.
+        latest = {row[0]: row for row in extractions}
+        params: list[Any] = []
+        for field_name, value, confidence, context, validation_status, validation_message, source in latest.values():
+            params.extend(
+                [document_id, field_name, value, confidence, context, validation_status, validation_message, source]
+            )
+        values = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, now())"] * len(latest))
 
-            # Use DuckDB's insert...select with values clause for efficiency
-            self.conn.executemany(
-                """
+        def write(conn):
+            conn.execute(
+                f"""
                 INSERT INTO extractions (document_id, field_name, value, confidence, context,
                                          validation_status, validation_message, source, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, now())
+                VALUES {values}
                 ON CONFLICT (document_id, field_name)
                 DO UPDATE SET value = EXCLUDED.value,
                               confidence = EXCLUDED.confidence,
@@ -803,15 +1351,18 @@ class DatabaseManager:
                               source = EXCLUDED.source,
                               created_at = now();
                 """,
-                batch_data,
+                params,
             )
+            self._refresh_document_results(conn, [document_id])
 
             logger.debug("Batch stored %d extractions for document %d", len(extractions), document_id)
 
+        self._write("store_extractions_batch", write)
+
     def get_extractions(self, document_id: int) -> dict[str, dict[str, Any]]:
         """Get all extractions for a document."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_extractions") as conn:
+            rows = conn.execute(
                 """SELECT field_name, value, confidence, context, validation_status,
                           validation_message, source
                    FROM extractions WHERE document_id = ?""",
@@ -836,8 +1387,8 @@ class DatabaseManager:
         self, document_id: int, ingredients: list[dict[str, Any]]
     ) -> None:
         """Replace Section 3 ingredient list for a document."""
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 "DELETE FROM sds_ingredients WHERE document_id = ?;",
                 [document_id],
             )
@@ -862,7 +1413,7 @@ class DatabaseManager:
                     )
                 )
 
-            self.conn.executemany(
+            conn.executemany(
                 """
                 INSERT INTO sds_ingredients (
                     document_id, cas_number, chemical_name, concentration_text,
@@ -874,10 +1425,12 @@ class DatabaseManager:
                 batch,
             )
 
+        self._write("replace_document_ingredients", write)
+
     def get_document_ingredients(self, document_id: int) -> list[dict[str, Any]]:
         """Return stored ingredient rows for a document."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_document_ingredients") as conn:
+            rows = conn.execute(
                 """
                 SELECT cas_number, chemical_name, concentration_text, concentration_min,
                        concentration_max, concentration_unit, confidence, evidence, source, created_at
@@ -904,8 +1457,8 @@ class DatabaseManager:
 
     def get_inventory_cas_numbers(self) -> list[str]:
         """Return distinct CAS numbers identified across all processed SDS."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_inventory_cas_numbers") as conn:
+            rows = conn.execute(
                 """
                 SELECT DISTINCT cas
                 FROM (
@@ -930,8 +1483,8 @@ class DatabaseManager:
 
     def get_identified_chemicals(self) -> list[dict[str, Any]]:
         """Return identified chemicals (CAS + best-effort name) across SDS set."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_identified_chemicals") as conn:
+            rows = conn.execute(
                 """
                 SELECT cas_number, chemical_name, confidence, document_id
                 FROM sds_ingredients
@@ -1011,8 +1564,8 @@ class DatabaseManager:
             return []
 
         rule_set = ["I", "R"] if include_restricted else ["I"]
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("find_hazardous_combinations") as conn:
+            rows = conn.execute(
                 """
                 WITH inventory(cas) AS (
                     SELECT * FROM UNNEST(?)
@@ -1041,70 +1594,114 @@ class DatabaseManager:
 
     # === Results / Matrix Queries ===
 
-    def fetch_results(self, limit: int = 500) -> list[dict[str, Any]]:
-        """Fetch processed documents with their extractions for matrix display."""
-        query = """
-            WITH latest_extractions AS (
-                SELECT document_id, field_name, value, confidence, validation_status, source, metadata
-                FROM extractions
-            )
-            SELECT
-                d.id,
-                d.filename,
-                d.status,
-                d.is_dangerous,
-                d.processed_at,
-                d.processing_time_seconds,
-                MAX(CASE WHEN e.field_name = 'product_name' THEN e.value END) AS product_name,
-                MAX(CASE WHEN e.field_name = 'manufacturer' THEN e.value END) AS manufacturer,
-                MAX(CASE WHEN e.field_name = 'cas_number' THEN e.value END) AS cas_number,
-                MAX(CASE WHEN e.field_name = 'un_number' THEN e.value END) AS un_number,
-                MAX(CASE WHEN e.field_name = 'hazard_class' THEN e.value END) AS hazard_class,
-                MAX(CASE WHEN e.field_name = 'packing_group' THEN e.value END) AS packing_group,
-                MAX(CASE WHEN e.field_name = 'h_statements' THEN e.value END) AS h_statements,
-                MAX(CASE WHEN e.field_name = 'p_statements' THEN e.value END) AS p_statements,
-                MAX(CASE WHEN e.field_name = 'incompatibilities' THEN e.value END) AS incompatibilities,
-                COALESCE(MAX(d.completeness_score), 0) AS completeness,
-                COALESCE(MAX(d.avg_confidence), AVG(e.confidence)) AS avg_confidence,
-                COALESCE(MAX(CASE WHEN e.field_name = 'product_name' THEN TRY_CAST(json_extract(e.metadata, '$.quality_tier') AS VARCHAR) END), 'unknown') AS quality_tier,
-                COALESCE(MAX(CASE WHEN e.field_name = 'product_name' THEN json_extract(e.metadata, '$.external_validation.is_valid') END), FALSE) AS validated
-            FROM documents d
-            LEFT JOIN latest_extractions e ON e.document_id = d.id
-            WHERE d.status IN ('success', 'failed', 'partial')
-            GROUP BY d.id, d.filename, d.status, d.is_dangerous, d.processed_at, d.processing_time_seconds
-            ORDER BY d.processed_at DESC NULLS LAST
-            LIMIT ?;
+    def fetch_results(
+        self,
+        limit: int = 500,
+        offset: int = 0,
+        statuses: Iterable[str] | None = None,
+        is_dangerous: bool | None = None,
+        search: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fetch processed documents with their extractions for matrix display.
+
+        Served from the materialized ``document_results`` table, newest first.
+
+        Args:
+            limit: Max rows to return
+            offset: Rows to skip (for pagination)
+            statuses: Document statuses to include (default: success/failed/partial)
+            is_dangerous: Only dangerous (True) or non-dangerous (False) documents
+            search: Case-insensitive match on filename, product name or CAS number
+
+        Returns:
+            One dict per document with the extraction fields as keys
         """
+        where, params = self._results_filter(statuses, is_dangerous, search)
+        with self._read("fetch_results") as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {", ".join(["document_id", *_RESULT_COLUMNS[1:]])}
+                FROM document_results
+                {where}
+                ORDER BY processed_at DESC NULLS LAST, document_id DESC
+                LIMIT ? OFFSET ?;
+                """,
+                [*params, limit, offset],
+            ).fetchall()
+            return [dict(zip(_RESULT_COLUMNS, row)) for row in rows]
 
-        with self._lock:
-            rows = self.conn.execute(query, [limit]).fetchall()
-            columns = [
-                "id",
-                "filename",
-                "status",
-                "is_dangerous",
-                "processed_at",
-                "processing_time",
-                "product_name",
-                "manufacturer",
-                "cas_number",
-                "un_number",
-                "hazard_class",
-                "packing_group",
-                "h_statements",
-                "p_statements",
-                "incompatibilities",
-                "completeness",
-                "avg_confidence",
-                "quality_tier",
-                "validated",
-            ]
-            return [dict(zip(columns, row)) for row in rows]
+    def count_results(
+        self,
+        statuses: Iterable[str] | None = None,
+        is_dangerous: bool | None = None,
+        search: str | None = None,
+    ) -> int:
+        """Count documents matching the ``fetch_results`` filters (for pagination)."""
+        where, params = self._results_filter(statuses, is_dangerous, search)
+        with self._read("count_results") as conn:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM document_results {where}", params
+            ).fetchone()[0]
+
+    def rebuild_document_results(self) -> None:
+        """Recompute ``document_results`` for every document.
+
+        Only needed after editing ``documents``/``extractions`` with ad-hoc SQL;
+        the write methods keep the table current.
+        """
+        def write(conn):
+            conn.execute("DELETE FROM document_results")
+            self._refresh_document_results(conn)
+
+        self._write("rebuild_document_results", write)
+
+    @staticmethod
+    def _refresh_document_results(
+        conn: duckdb.DuckDBPyConnection,
+        document_ids: list[int] | None = None,
+        missing_only: bool = False,
+    ) -> None:
+        """Re-pivot documents into ``document_results``.
+
+        Args:
+            conn: Connection to run on (the writer's, inside its transaction)
+            document_ids: Documents to refresh (default: all)
+            missing_only: Only add documents that have no row yet
+        """
+        where, params = "", []
+        if document_ids is not None:
+            where = f"WHERE d.id IN ({', '.join('?' * len(document_ids))})"
+            params = list(document_ids)
+        elif missing_only:
+            where = "WHERE d.id NOT IN (SELECT document_id FROM document_results)"
+        conn.execute(
+            f"INSERT OR REPLACE INTO document_results {_DOCUMENT_RESULTS_PIVOT.format(where=where)}",
+            params,
+        )
+
+    @staticmethod
+    def _results_filter(
+        statuses: Iterable[str] | None,
+        is_dangerous: bool | None,
+        search: str | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE clause shared by fetch_results and count_results."""
+        statuses = list(statuses) if statuses is not None else list(_RESULT_STATUSES)
+        # Plain IN lists: an UNNEST subquery here makes DuckDB scan far slower
+        clauses = [f"status IN ({', '.join('?' * len(statuses))})" if statuses else "FALSE"]
+        params: list[Any] = list(statuses)
+        if is_dangerous is not None:
+            clauses.append("COALESCE(is_dangerous, FALSE) = ?")
+            params.append(is_dangerous)
+        if search:
+            clauses.append("(filename ILIKE ? OR product_name ILIKE ? OR cas_number ILIKE ?)")
+            params.extend([f"%{search}%"] * 3)
+        return "WHERE " + " AND ".join(clauses), params
 
     def get_dangerous_chemicals(self) -> list[dict[str, Any]]:
         """Get all documents marked as dangerous for RAG enrichment."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_dangerous_chemicals") as conn:
+            rows = conn.execute(
                 """SELECT id, filename FROM documents WHERE is_dangerous = TRUE"""
             ).fetchall()
             return [{"id": row[0], "filename": row[1]} for row in rows]
@@ -1122,9 +1719,9 @@ class DatabaseManager:
         metadata: dict[str, Any] | None = None,
     ) -> int:
         """Register a document added to the RAG knowledge base."""
-        with self._lock:
+        def write(conn):
             if content_hash:
-                existing = self.conn.execute(
+                existing = conn.execute(
                     "SELECT id FROM rag_documents WHERE content_hash = ?",
                     [content_hash],
                 ).fetchone()
@@ -1135,7 +1732,7 @@ class DatabaseManager:
             if metadata:
                 metadata_str = json.dumps(metadata)
 
-            result = self.conn.execute(
+            result = conn.execute(
                 """
                 INSERT INTO rag_documents (
                     source_type, source_path, source_url, title, chunk_count, content_hash, metadata
@@ -1156,10 +1753,12 @@ class DatabaseManager:
 
             return result[0] if result else 0
 
+        return self._write("register_rag_document", write)
+
     def get_rag_documents(self) -> list[dict[str, Any]]:
         """Get all RAG indexed documents."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_rag_documents") as conn:
+            rows = conn.execute(
                 """SELECT id, source_type, source_path, source_url, title, chunk_count, content_hash, metadata, indexed_at
                    FROM rag_documents ORDER BY indexed_at DESC"""
             ).fetchall()
@@ -1184,8 +1783,8 @@ class DatabaseManager:
         if not content_hash:
             return False
 
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("rag_document_exists") as conn:
+            row = conn.execute(
                 "SELECT 1 FROM rag_documents WHERE content_hash = ?",
                 [content_hash],
             ).fetchone()
@@ -1210,8 +1809,8 @@ class DatabaseManager:
         rule = rule.upper().strip()
         metadata_str = json.dumps(metadata) if metadata else None
 
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 INSERT INTO rag_incompatibilities (cas_a, cas_b, rule, source, justification,
                                                     group_a, group_b, metadata, content_hash)
@@ -1223,7 +1822,8 @@ class DatabaseManager:
                               group_a = EXCLUDED.group_a,
                               group_b = EXCLUDED.group_b,
                               metadata = EXCLUDED.metadata,
-                              content_hash = EXCLUDED.content_hash;
+                              content_hash = EXCLUDED.content_hash,
+                              indexed_at = now();
                 """,
                 [
                     cas_a,
@@ -1238,39 +1838,180 @@ class DatabaseManager:
                 ],
             )
 
+        self._write("register_incompatibility_rule", write)
+        self.clear_rule_cache()
+
     def get_incompatibility_rule(
         self, cas_a: str | None, cas_b: str | None
     ) -> dict[str, Any] | None:
-        """Return a stored incompatibility rule for a CAS pair, if any."""
-        if not cas_a or not cas_b:
+        """Return a stored incompatibility rule for a CAS pair, if any (cached)."""
+        if not cas_a or not cas_b or not cas_a.strip() or not cas_b.strip():
             return None
 
-        cas_a, cas_b = sorted([cas_a.strip(), cas_b.strip()])
+        key = tuple(sorted([cas_a.strip(), cas_b.strip()]))
+        return self.get_incompatibility_rules_for_pairs([key]).get(key)
 
-        with self._lock:
-            row = self.conn.execute(
-                """
-                SELECT cas_a, cas_b, rule, source, justification, group_a, group_b, metadata
-                FROM rag_incompatibilities
-                WHERE cas_a = ? AND cas_b = ?;
-                """,
-                [cas_a, cas_b],
-            ).fetchone()
+    def get_incompatibility_rules_for_pairs(
+        self,
+        pairs: Iterable[tuple[str | None, str | None]],
+        as_arrow: bool = False,
+    ) -> Any:
+        """Resolve many CAS pairs in one query joined against an UNNEST list.
 
-            if not row:
-                return None
+        Pairs are order-insensitive; pairs with a blank CAS are ignored. Results
+        (including "no rule") are kept in an in-process cache that
+        ``register_incompatibility_rule`` invalidates.
+
+        Args:
+            pairs: (cas_a, cas_b) pairs to look up
+            as_arrow: Return a pyarrow Table straight from DuckDB (bypasses the
+                cache; ``metadata`` stays JSON text)
 
+        Returns:
+            Mapping of sorted (cas_a, cas_b) pairs to rule dicts (pairs without a
+            rule are omitted), or a pyarrow Table when ``as_arrow``
+        """
+        keys = sorted(
+            {
+                tuple(sorted([cas_a.strip(), cas_b.strip()]))
+                for cas_a, cas_b in pairs
+                if cas_a and cas_b and cas_a.strip() and cas_b.strip()
+            }
+        )
+        if as_arrow:
+            return self._query_rule_pairs(keys, as_arrow=True)
+
+        with self._rule_cache_lock:
+            generation = self._rule_cache_generation
+            found = {key: self._rule_cache[key] for key in keys if key in self._rule_cache}
+            self._rule_cache_hits += len(found)
+            self._rule_cache_misses += len(keys) - len(found)
+        misses = [key for key in keys if key not in found]
+
+        if misses:
+            fetched = self._query_rule_pairs(misses)
+            with self._rule_cache_lock:
+                if generation == self._rule_cache_generation:
+                    if len(self._rule_cache) + len(misses) > _RULE_CACHE_MAX_PAIRS:
+                        self._rule_cache.clear()
+                    self._rule_cache.update((key, fetched.get(key)) for key in misses)
+            found.update(fetched)
+
+        return {key: rule for key, rule in found.items() if rule}
+
+    def get_incompatibility_rules(
+        self, cas_numbers: Iterable[str | None], as_arrow: bool = False
+    ) -> Any:
+        """Return every stored rule between two CAS numbers of a set, in one query.
+
+        The CAS set is passed as one list parameter and joined via UNNEST; the
+        last few sets' results are cached until a rule is registered.
+
+        Args:
+            cas_numbers: CAS numbers of an inventory (blanks are ignored)
+            as_arrow: Return a pyarrow Table straight from DuckDB (bypasses the cache)
+
+        Returns:
+            Mapping of sorted (cas_a, cas_b) pairs to rule dicts, or a pyarrow Table
+        """
+        cas_set = tuple(sorted({cas.strip() for cas in cas_numbers if cas and cas.strip()}))
+        if not cas_set and not as_arrow:
+            return {}
+
+        if not as_arrow:
+            with self._rule_cache_lock:
+                generation = self._rule_cache_generation
+                cached = self._rule_set_cache.get(cas_set)
+                if cached is not None:
+                    self._rule_set_cache.move_to_end(cas_set)
+                    self._rule_cache_hits += 1
+                    return dict(cached)
+                self._rule_cache_misses += 1
+
+        with self._read("get_incompatibility_rules") as conn:
+            result = conn.execute(
+                f"""
+                WITH inventory AS (SELECT UNNEST(?::VARCHAR[]) AS cas)
+                SELECT {_RULE_COLUMNS}
+                FROM rag_incompatibilities r
+                JOIN inventory a ON r.cas_a = a.cas
+                JOIN inventory b ON r.cas_b = b.cas;
+                """,
+                [list(cas_set)],
+            )
+            if as_arrow:
+                return _to_arrow(result)
+            rules = {(row[0], row[1]): self._rule_from_row(row) for row in result.fetchall()}
+
+        with self._rule_cache_lock:
+            if generation == self._rule_cache_generation:
+                self._rule_set_cache[cas_set] = rules
+                while len(self._rule_set_cache) > _RULE_SET_CACHE_SIZE:
+                    self._rule_set_cache.popitem(last=False)
+        return dict(rules)
+
+    def get_incompatibility_rules_for_cas(self, cas: str | None) -> list[dict[str, Any]]:
+        """Return every stored rule involving one CAS number (either side of the pair)."""
+        if not cas or not cas.strip():
+            return []
+
+        with self._read("get_incompatibility_rules_for_cas") as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {_RULE_COLUMNS}
+                FROM rag_incompatibilities r
+                WHERE r.cas_a = ? OR r.cas_b = ?
+                ORDER BY r.rule, r.cas_a, r.cas_b;
+                """,
+                [cas.strip(), cas.strip()],
+            ).fetchall()
+            return [self._rule_from_row(row) for row in rows]
+
+    def clear_rule_cache(self) -> None:
+        """Drop cached rule lookups (call after editing rag_incompatibilities directly)."""
+        with self._rule_cache_lock:
+            self._rule_cache_generation += 1
+            self._rule_cache.clear()
+            self._rule_set_cache.clear()
+
+    def get_rule_cache_stats(self) -> dict[str, int]:
+        """Hit/miss counters and size of the incompatibility rule cache."""
+        with self._rule_cache_lock:
             return {
-                "cas_a": row[0],
-                "cas_b": row[1],
-                "rule": row[2],
-                "source": row[3],
-                "justification": row[4],
-                "group_a": row[5],
-                "group_b": row[6],
-                "metadata": json.loads(row[7]) if row[7] else None,
+                "hits": self._rule_cache_hits,
+                "misses": self._rule_cache_misses,
+                "pairs": len(self._rule_cache),
+                "sets": len(self._rule_set_cache),
             }
 
+    def _query_rule_pairs(self, keys: list[tuple[str, str]], as_arrow: bool = False) -> Any:
+        """One query for sorted CAS pairs, joined against two UNNESTed lists."""
+        with self._read("get_incompatibility_rules_for_pairs") as conn:
+            result = conn.execute(
+                f"""
+                SELECT {_RULE_COLUMNS}
+                FROM (SELECT UNNEST(?::VARCHAR[]) AS cas_a, UNNEST(?::VARCHAR[]) AS cas_b) p
+                JOIN rag_incompatibilities r ON r.cas_a = p.cas_a AND r.cas_b = p.cas_b;
+                """,
+                [[key[0] for key in keys], [key[1] for key in keys]],
+            )
+            if as_arrow:
+                return _to_arrow(result)
+            return {(row[0], row[1]): self._rule_from_row(row) for row in result.fetchall()}
+
+    @staticmethod
+    def _rule_from_row(row: tuple) -> dict[str, Any]:
+        return {
+            "cas_a": row[0],
+            "cas_b": row[1],
+            "rule": row[2],
+            "source": row[3],
+            "justification": row[4],
+            "group_a": row[5],
+            "group_b": row[6],
+            "metadata": json.loads(row[7]) if row[7] else None,
+        }
+
     # === Hazard Flags (Structured MRLP) ===
 
     def register_hazard_record(
@@ -1289,8 +2030,8 @@ class DatabaseManager:
         hazard_json = json.dumps(hazard_flags) if hazard_flags else None
         metadata_str = json.dumps(metadata) if metadata else None
 
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 INSERT INTO rag_hazards (cas, hazard_flags, idlh, pel, rel, env_risk, source, metadata, content_hash)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -1302,7 +2043,8 @@ class DatabaseManager:
                               env_risk = EXCLUDED.env_risk,
                               source = EXCLUDED.source,
                               metadata = EXCLUDED.metadata,
-                              content_hash = EXCLUDED.content_hash;
+                              content_hash = EXCLUDED.content_hash,
+                              indexed_at = now();
                 """,
                 [
                     cas.strip(),
@@ -1317,13 +2059,15 @@ class DatabaseManager:
                 ],
             )
 
+        self._write("register_hazard_record", write)
+
     def get_hazard_record(self, cas: str | None) -> dict[str, Any] | None:
         """Return hazard flags for a CAS."""
         if not cas:
             return None
 
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("get_hazard_record") as conn:
+            row = conn.execute(
                 """
                 SELECT cas, hazard_flags, idlh, pel, rel, env_risk, source, metadata
                 FROM rag_hazards WHERE cas = ?;
@@ -1331,19 +2075,42 @@ class DatabaseManager:
                 [cas.strip()],
             ).fetchone()
 
-            if not row:
-                return None
+            return self._hazard_from_row(row) if row else None
 
-            return {
-                "cas": row[0],
-                "hazard_flags": json.loads(row[1]) if row[1] else None,
-                "idlh": row[2],
-                "pel": row[3],
-                "rel": row[4],
-                "env_risk": row[5],
-                "source": row[6],
-                "metadata": json.loads(row[7]) if row[7] else None,
-            }
+    def get_hazard_records(
+        self, cas_numbers: Iterable[str | None]
+    ) -> dict[str, dict[str, Any]]:
+        """Return hazard flags for a set of CAS numbers in one query.
+
+        Returns:
+            Mapping of CAS number to hazard record (CAS without a record are omitted)
+        """
+        cas_set = sorted({cas.strip() for cas in cas_numbers if cas and cas.strip()})
+        if not cas_set:
+            return {}
+
+        with self._read("get_hazard_records") as conn:
+            rows = conn.execute(
+                f"""
+                SELECT cas, hazard_flags, idlh, pel, rel, env_risk, source, metadata
+                FROM rag_hazards WHERE cas IN ({", ".join("?" * len(cas_set))});
+                """,
+                cas_set,
+            ).fetchall()
+            return {row[0]: self._hazard_from_row(row) for row in rows}
+
+    @staticmethod
+    def _hazard_from_row(row: tuple) -> dict[str, Any]:
+        return {
+            "cas": row[0],
+            "hazard_flags": json.loads(row[1]) if row[1] else None,
+            "idlh": row[2],
+            "pel": row[3],
+            "rel": row[4],
+            "env_risk": row[5],
+            "source": row[6],
+            "metadata": json.loads(row[7]) if row[7] else None,
+        }
 
     # === MRLP Snapshots ===
 
@@ -1354,8 +2121,8 @@ class DatabaseManager:
         content_hash: str,
     ) -> None:
         """Register a snapshot ingestion (dedupe by hash)."""
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 INSERT INTO mrlp_snapshots (source_type, file_path, content_hash)
                 VALUES (?, ?, ?)
@@ -1364,9 +2131,11 @@ class DatabaseManager:
                 [source_type, str(file_path), content_hash],
             )
 
+        self._write("register_snapshot", write)
+
     def snapshot_exists(self, content_hash: str) -> bool:
-        with self._lock:
-            row = self.conn.execute(
+        with self._read("snapshot_exists") as conn:
+            row = conn.execute(
                 "SELECT 1 FROM mrlp_snapshots WHERE content_hash = ?",
                 [content_hash],
             ).fetchone()
@@ -1389,8 +2158,8 @@ class DatabaseManager:
         payload = f"{product_a}|{product_b}|{cas_a}|{cas_b}|{decision}|{source_layer}|{rule_source or ''}"
         decision_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 INSERT INTO matrix_decisions (product_a, product_b, cas_a, cas_b, decision,
                                               source_layer, rule_source, justification, decision_hash)
@@ -1409,17 +2178,217 @@ class DatabaseManager:
                 ],
             )
 
+        self._write("store_matrix_decision", write)
+
+    def store_matrix_decisions(self, decisions: Any, build_id: str) -> int:
+        """Append a whole matrix build's decisions in one transaction.
+
+        Args:
+            decisions: DataFrame with product_a, product_b, cas_a, cas_b, decision,
+                source_layer, rule_source and justification columns
+            build_id: Tag shared by every decision of the build
+
+        Returns:
+            Number of decisions stored
+        """
+        if len(decisions) == 0:
+            return 0
+
+        def write(conn):
+            conn.register("matrix_decisions_batch", decisions)
+            try:
+                # Same hash payload as store_matrix_decision (f-string renders None as "None")
+                conn.execute(
+                    """
+                    INSERT INTO matrix_decisions (product_a, product_b, cas_a, cas_b, decision,
+                                                  source_layer, rule_source, justification,
+                                                  decision_hash, build_id)
+                    SELECT product_a, product_b, cas_a, cas_b, decision,
+                           source_layer, rule_source, justification,
+                           sha256(concat_ws('|', product_a, product_b,
+                                            COALESCE(cas_a, 'None'), COALESCE(cas_b, 'None'),
+                                            decision, source_layer, COALESCE(rule_source, ''))),
+                           ?
+                    FROM matrix_decisions_batch;
+                    """,
+                    [build_id],
+                )
+            finally:
+                conn.unregister("matrix_decisions_batch")
+            return len(decisions)
+
+        return self._write("store_matrix_decisions", write)
+
+    def get_matrix_builds(self) -> list[dict[str, Any]]:
+        """List tagged matrix builds, newest first, with decision counts."""
+        with self._read("get_matrix_builds") as conn:
+            rows = conn.execute(
+                """
+                SELECT build_id, COUNT(*), COUNT(*) FILTER (WHERE decision = 'I'),
+                       COUNT(*) FILTER (WHERE decision = 'R'), MIN(decided_at)
+                FROM matrix_decisions
+                WHERE build_id IS NOT NULL
+                GROUP BY build_id
+                ORDER BY MIN(decided_at) DESC, build_id DESC;
+                """
+            ).fetchall()
+            return [
+                {
+                    "build_id": row[0],
+                    "decisions": row[1],
+                    "incompatible": row[2],
+                    "restricted": row[3],
+                    "decided_at": row[4],
+                }
+                for row in rows
+            ]
+
+    def prune_matrix_builds(self, keep: int) -> int:
+        """Delete decisions of all but the ``keep`` most recent builds.
+
+        Untagged decisions (logged before builds were tagged) are left alone.
+
+        Returns:
+            Number of decisions deleted
+        """
+        stale = [build["build_id"] for build in self.get_matrix_builds()[max(keep, 0):]]
+        if not stale:
+            return 0
+
+        def write(conn):
+            return conn.execute(
+                f"DELETE FROM matrix_decisions WHERE build_id IN ({', '.join('?' * len(stale))})",
+                stale,
+            ).fetchone()[0]
+
+        return self._write("prune_matrix_builds", write)
+
+    def delete_matrix_build(self, build_id: str) -> int:
+        """Delete every decision of one build (e.g. a build that failed partway).
+
+        Returns:
+            Number of decisions deleted
+        """
+        def write(conn):
+            return conn.execute(
+                "DELETE FROM matrix_decisions WHERE build_id = ?", [build_id]
+            ).fetchone()[0]
+
+        return self._write("delete_matrix_build", write)
+
+    def diff_matrix_builds(self, old_build_id: str, new_build_id: str) -> list[dict[str, Any]]:
+        """Compare the decisions of two builds pair by pair.
+
+        Incremental matrix refreshes log only their recomputed pairs, so
+        comparing one with a full build also lists the pairs it did not log.
+
+        Returns:
+            One dict per product pair whose decision changed, with ``old_decision``
+            and ``new_decision`` (None when the pair was not logged in that build)
+        """
+        with self._read("diff_matrix_builds") as conn:
+            rows = conn.execute(
+                """
+                WITH old AS (
+                    SELECT product_a, product_b, decision, source_layer
+                    FROM matrix_decisions WHERE build_id = ?
+                ), new AS (
+                    SELECT product_a, product_b, decision, source_layer
+                    FROM matrix_decisions WHERE build_id = ?
+                )
+                SELECT COALESCE(new.product_a, old.product_a), COALESCE(new.product_b, old.product_b),
+                       old.decision, new.decision, old.source_layer, new.source_layer
+                FROM old FULL OUTER JOIN new
+                  ON old.product_a = new.product_a AND old.product_b = new.product_b
+                WHERE old.decision IS DISTINCT FROM new.decision
+                   OR old.source_layer IS DISTINCT FROM new.source_layer
+                ORDER BY 1, 2;
+                """,
+                [old_build_id, new_build_id],
+            ).fetchall()
+            return [
+                {
+                    "product_a": row[0],
+                    "product_b": row[1],
+                    "old_decision": row[2],
+                    "new_decision": row[3],
+                    "old_source_layer": row[4],
+                    "new_source_layer": row[5],
+                }
+                for row in rows
+            ]
+
+    def get_matrix_changes(self, since: datetime | None) -> dict[str, Any]:
+        """CAS numbers whose matrix inputs changed at or after ``since``.
+
+        Covers documents processed since then (their extracted CAS number) and
+        rules/hazard records indexed since then.
+
+        Args:
+            since: ``as_of`` of an earlier call (None: only report ``as_of``)
+
+        Returns:
+            Dict with ``as_of`` (database clock, to pass as the next ``since``)
+            and ``cas`` (set of changed CAS numbers)
+        """
+        with self._read("get_matrix_changes") as conn:
+            as_of = conn.execute("SELECT CAST(CURRENT_TIMESTAMP AS TIMESTAMP)").fetchone()[0]
+            if since is None:
+                return {"as_of": as_of, "cas": set()}
+            rows = conn.execute(
+                """
+                SELECT cas_number FROM document_results WHERE processed_at >= ?
+                UNION SELECT cas_a FROM rag_incompatibilities WHERE indexed_at >= ?
+                UNION SELECT cas_b FROM rag_incompatibilities WHERE indexed_at >= ?
+                UNION SELECT cas FROM rag_hazards WHERE indexed_at >= ?;
+                """,
+                [since] * 4,
+            ).fetchall()
+            cas = {row[0].strip() for row in rows if row[0] and row[0].strip()}
+            return {"as_of": as_of, "cas": cas}
+
+    # === Parquet Backup ===
+
+    def export_parquet(self, output_dir: Path | str, tables: Iterable[str] | None = None) -> dict[str, Any]:
+        """Back up tables to a Parquet directory via DuckDB ``COPY`` (see ``parquet_backup``).
+
+        Returns:
+            The backup manifest (layout and row count per table)
+        """
+        with self._read("export_parquet") as conn:
+            return parquet_backup.export_tables(conn, output_dir, tables)
+
+    def import_parquet(self, backup_dir: Path | str, tables: Iterable[str] | None = None) -> dict[str, int]:
+        """Replace tables with a Parquet backup, in one transaction.
+
+        Returns:
+            Rows restored per table
+        """
+        def write(conn):
+            restored = parquet_backup.import_tables(conn, backup_dir, tables)
+            conn.execute("DELETE FROM document_results")
+            self._refresh_document_results(conn)
+            return restored
+
+        try:
+            return self._write("import_parquet", write)
+        finally:
+            self.clear_rule_cache()
+
     # === Statistics ===
 
     def _ensure_harvest_table(self) -> None:
         """Create harvester_downloads if missing (backward compat)."""
-        with self._lock:
-            exists = self.conn.execute(
+        if self._harvest_table_ready:
+            return
+
+        def write(conn):
+            exists = conn.execute(
                 "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'harvester_downloads'"
             ).fetchone()[0]
             if exists:
                 return
-            self.conn.execute(
+            conn.execute(
                 """
                 CREATE SEQUENCE IF NOT EXISTS harvest_seq START 1;
                 CREATE TABLE IF NOT EXISTS harvester_downloads (
@@ -1439,38 +2408,41 @@ class DatabaseManager:
                 """
             )
 
+        self._write("_ensure_harvest_table", write)
+        self._harvest_table_ready = True
+
     def get_statistics(self) -> dict[str, Any]:
         """Get database statistics."""
         self._ensure_harvest_table()
-        with self._lock:
-            doc_count = self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[
+        with self._read("get_statistics") as conn:
+            doc_count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[
                 0
             ]
-            processed = self.conn.execute(
+            processed = conn.execute(
                 "SELECT COUNT(*) FROM documents WHERE status = 'success'"
             ).fetchone()[0]
-            failed = self.conn.execute(
+            failed = conn.execute(
                 "SELECT COUNT(*) FROM documents WHERE status = 'failed'"
             ).fetchone()[0]
-            dangerous = self.conn.execute(
+            dangerous = conn.execute(
                 "SELECT COUNT(*) FROM documents WHERE is_dangerous = TRUE"
             ).fetchone()[0]
-            rag_docs = self.conn.execute(
+            rag_docs = conn.execute(
                 "SELECT COUNT(*) FROM rag_documents"
             ).fetchone()[0]
-            rag_chunks = self.conn.execute(
+            rag_chunks = conn.execute(
                 "SELECT COALESCE(SUM(chunk_count), 0) FROM rag_documents"
             ).fetchone()[0]
-            rag_last_updated = self.conn.execute(
+            rag_last_updated = conn.execute(
                 "SELECT MAX(indexed_at) FROM rag_documents"
             ).fetchone()[0]
-            harvest_total = self.conn.execute(
+            harvest_total = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads"
             ).fetchone()[0]
-            harvest_success = self.conn.execute(
+            harvest_success = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads WHERE status = 'downloaded'"
             ).fetchone()[0]
-            harvest_failed = self.conn.execute(
+            harvest_failed = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads WHERE status = 'failed'"
             ).fetchone()[0]
 
@@ -1518,8 +2490,8 @@ class DatabaseManager:
         elif saved_path:
             filename = Path(saved_path).name
 
-        with self._lock:
-            self.conn.execute(
+        def write(conn):
+            conn.execute(
                 """
                 INSERT INTO harvester_downloads
                     (cas_number, source, url, saved_path, filename, status, http_status,
@@ -1540,20 +2512,22 @@ class DatabaseManager:
                 ],
             )
 
+        self._write("record_harvest_download", write)
+
     def get_harvest_stats(self) -> dict[str, Any]:
         """Return simple harvest statistics."""
         self._ensure_harvest_table()
-        with self._lock:
-            total = self.conn.execute(
+        with self._read("get_harvest_stats") as conn:
+            total = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads"
             ).fetchone()[0]
-            success = self.conn.execute(
+            success = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads WHERE status = 'downloaded'"
             ).fetchone()[0]
-            failed = self.conn.execute(
+            failed = conn.execute(
                 "SELECT COUNT(*) FROM harvester_downloads WHERE status = 'failed'"
             ).fetchone()[0]
-            last = self.conn.execute(
+            last = conn.execute(
                 "SELECT MAX(downloaded_at) FROM harvester_downloads"
             ).fetchone()[0]
         return {
@@ -1566,8 +2540,8 @@ class DatabaseManager:
     def get_harvest_source_breakdown(self, limit: int = 10) -> list[tuple[str, int, int]]:
         """Return per-source success/total counts."""
         self._ensure_harvest_table()
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_harvest_source_breakdown") as conn:
+            rows = conn.execute(
                 """
                 SELECT source,
                        COUNT(*) as total,
@@ -1588,9 +2562,9 @@ class DatabaseManager:
         name = name.strip()
         metadata_str = json.dumps(metadata) if metadata else None
 
-        with self._lock:
+        def write(conn):
             # Check existing
-            existing = self.conn.execute(
+            existing = conn.execute(
                 "SELECT id FROM manufacturer_nodes WHERE name = ?",
                 [name]
             ).fetchone()
@@ -1598,7 +2572,7 @@ class DatabaseManager:
             if existing:
                 return existing[0]
 
-            result = self.conn.execute(
+            result = conn.execute(
                 """
                 INSERT INTO manufacturer_nodes (name, metadata)
                 VALUES (?, ?)
@@ -1609,10 +2583,12 @@ class DatabaseManager:
 
             return result[0]
 
+        return self._write("register_manufacturer", write)
+
     def get_all_manufacturers(self) -> list[dict[str, Any]]:
         """Get all registered manufacturers."""
-        with self._lock:
-            rows = self.conn.execute(
+        with self._read("get_all_manufacturers") as conn:
+            rows = conn.execute(
                 "SELECT id, name, metadata, created_at FROM manufacturer_nodes ORDER BY name"
             ).fetchall()
 
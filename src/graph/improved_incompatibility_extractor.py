@@ -288,6 +288,8 @@ class IncompatibilityExtractor:
                 print(f"  ⚠ Error saving {cas_a} ↔ {cas_b}: {e}")
 
         self.conn.commit()
+        if hasattr(self.db, "clear_rule_cache"):
+            self.db.clear_rule_cache()
         print(f"  ✓ Saved {saved} incompatibility pairs")
 
         return saved
@@ -7,11 +7,21 @@ extractions and exporting results to various formats.
 from __future__ import annotations
 
 from .builder import CompatibilityResult, MatrixBuilder, MatrixStats
+from .decisions import DecisionSink
+from .engine import MatrixEngine, MatrixResult
 from .exporter import MatrixExporter
+from .incremental import IncrementalMatrixService, MatrixDelta
+from .sparse import SparseMatrix
 
 __all__ = [
     "MatrixBuilder",
     "MatrixExporter",
     "MatrixStats",
     "CompatibilityResult",
+    "DecisionSink",
+    "MatrixEngine",
+    "MatrixResult",
+    "IncrementalMatrixService",
+    "MatrixDelta",
+    "SparseMatrix",
 ]
@@ -10,9 +10,15 @@ import pandas as pd
 from ..config.settings import get_settings
 from ..database import get_db_manager
 from ..utils.logger import get_logger
+from .decisions import DecisionSink
+from .engine import MatrixEngine
+from .sparse import SparseMatrix
 
 logger = get_logger(__name__)
 
+# Documents read per fetch_results call when loading the whole inventory
+_INVENTORY_PAGE_SIZE = 1000
+
 
 @dataclass
 class MatrixStats:
@@ -50,6 +56,9 @@ class MatrixBuilder:
         """
         self.db = db or get_db_manager()
         self.hazard_idlh_threshold = get_settings().hazard_idlh_threshold
+        self.keep_builds = get_settings().matrix_keep_builds
+        self.block_rows = get_settings().matrix_block_rows
+        self.last_build_id: str | None = None
 
     def build(self, filters: dict[str, Any] | None = None) -> pd.DataFrame:
         """Backward-compatible convenience method for UI.
@@ -72,115 +81,75 @@ class MatrixBuilder:
             DataFrame with chemicals as rows/columns, incompatibilities as values
         """
         try:
-            # Get all documents/chemicals
-            results = self.db.fetch_results()
-
-            if not results:
-                logger.warning("No documents found for matrix building")
-                return pd.DataFrame()
-
-            # Create product list
-            products = {}
-            for result in results:
-                doc_id = result["id"]
-                product_name = result.get("product_name", "Unknown")
-                if product_name and doc_id not in products:
-                    products[doc_id] = {
-                        "name": product_name,
-                        "hazard_class": result.get("hazard_class", "Unknown"),
-                        "incompatibilities": result.get("incompatibilities", ""),
-                        "cas": result.get("cas_number"),
-                    }
-
+            products = self.inventory_products()
             if not products:
+                logger.warning("No documents found for matrix building")
                 return pd.DataFrame()
 
-            # Build matrix
-            product_names = [p["name"] for p in products.values()]
-            matrix = pd.DataFrame(
-                index=product_names,
-                columns=product_names,
-                dtype=object,
-            )
-
-            # Fill matrix
-            for doc_id, product_data in products.items():
-                prod_name = product_data["name"]
-                incomp_str = product_data.get("incompatibilities", "") or ""
-                cas_a = product_data.get("cas")
-                incomp_list = [i.strip() for i in incomp_str.split(",") if i.strip()]
-
-                for other_doc_id, other_data in products.items():
-                    other_name = other_data["name"]
-                    if prod_name == other_name:
-                        matrix.loc[prod_name, other_name] = "Self"
-                    else:
-                        # Prefer structured incompatibility rules by CAS
-                        other_cas = products[other_doc_id].get("cas")
-                        rule = (
-                            self.db.get_incompatibility_rule(cas_a, other_cas)
-                            if cas_a or other_cas
-                            else None
-                        )
-
-                        if rule and rule.get("rule") == "I":
-                            matrix.loc[prod_name, other_name] = "Incompatible"
-                        elif rule and rule.get("rule") == "R":
-                            matrix.loc[prod_name, other_name] = "Restricted"
-                            self._log_decision(
-                                prod_name,
-                                other_name,
-                                cas_a,
-                                other_cas,
-                                "R",
-                                source_layer="structured_rule",
-                                rule_source=rule.get("source"),
-                                justification=rule.get("justification"),
-                            )
-                        elif any(
-                            incomp.lower() in other_name.lower()
-                            for incomp in incomp_list
-                        ):
-                            matrix.loc[prod_name, other_name] = "Incompatible"
-                            self._log_decision(
-                                prod_name,
-                                other_name,
-                                cas_a,
-                                other_cas,
-                                "I",
-                                source_layer="text_incompatibility",
-                                rule_source=None,
-                                justification="Name match from SDS incompatibilities",
-                            )
-                        else:
-                            # Elevate compatibility if hazard flags indicate higher risk
-                            if self._should_elevate_due_to_hazard(cas_a, other_cas):
-                                matrix.loc[prod_name, other_name] = "Restricted"
-                                self._log_decision(
-                                    prod_name,
-                                    other_name,
-                                    cas_a,
-                                    other_cas,
-                                    "R",
-                                    source_layer="hazard_flags",
-                                    rule_source=None,
-                                    justification="Elevated by hazard flags/IDLH/env risk",
-                                )
-                            else:
-                                matrix.loc[prod_name, other_name] = "Compatible"
-
-            # Fill empty cells
-            matrix = matrix.fillna("Unknown")
+            engine = MatrixEngine(self.db, self.hazard_idlh_threshold)
+            result = engine.build(products)
+            self.log_decisions(result.decisions)
 
             logger.debug(
                 "Built incompatibility matrix (%dx%d)", len(products), len(products)
             )
-            return matrix
+            return result.to_frame()
 
         except Exception as e:
             logger.error("Failed to build incompatibility matrix: %s", e)
             return pd.DataFrame()
 
+    def build_sparse_matrix(
+        self,
+        filters: dict[str, Any] | None = None,
+    ) -> SparseMatrix | None:
+        """Build the incompatibility matrix in sparse form, with bounded memory.
+
+        Use this instead of ``build_incompatibility_matrix`` for large inventories;
+        ``MatrixExporter`` streams the result to xlsx, CSV, Parquet or HTML tiles.
+
+        Args:
+            filters: Optional filters (hazard_class, validation_status, etc.)
+
+        Returns:
+            SparseMatrix, or None when there are no documents or the build failed
+        """
+        try:
+            products = self.inventory_products()
+            if not products:
+                logger.warning("No documents found for matrix building")
+                return None
+
+            # Decisions go to the audit log band by band instead of piling up. Each
+            # band is its own transaction, so a build that fails partway is deleted
+            # again rather than left behind as a partial build.
+            sink = DecisionSink(self.db)
+            audit_ok = True
+
+            def flush_band(decisions: pd.DataFrame) -> None:
+                nonlocal audit_ok
+                if audit_ok:
+                    sink.extend(decisions)
+                    audit_ok = self._flush_decisions(sink)
+
+            engine = MatrixEngine(self.db, self.hazard_idlh_threshold)
+            try:
+                matrix = engine.build_sparse(
+                    products, block_rows=self.block_rows, on_decisions=flush_band
+                )
+            except Exception:
+                self._discard_build(sink.build_id)
+                raise
+            if audit_ok:
+                self._prune_builds()
+            else:
+                self._discard_build(sink.build_id)
+            return matrix
+
+        except Exception as e:
+            logger.error("Failed to build sparse incompatibility matrix: %s", e)
+            return None
+
     def build_hazard_matrix(
         self,
         filters: dict[str, Any] | None = None,
@@ -407,56 +376,63 @@ class MatrixBuilder:
             logger.error("Failed to get dangerous chemicals: %s", e)
             return []
 
-    def _should_elevate_due_to_hazard(
-        self, cas_a: str | None, cas_b: str | None
-    ) -> bool:
-        """Determine if compatibility should be elevated based on hazard flags."""
-        for cas in (cas_a, cas_b):
-            if not cas:
-                continue
-            hazard = self.db.get_hazard_record(cas)
-            if not hazard:
-                continue
-
-            # Consider env_risk or explicit hazard_flags marker as dangerous
-            if hazard.get("env_risk"):
-                return True
-
-            flags = hazard.get("hazard_flags") or {}
-            if isinstance(flags, dict) and flags.get("dangerous"):
-                return True
-
-            idlh = hazard.get("idlh")
-            if idlh is not None and idlh <= self.hazard_idlh_threshold:
-                return True
+    def inventory_products(self) -> list[dict[str, Any]]:
+        """Matrix products: one per product name (first, i.e. most recent, document wins)."""
+        products: dict[str, dict[str, Any]] = {}
+        for result in self._iter_all_results():
+            product_name = result.get("product_name", "Unknown")
+            if product_name and product_name not in products:
+                products[product_name] = {
+                    "name": product_name,
+                    "hazard_class": result.get("hazard_class", "Unknown"),
+                    "incompatibilities": result.get("incompatibilities", ""),
+                    "cas": result.get("cas_number"),
+                }
+        return list(products.values())
+
+    def _iter_all_results(self):
+        """Yield every processed document, paging past ``fetch_results``' row limit."""
+        offset = 0
+        while True:
+            page = self.db.fetch_results(limit=_INVENTORY_PAGE_SIZE, offset=offset)
+            yield from page
+            if len(page) < _INVENTORY_PAGE_SIZE:
+                return
+            offset += len(page)
+
+    def log_decisions(self, decisions: pd.DataFrame) -> None:
+        """Persist a build's decisions for audit as one tagged batch."""
+        sink = DecisionSink(self.db)
+        sink.extend(decisions)
+        if self._flush_decisions(sink):
+            self._prune_builds()
+
+    def _flush_decisions(self, sink: DecisionSink) -> bool:
+        """Write a sink's buffered decisions; audit logging is best-effort."""
+        try:
+            sink.flush()
+            self.last_build_id = sink.build_id
+            return True
+        except Exception as exc:  # pragma: no cover - audit best-effort
+            logger.debug("Failed to log matrix decisions: %s", exc)
+            return False
 
-        return False
+    def _discard_build(self, build_id: str) -> None:
+        """Remove the decisions already logged for an incomplete build."""
+        if self.last_build_id == build_id:
+            self.last_build_id = None
+        try:
+            if hasattr(self.db, "delete_matrix_build"):
+                self.db.delete_matrix_build(build_id)
+        except Exception as exc:  # pragma: no cover - audit best-effort
+            logger.warning("Failed to remove partial matrix build %s: %s", build_id, exc)
 
-    def _log_decision(
-        self,
-        product_a: str,
-        product_b: str,
-        cas_a: str | None,
-        cas_b: str | None,
-        decision: str,
-        source_layer: str,
-        rule_source: str | None = None,
-        justification: str | None = None,
-    ) -> None:
-        """Persist matrix decision for audit."""
+    def _prune_builds(self) -> None:
         try:
-            self.db.store_matrix_decision(
-                product_a=product_a,
-                product_b=product_b,
-                cas_a=cas_a,
-                cas_b=cas_b,
-                decision=decision,
-                source_layer=source_layer,
-                rule_source=rule_source,
-                justification=justification,
-            )
+            if self.keep_builds > 0 and hasattr(self.db, "prune_matrix_builds"):
+                self.db.prune_matrix_builds(self.keep_builds)
         except Exception as exc:  # pragma: no cover - audit best-effort
-            logger.debug("Failed to log matrix decision: %s", exc)
+            logger.debug("Failed to prune matrix builds: %s", exc)
 
     def get_processing_summary(self) -> dict[str, Any]:
         """Get summary of all processed documents.
@@ -0,0 +1,103 @@
+"""Buffered audit logging for matrix decisions.
+
+A matrix build can produce hundreds of thousands of Restricted/Incompatible
+decisions. ``DecisionSink`` collects them while the matrix is built and
+persists them with a single bulk append (one transaction), tagging every
+row with the build's ID so old builds can be listed, diffed and pruned.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Iterable
+
+import pandas as pd
+
+from ..utils.logger import get_logger
+from .engine import DECISION_COLUMNS
+
+logger = get_logger(__name__)
+
+
+def new_build_id() -> str:
+    """Return a unique, chronologically sortable build ID."""
+    return f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+class DecisionSink:
+    """Collect matrix decisions and flush them as one tagged batch."""
+
+    def __init__(self, db: Any, build_id: str | None = None) -> None:
+        """Initialize sink.
+
+        Args:
+            db: DatabaseManager-like object. ``store_matrix_decisions`` is used
+                when available, otherwise decisions are stored one by one.
+            build_id: Tag for this build (default: a new build ID)
+        """
+        self.db = db
+        self.build_id = build_id or new_build_id()
+        self._frames: list[pd.DataFrame] = []
+        self._rows: list[dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return sum(len(frame) for frame in self._frames) + len(self._rows)
+
+    def add(
+        self,
+        product_a: str,
+        product_b: str,
+        cas_a: str | None,
+        cas_b: str | None,
+        decision: str,
+        source_layer: str,
+        rule_source: str | None = None,
+        justification: str | None = None,
+    ) -> None:
+        """Buffer a single decision."""
+        self._rows.append(
+            {
+                "product_a": product_a,
+                "product_b": product_b,
+                "cas_a": cas_a,
+                "cas_b": cas_b,
+                "decision": decision,
+                "source_layer": source_layer,
+                "rule_source": rule_source,
+                "justification": justification,
+            }
+        )
+
+    def extend(self, decisions: pd.DataFrame | Iterable[dict[str, Any]]) -> None:
+        """Buffer many decisions (a DataFrame with DECISION_COLUMNS, or dicts)."""
+        if isinstance(decisions, pd.DataFrame):
+            if not decisions.empty:
+                self._frames.append(decisions[DECISION_COLUMNS])
+        else:
+            for decision in decisions:
+                self.add(**decision)
+
+    def flush(self) -> int:
+        """Persist buffered decisions in one batch and clear the buffer.
+
+        Returns:
+            Number of decisions written
+        """
+        frames = list(self._frames)
+        if self._rows:
+            frames.append(pd.DataFrame(self._rows, columns=DECISION_COLUMNS))
+        self._frames, self._rows = [], []
+        if not frames:
+            return 0
+
+        batch = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if hasattr(self.db, "store_matrix_decisions"):
+            written = self.db.store_matrix_decisions(batch, self.build_id)
+        else:
+            for record in batch.to_dict(orient="records"):
+                self.db.store_matrix_decision(**record)
+            written = len(batch)
+
+        logger.debug("Flushed %d matrix decisions (build %s)", written, self.build_id)
+        return written
@@ -0,0 +1,454 @@
+"""Vectorized incompatibility matrix engine.
+
+Evaluates every product pair of an inventory in bulk instead of one pair at
+a time: structured rules for the inventory's CAS set come from one query,
+hazard records are loaded once into a boolean array, SDS incompatibility
+text is matched with a single Aho-Corasick automaton, and all decisions are
+written into an ``int8`` code array that is only turned into a DataFrame at
+the end.
+
+Decision precedence matches the original per-pair loop:
+Self > structured rule (I/R) > SDS text match (I) > hazard elevation (R) >
+Compatible.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from .sparse import SparseMatrix
+
+logger = get_logger(__name__)
+
+# Cell codes; MATRIX_LABELS[code] is the label shown in the matrix
+COMPATIBLE, RESTRICTED, INCOMPATIBLE, SELF = range(4)
+MATRIX_LABELS = ("Compatible", "Restricted", "Incompatible", "Self")
+
+# Which layer decided a cell (only logged layers are tracked)
+_LAYER_NONE, _LAYER_RULE, _LAYER_TEXT, _LAYER_HAZARD = range(4)
+
+# Audit fields per layer: (decision, source_layer, justification)
+_LAYER_DECISIONS = {
+    _LAYER_RULE: ("R", "structured_rule", None),
+    _LAYER_TEXT: ("I", "text_incompatibility", "Name match from SDS incompatibilities"),
+    _LAYER_HAZARD: ("R", "hazard_flags", "Elevated by hazard flags/IDLH/env risk"),
+}
+
+DECISION_COLUMNS = [
+    "product_a",
+    "product_b",
+    "cas_a",
+    "cas_b",
+    "decision",
+    "source_layer",
+    "rule_source",
+    "justification",
+]
+
+
+def hazard_elevates(hazard: dict[str, Any] | None, idlh_threshold: float) -> bool:
+    """Whether a hazard record marks its chemical as high risk."""
+    if not hazard:
+        return False
+
+    # Consider env_risk or explicit hazard_flags marker as dangerous
+    if hazard.get("env_risk"):
+        return True
+
+    flags = hazard.get("hazard_flags") or {}
+    if isinstance(flags, dict) and flags.get("dangerous"):
+        return True
+
+    idlh = hazard.get("idlh")
+    return idlh is not None and idlh <= idlh_threshold
+
+
+class MultiPatternMatcher:
+    """Aho-Corasick automaton that reports every pattern contained in a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """Compile patterns (matched as exact, case-sensitive substrings)."""
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (pattern_id,)
+
+        # Breadth-first: failure links point to the longest proper suffix in the trie
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, nxt in self._goto[node].items():
+                pending.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[int]:
+        """Return the ids of all patterns occurring in ``text``."""
+        node = 0
+        found: set[int] = set()
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._out[node]:
+                found.update(self._out[node])
+        return found
+
+
+@dataclass
+class MatrixResult:
+    """Incompatibility matrix as ``int8`` codes plus the decisions to audit."""
+
+    names: list[str]
+    cas: list[str | None]
+    codes: np.ndarray
+    decisions: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=DECISION_COLUMNS))
+    # Deciding layer per cell and per-product hazard elevation, kept for ``MatrixEngine.update``
+    layers: np.ndarray | None = None
+    elevated: np.ndarray | None = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wrap the codes as a DataFrame of categorical label columns."""
+        categories = list(MATRIX_LABELS)
+        return pd.DataFrame(
+            {
+                name: pd.Categorical.from_codes(self.codes[:, col], categories=categories)
+                for col, name in enumerate(self.names)
+            },
+            index=self.names,
+        )
+
+
+class MatrixEngine:
+    """Compute incompatibility matrices for a whole inventory at once."""
+
+    def __init__(self, db: Any, hazard_idlh_threshold: float) -> None:
+        """Initialize engine.
+
+        Args:
+            db: DatabaseManager-like object. ``get_incompatibility_rules`` and
+                ``get_hazard_records`` are used when available, otherwise the
+                per-CAS lookups are called once per unique CAS (pair).
+            hazard_idlh_threshold: IDLH at or below which a chemical is high risk
+        """
+        self.db = db
+        self.hazard_idlh_threshold = hazard_idlh_threshold
+
+    def build(self, products: list[dict[str, Any]]) -> MatrixResult:
+        """Build the matrix for products with ``name``, ``cas`` and ``incompatibilities``.
+
+        Product names must be unique; they label the rows and columns.
+        """
+        names = [product["name"] for product in products]
+        cas = [(product.get("cas") or "").strip() or None for product in products]
+        everyone = np.arange(len(products))
+
+        elevated = self._elevated_mask(cas)
+        rules = self._load_rules(cas)
+        codes, layers = self._evaluate(products, cas, elevated, rules, everyone, everyone)
+
+        decisions = self._decisions(names, cas, layers, rules)
+        logger.debug(
+            "Matrix engine: %d products, %d rules, %d hazard-elevated, %d decisions",
+            len(products),
+            len(rules),
+            int(elevated.sum()),
+            len(decisions),
+        )
+        return MatrixResult(
+            names=names, cas=cas, codes=codes, decisions=decisions, layers=layers, elevated=elevated
+        )
+
+    def update(
+        self,
+        previous: MatrixResult,
+        products: list[dict[str, Any]],
+        changed: Iterable[str],
+    ) -> MatrixResult:
+        """Rebuild only the rows and columns of changed products.
+
+        Cells between two products that exist in ``previous`` and are not in
+        ``changed`` are copied over; products missing from ``previous`` are
+        always evaluated, and products no longer present are dropped.
+
+        Args:
+            previous: Earlier result built by this engine (with layers and elevated)
+            products: Current inventory, as for ``build``
+            changed: Names of products whose data, CAS rules or hazards changed
+
+        Returns:
+            Full result for ``products``, equal to ``build(products)``
+        """
+        if previous.layers is None or previous.elevated is None:
+            return self.build(products)
+
+        names = [product["name"] for product in products]
+        cas = [(product.get("cas") or "").strip() or None for product in products]
+        old_index = {name: index for index, name in enumerate(previous.names)}
+        changed = set(changed)
+
+        kept = [(new, old_index[name]) for new, name in enumerate(names) if name in old_index and name not in changed]
+        kept_new = np.asarray([new for new, _ in kept], dtype=np.intp)
+        kept_old = np.asarray([old for _, old in kept], dtype=np.intp)
+        dirty = np.setdiff1d(np.arange(len(products)), kept_new)
+
+        elevated = np.zeros(len(products), dtype=bool)
+        elevated[kept_new] = previous.elevated[kept_old]
+        elevated[dirty] = self._elevated_mask([cas[index] for index in dirty])
+
+        codes = np.full((len(products), len(products)), COMPATIBLE, dtype=np.int8)
+        layers = np.zeros_like(codes)
+        kept_block = np.ix_(kept_new, kept_new)
+        codes[kept_block] = previous.codes[np.ix_(kept_old, kept_old)]
+        layers[kept_block] = previous.layers[np.ix_(kept_old, kept_old)]
+
+        rules = self._load_rules(cas)
+        if len(dirty):
+            everyone = np.arange(len(products))
+            codes[dirty, :], layers[dirty, :] = self._evaluate(products, cas, elevated, rules, dirty, everyone)
+            codes[:, dirty], layers[:, dirty] = self._evaluate(products, cas, elevated, rules, everyone, dirty)
+
+        decisions = self._decisions(names, cas, layers, rules)
+        logger.debug(
+            "Matrix engine: updated %d of %d products (%d rules)", len(dirty), len(products), len(rules)
+        )
+        return MatrixResult(
+            names=names, cas=cas, codes=codes, decisions=decisions, layers=layers, elevated=elevated
+        )
+
+    def build_sparse(
+        self,
+        products: list[dict[str, Any]],
+        block_rows: int = 512,
+        on_decisions: Callable[[pd.DataFrame], None] | None = None,
+    ) -> SparseMatrix:
+        """Build the matrix as a ``SparseMatrix``, one band of rows at a time.
+
+        Peak memory is bounded by ``block_rows`` x N cells plus the stored
+        (non-Compatible) cells, instead of N x N.
+
+        Args:
+            products: Inventory, as for ``build``
+            block_rows: Rows evaluated per band
+            on_decisions: Receives each band's decisions as soon as it is built
+                (they are then not kept on the result); default: keep them all
+        """
+        from .sparse import SparseMatrix
+
+        names = [product["name"] for product in products]
+        cas = [(product.get("cas") or "").strip() or None for product in products]
+        everyone = np.arange(len(products))
+
+        elevated = self._elevated_mask(cas)
+        rules = self._load_rules(cas)
+        rows: list[np.ndarray] = []
+        cols: list[np.ndarray] = []
+        codes: list[np.ndarray] = []
+        decisions: list[pd.DataFrame] = []
+        for start in range(0, len(products), max(block_rows, 1)):
+            band = everyone[start : start + block_rows]
+            band_codes, band_layers = self._evaluate(products, cas, elevated, rules, band, everyone)
+            hit_rows, hit_cols = np.nonzero(band_codes)
+            rows.append((hit_rows + start).astype(np.int32))
+            cols.append(hit_cols.astype(np.int32))
+            codes.append(band_codes[hit_rows, hit_cols])
+            band_decisions = self._decisions(names, cas, band_layers, rules, row_offset=start)
+            if on_decisions is None:
+                decisions.append(band_decisions)
+            else:
+                on_decisions(band_decisions)
+
+        matrix = SparseMatrix(
+            names=names,
+            cas=cas,
+            rows=np.concatenate(rows) if rows else np.empty(0, dtype=np.int32),
+            cols=np.concatenate(cols) if cols else np.empty(0, dtype=np.int32),
+            codes=np.concatenate(codes) if codes else np.empty(0, dtype=np.int8),
+            decisions=(
+                pd.concat(decisions, ignore_index=True)
+                if decisions
+                else pd.DataFrame(columns=DECISION_COLUMNS)
+            ),
+        )
+        logger.debug(
+            "Matrix engine (sparse): %d products, %d stored cells (%.2f%%)",
+            len(products),
+            matrix.nnz,
+            matrix.density * 100,
+        )
+        return matrix
+
+    # === Private Methods ===
+
+    def _evaluate(
+        self,
+        products: list[dict[str, Any]],
+        cas: list[str | None],
+        elevated: np.ndarray,
+        rules: dict[tuple[str, str], dict[str, Any]],
+        rows: np.ndarray,
+        cols: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Codes and decision layers for the block ``rows`` x ``cols`` of the matrix."""
+        codes = np.full((len(rows), len(cols)), COMPATIBLE, dtype=np.int8)
+        layers = np.zeros((len(rows), len(cols)), dtype=np.int8)
+
+        # Lowest precedence first; later layers overwrite earlier ones
+        hazard_cells = np.logical_or.outer(elevated[rows], elevated[cols])
+        codes[hazard_cells] = RESTRICTED
+        layers[hazard_cells] = _LAYER_HAZARD
+
+        text_rows, text_cols = self._text_matches(products, rows, cols)
+        codes[text_rows, text_cols] = INCOMPATIBLE
+        layers[text_rows, text_cols] = _LAYER_TEXT
+
+        rows_by_cas: dict[str, list[int]] = defaultdict(list)
+        cols_by_cas: dict[str, list[int]] = defaultdict(list)
+        for local, index in enumerate(rows):
+            if cas[index]:
+                rows_by_cas[cas[index]].append(local)
+        for local, index in enumerate(cols):
+            if cas[index]:
+                cols_by_cas[cas[index]].append(local)
+        for (cas_a, cas_b), rule in rules.items():
+            kind = rule.get("rule")
+            if kind not in ("I", "R"):
+                continue
+            for row_cas, col_cas in ((cas_a, cas_b), (cas_b, cas_a)):
+                if row_cas not in rows_by_cas or col_cas not in cols_by_cas:
+                    continue
+                block = np.ix_(rows_by_cas[row_cas], cols_by_cas[col_cas])
+                codes[block] = INCOMPATIBLE if kind == "I" else RESTRICTED
+                # Structured "I" rules are not audited, matching the per-pair builder
+                layers[block] = _LAYER_RULE if kind == "R" else _LAYER_NONE
+
+        col_of = {index: local for local, index in enumerate(cols)}
+        diagonal = [(local, col_of[index]) for local, index in enumerate(rows) if index in col_of]
+        if diagonal:
+            self_rows, self_cols = zip(*diagonal)
+            codes[self_rows, self_cols] = SELF
+            layers[self_rows, self_cols] = _LAYER_NONE
+        return codes, layers
+
+    def _load_rules(self, cas: list[str | None]) -> dict[tuple[str, str], dict[str, Any]]:
+        unique = sorted({c for c in cas if c})
+        if hasattr(self.db, "get_incompatibility_rules"):
+            return self.db.get_incompatibility_rules(unique)
+
+        rules = {}
+        for i, cas_a in enumerate(unique):
+            for cas_b in unique[i:]:
+                rule = self.db.get_incompatibility_rule(cas_a, cas_b)
+                if rule:
+                    rules[(cas_a, cas_b)] = rule
+        return rules
+
+    def _elevated_mask(self, cas: list[str | None]) -> np.ndarray:
+        unique = sorted({c for c in cas if c})
+        if hasattr(self.db, "get_hazard_records"):
+            hazards = self.db.get_hazard_records(unique)
+        else:
+            hazards = {c: self.db.get_hazard_record(c) for c in unique}
+        elevated = {c for c, record in hazards.items() if hazard_elevates(record, self.hazard_idlh_threshold)}
+        return np.fromiter((c in elevated for c in cas), dtype=bool, count=len(cas))
+
+    @staticmethod
+    def _text_matches(
+        products: list[dict[str, Any]], rows: np.ndarray, cols: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Block cells where an incompatibility listed by a row product occurs in a column name."""
+        token_ids: dict[str, int] = {}
+        owners: list[list[int]] = []
+        for local, index in enumerate(rows):
+            for token in (products[index].get("incompatibilities") or "").split(","):
+                token = token.strip().lower()
+                if not token:
+                    continue
+                if token not in token_ids:
+                    token_ids[token] = len(owners)
+                    owners.append([])
+                owners[token_ids[token]].append(local)
+
+        hit_rows: list[int] = []
+        hit_cols: list[int] = []
+        if token_ids:
+            matcher = MultiPatternMatcher(token_ids)
+            for local_col, index in enumerate(cols):
+                for token_id in matcher.find(products[index]["name"].lower()):
+                    for local_row in owners[token_id]:
+                        if rows[local_row] != index:
+                            hit_rows.append(local_row)
+                            hit_cols.append(local_col)
+        return np.asarray(hit_rows, dtype=np.intp), np.asarray(hit_cols, dtype=np.intp)
+
+    @staticmethod
+    def _decisions(
+        names: list[str],
+        cas: list[str | None],
+        layers: np.ndarray,
+        rules: dict[tuple[str, str], dict[str, Any]],
+        row_offset: int = 0,
+    ) -> pd.DataFrame:
+        """Audit records for logged cells, in row-major order.
+
+        ``layers`` may be a band of full rows starting at ``row_offset``.
+        """
+        rows, cols = np.nonzero(layers)
+        cell_layers = layers[rows, cols]
+        rows = rows + row_offset
+        count = len(rows)
+        cas_array = np.asarray(cas, dtype=object)
+
+        decision = np.empty(count, dtype=object)
+        source_layer = np.empty(count, dtype=object)
+        justification = np.full(count, None, dtype=object)
+        rule_source = np.full(count, None, dtype=object)
+        for layer, (code, source, reason) in _LAYER_DECISIONS.items():
+            mask = cell_layers == layer
+            decision[mask] = code
+            source_layer[mask] = source
+            justification[mask] = reason
+
+        # Structured rules carry their own source and justification
+        for k in np.flatnonzero(cell_layers == _LAYER_RULE):
+            rule = rules[tuple(sorted((cas_array[rows[k]], cas_array[cols[k]])))]
+            rule_source[k] = rule.get("source")
+            justification[k] = rule.get("justification")
+
+        names_array = np.asarray(names, dtype=object)
+        return pd.DataFrame(
+            {
+                "product_a": names_array[rows],
+                "product_b": names_array[cols],
+                "cas_a": cas_array[rows],
+                "cas_b": cas_array[cols],
+                "decision": decision,
+                "source_layer": source_layer,
+                "rule_source": rule_source,
+                "justification": justification,
+            },
+            columns=DECISION_COLUMNS,
+        )
@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+import csv
 import json
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
+from .engine import MATRIX_LABELS
+from .sparse import CELL_COLUMNS, SparseMatrix
 
 logger = get_logger(__name__)
 
+# Excel sheet limits (including the header row/column)
+_XLSX_MAX_ROWS = 1_048_576
+_XLSX_MAX_COLUMNS = 16_384
+
+_HTML_TILE_STYLE = (
+    "body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; padding: 16px; } "
+    ".tbl { border-collapse: collapse; } "
+    ".tbl th, .tbl td { border: 1px solid #ddd; padding: 4px 6px; font-size: 11px; } "
+    ".tbl th { background: #f6f6f6; } "
+    ".c1 { background: #fff3cd; } .c2 { background: #f8d7da; } .c3 { color: #999; }"
+)
+
 
 class MatrixExporter:
     """Export matrices to CSV, Excel, PDF, and JSON formats."""
@@ -236,7 +253,7 @@ class MatrixExporter:
                 rows = self.db.conn.execute(
                     """
                     SELECT product_a, product_b, cas_a, cas_b, decision,
-                           source_layer, rule_source, justification, decided_at
+                           source_layer, rule_source, justification, decided_at, build_id
                     FROM matrix_decisions
                     ORDER BY decided_at DESC;
                     """
@@ -252,12 +269,278 @@ class MatrixExporter:
                 "rule_source",
                 "justification",
                 "decided_at",
+                "build_id",
             ]
             return pd.DataFrame(rows, columns=columns)
         except Exception as exc:
             logger.error("Failed to export matrix decisions: %s", exc)
             return pd.DataFrame()
 
+    def export_delta(self, delta: Any, output_path: Path | str) -> bool:
+        """Export a ``MatrixDelta`` (changed products and cells) to CSV or JSON.
+
+        CSV holds only the changed cells; any other suffix writes the full delta as JSON.
+        """
+        if Path(output_path).suffix.lower() == ".csv":
+            return self.export_to_csv(delta.cells, output_path, index=False)
+        return self.export_to_json(delta.to_dict(), output_path, pretty=True)
+
+    # === Streaming Exports (SparseMatrix) ===
+
+    def export_sparse_csv(
+        self,
+        matrix: SparseMatrix,
+        output_path: Path | str,
+        layout: str = "long",
+    ) -> bool:
+        """Stream a sparse matrix to CSV.
+
+        Args:
+            matrix: Matrix from ``MatrixBuilder.build_sparse_matrix``
+            output_path: Output file path
+            layout: "long" (one line per non-Compatible cell) or "wide" (full grid)
+
+        Returns:
+            True if successful
+        """
+        try:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if layout == "long":
+                with open(output_path, "w", encoding="utf-8", newline="") as f:
+                    f.write(",".join(CELL_COLUMNS) + "\n")
+                    for chunk in matrix.iter_cells():
+                        chunk.to_csv(f, header=False, index=False)
+            elif layout == "wide":
+                labels = np.asarray(MATRIX_LABELS, dtype=object)
+                with open(output_path, "w", encoding="utf-8", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["", *matrix.names])
+                    for start, band in matrix.iter_bands(self.settings.matrix_block_rows):
+                        for offset, codes in enumerate(band):
+                            writer.writerow([matrix.names[start + offset], *labels[codes]])
+            else:
+                raise ValueError(f"Unknown CSV layout: {layout}")
+
+            logger.info("Exported sparse matrix to CSV (%s): %s", layout, output_path)
+            return True
+
+        except Exception as e:
+            logger.error("Sparse CSV export failed: %s", e)
+            return False
+
+    def export_sparse_xlsx(self, matrix: SparseMatrix, output_path: Path | str) -> bool:
+        """Stream a sparse matrix to Excel with openpyxl's write-only mode.
+
+        Writes the full grid ("Matriz", when it fits Excel's column limit), the
+        non-Compatible cells ("Celulas", split at the row limit) and a summary.
+
+        Returns:
+            True if successful
+        """
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            logger.error("openpyxl required for Excel export")
+            return False
+
+        try:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            labels = np.asarray(MATRIX_LABELS, dtype=object)
+            workbook = Workbook(write_only=True)
+
+            if matrix.size + 1 <= _XLSX_MAX_COLUMNS:
+                sheet = workbook.create_sheet("Matriz")
+                sheet.append(["", *matrix.names])
+                for start, band in matrix.iter_bands(self.settings.matrix_block_rows):
+                    for offset, codes in enumerate(band):
+                        sheet.append([matrix.names[start + offset], *labels[codes].tolist()])
+            else:
+                logger.warning(
+                    "Matrix has %d columns (Excel max %d); writing cell list only",
+                    matrix.size,
+                    _XLSX_MAX_COLUMNS,
+                )
+
+            sheet, written, parts = None, 0, 0
+            for chunk in matrix.iter_cells():
+                for record in chunk.itertuples(index=False, name=None):
+                    if sheet is None or written >= _XLSX_MAX_ROWS - 1:
+                        parts += 1
+                        sheet = workbook.create_sheet("Celulas" if parts == 1 else f"Celulas_{parts}")
+                        sheet.append(CELL_COLUMNS)
+                        written = 0
+                    sheet.append(list(record))
+                    written += 1
+
+            summary = workbook.create_sheet("Resumo")
+            summary.append(["Data de Exportacao", "Produtos", "Celulas Armazenadas", "Densidade"])
+            summary.append(
+                [
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    matrix.size,
+                    matrix.nnz,
+                    round(matrix.density, 6),
+                ]
+            )
+
+            workbook.save(output_path)
+            logger.info("Exported sparse matrix to Excel: %s", output_path)
+            return True
+
+        except Exception as e:
+            logger.error("Sparse Excel export failed: %s", e)
+            return False
+
+    def export_sparse_parquet(self, matrix: SparseMatrix, output_path: Path | str) -> bool:
+        """Stream the non-Compatible cells of a sparse matrix to Parquet (long layout).
+
+        Each chunk of cells becomes a row group; requires pyarrow.
+
+        Returns:
+            True if successful
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.error("pyarrow required for Parquet export")
+            return False
+
+        try:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            schema = pa.schema(
+                [
+                    ("row", pa.int32()),
+                    ("col", pa.int32()),
+                    ("product_a", pa.string()),
+                    ("product_b", pa.string()),
+                    ("cas_a", pa.string()),
+                    ("cas_b", pa.string()),
+                    ("label", pa.dictionary(pa.int8(), pa.string())),
+                ]
+            )
+            with pq.ParquetWriter(output_path, schema) as writer:
+                for chunk in matrix.iter_cells():
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+            logger.info("Exported sparse matrix to Parquet: %s", output_path)
+            return True
+
+        except Exception as e:
+            logger.error("Parquet export failed: %s", e)
+            return False
+
+    def export_html_tiles(
+        self,
+        matrix: SparseMatrix,
+        output_dir: Path | str,
+        tile_size: int = 200,
+    ) -> bool:
+        """Export a sparse matrix as paged HTML: an index page plus one page per tile.
+
+        Args:
+            matrix: Matrix from ``MatrixBuilder.build_sparse_matrix``
+            output_dir: Directory receiving ``index.html`` and ``tile_<r>_<c>.html``
+            tile_size: Rows and columns per tile
+
+        Returns:
+            True if successful
+        """
+        try:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            labels = np.asarray(MATRIX_LABELS, dtype=object)
+            tiles = range(0, matrix.size, max(tile_size, 1))
+            grid = len(tiles)
+
+            def _page(title: str, body: str) -> str:
+                return (
+                    f"<!doctype html>\n<html>\n<head>\n  <meta charset=\"utf-8\" />\n"
+                    f"  <title>{escape(title)}</title>\n  <style>{_HTML_TILE_STYLE}</style>\n"
+                    f"</head>\n<body>\n  <h1>{escape(title)}</h1>\n{body}\n</body>\n</html>\n"
+                )
+
+            index_rows = []
+            for tile_row, row_start in enumerate(tiles):
+                band = matrix.band(row_start, row_start + tile_size)
+                row_names = matrix.names[row_start : row_start + tile_size]
+                index_cells = []
+                for tile_col, col_start in enumerate(tiles):
+                    tile = band[:, col_start : col_start + tile_size]
+                    col_names = matrix.names[col_start : col_start + tile_size]
+                    stored = int(np.count_nonzero(tile))
+                    name = f"tile_{tile_row}_{tile_col}.html"
+                    index_cells.append(f'<td><a href="{name}">{stored}</a></td>')
+
+                    nav = []
+                    for label, (r, c) in (
+                        ("&uarr;", (tile_row - 1, tile_col)),
+                        ("&darr;", (tile_row + 1, tile_col)),
+                        ("&larr;", (tile_row, tile_col - 1)),
+                        ("&rarr;", (tile_row, tile_col + 1)),
+                    ):
+                        if 0 <= r < grid and 0 <= c < grid:
+                            nav.append(f'<a href="tile_{r}_{c}.html">{label}</a>')
+                    header = "".join(f"<th>{escape(n)}</th>" for n in col_names)
+                    body_rows = "\n".join(
+                        f"<tr><th>{escape(row_name)}</th>"
+                        + "".join(f'<td class="c{code}">{labels[code]}</td>' for code in codes)
+                        + "</tr>"
+                        for row_name, codes in zip(row_names, tile)
+                    )
+                    (output_dir / name).write_text(
+                        _page(
+                            f"Rows {row_start + 1}-{row_start + len(row_names)}, "
+                            f"columns {col_start + 1}-{col_start + len(col_names)}",
+                            f'  <p><a href="index.html">index</a> {" ".join(nav)}</p>\n'
+                            f'  <table class="tbl"><tr><th></th>{header}</tr>\n{body_rows}\n</table>',
+                        ),
+                        encoding="utf-8",
+                    )
+                first, last = row_names[0], row_names[-1]
+                index_rows.append(
+                    f"<tr><th>{escape(first)} &hellip; {escape(last)}</th>{''.join(index_cells)}</tr>"
+                )
+
+            summary = (
+                f"  <p>{matrix.size} products, {matrix.nnz} non-compatible cells, "
+                f"{grid}x{grid} tiles of {tile_size}. Each link shows the tile's stored cells.</p>\n"
+            )
+            (output_dir / "index.html").write_text(
+                _page(
+                    "RAG SDS Matrix Export",
+                    summary + '  <table class="tbl">\n' + "\n".join(index_rows) + "\n</table>",
+                ),
+                encoding="utf-8",
+            )
+            logger.info("Exported %d HTML matrix tiles to %s", grid * grid, output_dir)
+            return True
+
+        except Exception as e:
+            logger.error("HTML tile export failed: %s", e)
+            return False
+
+    def export_database_parquet(self, output_dir: Path | str) -> bool:
+        """Back up the extraction database (documents, extractions, rules, decisions) as Parquet.
+
+        Returns:
+            True if successful
+        """
+        try:
+            manifest = self.db.export_parquet(output_dir)
+            logger.info(
+                "Exported database to Parquet: %s (%d tables)", output_dir, len(manifest["tables"])
+            )
+            return True
+        except Exception as e:
+            logger.error("Parquet database export failed: %s", e)
+            return False
+
     # === UI Convenience Wrappers ===
 
     def export_xlsx(self, output_path: Path | str) -> bool:
@@ -0,0 +1,332 @@
+"""Incremental incompatibility matrix maintenance.
+
+``IncrementalMatrixService`` keeps the last matrix on disk together with a
+version number and the database clock at which its inputs were read. On the
+next refresh it asks the database which CAS numbers changed since then
+(newly processed documents, re-indexed rules and hazard records), compares
+per-product fingerprints to find added, removed and edited products, and
+re-evaluates only their rows and columns. Every refresh returns a
+``MatrixDelta`` describing what changed, for the UI and exporters.
+
+The decision audit follows the same split: a full build logs every
+decision, an incremental version only the decisions of its recomputed rows
+and columns, so the latest decision of a pair is found in the newest build
+that logged it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+from .builder import MatrixBuilder
+from .engine import MATRIX_LABELS, MatrixEngine, MatrixResult
+
+logger = get_logger(__name__)
+
+DELTA_COLUMNS = ["product_a", "product_b", "old_label", "new_label"]
+
+# Above this share of changed products a full build is cheaper than two strips
+_FULL_REBUILD_RATIO = 0.5
+
+
+def product_fingerprint(product: dict[str, Any]) -> str:
+    """Digest of the product fields the matrix engine reads."""
+    payload = "|".join(
+        str(product.get(key) or "").strip() for key in ("name", "cas", "incompatibilities")
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MatrixSnapshot:
+    """A persisted matrix and the state of its inputs."""
+
+    version: int
+    as_of: datetime
+    build_id: str | None
+    hazard_idlh_threshold: float
+    fingerprints: list[str]
+    result: MatrixResult
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot atomically (temp file + rename)."""
+        result = self.result
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    version=np.int64(self.version),
+                    as_of=np.str_(self.as_of.isoformat()),
+                    build_id=np.str_(self.build_id or ""),
+                    hazard_idlh_threshold=np.float64(self.hazard_idlh_threshold),
+                    fingerprints=np.asarray(self.fingerprints, dtype=str),
+                    names=np.asarray(result.names, dtype=str),
+                    cas=np.asarray([c or "" for c in result.cas], dtype=str),
+                    codes=result.codes,
+                    layers=result.layers,
+                    elevated=result.elevated,
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> MatrixSnapshot | None:
+        """Read a snapshot, or None when missing or unreadable."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                result = MatrixResult(
+                    names=data["names"].tolist(),
+                    cas=[c or None for c in data["cas"].tolist()],
+                    codes=data["codes"],
+                    layers=data["layers"],
+                    elevated=data["elevated"],
+                )
+                return cls(
+                    version=int(data["version"]),
+                    as_of=datetime.fromisoformat(str(data["as_of"])),
+                    build_id=str(data["build_id"]) or None,
+                    hazard_idlh_threshold=float(data["hazard_idlh_threshold"]),
+                    fingerprints=data["fingerprints"].tolist(),
+                    result=result,
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Discarding unreadable matrix snapshot %s: %s", path, exc)
+            return None
+
+
+@dataclass
+class MatrixDelta:
+    """What changed between two matrix versions."""
+
+    from_version: int | None
+    to_version: int
+    build_id: str | None = None
+    full_rebuild: bool = False
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    recomputed: list[str] = field(default_factory=list)
+    changed_cas: list[str] = field(default_factory=list)
+    cells: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=DELTA_COLUMNS))
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any product or cell changed."""
+        return bool(self.added or self.removed or self.recomputed or len(self.cells))
+
+    def summary(self) -> str:
+        """One-line description for status bars and logs."""
+        if self.from_version is None:
+            return f"Matrix v{self.to_version}: full build"
+        if not self.has_changes:
+            return f"Matrix v{self.to_version}: no changes"
+        return (
+            f"Matrix v{self.from_version} -> v{self.to_version}: "
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.recomputed)} recomputed, {len(self.cells)} cells changed"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form (cells as records)."""
+        return {
+            "from_version": self.from_version,
+            "to_version": self.to_version,
+            "build_id": self.build_id,
+            "full_rebuild": self.full_rebuild,
+            "added": self.added,
+            "removed": self.removed,
+            "recomputed": self.recomputed,
+            "changed_cas": self.changed_cas,
+            "cells": self.cells.to_dict(orient="records"),
+        }
+
+
+class IncrementalMatrixService:
+    """Keep the incompatibility matrix current by recomputing only what changed."""
+
+    def __init__(self, db: Any | None = None, snapshot_path: Path | str | None = None) -> None:
+        """Initialize service.
+
+        Args:
+            db: Optional DatabaseManager-like object (used by UI/tests)
+            snapshot_path: Where the last matrix is kept (default: settings)
+        """
+        self.builder = MatrixBuilder(db)
+        self.db = self.builder.db
+        self.snapshot_path = Path(snapshot_path or get_settings().paths.matrix_snapshot)
+        self.last_delta: MatrixDelta | None = None
+
+    def current(self) -> MatrixResult | None:
+        """The last persisted matrix, without checking for changes."""
+        snapshot = MatrixSnapshot.load(self.snapshot_path)
+        return snapshot.result if snapshot else None
+
+    def pending_changes(self) -> MatrixDelta:
+        """Products and CAS numbers changed since the last refresh (cells not evaluated)."""
+        snapshot = self._usable_snapshot()
+        changes = self._changes_since(snapshot)
+        products = self.builder.inventory_products()
+        if snapshot is None:
+            return MatrixDelta(
+                from_version=None, to_version=1, full_rebuild=True, added=[p["name"] for p in products]
+            )
+        added, removed, changed = self._plan(snapshot, products, changes["cas"])
+        return MatrixDelta(
+            from_version=snapshot.version,
+            to_version=snapshot.version + (1 if added or removed or changed else 0),
+            added=added,
+            removed=removed,
+            recomputed=sorted(changed - set(added)),
+            changed_cas=sorted(changes["cas"] or ()),
+        )
+
+    def refresh(self, force_full: bool = False) -> tuple[MatrixResult, MatrixDelta]:
+        """Bring the matrix up to date and persist it.
+
+        Args:
+            force_full: Ignore the snapshot and rebuild every cell
+
+        Returns:
+            The current matrix and the delta from the previous version
+        """
+        snapshot = None if force_full else self._usable_snapshot()
+        changes = self._changes_since(snapshot)
+        products = self.builder.inventory_products()
+        fingerprints = [product_fingerprint(product) for product in products]
+        engine = MatrixEngine(self.db, self.builder.hazard_idlh_threshold)
+
+        if snapshot is None:
+            result = engine.build(products)
+            decisions = result.decisions
+            delta = MatrixDelta(
+                from_version=None, to_version=1, full_rebuild=True, added=[p["name"] for p in products]
+            )
+        else:
+            added, removed, changed = self._plan(snapshot, products, changes["cas"])
+            if not (added or removed or changed):
+                self.last_delta = MatrixDelta(from_version=snapshot.version, to_version=snapshot.version)
+                return snapshot.result, self.last_delta
+
+            full = len(changed) > _FULL_REBUILD_RATIO * len(products)
+            if full:
+                result = engine.build(products)
+                decisions = result.decisions
+            else:
+                result = engine.update(snapshot.result, products, changed)
+                # Only the dirty rows and columns are new decisions
+                decisions = result.decisions[
+                    result.decisions["product_a"].isin(changed) | result.decisions["product_b"].isin(changed)
+                ]
+            delta = MatrixDelta(
+                from_version=snapshot.version,
+                to_version=snapshot.version + 1,
+                full_rebuild=full,
+                added=added,
+                removed=removed,
+                recomputed=sorted(changed - set(added)),
+                changed_cas=sorted(changes["cas"] or ()),
+                cells=self._changed_cells(snapshot.result, result, changed),
+            )
+
+        self.builder.log_decisions(decisions)
+        delta.build_id = self.builder.last_build_id
+        MatrixSnapshot(
+            version=delta.to_version,
+            as_of=changes["as_of"],
+            build_id=delta.build_id,
+            hazard_idlh_threshold=self.builder.hazard_idlh_threshold,
+            fingerprints=fingerprints,
+            result=result,
+        ).save(self.snapshot_path)
+
+        logger.info(delta.summary())
+        self.last_delta = delta
+        return result, delta
+
+    # === Private Methods ===
+
+    def _usable_snapshot(self) -> MatrixSnapshot | None:
+        snapshot = MatrixSnapshot.load(self.snapshot_path)
+        if snapshot and snapshot.hazard_idlh_threshold != self.builder.hazard_idlh_threshold:
+            logger.info("Hazard IDLH threshold changed; matrix snapshot ignored")
+            return None
+        return snapshot
+
+    def _changes_since(self, snapshot: MatrixSnapshot | None) -> dict[str, Any]:
+        """Changed CAS numbers (None when the DB cannot report them) and the read clock."""
+        if hasattr(self.db, "get_matrix_changes"):
+            return self.db.get_matrix_changes(snapshot.as_of if snapshot else None)
+        return {"as_of": datetime.now(), "cas": None}
+
+    @staticmethod
+    def _plan(
+        snapshot: MatrixSnapshot,
+        products: list[dict[str, Any]],
+        changed_cas: set[str] | None,
+    ) -> tuple[list[str], list[str], set[str]]:
+        """Added and removed product names, and every product name to recompute."""
+        old = dict(zip(snapshot.result.names, snapshot.fingerprints))
+        names = {product["name"] for product in products}
+        added = [product["name"] for product in products if product["name"] not in old]
+        removed = [name for name in snapshot.result.names if name not in names]
+
+        changed = set(added)
+        for product in products:
+            name = product["name"]
+            cas = (product.get("cas") or "").strip()
+            if changed_cas is None or old.get(name) != product_fingerprint(product):
+                changed.add(name)
+            elif cas and cas in changed_cas:
+                changed.add(name)
+        return added, removed, changed
+
+    @staticmethod
+    def _changed_cells(old: MatrixResult, new: MatrixResult, changed: set[str]) -> pd.DataFrame:
+        """Cells between products present in both versions whose label changed."""
+        old_index = {name: index for index, name in enumerate(old.names)}
+        common = [(new_i, old_index[name]) for new_i, name in enumerate(new.names) if name in old_index]
+        dirty = [(new_i, old_i) for new_i, old_i in common if new.names[new_i] in changed]
+        clean = [(new_i, old_i) for new_i, old_i in common if new.names[new_i] not in changed]
+
+        rows_a, rows_b, labels_old, labels_new = [], [], [], []
+        # Dirty rows against every column, then clean rows against dirty columns
+        for row_pairs, col_pairs in ((dirty, common), (clean, dirty)):
+            if not row_pairs or not col_pairs:
+                continue
+            new_rows, old_rows = (np.asarray(side, dtype=np.intp) for side in zip(*row_pairs))
+            new_cols, old_cols = (np.asarray(side, dtype=np.intp) for side in zip(*col_pairs))
+            before = old.codes[np.ix_(old_rows, old_cols)]
+            after = new.codes[np.ix_(new_rows, new_cols)]
+            hit_rows, hit_cols = np.nonzero(before != after)
+            rows_a.extend(new_rows[hit_rows])
+            rows_b.extend(new_cols[hit_cols])
+            labels_old.extend(before[hit_rows, hit_cols])
+            labels_new.extend(after[hit_rows, hit_cols])
+
+        names = np.asarray(new.names, dtype=object)
+        labels = np.asarray(MATRIX_LABELS, dtype=object)
+        return pd.DataFrame(
+            {
+                "product_a": names[np.asarray(rows_a, dtype=np.intp)],
+                "product_b": names[np.asarray(rows_b, dtype=np.intp)],
+                "old_label": labels[np.asarray(labels_old, dtype=np.intp)],
+                "new_label": labels[np.asarray(labels_new, dtype=np.intp)],
+            },
+            columns=DELTA_COLUMNS,
+        )
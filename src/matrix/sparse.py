@@ -0,0 +1,122 @@
+"""Sparse incompatibility matrix for large inventories.
+
+Most pairs of a site inventory are Compatible, so ``SparseMatrix`` stores
+only the other cells: an ``int8`` code per cell plus its (row, col)
+coordinates, sorted row-major. Dense rows, bands and tiles are
+materialized on demand, which lets exporters stream a 10k x 10k matrix
+without ever holding it whole.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .engine import COMPATIBLE, DECISION_COLUMNS, MATRIX_LABELS, MatrixResult
+
+# Columns of the long (one row per stored cell) layout
+CELL_COLUMNS = ["row", "col", "product_a", "product_b", "cas_a", "cas_b", "label"]
+
+
+@dataclass
+class SparseMatrix:
+    """Non-Compatible cells of an N x N matrix as a coordinate list."""
+
+    names: list[str]
+    cas: list[str | None]
+    rows: np.ndarray
+    cols: np.ndarray
+    codes: np.ndarray
+    decisions: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=DECISION_COLUMNS))
+
+    @classmethod
+    def from_result(cls, result: MatrixResult) -> SparseMatrix:
+        """Convert a dense ``MatrixResult``."""
+        rows, cols = np.nonzero(result.codes != COMPATIBLE)
+        return cls(
+            names=list(result.names),
+            cas=list(result.cas),
+            rows=rows.astype(np.int32),
+            cols=cols.astype(np.int32),
+            codes=result.codes[rows, cols],
+            decisions=result.decisions,
+        )
+
+    @property
+    def size(self) -> int:
+        """Number of products (rows = columns)."""
+        return len(self.names)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (non-Compatible) cells."""
+        return len(self.codes)
+
+    @property
+    def density(self) -> float:
+        """Share of cells that are stored."""
+        return self.nnz / (self.size * self.size) if self.size else 0.0
+
+    def get(self, row: int, col: int) -> str:
+        """Label of one cell."""
+        start, stop = np.searchsorted(self.rows, [row, row + 1])
+        hit = start + np.searchsorted(self.cols[start:stop], col)
+        if hit < stop and self.cols[hit] == col:
+            return MATRIX_LABELS[self.codes[hit]]
+        return MATRIX_LABELS[COMPATIBLE]
+
+    def band(self, start: int, stop: int, col_start: int = 0, col_stop: int | None = None) -> np.ndarray:
+        """Dense ``int8`` codes of rows ``start:stop`` (optionally a column range of them)."""
+        col_stop = self.size if col_stop is None else col_stop
+        stop = min(stop, self.size)
+        first, last = np.searchsorted(self.rows, [start, stop])
+        rows, cols, codes = self.rows[first:last], self.cols[first:last], self.codes[first:last]
+        if col_start or col_stop != self.size:
+            keep = (cols >= col_start) & (cols < col_stop)
+            rows, cols, codes = rows[keep], cols[keep], codes[keep]
+
+        dense = np.full((stop - start, col_stop - col_start), COMPATIBLE, dtype=np.int8)
+        dense[rows - start, cols - col_start] = codes
+        return dense
+
+    def iter_bands(self, block_rows: int) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield ``(first_row, dense_band)`` for consecutive bands of ``block_rows`` rows."""
+        for start in range(0, self.size, max(block_rows, 1)):
+            yield start, self.band(start, start + block_rows)
+
+    def iter_cells(self, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Yield the stored cells in the long layout (``CELL_COLUMNS``), in chunks."""
+        names = np.asarray(self.names, dtype=object)
+        cas = np.asarray(self.cas, dtype=object)
+        labels = np.asarray(MATRIX_LABELS, dtype=object)
+        for start in range(0, self.nnz, max(chunk_size, 1)):
+            rows = self.rows[start : start + chunk_size]
+            cols = self.cols[start : start + chunk_size]
+            yield pd.DataFrame(
+                {
+                    "row": rows,
+                    "col": cols,
+                    "product_a": names[rows],
+                    "product_b": names[cols],
+                    "cas_a": cas[rows],
+                    "cas_b": cas[cols],
+                    "label": labels[self.codes[start : start + chunk_size]],
+                },
+                columns=CELL_COLUMNS,
+            )
+
+    def to_result(self) -> MatrixResult:
+        """Densify into a ``MatrixResult`` (only for inventories that fit in memory)."""
+        return MatrixResult(
+            names=list(self.names),
+            cas=list(self.cas),
+            codes=self.band(0, self.size),
+            decisions=self.decisions,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dense labelled DataFrame, as ``MatrixResult.to_frame``."""
+        return self.to_result().to_frame()
@@ -1,9 +1,12 @@
 """Model interfaces for LLM, embeddings, and OCR."""
 
+from .async_ollama import AsyncOllamaClient, get_async_ollama_client
 from .ollama_client import OllamaClient, get_ollama_client
 from .llm_factory import LLMFactory, LLMProvider, get_llm
 
 __all__ = [
+    "AsyncOllamaClient",
+    "get_async_ollama_client",
     "OllamaClient",
     "get_ollama_client",
     "LLMFactory",
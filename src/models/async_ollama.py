@@ -0,0 +1,314 @@
+"""Asyncio-native Ollama HTTP client with a shared keep-alive pool.
+
+``OllamaClient`` used to open a new ``httpx.Client`` for every request, so
+each call paid a TCP handshake and nothing bounded how many requests hit
+the server at once. ``AsyncOllamaClient`` owns one ``httpx.AsyncClient``
+(keep-alive connections, sized to the concurrency limit) running on a
+private event loop thread, and an ``asyncio.Semaphore`` caps in-flight
+requests across every caller in the process.
+
+Coroutines can be awaited from any event loop (they are forwarded to the
+client's own loop), and the ``*_sync`` wrappers let the existing threaded
+code (LLM extraction, parallel OCR, RAG answers) share the same pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import httpx
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STREAM_DONE = object()
+
+
+class AsyncOllamaClient:
+    """Pooled async client for the Ollama HTTP API."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        keepalive_expiry: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize client. The event loop and connection pool start lazily.
+
+        Args:
+            base_url: Ollama server URL (default: OllamaConfig.base_url)
+            max_concurrency: Max in-flight requests (default: OllamaConfig.max_concurrency)
+            timeout: Default request timeout in seconds (default: OllamaConfig.timeout)
+            keepalive_expiry: Seconds an idle connection is kept open
+            transport: Optional httpx transport (used by tests and benchmarks)
+        """
+        config = get_settings().ollama
+        self.base_url = (base_url or config.base_url).rstrip("/")
+        self.max_concurrency = max(1, max_concurrency or config.max_concurrency)
+        self.timeout = float(timeout or config.timeout)
+        self.keepalive_expiry = (
+            keepalive_expiry if keepalive_expiry is not None else config.keepalive_expiry
+        )
+        self._transport = transport
+
+        self._start_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._queue_wait = 0.0
+        self._latency = 0.0
+
+    # === Public API ===
+
+    async def post(
+        self, path: str, payload: dict[str, Any], timeout: float | None = None
+    ) -> dict[str, Any]:
+        """POST a JSON payload to an Ollama endpoint and return the JSON response.
+
+        Args:
+            path: API path (e.g. "/api/chat")
+            payload: Request body
+            timeout: Request timeout in seconds (default: client timeout)
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            httpx.HTTPError: On connection, timeout or HTTP status errors
+        """
+        loop = self._ensure_started()
+        coro = self._post(path, payload, timeout)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def chat(self, payload: dict[str, Any], timeout: float | None = None) -> str:
+        """Send a non-streaming ``/api/chat`` request and return the message content."""
+        data = await self.post("/api/chat", payload, timeout)
+        return data.get("message", {}).get("content", "")
+
+    async def chat_many(
+        self, payloads: list[dict[str, Any]], timeout: float | None = None
+    ) -> list[str | BaseException]:
+        """Run several chat requests concurrently (bounded by the semaphore).
+
+        Returns:
+            Message contents in input order; failed requests hold their exception
+        """
+        return await asyncio.gather(
+            *(self.chat(payload, timeout) for payload in payloads),
+            return_exceptions=True,
+        )
+
+    def post_sync(
+        self, path: str, payload: dict[str, Any], timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Blocking wrapper around :meth:`post` for threaded callers."""
+        return self._run(self._post(path, payload, timeout))
+
+    def chat_sync(self, payload: dict[str, Any], timeout: float | None = None) -> str:
+        """Blocking wrapper around :meth:`chat` for threaded callers."""
+        return self._run(self.chat(payload, timeout))
+
+    def chat_many_sync(
+        self, payloads: list[dict[str, Any]], timeout: float | None = None
+    ) -> list[str | BaseException]:
+        """Blocking wrapper around :meth:`chat_many`."""
+        return self._run(self.chat_many(payloads, timeout))
+
+    def stream_chat_sync(
+        self, payload: dict[str, Any], timeout: float | None = None
+    ) -> Iterator[str]:
+        """Stream ``/api/chat`` content chunks to a threaded caller as they arrive.
+
+        The request holds one concurrency slot until the stream ends. Closing
+        the generator early cancels the request.
+
+        Raises:
+            httpx.HTTPError: On connection, timeout or HTTP status errors
+        """
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Sync Ollama calls cannot run on the client's event loop")
+
+        chunks: queue.Queue = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream_chat(payload, timeout, chunks.put), loop
+        )
+        future.add_done_callback(lambda _: chunks.put(_STREAM_DONE))
+        try:
+            while (chunk := chunks.get()) is not _STREAM_DONE:
+                yield chunk
+            future.result()
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return request counters, peak concurrency and average wait/latency."""
+        with self._stats_lock:
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "max_concurrency": self.max_concurrency,
+                "avg_queue_wait_s": self._queue_wait / self._requests if self._requests else 0.0,
+                "avg_latency_s": self._latency / self._requests if self._requests else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close the connection pool and stop the event loop thread."""
+        with self._start_lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+            self._semaphore = None
+        if loop is None:
+            return
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            except Exception as exc:
+                logger.debug("Error closing Ollama connection pool: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+    # === Private Methods ===
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is not None:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="ollama-async-client", daemon=True
+            )
+            thread.start()
+
+            async def _create() -> None:
+                self._client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    transport=self._transport,
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                )
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            asyncio.run_coroutine_threadsafe(_create(), loop).result()
+            self._loop, self._thread = loop, thread
+            logger.debug(
+                "Started pooled Ollama client for %s (max_concurrency=%d)",
+                self.base_url,
+                self.max_concurrency,
+            )
+            return loop
+
+    def _run(self, coro) -> Any:
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Sync Ollama calls cannot run on the client's event loop")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot and record queue wait, latency and errors."""
+        assert self._semaphore is not None
+        queued = time.perf_counter()
+        async with self._semaphore:
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._in_flight += 1
+                self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            failed = True
+            try:
+                yield
+                failed = False
+            finally:
+                finished = time.perf_counter()
+                with self._stats_lock:
+                    self._in_flight -= 1
+                    self._requests += 1
+                    self._errors += int(failed)
+                    self._queue_wait += started - queued
+                    self._latency += finished - started
+
+    async def _post(
+        self, path: str, payload: dict[str, Any], timeout: float | None
+    ) -> dict[str, Any]:
+        assert self._client is not None
+        async with self._slot():
+            response = await self._client.post(
+                path,
+                json=payload,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def _stream_chat(
+        self,
+        payload: dict[str, Any],
+        timeout: float | None,
+        emit: Callable[[str], None],
+    ) -> None:
+        assert self._client is not None
+        async with self._slot():
+            async with self._client.stream(
+                "POST",
+                "/api/chat",
+                json={**payload, "stream": True},
+                timeout=timeout if timeout is not None else self.timeout,
+            ) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(f"Ollama stream error: {data['error']}")
+                    content = data.get("message", {}).get("content", "")
+                    if content:
+                        emit(content)
+                    if data.get("done"):
+                        break
+
+
+@lru_cache(maxsize=8)
+def _client_for(base_url: str) -> AsyncOllamaClient:
+    return AsyncOllamaClient(base_url=base_url)
+
+
+def get_async_ollama_client(base_url: str | None = None) -> AsyncOllamaClient:
+    """Get the shared pooled client for an Ollama server."""
+    return _client_for((base_url or get_settings().ollama.base_url).rstrip("/"))
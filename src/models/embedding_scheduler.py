@@ -0,0 +1,216 @@
+"""Batched, concurrent embedding requests against Ollama.
+
+``OllamaEmbeddings.embed_documents`` sends one request for the whole list
+and waits for it, so ingestion spends most of its time with a single
+request in flight. ``EmbeddingScheduler`` splits texts into batches bounded
+by count and total characters, keeps several ``/api/embed`` requests in
+flight over the shared pooled client (``AsyncOllamaClient``). A batch the
+server rejects is retried with backoff and then halved, so one bad text only
+costs its own vector instead of the whole batch. Transport errors (server
+down, timeouts) are not the input's fault: they open a circuit breaker
+instead, and texts fail fast until the cooldown has passed.
+
+``ScheduledEmbeddings`` exposes the scheduler through LangChain's
+``Embeddings`` interface. Texts that still fail after all retries come back
+as empty vectors, as ``OllamaClient.embed_documents`` has always signalled
+failure; callers drop them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+from langchain_core.embeddings import Embeddings
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+from .async_ollama import AsyncOllamaClient, get_async_ollama_client
+
+logger = get_logger(__name__)
+
+
+class EmbeddingScheduler:
+    """Split texts into right-sized batches and embed them concurrently."""
+
+    def __init__(
+        self,
+        model: str,
+        client: AsyncOllamaClient | None = None,
+        batch_size: int | None = None,
+        batch_chars: int | None = None,
+        concurrency: int | None = None,
+        max_retries: int | None = None,
+        retry_delay: float = 0.5,
+        breaker_cooldown: float = 30.0,
+    ) -> None:
+        """Initialize scheduler.
+
+        Args:
+            model: Ollama embedding model
+            client: Pooled client (default: shared client for OllamaConfig.base_url)
+            batch_size: Max texts per request (default: OllamaConfig.embedding_batch_size)
+            batch_chars: Max characters per request (default: OllamaConfig.embedding_batch_chars)
+            concurrency: Requests in flight (default: OllamaConfig.embedding_concurrency)
+            max_retries: Retries of a failed batch before it is halved
+                (default: OllamaConfig.embedding_max_retries)
+            retry_delay: Initial backoff in seconds (doubles per retry)
+            breaker_cooldown: Seconds without requests after a transport error
+        """
+        config = get_settings().ollama
+        self.model = model
+        self.client = client or get_async_ollama_client()
+        self.batch_size = max(1, batch_size or config.embedding_batch_size)
+        self.batch_chars = max(1, batch_chars or config.embedding_batch_chars)
+        self.concurrency = max(1, concurrency or config.embedding_concurrency)
+        self.max_retries = max(0, config.embedding_max_retries if max_retries is None else max_retries)
+        self.retry_delay = retry_delay
+        self.breaker_cooldown = breaker_cooldown
+
+        self._stats_lock = threading.Lock()
+        self._texts = 0
+        self._requests = 0
+        self._retries = 0
+        self._failed = 0
+        self._seconds = 0.0
+        self._trips = 0
+        self._open_until = 0.0
+
+    def split(self, texts: list[str]) -> list[tuple[int, int]]:
+        """Return ``(start, stop)`` ranges within the count and character budgets."""
+        batches: list[tuple[int, int]] = []
+        start = chars = 0
+        for i, text in enumerate(texts):
+            if i > start and (i - start >= self.batch_size or chars + len(text) > self.batch_chars):
+                batches.append((start, i))
+                start, chars = i, 0
+            chars += len(text)
+        if start < len(texts):
+            batches.append((start, len(texts)))
+        return batches
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, in input order; texts that could not be embedded get ``[]``."""
+        if not texts:
+            return []
+        started = time.perf_counter()
+        vectors: list[list[float]] = [[] for _ in texts]
+        batches = self.split(texts)
+
+        def run(batch: tuple[int, int]) -> None:
+            start, stop = batch
+            for offset, vector in enumerate(self._embed_batch(texts[start:stop])):
+                vectors[start + offset] = vector
+
+        if len(batches) == 1:
+            run(batches[0])
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(batches)), thread_name_prefix="embed"
+            ) as pool:
+                list(pool.map(run, batches))
+
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for v in vectors if not v)
+        with self._stats_lock:
+            self._texts += len(texts)
+            self._failed += failed
+            self._seconds += elapsed
+        logger.debug(
+            "Embedded %d texts in %d batches (%.2fs, %d failed)", len(texts), len(batches), elapsed, failed
+        )
+        return vectors
+
+    def get_stats(self) -> dict[str, Any]:
+        """Texts embedded, requests sent, retries, failures and throughput."""
+        with self._stats_lock:
+            return {
+                "model": self.model,
+                "texts": self._texts,
+                "requests": self._requests,
+                "retries": self._retries,
+                "failed_texts": self._failed,
+                "circuit_trips": self._trips,
+                "circuit_open": time.monotonic() < self._open_until,
+                "seconds": round(self._seconds, 3),
+                "texts_per_second": self._texts / self._seconds if self._seconds else 0.0,
+            }
+
+    # === Private Methods ===
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """One batch with retries; halves it when the server keeps rejecting it."""
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            if self._circuit_open():
+                return [[] for _ in texts]
+            try:
+                return self._request(texts)
+            except httpx.TransportError as exc:
+                self._trip(exc)
+                return [[] for _ in texts]
+            except Exception as exc:
+                # 4xx means this input is rejected as sent; retrying it is pointless
+                rejected = (
+                    isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code < 500
+                )
+                if attempt < self.max_retries and not rejected:
+                    with self._stats_lock:
+                        self._retries += 1
+                    logger.warning(
+                        "Embedding batch of %d failed (attempt %d/%d), retrying: %s",
+                        len(texts),
+                        attempt + 1,
+                        self.max_retries + 1,
+                        exc,
+                    )
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                if len(texts) == 1:
+                    logger.error("Embedding failed for one text (%d chars): %s", len(texts[0]), exc)
+                    return [[]]
+                break
+        half = len(texts) // 2
+        return self._embed_batch(texts[:half]) + self._embed_batch(texts[half:])
+
+    def _circuit_open(self) -> bool:
+        with self._stats_lock:
+            return time.monotonic() < self._open_until
+
+    def _trip(self, exc: Exception) -> None:
+        """Stop sending requests for ``breaker_cooldown`` seconds."""
+        with self._stats_lock:
+            if time.monotonic() < self._open_until:
+                return
+            self._open_until = time.monotonic() + self.breaker_cooldown
+            self._trips += 1
+        logger.error(
+            "Embedding server unreachable, skipping embeddings for %.0fs: %s", self.breaker_cooldown, exc
+        )
+
+    def _request(self, texts: list[str]) -> list[list[float]]:
+        with self._stats_lock:
+            self._requests += 1
+        data = self.client.post_sync("/api/embed", {"model": self.model, "input": texts})
+        embeddings = data.get("embeddings") or []
+        if len(embeddings) != len(texts):
+            raise ValueError(f"expected {len(texts)} embeddings, got {len(embeddings)}")
+        return embeddings
+
+
+class ScheduledEmbeddings(Embeddings):
+    """LangChain embeddings whose document embedding goes through an ``EmbeddingScheduler``."""
+
+    def __init__(self, embeddings: Embeddings, scheduler: EmbeddingScheduler) -> None:
+        self.embeddings = embeddings
+        self.scheduler = scheduler
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.scheduler.embed(list(texts))
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
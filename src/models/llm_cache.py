@@ -0,0 +1,226 @@
+"""Persistent LLM response cache shared across processes.
+
+Sits behind ``OllamaClient``'s in-memory LRU so a re-run over the same
+corpus (or another batch-engine worker process) reuses earlier answers
+instead of paying for the LLM call again. Entries are keyed by a hash of
+the request (field, system prompt, user prompt) plus model and
+temperature, and live in a SQLite file in WAL mode: readers never block,
+writers from several processes serialize on SQLite's own file lock with a
+busy timeout. DuckDB was not used here because it allows only one writing
+process per database file.
+
+Entries older than the TTL are dropped on read and during eviction; when
+the stored payload exceeds the size budget, the least recently read
+entries are deleted first.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at);
+"""
+
+
+class PersistentLLMCache:
+    """SQLite-backed key/value cache for LLM responses with TTL and size limits."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 0,
+        max_bytes: int = 0,
+        evict_every: int = 100,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            path: SQLite database file
+            ttl_seconds: Entry lifetime (0 keeps entries forever)
+            max_bytes: Budget for stored payloads (0 disables size eviction)
+            evict_every: Run eviction after this many writes from this process
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # sqlite3 connections are per-thread; each process opens its own
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for a key, or None on miss/expiry."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache read failed: %s", exc)
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, value: Any, model: str, temperature: float) -> None:
+        """Store a JSON-serializable value.
+
+        Args:
+            key: Request hash
+            value: Value to store
+            model: Model that produced it
+            temperature: Sampling temperature used
+        """
+        now = time.time()
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, model, temperature, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, temperature, json.dumps(value, ensure_ascii=False), now, now),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache write failed: %s", exc)
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to the size budget.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        try:
+            conn = self._connect()
+            if self.ttl_seconds:
+                removed += conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                ).rowcount
+            if self.max_bytes:
+                removed += conn.execute(
+                    """
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(LENGTH(value)) OVER (
+                                ORDER BY accessed_at DESC, key
+                            ) AS running_bytes
+                            FROM llm_cache
+                        ) WHERE running_bytes > ?
+                    )
+                    """,
+                    (self.max_bytes,),
+                ).rowcount
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache eviction failed: %s", exc)
+            return 0
+
+        if removed:
+            with self._lock:
+                self._evictions += removed
+            logger.debug("LLM cache evicted %d entries", removed)
+        return removed
+
+    def clear(self) -> int:
+        """Delete all entries.
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            return self._connect().execute("DELETE FROM llm_cache").rowcount
+        except sqlite3.Error as exc:
+            logger.warning("Failed to clear LLM cache: %s", exc)
+            return 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for this process and current table size."""
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM llm_cache"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = 0, 0
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> PersistentLLMCache | None:
+    """Get the shared persistent LLM cache, or None when disabled."""
+    settings = get_settings()
+    if not settings.processing.llm_cache_persistent:
+        return None
+    try:
+        return PersistentLLMCache(
+            settings.paths.llm_cache,
+            ttl_seconds=settings.processing.llm_cache_ttl_hours * 3600,
+            max_bytes=settings.processing.llm_cache_max_mb * 1024 * 1024,
+        )
+    except Exception as exc:
+        logger.warning("Persistent LLM cache unavailable: %s", exc)
+        return None
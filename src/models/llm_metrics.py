@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 import statistics
+import threading
 
 from ..utils.logger import get_logger
 
@@ -45,6 +46,11 @@ class LLMMetrics:
 
     _metrics: list[ExtractionMetrics] = field(default_factory=list, init=False)
     _start_time: datetime = field(default_factory=datetime.now, init=False)
+    # Lookups per cache tier ("memory", "persistent"): {"hits": n, "misses": n}
+    _cache_tiers: dict[str, dict[str, int]] = field(default_factory=dict, init=False)
+    _cache_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    # Streaming chat: (time to first token or None, total latency, success)
+    _streams: list[tuple[float | None, float, bool]] = field(default_factory=list, init=False)
 
     def record(
         self,
@@ -88,6 +94,67 @@ class LLMMetrics:
             cache_hit,
         )
 
+    def record_cache_lookup(self, tier: str, hit: bool) -> None:
+        """Record a lookup in one cache tier.
+
+        Args:
+            tier: Cache tier name (e.g. "memory", "persistent")
+            hit: Whether the tier returned a value
+        """
+        with self._cache_lock:
+            counts = self._cache_tiers.setdefault(tier, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def get_cache_tier_stats(self) -> dict[str, Any]:
+        """Get hit/miss counts and hit rate per cache tier."""
+        with self._cache_lock:
+            return {
+                tier: {
+                    **counts,
+                    "hit_rate": round(
+                        counts["hits"] / (counts["hits"] + counts["misses"]), 4
+                    )
+                    if counts["hits"] + counts["misses"]
+                    else 0.0,
+                }
+                for tier, counts in self._cache_tiers.items()
+            }
+
+    def record_stream(
+        self,
+        time_to_first_token: float | None,
+        latency: float,
+        success: bool,
+    ) -> None:
+        """Record a streamed completion.
+
+        Args:
+            time_to_first_token: Seconds until the first token (None if none arrived)
+            latency: Seconds until the stream finished
+            success: Whether the stream completed without error
+        """
+        with self._cache_lock:
+            self._streams.append((time_to_first_token, latency, success))
+            if len(self._streams) > self.max_history:
+                self._streams = self._streams[-self.max_history :]
+
+    def get_stream_stats(self) -> dict[str, Any]:
+        """Get time-to-first-token and total latency for streamed completions."""
+        with self._cache_lock:
+            streams = list(self._streams)
+        ttfts = [ttft for ttft, _, _ in streams if ttft is not None]
+        latencies = [latency for _, latency, _ in streams]
+        return {
+            "total_streams": len(streams),
+            "failed_streams": sum(1 for _, _, ok in streams if not ok),
+            "time_to_first_token": {
+                "avg": round(statistics.mean(ttfts), 3) if ttfts else 0.0,
+                "median": round(statistics.median(ttfts), 3) if ttfts else 0.0,
+                "max": round(max(ttfts), 3) if ttfts else 0.0,
+            },
+            "avg_latency": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        }
+
     def get_stats(self, field_name: str | None = None, model: str | None = None) -> dict[str, Any]:
         """Get aggregated statistics.
 
@@ -170,6 +237,9 @@ class LLMMetrics:
     def clear(self) -> None:
         """Clear all metrics."""
         self._metrics.clear()
+        with self._cache_lock:
+            self._cache_tiers.clear()
+            self._streams.clear()
         self._start_time = datetime.now()
         logger.info("Metrics cleared")
 
@@ -195,6 +265,17 @@ class LLMMetrics:
             f"Avg confidence: {stats['confidence']['avg']:.2f}",
             f"Cache hit rate: {stats['cache_hit_rate']*100:.1f}%",
         ]
+        stream_stats = self.get_stream_stats()
+        if stream_stats["total_streams"]:
+            summary_lines.append(
+                f"Streamed answers: {stream_stats['total_streams']} "
+                f"(avg time to first token {stream_stats['time_to_first_token']['avg']:.2f}s)"
+            )
+        for tier, tier_stats in self.get_cache_tier_stats().items():
+            summary_lines.append(
+                f"Cache ({tier}): {tier_stats['hits']} hits / {tier_stats['misses']} misses "
+                f"({tier_stats['hit_rate']*100:.1f}%)"
+            )
 
         return "\n".join(summary_lines)
 
@@ -10,7 +10,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 import os
 import time
 import collections
@@ -20,6 +20,9 @@ from langchain_ollama import OllamaEmbeddings
 
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
+from .async_ollama import AsyncOllamaClient, get_async_ollama_client
+from .embedding_scheduler import EmbeddingScheduler
+from .llm_cache import PersistentLLMCache, get_llm_cache
 from .llm_metrics import LLMMetrics
 from .few_shot_examples import get_few_shot_examples
 
@@ -113,9 +116,13 @@ class OllamaClient:
 
     _embeddings: OllamaEmbeddings | None = field(default=None, init=False)
     _embeddings_initialized: bool = field(default=False, init=False)
+    _embedding_scheduler: EmbeddingScheduler | None = field(default=None, init=False)
     _extraction_cache: SimpleLRUCache = field(
         default_factory=lambda: SimpleLRUCache(max_size=1000), init=False
     )
+    _persistent_cache: PersistentLLMCache | None = field(
+        default_factory=get_llm_cache, init=False
+    )
     _metrics: LLMMetrics = field(default_factory=LLMMetrics, init=False)
 
     def __post_init__(self) -> None:
@@ -124,22 +131,70 @@ class OllamaClient:
         # Initialize lazily when first needed
         pass
 
-    def _get_cache_key(self, text: str, field_name: str, model: str) -> str:
-        """Generate cache key from text, field name, and model.
+    @property
+    def http(self) -> AsyncOllamaClient:
+        """Shared pooled HTTP client for this client's Ollama server."""
+        return get_async_ollama_client(self.base_url)
+
+    def get_http_stats(self) -> dict[str, Any]:
+        """Get connection-pool statistics (requests, peak concurrency, waits)."""
+        return self.http.get_stats()
+
+    def _get_cache_key(self, prompt: str, field_name: str, model: str, system: str = "") -> str:
+        """Generate cache key from the full request, model and temperature.
 
         Uses SHA256 hash to keep keys short and avoid issues with special chars.
         """
-        content = f"{text[:2000]}:{field_name}:{model}"
+        content = json.dumps([field_name, system, prompt, model, self.temperature])
         return hashlib.sha256(content.encode()).hexdigest()
 
+    def _cache_get(self, cache_key: str) -> Any | None:
+        """Look up a result in the in-memory LRU, then the persistent tier."""
+        cached = self._extraction_cache.get(cache_key)
+        self._metrics.record_cache_lookup("memory", cached is not None)
+        if cached is not None or self._persistent_cache is None:
+            return cached
+
+        stored = self._persistent_cache.get(cache_key)
+        self._metrics.record_cache_lookup("persistent", stored is not None)
+        if stored is None:
+            return None
+        if "results" in stored:
+            cached = {
+                name: ExtractionResult(**data) for name, data in stored["results"].items()
+            }
+        else:
+            cached = ExtractionResult(**stored["result"])
+        self._extraction_cache.put(cache_key, cached)
+        return cached
+
+    def _cache_put(self, cache_key: str, value: Any) -> None:
+        """Store an ExtractionResult (or field -> result dict) in both tiers."""
+        self._extraction_cache.put(cache_key, value)
+        if self._persistent_cache is None:
+            return
+        if isinstance(value, dict):
+            stored = {"results": {name: result.to_dict() for name, result in value.items()}}
+        else:
+            stored = {"result": value.to_dict()}
+        self._persistent_cache.put(
+            cache_key, stored, model=self.extraction_model, temperature=self.temperature
+        )
+
     def clear_extraction_cache(self) -> None:
-        """Clear the extraction result cache."""
+        """Clear the extraction result cache (memory and persistent tiers)."""
         self._extraction_cache.clear()
+        if self._persistent_cache is not None:
+            self._persistent_cache.clear()
         logger.info("Extraction cache cleared")
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        return self._extraction_cache.stats()
+        stats: dict[str, Any] = dict(self._extraction_cache.stats())
+        if self._persistent_cache is not None:
+            stats["persistent"] = self._persistent_cache.get_stats()
+        stats["tiers"] = self._metrics.get_cache_tier_stats()
+        return stats
 
     def get_metrics_stats(self, field_name: str | None = None) -> dict[str, Any]:
         """Get performance metrics statistics.
@@ -470,10 +525,18 @@ class OllamaClient:
         start_time = time.time()
         cache_hit = False
 
+        default_system = (
+            "You are an expert at extracting specific information from Safety Data Sheets (SDS). "
+            "Always respond in JSON format with keys: 'value', 'confidence' (0.0-1.0), 'context'. "
+            "If the information is not found, use value='NOT_FOUND' and confidence=0.0."
+        )
+        system = system_prompt or default_system
+        prompt = prompt_template.format(text=text[:4000])  # Limit context size
+        cache_key = self._get_cache_key(prompt, field_name, self.extraction_model, system)
+
         # Check cache first
         if use_cache:
-            cache_key = self._get_cache_key(text, field_name, self.extraction_model)
-            cached_result = self._extraction_cache.get(cache_key)
+            cached_result = self._cache_get(cache_key)
             if cached_result is not None:
                 logger.debug(
                     "Cache hit for field %s (key: %s)", field_name, cache_key[:8]
@@ -491,18 +554,10 @@ class OllamaClient:
                 )
                 return cached_result
 
-        default_system = (
-            "You are an expert at extracting specific information from Safety Data Sheets (SDS). "
-            "Always respond in JSON format with keys: 'value', 'confidence' (0.0-1.0), 'context'. "
-            "If the information is not found, use value='NOT_FOUND' and confidence=0.0."
-        )
-
-        prompt = prompt_template.format(text=text[:4000])  # Limit context size
-
         try:
             response = self._chat_completion(
                 model=self.extraction_model,
-                system=system_prompt or default_system,
+                system=system,
                 user=prompt,
             )
 
@@ -517,8 +572,7 @@ class OllamaClient:
 
             # Store in cache
             if use_cache:
-                cache_key = self._get_cache_key(text, field_name, self.extraction_model)
-                self._extraction_cache.put(cache_key, result)
+                self._cache_put(cache_key, result)
 
             # Record success metric
             latency = time.time() - start_time
@@ -610,6 +664,124 @@ Document text:
                 for field in fields
             }
 
+    def extract_fields_structured(
+        self,
+        text: str,
+        fields: dict[str, str],
+        use_cache: bool = True,
+    ) -> dict[str, ExtractionResult]:
+        """Extract several fields in one JSON-schema-constrained request.
+
+        Args:
+            text: Context to analyze (already trimmed by the caller)
+            fields: Field name -> short description of what to extract
+            use_cache: Whether to use the extraction cache
+
+        Returns:
+            Dictionary mapping every requested field to an ExtractionResult
+        """
+        start_time = time.time()
+        names = sorted(fields)
+        field_lines = "\n".join(f"- {name}: {fields[name]}" for name in names)
+        prompt = (
+            "Extract the following fields from this Safety Data Sheet text:\n"
+            f"{field_lines}\n\n"
+            "For each field return an object with 'value', 'confidence' (0.0-1.0) and "
+            "'context' (the short source phrase). Use value='NOT_FOUND' and "
+            "confidence=0.0 when a field is not present.\n\n"
+            f"Text:\n{text}"
+        )
+        cache_key = self._get_cache_key(prompt, "structured:" + ",".join(names), self.extraction_model)
+
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                latency = (time.time() - start_time) / max(1, len(names))
+                for name in names:
+                    self._metrics.record(
+                        field_name=name,
+                        model=self.extraction_model,
+                        latency=latency,
+                        success=True,
+                        confidence=cached[name].confidence,
+                        cache_hit=True,
+                    )
+                return dict(cached)
+
+        field_schema = {
+            "type": "object",
+            "properties": {
+                "value": {"type": "string"},
+                "confidence": {"type": "number"},
+                "context": {"type": "string"},
+            },
+            "required": ["value", "confidence"],
+        }
+        schema = {
+            "type": "object",
+            "properties": {name: field_schema for name in names},
+            "required": names,
+        }
+
+        try:
+            response = self._chat_completion(
+                model=self.extraction_model,
+                system="You are an expert SDS analyzer. Respond only with JSON matching the schema.",
+                user=prompt,
+                response_format=schema,
+            )
+            parsed = self._parse_json_response(response)
+            # A truncated or garbled response parses to nothing: treat it as an
+            # error rather than caching every field as NOT_FOUND
+            if not isinstance(parsed, dict) or not any(isinstance(parsed.get(name), dict) for name in names):
+                raise ValueError("response has no JSON object for any requested field")
+        except Exception as e:
+            logger.error("Structured extraction failed for %d fields: %s", len(names), e)
+            latency = (time.time() - start_time) / max(1, len(names))
+            for name in names:
+                self._metrics.record(
+                    field_name=name,
+                    model=self.extraction_model,
+                    latency=latency,
+                    success=False,
+                )
+            return {
+                name: ExtractionResult(value="ERROR", confidence=0.0, context=str(e))
+                for name in names
+            }
+
+        results: dict[str, ExtractionResult] = {}
+        for name in names:
+            field_data = parsed.get(name)
+            if isinstance(field_data, dict):
+                try:
+                    confidence = float(field_data.get("confidence", 0.0))
+                except (TypeError, ValueError):
+                    confidence = 0.0
+                results[name] = ExtractionResult(
+                    value=str(field_data.get("value", "NOT_FOUND")),
+                    confidence=confidence,
+                    context=str(field_data.get("context", "")),
+                    source="llm",
+                )
+            else:
+                results[name] = ExtractionResult(value="NOT_FOUND", confidence=0.0, source="llm")
+
+        if use_cache:
+            self._cache_put(cache_key, results)
+
+        # One request serves every field: record its latency amortized per field
+        latency = (time.time() - start_time) / max(1, len(names))
+        for name, result in results.items():
+            self._metrics.record(
+                field_name=name,
+                model=self.extraction_model,
+                latency=latency,
+                success=True,
+                confidence=result.confidence,
+            )
+        return dict(results)
+
     # === Chat / RAG ===
 
     def chat(
@@ -647,6 +819,57 @@ Document text:
             logger.error("Chat failed: %s", e)
             return f"Error: {e}"
 
+    def chat_stream(
+        self,
+        message: str,
+        context: str | None = None,
+        system_prompt: str | None = None,
+    ) -> Iterator[str]:
+        """Stream a chat answer token by token as the model produces it.
+
+        Unlike :meth:`chat`, errors are raised to the caller (a partially
+        streamed answer cannot be retried transparently).
+
+        Args:
+            message: User message
+            context: Optional context (e.g., retrieved documents)
+            system_prompt: Optional system prompt
+
+        Yields:
+            Content chunks of the answer
+        """
+        default_system = (
+            "You are a helpful assistant specialized in chemical safety and SDS analysis. "
+            "Provide accurate, concise answers based on the context provided."
+        )
+
+        user_message = message
+        if context:
+            user_message = f"Context:\n{context}\n\nQuestion: {message}"
+
+        self._throttle_ollama()
+        payload = self._chat_payload(self.chat_model, system_prompt or default_system, user_message)
+
+        start_time = time.time()
+        first_token: float | None = None
+        success = False
+        try:
+            for chunk in self.http.stream_chat_sync(payload, timeout=self.timeout):
+                if first_token is None:
+                    first_token = time.time() - start_time
+                yield chunk
+            success = True
+        finally:
+            self._metrics.record_stream(
+                time_to_first_token=first_token,
+                latency=time.time() - start_time,
+                success=success,
+            )
+
+    def get_stream_stats(self) -> dict[str, Any]:
+        """Get time-to-first-token statistics for streamed chat answers."""
+        return self._metrics.get_stream_stats()
+
     # === Embeddings ===
 
     def embed_text(self, text: str) -> list[float]:
@@ -670,21 +893,33 @@ Document text:
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple documents.
 
+        Texts are sent in concurrent batches (see ``EmbeddingScheduler``).
+
         Args:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors (empty for texts that failed)
         """
         try:
-            self._ensure_embeddings()
-            if self._embeddings:
-                return self._embeddings.embed_documents(texts)
+            scheduler = self.get_embedding_scheduler()
+            if scheduler:
+                return scheduler.embed(texts)
             return []
         except Exception as e:
             logger.error("Batch embedding failed: %s", e)
             return []
 
+    def get_embedding_scheduler(self) -> EmbeddingScheduler | None:
+        """Get the batched, concurrent embedder for the loaded embedding model."""
+        self._ensure_embeddings()
+        if self._embeddings is None:
+            return None
+        model = self._embeddings.model
+        if self._embedding_scheduler is None or self._embedding_scheduler.model != model:
+            self._embedding_scheduler = EmbeddingScheduler(model, client=self.http)
+        return self._embedding_scheduler
+
     def get_embeddings(self) -> OllamaEmbeddings | None:
         """Get the embeddings model for LangChain integration."""
         self._ensure_embeddings()
@@ -757,7 +992,7 @@ Document text:
 
         Args:
             image_paths: List of paths to image files
-            max_workers: Maximum number of parallel workers (default: CPU count)
+            max_workers: Maximum number of parallel workers (default: OLLAMA_MAX_CONCURRENCY)
 
         Returns:
             List of extracted texts in same order as input
@@ -765,9 +1000,10 @@ Document text:
         if not image_paths:
             return []
 
-        # Determine number of workers (default to CPU count, max 8 for OCR)
+        # Requests share the pooled client, so more workers than its
+        # concurrency limit would only wait on the semaphore
         if max_workers is None:
-            max_workers = min(os.cpu_count() or 4, 8)
+            max_workers = self.http.max_concurrency
 
         results: list[str] = [None] * len(image_paths)  # type: ignore
 
@@ -812,7 +1048,7 @@ Document text:
 
         Args:
             image_bytes_list: List of image data as bytes
-            max_workers: Maximum number of parallel workers (default: CPU count)
+            max_workers: Maximum number of parallel workers (default: OLLAMA_MAX_CONCURRENCY)
 
         Returns:
             List of extracted texts in same order as input
@@ -821,7 +1057,7 @@ Document text:
             return []
 
         if max_workers is None:
-            max_workers = min(os.cpu_count() or 4, 8)
+            max_workers = self.http.max_concurrency
 
         results: list[str] = [None] * len(image_bytes_list)  # type: ignore
 
@@ -913,17 +1149,15 @@ Document text:
         if last_exception:
             raise last_exception
 
-    def _chat_completion(
+    def _chat_payload(
         self,
         model: str,
         system: str,
         user: str,
-    ) -> str:
-        """Make a chat completion request to Ollama."""
-        url = f"{self.base_url}/api/chat"
-        self._throttle_ollama()
-
-        payload = {
+        response_format: dict[str, Any] | str | None = None,
+    ) -> dict[str, Any]:
+        """Build a non-streaming ``/api/chat`` request body."""
+        payload: dict[str, Any] = {
             "model": model,
             "messages": [
                 {"role": "system", "content": system},
@@ -935,13 +1169,31 @@ Document text:
                 "num_predict": self.max_tokens,
             },
         }
+        if response_format is not None:
+            payload["format"] = response_format
+        return payload
+
+    def _chat_completion(
+        self,
+        model: str,
+        system: str,
+        user: str,
+        response_format: dict[str, Any] | str | None = None,
+    ) -> str:
+        """Make a chat completion request to Ollama.
+
+        Args:
+            model: Model name
+            system: System prompt
+            user: User prompt
+            response_format: Optional Ollama ``format`` ("json" or a JSON schema)
+                to constrain the output
+        """
+        self._throttle_ollama()
+        payload = self._chat_payload(model, system, user, response_format)
 
         def make_request():
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                resp_json = response.json()
-                return resp_json.get("message", {}).get("content", "")
+            return self.http.chat_sync(payload, timeout=self.timeout)
 
         return self._call_with_retry(make_request)
 
@@ -952,7 +1204,6 @@ Document text:
         image_base64: str,
     ) -> str:
         """Make a chat completion request with an image."""
-        url = f"{self.base_url}/api/chat"
         self._throttle_ollama()
 
         payload = {
@@ -973,11 +1224,7 @@ Document text:
         ocr_timeout = settings.processing.ocr_timeout_seconds
 
         def make_request():
-            with httpx.Client(timeout=ocr_timeout) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                resp_json = response.json()
-                return resp_json.get("message", {}).get("content", "")
+            return self.http.chat_sync(payload, timeout=ocr_timeout)
 
         return self._call_with_retry(make_request)
 
@@ -0,0 +1,363 @@
+"""Persistent embedding cache keyed by chunk content.
+
+Re-indexing a source, re-ingesting an SDS after a forced reprocess or an
+incremental retrain embeds the same chunk texts again. ``CachedEmbeddings``
+wraps the LangChain embeddings used by ``VectorStore`` and answers
+``embed_documents`` from an ``EmbeddingCache`` first, so only unseen texts
+reach the embedding model.
+
+One cache directory per embedding model holds:
+
+- ``vectors-<generation>.f16``: float16 vectors, one fixed-size row each,
+  appended and read through a memory map;
+- ``index.sqlite``: the SHA-256 of each row's normalized text mapped to its
+  row, plus the dimension, the generation and the running embedding time
+  per text (used to estimate the time saved by hits).
+
+Several processes (batch-engine workers, the UI) may share a directory.
+Appends run inside a SQLite write transaction, which serializes writers
+across processes, and new row ids are derived from the vector file's size
+on disk, so rows and index entries always agree. Rows appended by a writer
+that died before committing are simply never referenced. ``clear`` starts a
+new generation (a new vector file) instead of truncating one that other
+processes may have mapped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DTYPE = np.float16
+# Keys per "IN (...)" lookup, below SQLite's bound-parameter limit
+_QUERY_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    key BLOB PRIMARY KEY,
+    row INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES
+    ('dim', 0), ('generation', 0), ('embedded', 0), ('embed_seconds', 0);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Normalize chunk text for cache keys (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text: str) -> bytes:
+    """SHA-256 digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """Memory-mapped float16 store of embeddings for one embedding model."""
+
+    def __init__(self, cache_dir: Path, model: str) -> None:
+        """Initialize cache.
+
+        Args:
+            cache_dir: Root directory of the embedding caches
+            model: Embedding model name (each model gets its own subdirectory)
+        """
+        self.model = model
+        self.directory = Path(cache_dir) / re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.directory / "index.sqlite"
+
+        # sqlite3 connections are per-thread; each process opens its own
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._map: np.memmap | None = None
+        self._map_generation: int | None = None
+        self._hits = 0
+        self._misses = 0
+        self._embedded = 0
+        self._embed_seconds = 0.0
+
+        self._connect().executescript(_SCHEMA)
+        self._remove_stale_files()
+        logger.info("Embedding cache opened: %d vectors for %s", len(self), self.model)
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    @property
+    def dim(self) -> int | None:
+        return self._read_meta(self._connect())["dim"]
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up embeddings; None marks a miss.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            One float32 vector (as a list) or None per text
+        """
+        keys = [text_key(text) for text in texts]
+        conn = self._connect()
+        # One read transaction: rows and generation come from the same snapshot
+        conn.execute("BEGIN")
+        try:
+            meta = self._read_meta(conn)
+            found: dict[bytes, int] = {}
+            unique = list(dict.fromkeys(keys))
+            for i in range(0, len(unique), _QUERY_BATCH):
+                batch = unique[i : i + _QUERY_BATCH]
+                found.update(
+                    conn.execute(
+                        f"SELECT key, row FROM vectors WHERE key IN ({', '.join('?' * len(batch))})",
+                        batch,
+                    ).fetchall()
+                )
+        finally:
+            conn.execute("COMMIT")
+
+        rows = [found.get(key) for key in keys]
+        hits = [row for row in rows if row is not None]
+        with self._lock:
+            vectors = (
+                self._vectors(meta["generation"], meta["dim"], max(hits))[hits].astype(np.float32)
+                if hits
+                else None
+            )
+            self._hits += len(hits)
+            self._misses += len(rows) - len(hits)
+
+        results: list[list[float] | None] = []
+        hit = 0
+        for row in rows:
+            if row is None:
+                results.append(None)
+            else:
+                results.append(vectors[hit].tolist())
+                hit += 1
+        return results
+
+    def put_many(self, texts: list[str], vectors: list[list[float]], seconds: float = 0.0) -> int:
+        """Store freshly computed embeddings.
+
+        Args:
+            texts: Chunk texts
+            vectors: Their embeddings, in the same order
+            seconds: Time the embedding call took (for the time-saved estimate)
+
+        Returns:
+            Number of new rows written
+        """
+        if not texts:
+            return 0
+        array = np.asarray(vectors, dtype=_DTYPE)
+        if array.ndim != 2 or len(array) != len(texts):
+            logger.warning("Embedding cache: unexpected vector shape %s, not cached", array.shape)
+            return 0
+
+        with self._lock:
+            self._embedded += len(texts)
+            self._embed_seconds += seconds
+
+        conn = self._connect()
+        # The write lock serializes appends from every process sharing the directory
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE meta SET value = value + CASE name WHEN 'embedded' THEN ? ELSE ? END "
+                "WHERE name IN ('embedded', 'embed_seconds')",
+                (len(texts), seconds),
+            )
+            meta = self._read_meta(conn)
+            dim = meta["dim"]
+            if dim is None:
+                dim = int(array.shape[1])
+                conn.execute("UPDATE meta SET value = ? WHERE name = 'dim'", (dim,))
+            elif array.shape[1] != dim:
+                logger.warning(
+                    "Embedding cache for %s holds %d-d vectors, got %d-d; not cached",
+                    self.model,
+                    dim,
+                    array.shape[1],
+                )
+                conn.execute("COMMIT")
+                return 0
+
+            new_keys: dict[bytes, int] = {}
+            for i, text in enumerate(texts):
+                new_keys.setdefault(text_key(text), i)
+            known = list(new_keys)
+            for i in range(0, len(known), _QUERY_BATCH):
+                batch = known[i : i + _QUERY_BATCH]
+                for (key,) in conn.execute(
+                    f"SELECT key FROM vectors WHERE key IN ({', '.join('?' * len(batch))})", batch
+                ):
+                    new_keys.pop(key, None)
+
+            if new_keys:
+                row_bytes = dim * np.dtype(_DTYPE).itemsize
+                with self._vectors_path(meta["generation"]).open("ab") as f:
+                    size = f.seek(0, 2)
+                    # Pad past a torn row so the new rows start on a row boundary
+                    pad = -size % row_bytes
+                    f.write(b"\0" * pad + array[list(new_keys.values())].tobytes())
+                start = (size + pad) // row_bytes
+                conn.executemany(
+                    "INSERT INTO vectors (key, row) VALUES (?, ?)",
+                    [(key, start + offset) for offset, key in enumerate(new_keys)],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(new_keys)
+
+    def clear(self) -> None:
+        """Delete every cached vector of this model."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            generation = self._read_meta(conn)["generation"]
+            conn.execute("DELETE FROM vectors")
+            conn.execute(
+                "UPDATE meta SET value = CASE name WHEN 'generation' THEN ? ELSE 0 END",
+                (generation + 1,),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._map = None
+        self._remove_stale_files()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit ratio and embedding time saved in this process, plus cache size."""
+        conn = self._connect()
+        meta = self._read_meta(conn)
+        entries = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        # Seconds per text measured over the cache's lifetime (all runs and processes)
+        per_text = meta["embed_seconds"] / meta["embedded"] if meta["embedded"] else 0.0
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "model": self.model,
+                "entries": entries,
+                "dim": meta["dim"],
+                "size_bytes": entries * (meta["dim"] or 0) * np.dtype(_DTYPE).itemsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "embedded": self._embedded,
+                "embed_seconds": round(self._embed_seconds, 3),
+                "seconds_saved": round(self._hits * per_text, 3),
+            }
+
+    # === Private Methods ===
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._index_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _read_meta(conn: sqlite3.Connection) -> dict[str, Any]:
+        meta = dict(conn.execute("SELECT name, value FROM meta").fetchall())
+        return {
+            "dim": int(meta["dim"]) or None,
+            "generation": int(meta["generation"]),
+            "embedded": int(meta["embedded"]),
+            "embed_seconds": meta["embed_seconds"],
+        }
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.directory / f"vectors-{generation}.f16"
+
+    def _vectors(self, generation: int, dim: int, max_row: int) -> np.ndarray:
+        """Memory map covering ``max_row``, remapped as the file grows."""
+        if self._map is None or self._map_generation != generation or len(self._map) <= max_row:
+            path = self._vectors_path(generation)
+            rows = path.stat().st_size // (dim * np.dtype(_DTYPE).itemsize)
+            self._map = np.memmap(path, dtype=_DTYPE, mode="r", shape=(rows, dim))
+            self._map_generation = generation
+        return self._map
+
+    def _remove_stale_files(self) -> None:
+        """Delete vector files of earlier generations (and the old index layout)."""
+        current = self._vectors_path(self._read_meta(self._connect())["generation"])
+        stale = [p for p in self.directory.glob("vectors*.f16") if p != current]
+        stale += [self.directory / "index.bin", self.directory / "meta.json"]
+        for path in stale:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:  # still mapped by another process (Windows)
+                pass
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings that consult an ``EmbeddingCache`` before embedding."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache) -> None:
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, sending only cache misses (deduplicated) to the model."""
+        vectors = self.cache.get_many(texts)
+        pending: dict[bytes, list[int]] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                pending.setdefault(text_key(texts[i]), []).append(i)
+        if not pending:
+            return vectors  # type: ignore[return-value]
+
+        unique = [texts[positions[0]] for positions in pending.values()]
+        start = time.perf_counter()
+        fresh = self.embeddings.embed_documents(unique)
+        elapsed = time.perf_counter() - start
+        # Empty vectors mark texts the model failed to embed; never cache those
+        ok = [i for i, vector in enumerate(fresh) if len(vector)]
+        self.cache.put_many([unique[i] for i in ok], [fresh[i] for i in ok], elapsed)
+        for positions, vector in zip(pending.values(), fresh):
+            for i in positions:
+                vectors[i] = vector
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+
+@lru_cache(maxsize=4)
+def get_embedding_cache(model: str) -> EmbeddingCache | None:
+    """Get the shared embedding cache for a model, or None when disabled."""
+    settings = get_settings()
+    if not settings.processing.embedding_cache_enabled:
+        return None
+    try:
+        return EmbeddingCache(settings.paths.embedding_cache, model)
+    except Exception as exc:
+        logger.warning("Embedding cache unavailable: %s", exc)
+        return None
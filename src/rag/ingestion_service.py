@@ -22,6 +22,10 @@ from .vector_store import get_vector_store
 
 logger = get_logger(__name__)
 
+# Chunks buffered across snapshot records before one add_documents call, so
+# the embedding scheduler always has enough work to keep requests in flight
+_SNAPSHOT_FLUSH_CHUNKS = 512
+
 
 @dataclass
 class IngestionSummary:
@@ -233,7 +237,9 @@ class KnowledgeIngestionService:
                     summary.skipped.append(path.name)
                     continue
 
-                self.vector_store.add_documents(chunks)
+                if not self._index_chunks(chunks):
+                    summary.errors.append(f"{path.name}: chunks not indexed")
+                    continue
                 self.db.register_rag_document(
                     source_type="file",
                     source_path=str(path),
@@ -287,6 +293,7 @@ class KnowledgeIngestionService:
 
         invalid_count = 0
         total = len(lines)
+        pending: list[tuple[list[Document], dict[str, Any]]] = []
         for idx, line in enumerate(lines, 1):
             if not line.strip():
                 continue
@@ -307,7 +314,9 @@ class KnowledgeIngestionService:
                     "title": payload.get("title") or "BrightData Article",
                     "type": "crawler",
                 }
-                self._ingest_text_blob(text, metadata=metadata, summary=summary)
+                self._ingest_text_blob(text, metadata=metadata, summary=summary, pending=pending)
+                if sum(len(chunks) for chunks, _ in pending) >= _SNAPSHOT_FLUSH_CHUNKS:
+                    self._flush_pending(pending, summary)
             except json.JSONDecodeError:
                 invalid_count += 1
                 logger.warning(
@@ -317,6 +326,7 @@ class KnowledgeIngestionService:
                     line[:80],
                 )
                 summary.skipped.append("invalid_json")
+        self._flush_pending(pending, summary)
         if invalid_count:
             logger.warning(
                 "Snapshot %s had %d invalid JSON lines out of %d",
@@ -543,10 +553,17 @@ class KnowledgeIngestionService:
         text: str,
         metadata: dict[str, Any],
         summary: IngestionSummary,
+        pending: list[tuple[list[Document], dict[str, Any]]] | None = None,
     ) -> None:
-        """Chunk and ingest a single text blob."""
+        """Chunk and ingest a single text blob.
+
+        With ``pending``, the chunks are queued there instead and indexed by
+        ``_flush_pending`` together with other blobs.
+        """
         content_hash = self._hash_text(text)
-        if self.db.rag_document_exists(content_hash):
+        if self.db.rag_document_exists(content_hash) or (
+            pending and any(record["content_hash"] == content_hash for _, record in pending)
+        ):
             summary.skipped.append(metadata.get("title", "unknown"))
             return
 
@@ -556,19 +573,60 @@ class KnowledgeIngestionService:
             summary.skipped.append(metadata.get("title", "empty"))
             return
 
-        self.vector_store.add_documents(chunks)
-        self.db.register_rag_document(
-            source_type=metadata.get("type", "text"),
-            source_path=metadata.get("source"),
-            source_url=metadata.get("source"),
-            title=metadata.get("title"),
-            chunk_count=len(chunks),
-            content_hash=content_hash,
-            metadata=metadata,
-        )
+        record = {
+            "source_type": metadata.get("type", "text"),
+            "source_path": metadata.get("source"),
+            "source_url": metadata.get("source"),
+            "title": metadata.get("title"),
+            "chunk_count": len(chunks),
+            "content_hash": content_hash,
+            "metadata": metadata,
+        }
+        if pending is not None:
+            pending.append((chunks, record))
+            return
+        self._flush_pending([(chunks, record)], summary)
 
-        summary.processed += 1
-        summary.chunks_added += len(chunks)
+    def _flush_pending(
+        self,
+        pending: list[tuple[list[Document], dict[str, Any]]],
+        summary: IngestionSummary,
+    ) -> None:
+        """Index queued blobs with one ``index_documents`` call, then register them.
+
+        Only blobs whose chunks were all added are registered. The chunks
+        that were added for any other blob are deleted again, and the blob
+        is reported as an error and picked up again by the next ingestion.
+        """
+        if not pending:
+            return
+        ids = self.vector_store.index_documents([chunk for chunks, _ in pending for chunk in chunks])
+        offset = 0
+        for chunks, record in pending:
+            blob_ids = ids[offset : offset + len(chunks)]
+            offset += len(chunks)
+            if not self._keep_if_complete(blob_ids):
+                summary.errors.append(f"{record.get('title') or 'unknown'}: chunks not indexed")
+                continue
+            self.db.register_rag_document(**record)
+            summary.processed += 1
+            summary.chunks_added += len(chunks)
+        pending.clear()
+
+    def _index_chunks(self, chunks: list[Document]) -> bool:
+        """Index one document's chunks; all or nothing (see ``_keep_if_complete``)."""
+        return self._keep_if_complete(self.vector_store.index_documents(chunks))
+
+    def _keep_if_complete(self, ids: list[str | None]) -> bool:
+        """Whether every chunk was added; if not, delete the ones that were.
+
+        Re-ingesting an unregistered document would otherwise store its
+        added chunks a second time.
+        """
+        if all(chunk_id is not None for chunk_id in ids):
+            return True
+        self.vector_store.delete_ids([chunk_id for chunk_id in ids if chunk_id is not None])
+        return False
 
     @staticmethod
     def _hash_file(path: Path) -> str:
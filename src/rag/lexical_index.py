@@ -0,0 +1,306 @@
+"""Local BM25 inverted index over the knowledge-base chunks.
+
+SDS questions are often dominated by exact tokens (CAS numbers, UN numbers,
+H/P-codes) that dense embeddings match poorly. ``LexicalIndex`` keeps a
+BM25 index of the same chunks that ``VectorStore`` writes to Chroma,
+updated incrementally on every ``add_documents``. ``RAGRetriever`` fuses
+its ranking with the dense one through reciprocal-rank fusion, and answers
+pure identifier queries from it alone, with no embedding round trip.
+
+The index lives in a SQLite file next to the Chroma collection (WAL mode,
+one connection per thread, as ``PersistentLLMCache``): a ``chunks`` table
+and a ``postings`` table clustered by term, so a query reads only the
+postings of its own terms. Stopwords and terms found in most chunks are
+dropped from queries, and BM25 is summed, ordered and limited in SQL, so
+only the top ``k`` chunks come back to Python.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterable
+
+from langchain_core.documents import Document
+
+from .vector_store import SearchResult
+
+# Identifiers are kept whole: CAS numbers, UN/NA numbers ("UN 1170" -> "un1170"),
+# GHS hazard/precautionary codes (H225, EUH066, P301+P310 -> p301, p310)
+_CAS_RE = r"\d{2,7}-\d{2}-\d"
+_UN_RE = r"(?:un|na)\s?\d{4}"
+_CODE_RE = r"(?:euh|h|p)\d{3}"
+_IDENTIFIER_RE = re.compile(rf"\b(?:{_CAS_RE}|{_UN_RE}|{_CODE_RE})\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(rf"\b(?:{_CAS_RE}|{_UN_RE}|{_CODE_RE})\b|\w+", re.IGNORECASE)
+
+# Words that may accompany identifiers in an identifier-only query ("CAS 64-17-5")
+_IDENTIFIER_WORDS = frozenset({"cas", "un", "na", "no", "number", "numero", "número", "n", "ghs"})
+
+# Function words (English and Spanish) that never help a BM25 ranking
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be by can do does for from has have how i if in is it its of on or
+    should that the this to was what when where which who why will with
+    al como con de del el en es la las lo los o para por que se su un una y
+    """.split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    chunk_id TEXT UNIQUE NOT NULL,
+    source TEXT,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks(source);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, chunk)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings(chunk);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, with CAS/UN/H-code identifiers kept whole."""
+    return [re.sub(r"\s+", "", token).lower() for token in _TOKEN_RE.findall(text)]
+
+
+def identifier_terms(text: str) -> list[str]:
+    """CAS, UN and H/P-code identifiers found in ``text``, normalized as index terms."""
+    return [re.sub(r"\s+", "", match).lower() for match in _IDENTIFIER_RE.findall(text)]
+
+
+def is_identifier_query(query: str) -> bool:
+    """Whether a query is just identifiers (plus words like "CAS" or "UN number")."""
+    identifiers = set(identifier_terms(query))
+    if not identifiers:
+        return False
+    return all(token in identifiers or token in _IDENTIFIER_WORDS for token in tokenize(query))
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[list[SearchResult]], k: int, constant: int = 60
+) -> list[SearchResult]:
+    """Fuse ranked result lists; a result scores the sum of ``1 / (constant + rank)``.
+
+    Results are matched by source and content. The fused score replaces
+    ``SearchResult.score``; the first-seen result object is kept.
+    """
+    fused: dict[tuple[str, str], list[Any]] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, 1):
+            entry = fused.setdefault((result.source, result.content), [0.0, result])
+            entry[0] += 1.0 / (constant + rank)
+    ordered = sorted(fused.values(), key=lambda entry: entry[0], reverse=True)[:k]
+    return [
+        SearchResult(content=result.content, metadata=result.metadata, score=score)
+        for score, result in ordered
+    ]
+
+
+class LexicalIndex:
+    """Incrementally built, SQLite-persisted BM25 index of text chunks."""
+
+    def __init__(self, path: Path, k1: float = 1.2, b: float = 0.75, max_df_ratio: float = 0.5) -> None:
+        """Initialize index.
+
+        Args:
+            path: SQLite file holding the index
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            max_df_ratio: Query terms found in a larger share of chunks are dropped
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # (chunk count, total length), refreshed after writes
+        self._totals: tuple[int, int] | None = None
+
+        with self._write_lock:
+            self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, ids: list[str], documents: list[Document]) -> int:
+        """Index (or re-index) chunks under their vector-store ids.
+
+        Args:
+            ids: Chunk ids, as written to the vector store
+            documents: The chunks
+
+        Returns:
+            Number of chunks indexed
+        """
+        rows = []
+        for chunk_id, doc in zip(ids, documents):
+            counts = Counter(tokenize(doc.page_content))
+            rows.append((chunk_id, doc, counts))
+        if not rows:
+            return 0
+
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for chunk_id, doc, counts in rows:
+                    conn.execute(
+                        "DELETE FROM postings WHERE chunk = (SELECT id FROM chunks WHERE chunk_id = ?)",
+                        (chunk_id,),
+                    )
+                    conn.execute("DELETE FROM chunks WHERE chunk_id = ?", (chunk_id,))
+                    row_id = conn.execute(
+                        "INSERT INTO chunks (chunk_id, source, content, metadata, length) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            chunk_id,
+                            doc.metadata.get("source"),
+                            doc.page_content,
+                            json.dumps(doc.metadata, ensure_ascii=False, default=str),
+                            sum(counts.values()),
+                        ),
+                    ).lastrowid
+                    conn.executemany(
+                        "INSERT INTO postings (term, chunk, tf) VALUES (?, ?, ?)",
+                        [(term, row_id, tf) for term, tf in counts.items()],
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._totals = None
+        return len(rows)
+
+    def search(self, query: str, k: int = 5, terms: list[str] | None = None) -> list[SearchResult]:
+        """Rank chunks by BM25 against the query terms.
+
+        Args:
+            query: Query text
+            k: Number of results
+            terms: Terms to match instead of all query tokens
+
+        Returns:
+            SearchResult objects, best first (score = BM25)
+        """
+        terms = sorted(set(terms if terms is not None else tokenize(query)) - _STOPWORDS)
+        if not terms:
+            return []
+        conn = self._connect()
+        total, total_length = self._get_totals(conn)
+        if not total:
+            return []
+        avg_length = total_length / total
+
+        placeholders = ",".join("?" * len(terms))
+        df = dict(
+            conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term",
+                terms,
+            ).fetchall()
+        )
+        # Terms found in most chunks barely move the ranking but dominate the
+        # postings read; keep them only when nothing rarer is left
+        selective = {term: n for term, n in df.items() if n <= total * self.max_df_ratio}
+        df = selective or df
+        if not df:
+            return []
+
+        params: dict[str, Any] = {"k1": self.k1, "b": self.b, "avg_length": avg_length, "k": k}
+        values = []
+        for i, (term, n) in enumerate(df.items()):
+            params[f"t{i}"] = term
+            params[f"idf{i}"] = math.log(1 + (total - n + 0.5) / (n + 0.5))
+            values.append(f"(:t{i}, :idf{i})")
+
+        rows = conn.execute(
+            f"""
+            WITH q(term, idf) AS (VALUES {",".join(values)}),
+            ranked AS (
+                SELECT p.chunk AS chunk,
+                       SUM(q.idf * p.tf * (:k1 + 1)
+                           / (p.tf + :k1 * (1 - :b + :b * c.length / :avg_length))) AS score
+                FROM q
+                JOIN postings p ON p.term = q.term
+                JOIN chunks c ON c.id = p.chunk
+                GROUP BY p.chunk
+                ORDER BY score DESC
+                LIMIT :k
+            )
+            SELECT c.content, c.metadata, ranked.score
+            FROM ranked JOIN chunks c ON c.id = ranked.chunk
+            ORDER BY ranked.score DESC
+            """,
+            params,
+        ).fetchall()
+        return [
+            SearchResult(content=content, metadata=json.loads(metadata), score=score)
+            for content, metadata, score in rows
+        ]
+
+    def delete(self, ids: list[str]) -> int:
+        """Remove chunks by their vector-store ids."""
+        if not ids:
+            return 0
+        placeholders = ",".join("?" * len(ids))
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"DELETE FROM postings WHERE chunk IN (SELECT id FROM chunks WHERE chunk_id IN ({placeholders}))",
+                ids,
+            )
+            removed = conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", ids).rowcount
+            conn.execute("COMMIT")
+            self._totals = None
+        return removed
+
+    def delete_by_source(self, source: str) -> int:
+        """Remove every chunk of a source."""
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM postings WHERE chunk IN (SELECT id FROM chunks WHERE source = ?)", (source,)
+            )
+            removed = conn.execute("DELETE FROM chunks WHERE source = ?", (source,)).rowcount
+            conn.execute("COMMIT")
+            self._totals = None
+        return removed
+
+    def clear(self) -> None:
+        """Remove every chunk."""
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM chunks")
+            self._totals = None
+
+    def count(self) -> int:
+        """Number of indexed chunks."""
+        return self._get_totals(self._connect())[0]
+
+    def _get_totals(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        totals = self._totals
+        if totals is None:
+            count, length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks").fetchone()
+            totals = self._totals = (count, length)
+        return totals
@@ -31,6 +31,7 @@ class QueryRecord:
     feedback_rating: str | None = None  # "relevant" | "partially_relevant" | "irrelevant"
     feedback_notes: str | None = None
     user_id: str | None = None
+    time_to_first_token: float | None = None  # Streamed answers: time until first token
 
     def __post_init__(self):
         if self.query_timestamp is None:
@@ -66,10 +67,15 @@ class QueryTracker:
                     answer_generation_time DOUBLE,
                     total_time DOUBLE,
                     user_id VARCHAR,
-                    metadata TEXT
+                    metadata TEXT,
+                    time_to_first_token DOUBLE
                 );
                 """
             )
+            # Databases created before streamed answers were tracked
+            self.db.conn.execute(
+                "ALTER TABLE query_logs ADD COLUMN IF NOT EXISTS time_to_first_token DOUBLE"
+            )
 
             # Query results mapping (which documents/chunks were returned)
             self.db.conn.execute(
@@ -145,8 +151,9 @@ class QueryTracker:
                         top_result_relevance,
                         answer_generation_time,
                         total_time,
-                        user_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        user_id,
+                        time_to_first_token
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     RETURNING id
                     """,
                     [
@@ -159,6 +166,7 @@ class QueryTracker:
                         record.answer_generation_time,
                         record.total_time,
                         record.user_id,
+                        record.time_to_first_token,
                     ],
                 )
                 query_id = result.fetchall()[0][0]
@@ -251,7 +259,8 @@ class QueryTracker:
                         AVG(query_embedding_time) as avg_embedding_time,
                         AVG(search_time) as avg_search_time,
                         AVG(result_count) as avg_result_count,
-                        COUNT(CASE WHEN result_count > 0 THEN 1 END) as queries_with_results
+                        COUNT(CASE WHEN result_count > 0 THEN 1 END) as queries_with_results,
+                        AVG(time_to_first_token) as avg_time_to_first_token
                     FROM query_logs
                     WHERE query_timestamp > CURRENT_TIMESTAMP - INTERVAL '{days} days'
                     """
@@ -268,6 +277,7 @@ class QueryTracker:
                         "avg_search_time_ms": round(row[5] * 1000, 2) if row[5] else 0,
                         "avg_result_count": round(row[6], 2) if row[6] else 0,
                         "queries_with_results": int(row[7]) if row[7] else 0,
+                        "avg_time_to_first_token_ms": round(row[8] * 1000, 2) if row[8] else 0,
                         "period_days": days,
                     }
                 return {}
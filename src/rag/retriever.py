@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import hashlib
+import time
 from functools import lru_cache
+from typing import Any, Iterator
 
 from ..models import get_ollama_client
 from ..utils.logger import get_logger
+from .lexical_index import identifier_terms, is_identifier_query, reciprocal_rank_fusion
+from .query_tracker import QueryRecord
 from .vector_store import SearchResult, get_vector_store
 
 logger = get_logger(__name__)
@@ -15,15 +19,23 @@ logger = get_logger(__name__)
 class RAGRetriever:
     """Retrieve and answer questions using RAG."""
 
-    def __init__(self, vector_store=None, ollama_client=None) -> None:
+    _DEFAULT_SYSTEM = (
+        "You are a helpful assistant specialized in chemical safety and SDS analysis. "
+        "Answer questions based on the provided context. "
+        "If the context doesn't contain the answer, say so clearly."
+    )
+
+    def __init__(self, vector_store=None, ollama_client=None, query_tracker=None) -> None:
         """Initialize retriever.
 
         Args:
             vector_store: VectorStore instance (uses default if None)
             ollama_client: OllamaClient instance (uses default if None)
+            query_tracker: Optional QueryTracker that streamed answers are logged to
         """
         self.vector_store = vector_store or get_vector_store()
         self.ollama = ollama_client or get_ollama_client()
+        self.query_tracker = query_tracker
         # Cache for RAG search results (up to 256 queries)
         self._search_cache: dict[str, list[SearchResult]] = {}
         self._cache_max_size = 256
@@ -48,8 +60,11 @@ class RAGRetriever:
     ) -> list[SearchResult]:
         """Retrieve relevant documents for a query with result caching.
 
-        Caches search results to avoid redundant vector store queries (1-2s savings
-        for repeated queries over the same knowledge base).
+        Dense and BM25 rankings are fused by reciprocal rank. Queries made only
+        of identifiers (CAS, UN, H/P-codes) are answered from the BM25 index
+        alone when it has a match, skipping the query embedding. Caches search
+        results to avoid redundant vector store queries (1-2s savings for
+        repeated queries over the same knowledge base).
 
         Args:
             query: Search query
@@ -65,7 +80,19 @@ class RAGRetriever:
             return self._search_cache[cache_key]
 
         logger.info("Retrieving documents for query: %s", query[:50])
-        results = self.vector_store.search(query, k=k)
+        # Stores without a lexical index (e.g. test doubles) get dense search only
+        lexical_search = getattr(self.vector_store, "lexical_search", None)
+        results: list[SearchResult] = []
+        if lexical_search is not None and is_identifier_query(query):
+            results = lexical_search(query, k=k, terms=identifier_terms(query))
+            if results:
+                logger.debug("Identifier query answered from the lexical index: %s", query[:50])
+        if not results:
+            results = self.vector_store.search(query, k=k)
+            if lexical_search is not None:
+                lexical = lexical_search(query, k=k)
+                if lexical:
+                    results = reciprocal_rank_fusion([results, lexical], k=k)
         
         # Update cache
         self._update_cache(cache_key, results)
@@ -113,8 +140,100 @@ class RAGRetriever:
             logger.warning("No relevant documents found")
             return "No relevant information found in the knowledge base."
 
-        # Generate answer with context
-        prompt = f"""Based on the following context, answer the question.
+        answer = self.ollama.chat(
+            message=self._answer_prompt(query, context),
+            system_prompt=system_prompt or self._DEFAULT_SYSTEM,
+        )
+
+        return answer
+
+    def answer_stream(
+        self,
+        query: str,
+        k: int = 5,
+        system_prompt: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Answer a question with RAG, yielding the answer as it is generated.
+
+        Events are dicts keyed by ``type``:
+
+        - ``retrieval``: ``search_time``, ``result_count`` and ``sources``
+          (source, score, metadata), sent before generation starts
+        - ``token``: ``text`` chunk of the answer
+        - ``done``: full ``answer``, ``time_to_first_token``,
+          ``generation_time``, ``total_time`` and the tracker ``query_id``
+        - ``error``: ``message`` if generation failed
+
+        Args:
+            query: User question
+            k: Number of documents to retrieve
+            system_prompt: Optional system prompt override
+
+        Yields:
+            Stream events
+        """
+        logger.info("Streaming answer for question: %s", query[:50])
+        start_time = time.time()
+
+        search_results = self.retrieve(query, k=k)
+        search_time = time.time() - start_time
+        yield {
+            "type": "retrieval",
+            "search_time": search_time,
+            "result_count": len(search_results),
+            "sources": [
+                {"source": r.source, "score": r.score, "metadata": r.metadata}
+                for r in search_results
+            ],
+        }
+
+        context = "\n---\n".join(
+            f"{result.source}:\n{result.content}" for result in search_results
+        )
+        parts: list[str] = []
+        first_token: float | None = None
+        generation_start = time.time()
+        failed = False
+
+        if not context:
+            parts.append(
+                "I don't have access to the knowledge base to answer this question. "
+                "The RAG system may not be configured or the embedding model is unavailable."
+            )
+            yield {"type": "token", "text": parts[0]}
+        else:
+            try:
+                for chunk in self.ollama.chat_stream(
+                    message=self._answer_prompt(query, context),
+                    system_prompt=system_prompt or self._DEFAULT_SYSTEM,
+                ):
+                    if first_token is None:
+                        first_token = time.time() - generation_start
+                    parts.append(chunk)
+                    yield {"type": "token", "text": chunk}
+            except Exception as e:
+                logger.error("Streaming answer failed: %s", e)
+                failed = True
+                yield {"type": "error", "message": str(e)}
+
+        generation_time = time.time() - generation_start
+        total_time = time.time() - start_time
+        query_id = self._log_streamed_query(
+            query, search_results, search_time, generation_time, total_time, first_token
+        )
+        if not failed:
+            yield {
+                "type": "done",
+                "answer": "".join(parts),
+                "time_to_first_token": first_token,
+                "generation_time": generation_time,
+                "total_time": total_time,
+                "query_id": query_id,
+            }
+
+    @staticmethod
+    def _answer_prompt(query: str, context: str) -> str:
+        return f"""Based on the following context, answer the question.
 
 Context:
 {context}
@@ -123,18 +242,44 @@ Question: {query}
 
 Answer:"""
 
-        default_system = (
-            "You are a helpful assistant specialized in chemical safety and SDS analysis. "
-            "Answer questions based on the provided context. "
-            "If the context doesn't contain the answer, say so clearly."
-        )
+    def _log_streamed_query(
+        self,
+        query: str,
+        search_results: list[SearchResult],
+        search_time: float,
+        generation_time: float,
+        total_time: float,
+        time_to_first_token: float | None,
+    ) -> int | None:
+        """Log a finished streamed answer to the query tracker, if configured."""
+        if self.query_tracker is None:
+            return None
 
-        answer = self.ollama.chat(
-            message=prompt,
-            system_prompt=system_prompt or default_system,
-        )
+        document_ids: list[int] = []
+        chunks: list[int] = []
+        for result in search_results:
+            doc_id = result.metadata.get("document_id", result.metadata.get("doc_id"))
+            if isinstance(doc_id, int):
+                document_ids.append(doc_id)
+                chunks.append(int(result.metadata.get("chunk_index", 0) or 0))
 
-        return answer
+        record = QueryRecord(
+            query_text=query,
+            query_embedding_time=0.0,  # embedding happens inside the vector search
+            search_time=search_time,
+            result_count=len(search_results),
+            top_result_relevance=search_results[0].score if search_results else None,
+            answer_generation_time=generation_time,
+            total_time=total_time,
+            returned_document_ids=document_ids,
+            returned_chunks=chunks,
+            time_to_first_token=time_to_first_token,
+        )
+        try:
+            return self.query_tracker.log_query(record)
+        except Exception as e:
+            logger.warning("Failed to log streamed query: %s", e)
+            return None
 
     def get_knowledge_base_stats(self) -> dict[str, str | int]:
         """Get statistics about the knowledge base.
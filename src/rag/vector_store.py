@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import shutil
 import threading
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -13,7 +14,9 @@ from langchain_core.documents import Document
 
 from ..config.settings import get_settings
 from ..models import get_ollama_client
+from ..models.embedding_scheduler import ScheduledEmbeddings
 from ..utils.logger import get_logger
+from .embedding_cache import CachedEmbeddings, get_embedding_cache
 
 logger = get_logger(__name__)
 
@@ -60,6 +63,10 @@ class VectorStore:
         # Thread lock for write operations
         self._lock = threading.Lock()
 
+        # BM25 index over the same chunks (lazy, see rag.lexical_index)
+        self._lexical = None
+        self._lexical_synced = False
+
         logger.info("VectorStore initialized at: %s", self.persist_directory)
 
     @property
@@ -73,6 +80,16 @@ class VectorStore:
                         "Embeddings model unavailable. RAG features disabled. "
                         "Pull an embedding model: ollama pull nomic-embed-text"
                     )
+                else:
+                    # Embed documents in concurrent batches, and answer repeated
+                    # chunk texts from the persistent embedding cache first
+                    model = getattr(self._embeddings, "model", None) or get_settings().ollama.embedding_model
+                    scheduler = self.ollama.get_embedding_scheduler()
+                    if scheduler is not None:
+                        self._embeddings = ScheduledEmbeddings(self._embeddings, scheduler)
+                    cache = get_embedding_cache(model)
+                    if cache is not None:
+                        self._embeddings = CachedEmbeddings(self._embeddings, cache)
                 self._embeddings_initialized = True
             except Exception as e:
                 logger.warning("Failed to initialize embeddings (continuing without RAG): %s", e)
@@ -103,6 +120,18 @@ class VectorStore:
                 self._db = None
         return self._db
 
+    @property
+    def lexical(self):
+        """Get the BM25 index kept next to the collection (None when hybrid retrieval is off)."""
+        if self._lexical is None and get_settings().processing.rag_hybrid_enabled:
+            from .lexical_index import LexicalIndex
+
+            try:
+                self._lexical = LexicalIndex(self.persist_directory / "lexical_index.sqlite")
+            except Exception as e:
+                logger.warning("Lexical index unavailable (dense retrieval only): %s", e)
+        return self._lexical
+
     # === Health/Readiness ===
 
     def ensure_ready(self) -> bool:
@@ -143,15 +172,34 @@ class VectorStore:
     ) -> int:
         """Add documents to the vector store.
 
+        Documents that cannot be embedded (after the scheduler's retries) or
+        whose upsert fails are skipped; the rest are still added.
+
         Args:
             documents: List of LangChain Document objects
-            batch_size: Number of documents to add per batch
+            batch_size: Number of documents embedded and upserted together
 
         Returns:
             Number of documents added
         """
+        return sum(1 for chunk_id in self.index_documents(documents, batch_size) if chunk_id is not None)
+
+    def index_documents(
+        self,
+        documents: list[Document],
+        batch_size: int = 100,
+    ) -> list[str | None]:
+        """Add documents like ``add_documents`` and report which ones were added.
+
+        Each batch is embedded and upserted before the next one is embedded,
+        so memory stays bounded by ``batch_size`` whatever the input size.
+
+        Returns:
+            The chunk id of each document, in input order (None when not added)
+        """
+        added: list[str | None] = [None] * len(documents)
         if not documents:
-            return 0
+            return added
 
         # Check if embeddings are available
         if self.embeddings is None:
@@ -159,35 +207,84 @@ class VectorStore:
                 "Cannot index documents: embeddings model unavailable. "
                 "RAG features disabled. Skipping vectorization."
             )
-            return 0
-
-        total_added = 0
+            return added
 
-        # Process in batches to avoid memory issues
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
+        skipped = 0
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start : start + batch_size]
+            # Embed outside the lock (cache first, then concurrent batched
+            # requests); only the Chroma upsert below is serialized
+            try:
+                vectors = self.embeddings.embed_documents([doc.page_content for doc in batch])
+            except Exception as e:
+                logger.error("Failed to embed batch starting at %d: %s", start, e)
+                skipped += len(batch)
+                continue
+            embedded = [i for i, vector in enumerate(vectors) if len(vector)]
+            skipped += len(batch) - len(embedded)
+            if not embedded:
+                continue
 
             try:
                 with self._lock:
                     if not self.ensure_ready():
                         raise RuntimeError("vector store unavailable")
-                    self.db.add_documents(batch)
-
-                total_added += len(batch)
-                logger.debug(
-                    "Added batch of %d documents (%d/%d)",
-                    len(batch),
-                    total_added,
-                    len(documents),
-                )
+                    ids = self._upsert([batch[i] for i in embedded], [vectors[i] for i in embedded])
+                self._index_lexical(ids, [batch[i] for i in embedded])
             except Exception as e:
-                logger.error("Failed to add batch starting at %d: %s", i, e)
-                # Log but don't raise - allow processing to continue without RAG
-                logger.warning("Skipping RAG indexing for this batch due to error")
-                break
+                # Log but don't raise - the remaining batches are still added
+                logger.error("Failed to add batch starting at %d: %s", start, e)
+                continue
+            for i, chunk_id in zip(embedded, ids):
+                added[start + i] = chunk_id
+            logger.debug(
+                "Added batch of %d documents (%d/%d processed)", len(embedded), start + len(batch), len(documents)
+            )
+
+        if skipped:
+            logger.warning("Skipping %d of %d documents that could not be embedded", skipped, len(documents))
+        logger.info("Added %d documents to vector store", sum(1 for chunk_id in added if chunk_id is not None))
+        cache_stats = self.get_embedding_cache_stats()
+        if cache_stats:
+            logger.info(
+                "Embedding cache: %d hits / %d misses (%.0f%% hit rate), ~%.1fs of embedding saved",
+                cache_stats["hits"],
+                cache_stats["misses"],
+                cache_stats["hit_rate"] * 100,
+                cache_stats["seconds_saved"],
+            )
+        return added
 
-        logger.info("Added %d documents to vector store", total_added)
-        return total_added
+    def _upsert(self, documents: list[Document], vectors: list[list[float]]) -> list[str]:
+        """Write pre-computed embeddings to the collection (as ``Chroma.add_texts`` would).
+
+        Returns:
+            The chunk ids written
+        """
+        collection = self.db._collection  # type: ignore[attr-defined]
+        ids = [getattr(doc, "id", None) or str(uuid.uuid4()) for doc in documents]
+        # Chroma rejects empty metadata dicts, so those rows are upserted without metadata
+        with_metadata = [i for i, doc in enumerate(documents) if doc.metadata]
+        without_metadata = [i for i, doc in enumerate(documents) if not doc.metadata]
+        for rows, has_metadata in ((with_metadata, True), (without_metadata, False)):
+            if rows:
+                collection.upsert(
+                    ids=[ids[i] for i in rows],
+                    embeddings=[vectors[i] for i in rows],
+                    documents=[documents[i].page_content for i in rows],
+                    metadatas=[documents[i].metadata for i in rows] if has_metadata else None,
+                )
+        return ids
+
+    def _index_lexical(self, ids: list[str], documents: list[Document]) -> None:
+        """Add upserted chunks to the lexical index (failures only cost hybrid recall)."""
+        if self.lexical is None:
+            return
+        try:
+            self._sync_lexical()
+            self.lexical.add(ids, documents)
+        except Exception as e:
+            logger.warning("Failed to update lexical index: %s", e)
 
     def add_texts(
         self,
@@ -214,12 +311,25 @@ class VectorStore:
                 metadatas=metadatas,
                 ids=ids,
             )
+            self._index_lexical(
+                doc_ids,
+                [
+                    Document(page_content=text, metadata=metadata or {})
+                    for text, metadata in zip(texts, metadatas or [None] * len(texts))
+                ],
+            )
             logger.info("Added %d texts to vector store", len(texts))
             return doc_ids
         except Exception as e:
             logger.error("Failed to add texts: %s", e)
             raise
 
+    def get_embedding_cache_stats(self) -> dict[str, Any] | None:
+        """Hit ratio and embedding time saved by the embedding cache (None when disabled)."""
+        if isinstance(self._embeddings, CachedEmbeddings):
+            return self._embeddings.cache.get_stats()
+        return None
+
     # === Search Operations ===
 
     def search(
@@ -268,6 +378,54 @@ class VectorStore:
             logger.error("Search failed: %s", e)
             return []
 
+    def lexical_search(
+        self,
+        query: str,
+        k: int = 5,
+        terms: list[str] | None = None,
+    ) -> list[SearchResult]:
+        """Search the BM25 index (no embedding call).
+
+        Args:
+            query: Search query text
+            k: Number of results to return
+            terms: Index terms to match instead of all query tokens
+
+        Returns:
+            List of SearchResult objects scored by BM25 (empty if the index is off)
+        """
+        if self.lexical is None:
+            return []
+        try:
+            self._sync_lexical()
+            return self.lexical.search(query, k=k, terms=terms)
+        except Exception as e:
+            logger.error("Lexical search failed: %s", e)
+            return []
+
+    def get_chunk_metadata(
+        self,
+        where: dict[str, Any],
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Return metadata of chunks matching a metadata filter (no embedding call).
+
+        Args:
+            where: Chroma metadata filter (e.g. ``{"cas_number": "64-17-5"}``)
+            limit: Maximum number of chunks
+
+        Returns:
+            List of chunk metadata dicts (empty if the store is unavailable)
+        """
+        try:
+            if self.db is None:
+                return []
+            page = self.db._collection.get(where=where, limit=limit, include=["metadatas"])  # type: ignore[attr-defined]
+            return [metadata for metadata in page.get("metadatas") or [] if metadata]
+        except Exception as e:
+            logger.error("Chunk metadata lookup failed: %s", e)
+            return []
+
     def search_with_context(
         self,
         query: str,
@@ -314,6 +472,7 @@ class VectorStore:
                 "document_count": count,
                 "chunk_count": count,
                 "persist_directory": str(self.persist_directory),
+                "embedding_cache": self.get_embedding_cache_stats(),
             }
         except Exception as e:
             logger.error("Failed to get collection stats: %s", e)
@@ -333,12 +492,35 @@ class VectorStore:
 
             # Recreate
             _ = self.db  # Triggers lazy initialization
+            if self.lexical is not None:
+                self.lexical.clear()
 
             logger.info("Vector store cleared")
         except Exception as e:
             logger.error("Failed to clear vector store: %s", e)
             raise
 
+    def delete_ids(self, ids: list[str]) -> int:
+        """Delete chunks by id from the collection and the lexical index.
+
+        Args:
+            ids: Chunk ids, as returned by ``index_documents``
+
+        Returns:
+            Number of ids deleted (0 on failure)
+        """
+        if not ids:
+            return 0
+        try:
+            with self._lock:
+                self.db.delete(ids=ids)
+            if self.lexical is not None:
+                self.lexical.delete(ids)
+            return len(ids)
+        except Exception as e:
+            logger.error("Failed to delete %d documents: %s", len(ids), e)
+            return 0
+
     def delete_by_source(self, source: str) -> int:
         """Delete all documents from a specific source.
 
@@ -355,6 +537,8 @@ class VectorStore:
             if results and results.get("ids"):
                 ids_to_delete = results["ids"]
                 self.db.delete(ids=ids_to_delete)
+                if self.lexical is not None:
+                    self.lexical.delete_by_source(source)
                 logger.info(
                     "Deleted %d documents from source: %s", len(ids_to_delete), source
                 )
@@ -373,11 +557,46 @@ class VectorStore:
                 self.persist_directory.mkdir(parents=True, exist_ok=True)
 
             self._db = None
+            self._lexical = None
+            self._lexical_synced = False
             logger.info("Collection deleted")
         except Exception as e:
             logger.error("Failed to delete collection: %s", e)
             raise
 
+    # === Private Methods ===
+
+    def _sync_lexical(self, page_size: int = 1000) -> None:
+        """Build the lexical index from the collection once, if it predates the index.
+
+        An index whose size differs from the collection (e.g. a backfill that
+        failed partway) is rebuilt from scratch. Only a completed check or
+        backfill marks the index as synced, so a failed one is retried.
+        """
+        if self._lexical_synced:
+            return
+        with self._lock:
+            if self._lexical_synced or not self.ensure_ready():
+                return
+            collection = self.db._collection  # type: ignore[attr-defined]
+            total = collection.count()
+            indexed = self.lexical.count()
+            if indexed != total:
+                if indexed:
+                    logger.info("Lexical index has %d of %d chunks; rebuilding it", indexed, total)
+                    self.lexical.clear()
+                logger.info("Building lexical index from %d existing chunks", total)
+                for offset in range(0, total, page_size):
+                    page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+                    self.lexical.add(
+                        page["ids"],
+                        [
+                            Document(page_content=text or "", metadata=metadata or {})
+                            for text, metadata in zip(page["documents"], page["metadatas"])
+                        ],
+                    )
+            self._lexical_synced = True
+
 
 # Singleton instance
 _vector_store: VectorStore | None = None
@@ -6,6 +6,8 @@ using heuristics, LLM processing, and RAG knowledge base integration.
 
 from __future__ import annotations
 
+from .batch_engine import ParallelBatchEngine
+from .dedup_scan import DedupScanner, FolderScan
 from .extractor import SDSExtractor
 from .heuristics import HeuristicExtractor
 from .llm_extractor import LLMExtractor
@@ -19,5 +21,8 @@ __all__ = [
     "FieldValidator",
     "SDSProcessor",
     "ProcessingResult",
+    "ParallelBatchEngine",
+    "DedupScanner",
+    "FolderScan",
     "validate_extraction_result",
 ]
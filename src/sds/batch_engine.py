@@ -0,0 +1,456 @@
+"""Staged batch pipeline for SDS processing.
+
+Each document flows through four stages, each with its own worker pool and
+a bounded queue in front of it:
+
+    extract  -> PDF parsing, OCR, heuristics (process pool, CPU-bound)
+    llm      -> LLM extraction, validation, first store (Ollama-bound)
+    enrich   -> PubChem enrichment and RAG field completion (network-bound)
+    index    -> RAG indexing and final status update
+
+OCR of document N+1 therefore overlaps with LLM extraction of document N.
+Bounded queues apply back-pressure so memory stays flat on large folders,
+and per-stage throughput and queue depth show which stage is saturated.
+All database access happens in the parent process.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+from .processor import LocalExtraction, ProcessingResult, SDSProcessor, extract_local
+
+logger = get_logger(__name__)
+
+# Per-process components, created lazily on first use inside each worker
+_worker_components: dict[str, object] | None = None
+
+# Queue sentinel: no more work for this stage
+_STOP = object()
+
+# Poll interval used so blocked workers notice cancellation
+_POLL_SECONDS = 0.1
+
+
+def _local_extraction_worker(file_path: str, refresh_cache: bool = False) -> LocalExtraction:
+    """Process-pool entry point: run Phase 1 for a single file."""
+    global _worker_components
+    if _worker_components is None:
+        from .extractor import SDSExtractor
+        from .heuristics import HeuristicExtractor
+        from .ingredient_extractor import IngredientExtractor
+        from .profile_router import ProfileRouter
+
+        _worker_components = {
+            "extractor": SDSExtractor(),
+            "heuristics": HeuristicExtractor(),
+            "ingredient_extractor": IngredientExtractor(),
+            "router": ProfileRouter(),
+        }
+
+    return extract_local(
+        Path(file_path), refresh_cache=refresh_cache, **_worker_components  # type: ignore[arg-type]
+    )
+
+
+@dataclass
+class StageStats:
+    """Throughput and queue statistics for one pipeline stage."""
+
+    name: str
+    workers: int
+    queue_capacity: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+    def to_dict(self, elapsed: float) -> dict[str, Any]:
+        """Snapshot with derived rates for ``elapsed`` seconds of wall time."""
+        done = self.processed + self.failed
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput_per_s": done / elapsed if elapsed > 0 else 0.0,
+            "avg_seconds": self.busy_seconds / done if done else 0.0,
+            "utilization": (
+                self.busy_seconds / (self.workers * elapsed) if elapsed > 0 else 0.0
+            ),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.queue_capacity,
+        }
+
+
+@dataclass
+class _Job:
+    """A document moving through the pipeline."""
+
+    file_path: Path
+    doc_id: int
+    start_time: float
+    index: int = 0
+    payload: Any = None
+
+
+class _Stage:
+    """Worker threads draining one bounded input queue."""
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        queue_size: int,
+        handler: Callable[[_Job], Any],
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.handler = handler
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stats = StageStats(name=name, workers=workers, queue_capacity=queue_size)
+        self.alive = workers
+        self.lock = threading.Lock()
+
+    def record_depth(self) -> None:
+        depth = self.queue.qsize()
+        with self.lock:
+            self.stats.queue_depth = depth
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+
+class ParallelBatchEngine:
+    """Process many SDS files through a staged pipeline with streaming results."""
+
+    def __init__(
+        self,
+        processor: SDSProcessor | None = None,
+        max_workers: int | None = None,
+        llm_workers: int | None = None,
+        enrich_workers: int | None = None,
+        index_workers: int | None = None,
+        queue_size: int | None = None,
+        use_processes: bool = True,
+    ) -> None:
+        """Initialize engine.
+
+        Args:
+            processor: SDSProcessor used for dedup, LLM, enrichment and storage
+            max_workers: Extraction workers (default: ProcessingConfig.max_workers)
+            llm_workers: LLM stage threads (default: ProcessingConfig.batch_llm_workers)
+            enrich_workers: PubChem/RAG stage threads
+                (default: ProcessingConfig.batch_enrich_workers)
+            index_workers: Indexing stage threads
+                (default: ProcessingConfig.batch_index_workers)
+            queue_size: Capacity of each stage's input queue
+                (default: ProcessingConfig.batch_queue_size, or the stage's worker count)
+            use_processes: Run extraction in processes (True) or threads using
+                the processor's own components (False)
+        """
+        config = get_settings().processing
+        self.processor = processor or SDSProcessor()
+        self.max_workers = max(1, max_workers or config.max_workers)
+        self.llm_workers = max(1, llm_workers or config.batch_llm_workers)
+        self.enrich_workers = max(1, enrich_workers or config.batch_enrich_workers)
+        self.index_workers = max(1, index_workers or config.batch_index_workers)
+        self.queue_size = queue_size if queue_size is not None else config.batch_queue_size
+        self.use_processes = use_processes
+
+        self._stages: list[_Stage] = []
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def get_stage_stats(self) -> list[dict[str, Any]]:
+        """Return per-stage throughput and queue depth for the current/last run."""
+        if self._started_at is None:
+            return []
+        end = self._finished_at or time.time()
+        elapsed = end - self._started_at
+        snapshot = []
+        for stage in self._stages:
+            stage.record_depth()
+            with stage.lock:
+                snapshot.append(stage.stats.to_dict(elapsed))
+        return snapshot
+
+    def _create_extraction_pool(self) -> Executor | None:
+        if not self.use_processes:
+            return None
+        # spawn: the parent holds DuckDB/HTTP threads that must not be forked
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _build_stages(
+        self, pool: Executor | None, use_rag: bool, force_reprocess: bool = False
+    ) -> list[_Stage]:
+        processor = self.processor
+
+        def extract(job: _Job) -> LocalExtraction:
+            if pool is not None:
+                return pool.submit(
+                    _local_extraction_worker, str(job.file_path), force_reprocess
+                ).result()
+            return processor.run_local_extraction(job.file_path, refresh_cache=force_reprocess)
+
+        def llm(job: _Job):
+            return processor.run_llm_stage(job.doc_id, job.file_path, job.payload, job.start_time)
+
+        def enrich(job: _Job):
+            return processor.run_enrichment_stage(job.payload, use_rag=use_rag)
+
+        def index(job: _Job) -> ProcessingResult:
+            return processor.complete_document(job.payload, index_in_background=False)
+
+        return [
+            _Stage(name, workers, self.queue_size or workers, handler)
+            for name, workers, handler in (
+                ("extract", self.max_workers, extract),
+                ("llm", self.llm_workers, llm),
+                ("enrich", self.enrich_workers, enrich),
+                ("index", self.index_workers, index),
+            )
+        ]
+
+    def run(
+        self,
+        file_paths: Iterable[Path | str],
+        use_rag: bool = True,
+        force_reprocess: bool = False,
+        progress_callback: Callable[[int, int, ProcessingResult], None] | None = None,
+    ) -> Iterator[ProcessingResult]:
+        """Process files and yield results in completion order.
+
+        Args:
+            file_paths: Files to process
+            use_rag: Whether to use RAG enrichment
+            force_reprocess: Reprocess files even if already processed
+            progress_callback: Optional callback(completed, total, result)
+
+        Yields:
+            ProcessingResult for each file as soon as it finishes
+        """
+        for _, result in self.run_indexed(
+            file_paths,
+            use_rag=use_rag,
+            force_reprocess=force_reprocess,
+            progress_callback=progress_callback,
+        ):
+            yield result
+
+    def run_indexed(
+        self,
+        file_paths: Iterable[Path | str],
+        use_rag: bool = True,
+        force_reprocess: bool = False,
+        progress_callback: Callable[[int, int, ProcessingResult], None] | None = None,
+    ) -> Iterator[tuple[int, ProcessingResult]]:
+        """Like ``run``, but yield ``(input_index, result)`` pairs.
+
+        The index identifies the input file even when several files share
+        a name (same basename in different folders).
+        """
+        paths = [Path(p) for p in file_paths]
+        total = len(paths)
+        completed = 0
+        results: queue.Queue = queue.Queue()
+        cancel = threading.Event()
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not cancel.is_set():
+                try:
+                    q.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed() -> None:
+            first = stages[0]
+            try:
+                prescanned = {}
+                try:
+                    # Hash the batch in parallel and resolve dedup in one query
+                    prescanned = self.processor.prescan(paths).by_path()
+                except Exception as exc:
+                    logger.warning("Dedup pre-scan failed, checking files one by one: %s", exc)
+                for position, file_path in enumerate(paths):
+                    if cancel.is_set():
+                        break
+                    start_time = time.time()
+                    try:
+                        cached, doc_id = self.processor.prepare_document(
+                            file_path,
+                            force_reprocess=force_reprocess,
+                            prescanned=prescanned.get(file_path),
+                        )
+                    except Exception as exc:
+                        logger.error("Failed to process %s: %s", file_path, exc)
+                        results.put((position, _failed_result(file_path, exc)))
+                        continue
+                    if cached is not None:
+                        results.put((position, cached))
+                        continue
+                    if not put(first.queue, _Job(file_path, doc_id, start_time, position)):
+                        break
+                    first.record_depth()
+            finally:
+                # Always close the first stage, or its workers would wait forever
+                for _ in range(first.workers):
+                    put(first.queue, _STOP)
+
+        def fail(job: _Job, exc: Exception) -> ProcessingResult:
+            try:
+                return self.processor._fail_document(job.doc_id, job.file_path, job.start_time, exc)
+            except Exception as store_exc:
+                logger.error("Could not record failure of %s: %s", job.file_path, store_exc)
+                return _failed_result(job.file_path, exc)
+
+        def work(index: int) -> None:
+            stage = stages[index]
+            downstream = stages[index + 1] if index + 1 < len(stages) else None
+            try:
+                while not cancel.is_set():
+                    try:
+                        job = stage.queue.get(timeout=_POLL_SECONDS)
+                    except queue.Empty:
+                        continue
+                    if job is _STOP:
+                        break
+                    stage.record_depth()
+
+                    began = time.time()
+                    try:
+                        job.payload = stage.handler(job)
+                    except Exception as exc:
+                        failure = fail(job, exc)
+                        with stage.lock:
+                            stage.stats.failed += 1
+                            stage.stats.busy_seconds += time.time() - began
+                        results.put((job.index, failure))
+                        continue
+                    with stage.lock:
+                        stage.stats.processed += 1
+                        stage.stats.busy_seconds += time.time() - began
+
+                    if downstream is None:
+                        results.put((job.index, job.payload))
+                    elif put(downstream.queue, job):
+                        downstream.record_depth()
+            except Exception as exc:
+                logger.error("Stage %s worker crashed: %s", stage.name, exc)
+            finally:
+                # Last worker out closes the next stage, even after a crash
+                with stage.lock:
+                    stage.alive -= 1
+                    last = stage.alive == 0
+                if last:
+                    if downstream is None:
+                        results.put(_STOP)
+                    else:
+                        for _ in range(downstream.workers):
+                            put(downstream.queue, _STOP)
+
+        pool = self._create_extraction_pool()
+        stages = self._build_stages(pool, use_rag, force_reprocess)
+        self._stages = stages
+        self._started_at = time.time()
+        self._finished_at = None
+
+        logger.info(
+            "Staged batch: %d files (extract=%d, llm=%d, enrich=%d, index=%d, processes=%s)",
+            total,
+            self.max_workers,
+            self.llm_workers,
+            self.enrich_workers,
+            self.index_workers,
+            self.use_processes,
+        )
+
+        threads = [threading.Thread(target=feed, name="SDS_Feed", daemon=True)]
+        for index, stage in enumerate(stages):
+            threads.extend(
+                threading.Thread(
+                    target=work, args=(index,), name=f"SDS_{stage.name}_{n}", daemon=True
+                )
+                for n in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    item = results.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    # Every worker gone without a final _STOP: nothing more will arrive
+                    if not any(thread.is_alive() for thread in threads) and results.empty():
+                        logger.error("Staged batch workers exited early; %d/%d results", completed, total)
+                        break
+                    continue
+                if item is _STOP:
+                    break
+                result = item[1]
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total, result)
+                if completed % 10 == 0:
+                    self._log_stage_stats(logging_level="debug")
+                yield item
+        finally:
+            cancel.set()
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self._finished_at = time.time()
+
+        elapsed = self._finished_at - self._started_at
+        logger.info(
+            "Staged batch finished: %d files in %.2fs (%.2f files/s)",
+            completed,
+            elapsed,
+            completed / elapsed if elapsed > 0 else 0.0,
+        )
+        self._log_stage_stats()
+
+    def _log_stage_stats(self, logging_level: str = "info") -> None:
+        log = getattr(logger, logging_level)
+        for stats in self.get_stage_stats():
+            log(
+                "Stage %-7s %.2f docs/s, avg %.2fs, util %.0f%%, queue %d/%d (max %d), failed %d",
+                stats["name"],
+                stats["throughput_per_s"],
+                stats["avg_seconds"],
+                stats["utilization"] * 100,
+                stats["queue_depth"],
+                stats["queue_capacity"],
+                stats["max_queue_depth"],
+                stats["failed"],
+            )
+
+
+def _failed_result(file_path: Path, error: Exception) -> ProcessingResult:
+    return ProcessingResult(
+        document_id=-1,
+        filename=file_path.name,
+        status="failed",
+        extractions={},
+        is_dangerous=False,
+        completeness=0.0,
+        avg_confidence=0.0,
+        processing_time=0.0,
+        error_message=str(error),
+    )
@@ -0,0 +1,171 @@
+"""Per-field prompt context for LLM extraction.
+
+Instead of sending the first 3000 characters of every document, each field
+gets the SDS section its ``FieldDefinition.section`` points to. When that
+section is longer than the token budget, the window around the field's
+heuristic pattern (or label) is used; when the section was not detected,
+the pattern is searched in the full text before falling back to the
+leading characters. Token counts are estimated at ~4 characters/token.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from ..config.constants import EXTRACTION_FIELDS, FieldDefinition
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for prompt-size accounting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class FieldContext:
+    """Context selected for one field."""
+
+    text: str
+    strategy: str  # "section", "section_window", "pattern_window" or "fallback"
+    section: int | None
+    tokens: int
+
+
+class FieldContextBuilder:
+    """Assemble minimal per-field context windows within a token budget."""
+
+    def __init__(self, token_budget: int | None = None) -> None:
+        """Initialize builder.
+
+        Args:
+            token_budget: Max context tokens per field
+                (default: ProcessingConfig.llm_context_token_budget)
+        """
+        self.token_budget = token_budget or get_settings().processing.llm_context_token_budget
+        self._fields = {f.name: f for f in EXTRACTION_FIELDS}
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    @property
+    def max_chars(self) -> int:
+        return self.token_budget * CHARS_PER_TOKEN
+
+    def build(
+        self,
+        field_name: str,
+        text: str,
+        sections: dict[int, str] | None = None,
+    ) -> FieldContext:
+        """Select the context for a field.
+
+        Args:
+            field_name: Field being extracted
+            text: Full document text
+            sections: Extracted SDS sections (section number -> text)
+
+        Returns:
+            FieldContext with the text to send and how it was chosen
+        """
+        field_def = self._fields.get(field_name)
+        sections = sections or {}
+        budget = self.max_chars
+        section = field_def.section if field_def else None
+        section_text = (sections.get(section) or "").strip() if section is not None else ""
+
+        if section_text:
+            if len(section_text) <= budget:
+                context = FieldContext(section_text, "section", section, 0)
+            else:
+                window = self._window(field_def, section_text, budget)
+                context = FieldContext(
+                    window or section_text[:budget], "section_window", section, 0
+                )
+        else:
+            window = self._window(field_def, text, budget) if field_def else None
+            if window:
+                context = FieldContext(window, "pattern_window", None, 0)
+            else:
+                context = FieldContext(text[:budget], "fallback", None, 0)
+
+        context.tokens = estimate_tokens(context.text)
+        self._record(field_name, context)
+        return context
+
+    def record_prompt(self, field_name: str, prompt: str) -> None:
+        """Record the size of the full prompt sent for a field."""
+        with self._lock:
+            stats = self._stats.setdefault(field_name, _empty_stats())
+            stats["prompt_tokens"] += estimate_tokens(prompt)
+            stats["prompts"] += 1
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-field section hit rate and average context/prompt tokens."""
+        with self._lock:
+            snapshot = {}
+            for name, stats in self._stats.items():
+                requests = stats["requests"]
+                snapshot[name] = {
+                    **stats,
+                    "section_hit_rate": (
+                        (stats["section"] + stats["section_window"]) / requests
+                        if requests
+                        else 0.0
+                    ),
+                    "avg_context_tokens": stats["context_tokens"] / requests if requests else 0.0,
+                    "avg_prompt_tokens": (
+                        stats["prompt_tokens"] / stats["prompts"] if stats["prompts"] else 0.0
+                    ),
+                }
+            return snapshot
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _record(self, field_name: str, context: FieldContext) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(field_name, _empty_stats())
+            stats["requests"] += 1
+            stats[context.strategy] += 1
+            stats["context_tokens"] += context.tokens
+
+    def _window(self, field_def: FieldDefinition | None, text: str, budget: int) -> str | None:
+        """Return a budget-sized window around the first pattern/label match."""
+        if field_def is None or not text:
+            return None
+
+        match = field_def.pattern.search(text) if field_def.pattern is not None else None
+        if match is None:
+            labels = [label for label in (field_def.label_en, field_def.label_pt) if label]
+            if labels:
+                label_re = re.compile("|".join(re.escape(label) for label in labels), re.IGNORECASE)
+                match = label_re.search(text)
+        if match is None:
+            return None
+
+        # Keep a little text before the match for the label, the rest after it
+        start = max(0, match.start() - budget // 4)
+        end = min(len(text), start + budget)
+        start = max(0, end - budget)
+        return text[start:end]
+
+
+def _empty_stats() -> dict[str, int]:
+    return {
+        "requests": 0,
+        "section": 0,
+        "section_window": 0,
+        "pattern_window": 0,
+        "fallback": 0,
+        "context_tokens": 0,
+        "prompt_tokens": 0,
+        "prompts": 0,
+    }
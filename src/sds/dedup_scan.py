@@ -0,0 +1,217 @@
+"""Deduplication pre-scan of a set of SDS files.
+
+Before a batch (or a folder listing) the scanner resolves, for every file,
+its content hash and whether it was already processed:
+
+- hashes are cached in DuckDB by ``(path, size, mtime)``, so unchanged files
+  are never read twice;
+- the remaining files are hashed in a thread pool (memory-mapped reads, see
+  ``DatabaseManager.calculate_hash``);
+- the processed status of the whole set is resolved with one query.
+
+With ``hash_missing=False`` no file is read at all: cached hashes are used
+where available and the rest is matched by name and size, which keeps
+listing a large share interactive.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+from ..config.settings import get_settings
+from ..database.db_manager import DatabaseManager
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class FileStatus:
+    """Pre-scan result for one file."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+    document_id: int | None = None
+    processed_at: datetime | None = None
+    matched_by: str | None = None
+    duplicate_of: Path | None = None
+
+    @property
+    def processed(self) -> bool:
+        """Whether a completed document already covers this file."""
+        return self.document_id is not None
+
+
+@dataclass
+class FolderScan:
+    """Pre-scan result for a set of files, in input order."""
+
+    files: list[FileStatus] = field(default_factory=list)
+    hashed: int = 0
+    cache_hits: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> list[FileStatus]:
+        return [f for f in self.files if f.processed]
+
+    @property
+    def pending(self) -> list[FileStatus]:
+        """Files still to process (not processed, not a copy of an earlier file)."""
+        return [f for f in self.files if not f.processed and f.duplicate_of is None]
+
+    @property
+    def duplicates(self) -> list[FileStatus]:
+        return [f for f in self.files if f.duplicate_of is not None]
+
+    def by_path(self) -> dict[Path, FileStatus]:
+        return {f.path: f for f in self.files}
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "files": len(self.files),
+            "processed": len(self.processed),
+            "pending": len(self.pending),
+            "duplicates": len(self.duplicates),
+            "hashed": self.hashed,
+            "cache_hits": self.cache_hits,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class DedupScanner:
+    """Parallel, cached file hashing and bulk processed-status resolution."""
+
+    def __init__(self, db: DatabaseManager | None = None, workers: int | None = None) -> None:
+        """Initialize scanner.
+
+        Args:
+            db: Database holding the hash cache and documents (None: hash only)
+            workers: Hashing threads (default: ``processing.hash_workers``)
+        """
+        self.db = db
+        self.workers = max(1, workers or get_settings().processing.hash_workers)
+
+    def hash_files(self, file_paths: Iterable[Path | str]) -> dict[Path, str]:
+        """Return the SHA256 of every readable file, hashing only cache misses.
+
+        Args:
+            file_paths: Files to hash
+
+        Returns:
+            Dictionary mapping path -> SHA256 (unreadable files are left out)
+        """
+        statuses = self._stat([Path(p) for p in file_paths])
+        self._fill_hashes(statuses)
+        return {s.path: s.sha256 for s in statuses if s.sha256}
+
+    def scan(self, file_paths: Iterable[Path | str], hash_missing: bool = True) -> FolderScan:
+        """Hash files and resolve which were already processed.
+
+        Args:
+            file_paths: Files to scan
+            hash_missing: Read files missing from the hash cache (False: match
+                those by name and size only)
+
+        Returns:
+            FolderScan with one FileStatus per readable file
+        """
+        start = time.perf_counter()
+        statuses = self._stat([Path(p) for p in file_paths])
+        scan = FolderScan(files=statuses)
+        scan.hashed, scan.cache_hits = self._fill_hashes(statuses, hash_missing)
+
+        seen: dict[str, Path] = {}
+        for status in statuses:
+            if status.sha256 is None:
+                continue
+            if status.sha256 in seen:
+                status.duplicate_of = seen[status.sha256]
+            else:
+                seen[status.sha256] = status.path
+
+        if self.db is not None and statuses:
+            resolved = self.db.resolve_processed_files(
+                [(s.path.name, s.size, s.sha256) for s in statuses]
+            )
+            for status, match in zip(statuses, resolved):
+                if match:
+                    status.document_id = match["document_id"]
+                    status.processed_at = match["processed_at"]
+                    status.matched_by = match["matched_by"]
+
+        scan.elapsed = time.perf_counter() - start
+        logger.info("Dedup pre-scan: %s", scan.summary())
+        return scan
+
+    def scan_folder(
+        self, folder: Path | str, suffixes: Iterable[str], hash_missing: bool = True
+    ) -> FolderScan:
+        """``scan`` every file under ``folder`` (recursively) with one of ``suffixes``."""
+        suffixes = {s.lower() for s in suffixes}
+        files = [
+            Path(root) / name
+            for root, _dirs, names in os.walk(folder)
+            for name in names
+            if Path(name).suffix.lower() in suffixes
+        ]
+        return self.scan(sorted(files), hash_missing=hash_missing)
+
+    # === Private Methods ===
+
+    @staticmethod
+    def _stat(paths: list[Path]) -> list[FileStatus]:
+        statuses = []
+        for path in paths:
+            try:
+                _key, size, mtime_ns = DatabaseManager.file_signature(path)
+            except OSError as exc:
+                logger.warning("Skipping unreadable file %s: %s", path, exc)
+                continue
+            statuses.append(FileStatus(path=path, size=size, mtime_ns=mtime_ns))
+        return statuses
+
+    def _fill_hashes(self, statuses: list[FileStatus], hash_missing: bool = True) -> tuple[int, int]:
+        """Set ``sha256`` from the cache, then hash the misses in parallel.
+
+        Returns:
+            Tuple of (files hashed, cache hits)
+        """
+        keys = [os.path.abspath(s.path) for s in statuses]
+        cached: dict[str, str] = {}
+        if self.db is not None:
+            cached = self.db.get_cached_file_hashes(
+                (key, s.size, s.mtime_ns) for key, s in zip(keys, statuses)
+            )
+
+        missing: list[tuple[str, FileStatus]] = []
+        for key, status in zip(keys, statuses):
+            status.sha256 = cached.get(key)
+            if status.sha256 is None:
+                missing.append((key, status))
+        if not hash_missing or not missing:
+            return 0, len(statuses) - len(missing)
+
+        def digest(status: FileStatus) -> str | None:
+            try:
+                return DatabaseManager.calculate_hash(status.path)
+            except OSError as exc:
+                logger.warning("Could not hash %s: %s", status.path, exc)
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+            for (_key, status), sha256 in zip(missing, pool.map(digest, [s for _k, s in missing])):
+                status.sha256 = sha256
+
+        hashed = [(key, s.size, s.mtime_ns, s.sha256) for key, s in missing if s.sha256]
+        if self.db is not None:
+            self.db.store_file_hashes(hashed)
+        return len(hashed), len(statuses) - len(missing)
@@ -13,7 +13,7 @@ from urllib3.util.retry import Retry
 import re
 
 from ..utils.logger import get_logger
-from ..utils.cache import SimpleCache
+from ..utils.cache import create_cache
 
 logger = get_logger(__name__)
 
@@ -155,7 +155,7 @@ class PubChemClient:
     
     def __init__(self, cache_ttl: int = 3600):
         self._last_request_time = 0.0
-        self._cache = SimpleCache(ttl_seconds=cache_ttl, max_size=500)
+        self._cache = create_cache("pubchem", ttl_seconds=cache_ttl, max_size=500, max_bytes=8 * 1024 * 1024)
         self._lock = threading.Lock()
         self._offline_mode = False
         self._fixtures_by_cas = {
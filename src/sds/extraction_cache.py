@@ -0,0 +1,178 @@
+"""Persistent content-addressed cache of extracted document text.
+
+Entries are keyed by the file's SHA-256 plus the extractor version (and the
+OCR settings that change its output), so a renamed or moved file still hits
+and any change to the extraction logic invalidates old entries. Each entry
+is a gzip-compressed JSON file holding the page texts, OCR provenance and
+parsed sections. The directory is bounded by total size; the least recently
+used entries (by file mtime, refreshed on every hit) are evicted first.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SUFFIX = ".json.gz"
+
+
+def file_sha256(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with Path(file_path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded on-disk LRU cache of ``extract_document`` results."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int, version: str) -> None:
+        """Initialize cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Total size budget for the directory (0 disables eviction)
+            version: Extractor version/config fingerprint mixed into every key
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+
+    def _entry_path(self, file_hash: str) -> Path:
+        return self.cache_dir / f"{file_hash}-{self.version}{_SUFFIX}"
+
+    def get(self, file_hash: str) -> dict[str, Any] | None:
+        """Return the cached extraction for a file hash, or None.
+
+        Args:
+            file_hash: SHA-256 of the source file
+
+        Returns:
+            Extraction result dict as produced by ``extract_document``
+        """
+        path = self._entry_path(file_hash)
+        try:
+            payload = json.loads(gzip.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        except Exception as exc:
+            logger.warning("Discarding unreadable extraction cache entry %s: %s", path.name, exc)
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            os.utime(path)  # refresh recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+
+        result = payload["result"]
+        # JSON object keys are strings; sections are keyed by section number
+        result["sections"] = {int(k): v for k, v in (result.get("sections") or {}).items()}
+        return result
+
+    def put(self, file_hash: str, result: dict[str, Any]) -> None:
+        """Store an extraction result and evict old entries if over budget.
+
+        Args:
+            file_hash: SHA-256 of the source file
+            result: Extraction result dict
+        """
+        payload = {"file_sha256": file_hash, "version": self.version, "result": result}
+        try:
+            data = gzip.compress(
+                json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                compresslevel=6,
+            )
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers/processes never see partial files
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, self._entry_path(file_hash))
+        except Exception as exc:
+            logger.warning("Failed to write extraction cache entry: %s", exc)
+            return
+
+        with self._lock:
+            self._writes += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, Path(entry.path))
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(_SUFFIX)
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._evictions += evicted
+        logger.debug("Extraction cache evicted %d entries (now %d bytes)", evicted, total)
+
+    def clear(self) -> int:
+        """Delete all cache entries.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current on-disk size."""
+        entries = list(self.cache_dir.glob(f"*{_SUFFIX}")) if self.cache_dir.exists() else []
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "entries": len(entries),
+                "size_bytes": sum(p.stat().st_size for p in entries if p.exists()),
+                "max_bytes": self.max_bytes,
+            }
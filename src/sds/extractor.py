@@ -6,10 +6,13 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import logging
 import os
 import time
 import collections
+import hashlib
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -17,9 +20,47 @@ from typing import Any
 from ..config.constants import SDS_SECTIONS
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
+from .extraction_cache import ExtractionCache, file_sha256
+from .ocr_batcher import get_ocr_batcher
 
 logger = get_logger(__name__)
 
+# Bump when text/OCR/section extraction changes so cached results are invalidated
+EXTRACTOR_VERSION = "3"
+
+# pdfminer placeholder for glyphs without a unicode mapping
+_CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+# OCR attempts that errored, timed out or found no engine during the current
+# extract_pdf call (per thread); results with such gaps are not cached
+_ocr_state = threading.local()
+
+
+def _note_ocr_failure() -> None:
+    _ocr_state.failures = getattr(_ocr_state, "failures", 0) + 1
+
+
+@dataclass
+class PageQuality:
+    """Text-layer quality signals for one PDF page."""
+
+    page_number: int
+    char_count: int
+    glyph_warnings: int
+    image_coverage: float
+
+    def ocr_reason(
+        self, min_chars: int, image_coverage: float, glyph_warnings: int, image_min_chars: int
+    ) -> str | None:
+        """Return why this page should be OCR'd, or None if its text layer is usable."""
+        if self.char_count < min_chars:
+            return "low_text"
+        if glyph_warnings > 0 and self.glyph_warnings >= glyph_warnings:
+            return "glyph_warnings"
+        if self.image_coverage >= image_coverage and self.char_count < image_min_chars:
+            return "image_page"
+        return None
+
 
 class _WarningCounter(logging.Handler):
     """Count specific warning messages emitted during PDF parsing."""
@@ -83,6 +124,11 @@ class SDSExtractor:
         pdfminer_logger = logging.getLogger("pdfminer")
         pdfminer_logger.addHandler(warning_counter)
 
+        processing = get_settings().processing
+        selective = processing.ocr_fallback_enabled and processing.ocr_page_selective
+        ocr_pages: dict[int, Any] = {}  # page number -> rendered PIL image
+        _ocr_state.failures = 0
+
         try:
             settings = get_settings()
             if settings.processing.pdf_preprocess_enabled:
@@ -97,8 +143,30 @@ class SDSExtractor:
                 page_count = len(pdf.pages)
 
                 for page_num, page in enumerate(pdf.pages, 1):
+                    warnings_before = warning_counter.count
                     text = page.extract_text() or ""
                     raw_page_text.append(text)
+                    if selective:
+                        if not text.strip():
+                            blank_pages += 1
+                        quality = self._score_page(
+                            page, page_num, text, warning_counter.count - warnings_before
+                        )
+                        reason = quality.ocr_reason(
+                            processing.ocr_page_min_chars,
+                            processing.ocr_page_image_coverage,
+                            processing.ocr_page_glyph_warnings,
+                            processing.ocr_min_avg_chars_per_page,
+                        )
+                        if reason:
+                            logger.debug("Page %d queued for OCR (%s)", page_num, reason)
+                            image = self._render_page(page)
+                            if image is not None:
+                                ocr_pages[page_num] = image
+                            else:
+                                _note_ocr_failure()
+                        text_parts.append(f"\n--- Page {page_num} ---\n{text}")
+                        continue
                     if not text.strip():
                         blank_pages += 1
                         # Try OCR immediately for empty page
@@ -124,13 +192,20 @@ class SDSExtractor:
                     pass
             pdfminer_logger.removeHandler(warning_counter)
 
+        if ocr_pages:
+            self._splice_page_ocr(
+                text_parts, raw_page_text, ocr_pages, page_count, progress_callback
+            )
+
         full_text = "\n".join(text_parts)
+        full_ocr = False
 
         # === Global OCR Fallback Decision ===
+        # (superseded by page-level scoring when OCR_PAGE_SELECTIVE is on)
         try:
             settings = get_settings()
             if not settings.processing.ocr_fallback_enabled:
-                return {"text": full_text, "page_count": page_count, "sections": self._extract_sections(full_text)}
+                return self._pdf_result(full_text, page_count, text_parts)
 
             total_chars = sum(len(t) for t in raw_page_text)
             avg_chars = total_chars / page_count if page_count else 0
@@ -139,7 +214,11 @@ class SDSExtractor:
             min_avg_chars = settings.processing.ocr_min_avg_chars_per_page
             max_blank_ratio = settings.processing.ocr_max_blank_page_ratio
 
-            if (avg_chars < min_avg_chars or blank_ratio > max_blank_ratio) and page_count > 0:
+            if (
+                not selective
+                and (avg_chars < min_avg_chars or blank_ratio > max_blank_ratio)
+                and page_count > 0
+            ):
                 logger.info(
                     "Triggering full-document OCR fallback (avg_chars=%.1f blank_ratio=%.2f)",
                     avg_chars,
@@ -151,6 +230,7 @@ class SDSExtractor:
                     ocr_text = self._ocr_pdf_doctr(file_path, progress_callback=progress_callback)
                     if ocr_text and len(ocr_text.strip()) > len(full_text.strip()) * 0.8:
                         full_text = ocr_text
+                        full_ocr = True
                         logger.info(
                             "Full OCR fallback used (length=%d, original=%d)",
                             len(ocr_text),
@@ -158,9 +238,10 @@ class SDSExtractor:
                         )
                 except Exception as exc:  # pragma: no cover - best effort
                     logger.warning("Full OCR fallback failed: %s", exc)
+                    _note_ocr_failure()
             # Trigger OCR if pdfminer logged many graphics warnings
             warn_threshold = settings.processing.pdf_graphics_warning_threshold
-            if warn_threshold > 0 and warning_counter.count >= warn_threshold:
+            if not selective and warn_threshold > 0 and warning_counter.count >= warn_threshold:
                 min_chars_for_graphics = min_avg_chars * 0.5
                 if avg_chars >= min_chars_for_graphics:
                     logger.info(
@@ -182,9 +263,11 @@ class SDSExtractor:
                         ocr_text = self._ocr_pdf_doctr(file_path, progress_callback=progress_callback)
                         if ocr_text and len(ocr_text.strip()) > len(full_text.strip()) * 0.5:
                             full_text = ocr_text
+                            full_ocr = True
                             logger.info("Full OCR fallback used after graphics warnings")
                     except Exception as exc:  # pragma: no cover
                         logger.warning("OCR fallback after graphics warnings failed: %s", exc)
+                        _note_ocr_failure()
         except Exception as exc:  # pragma: no cover
             logger.debug("OCR fallback decision failed: %s", exc)
 
@@ -192,18 +275,135 @@ class SDSExtractor:
         if page_count == 0 or not full_text.strip():
             doctr_text = self._ocr_pdf_doctr(file_path)
             if doctr_text.strip():
-                return {
-                    "text": doctr_text,
-                    "page_count": page_count or len(doctr_text.split("\n\n")),
-                    "sections": self._extract_sections(doctr_text),
-                }
+                return self._pdf_result(
+                    doctr_text,
+                    page_count or len(doctr_text.split("\n\n")),
+                    text_parts,
+                    full_ocr=True,
+                )
+
+        return self._pdf_result(full_text, page_count, text_parts, full_ocr=full_ocr)
+
+    def _pdf_result(
+        self, text: str, page_count: int, text_parts: list[str], full_ocr: bool = False
+    ) -> dict[str, Any]:
+        """Build the extract_pdf result with per-page text and OCR provenance.
+
+        ``ocr["failed"]`` is set when an OCR attempt errored, timed out or had
+        no engine available, so the text may be missing pages.
+        """
+        if full_ocr:
+            ocr = {"mode": "full", "pages": list(range(1, page_count + 1))}
+        else:
+            ocr_pages = [
+                page_num
+                for page_num, part in enumerate(text_parts, 1)
+                if part.startswith(f"\n--- Page {page_num} (OCR) ---")
+            ]
+            ocr = {"mode": "page" if ocr_pages else None, "pages": ocr_pages}
+        ocr["failed"] = getattr(_ocr_state, "failures", 0) > 0
 
         return {
-            "text": full_text,
+            "text": text,
             "page_count": page_count,
-            "sections": self._extract_sections(full_text),
+            "sections": self._extract_sections(text),
+            "pages": None if full_ocr else list(text_parts),
+            "ocr": ocr,
         }
 
+    def _score_page(
+        self, page: Any, page_num: int, text: str, glyph_warnings: int
+    ) -> PageQuality:
+        """Score a pdfplumber page's text layer.
+
+        Args:
+            page: pdfplumber page object
+            page_num: 1-based page number
+            text: Text extracted from the page
+            glyph_warnings: pdfminer warnings logged while extracting the page
+
+        Returns:
+            PageQuality for the page
+        """
+        unmapped = len(_CID_PATTERN.findall(text))
+        char_count = len(_CID_PATTERN.sub("", text).strip())
+
+        coverage = 0.0
+        try:
+            page_area = float(page.width) * float(page.height)
+            if page_area > 0:
+                image_area = sum(
+                    max(0.0, float(img["x1"]) - float(img["x0"]))
+                    * max(0.0, float(img["bottom"]) - float(img["top"]))
+                    for img in page.images
+                )
+                coverage = min(1.0, image_area / page_area)
+        except Exception as exc:  # pragma: no cover - malformed image metadata
+            logger.debug("Image coverage unavailable for page %d: %s", page_num, exc)
+
+        return PageQuality(
+            page_number=page_num,
+            char_count=char_count,
+            glyph_warnings=glyph_warnings + unmapped,
+            image_coverage=coverage,
+        )
+
+    def _render_page(self, page: Any) -> Any | None:
+        """Render a pdfplumber page to a PIL image for OCR."""
+        try:
+            page_img = page.to_image(resolution=150)
+            return getattr(page_img, "original", None)
+        except Exception as exc:
+            logger.debug("Page render failed (skipping OCR): %s", exc)
+            return None
+
+    def _splice_page_ocr(
+        self,
+        text_parts: list[str],
+        raw_page_text: list[str],
+        ocr_pages: dict[int, Any],
+        page_count: int,
+        progress_callback=None,
+    ) -> None:
+        """OCR the selected pages in one batch and splice the text back in place.
+
+        Args:
+            text_parts: Per-page text blocks, updated in place
+            raw_page_text: Original pdfplumber text per page
+            ocr_pages: Page number -> rendered PIL image for low-quality pages
+            page_count: Total pages in the document
+            progress_callback: Optional callback(current, total, message)
+        """
+        page_numbers = sorted(ocr_pages)
+        logger.info(
+            "Selective OCR on %d of %d pages: %s",
+            len(page_numbers),
+            page_count,
+            page_numbers,
+        )
+        if progress_callback:
+            progress_callback(
+                0, len(page_numbers), f"OCR on {len(page_numbers)} of {page_count} pages..."
+            )
+
+        texts = self._ocr_images_doctr([ocr_pages[n] for n in page_numbers])
+
+        replaced = 0
+        for done, (page_num, ocr_text) in enumerate(zip(page_numbers, texts), 1):
+            original = raw_page_text[page_num - 1]
+            if not ocr_text.strip() and not original.strip():
+                # Nothing from docTR on a blank page: try the per-page Ollama fallback
+                ocr_text = self._ocr_image_ollama(ocr_pages[page_num])
+            clean_len = len(_CID_PATTERN.sub("", original).strip())
+            if ocr_text.strip() and len(ocr_text.strip()) >= clean_len * 0.5:
+                text_parts[page_num - 1] = f"\n--- Page {page_num} (OCR) ---\n{ocr_text}"
+                replaced += 1
+            if progress_callback:
+                progress_callback(done, len(page_numbers), f"OCR page {page_num}/{page_count}...")
+
+        logger.info("Selective OCR replaced %d/%d pages", replaced, len(page_numbers))
+        logger.debug("OCR batcher stats: %s", get_ocr_batcher().get_stats())
+
     def _preprocess_pdf(self, file_path: Path, engines: str) -> Path | None:
         """Optionally normalize PDFs (flatten patterns) before pdfplumber parses them."""
         engine_list = [e.strip() for e in engines.split(",") if e.strip()]
@@ -256,11 +456,10 @@ class SDSExtractor:
             Extracted text
         """
         try:
-            import io
-
             page_img = page.to_image(resolution=150)
             pil_img = getattr(page_img, "original", None)
             if pil_img is None:
+                _note_ocr_failure()
                 return ""
 
             # Try docTR first (faster, better for structured docs)
@@ -271,22 +470,15 @@ class SDSExtractor:
 
             # Fallback to Ollama if docTR fails or returns empty
             logger.debug("docTR returned empty, trying Ollama fallback")
-            from ..models import get_ollama_client
-
-            ollama = get_ollama_client()
-            img_bytes = io.BytesIO()
-            pil_img.save(img_bytes, format="PNG")
-            img_bytes.seek(0)
-            self._throttle_ocr()
-            text = ollama.ocr_image_bytes(img_bytes.read())
-            logger.debug("Ollama extracted %d characters", len(text))
-            return text
+            return self._ocr_image_ollama(pil_img)
 
         except TimeoutError as e:
             logger.debug("OCR timeout (skipping): %s", e)
+            _note_ocr_failure()
             return ""
         except Exception as e:
             logger.debug("OCR failed (skipping): %s", e)
+            _note_ocr_failure()
             return ""
 
     def _ocr_page_doctr(self, pil_image: Any) -> str:
@@ -299,36 +491,61 @@ class SDSExtractor:
             Extracted text
         """
         try:
-            import torch
-            from doctr.io import DocumentFile
-            from doctr.models import ocr_predictor
+            # Routed through the shared batcher so concurrent pages share predictor calls
+            return get_ocr_batcher().ocr([pil_image])[0]
 
-            # Initialize model once (lazy load via class var to avoid repeated init)
-            if not hasattr(self, '_doctr_model'):
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                logger.info("Initializing docTR model on %s (first use)", device)
-                self._doctr_model = ocr_predictor(pretrained=True).to(device)
+        except ImportError:
+            logger.debug("docTR not available (install with: pip install doctr)")
+            _note_ocr_failure()
+            return ""
+        except Exception as e:
+            logger.debug("docTR extraction failed: %s", e)
+            _note_ocr_failure()
+            return ""
 
-            # Predict on image
-            doc = DocumentFile.from_pil(pil_image)
-            result = self._doctr_model(doc)
+    def _ocr_images_doctr(self, images: list[Any]) -> list[str]:
+        """OCR several page images through the shared docTR batcher.
 
-            # Extract text from result
-            text_parts = []
-            for page in result.pages:
-                for block in page.blocks:
-                    for line in block.lines:
-                        for word in line.words:
-                            text_parts.append(word.value)
-                        text_parts.append("\n")
+        Pages are grouped with those of other concurrent documents into
+        fixed-size predictor calls (see ``ocr_batcher``).
 
-            return " ".join(text_parts)
+        Args:
+            images: PIL images, one per page
 
+        Returns:
+            Text per image, in input order ("" where OCR failed)
+        """
+        if not images:
+            return []
+        try:
+            return get_ocr_batcher().ocr(images)
         except ImportError:
-            logger.debug("docTR not available (install with: pip install doctr)")
-            return ""
+            logger.debug("docTR not available for page OCR")
+            _note_ocr_failure()
+            return [""] * len(images)
         except Exception as e:
-            logger.debug("docTR extraction failed: %s", e)
+            logger.debug("docTR batched page OCR failed: %s", e)
+            _note_ocr_failure()
+            return [""] * len(images)
+
+    def _ocr_image_ollama(self, pil_img: Any) -> str:
+        """OCR a single page image with the Ollama vision model."""
+        try:
+            import io
+
+            from ..models import get_ollama_client
+
+            ollama = get_ollama_client()
+            img_bytes = io.BytesIO()
+            pil_img.save(img_bytes, format="PNG")
+            img_bytes.seek(0)
+            self._throttle_ocr()
+            text = ollama.ocr_image_bytes(img_bytes.read())
+            logger.debug("Ollama extracted %d characters", len(text))
+            return text
+        except Exception as e:
+            logger.debug("Ollama OCR failed (skipping): %s", e)
+            _note_ocr_failure()
             return ""
 
     def _ocr_pdf_full(self, file_path: Path) -> str:
@@ -378,46 +595,40 @@ class SDSExtractor:
 
     def _ocr_pdf_doctr(self, file_path: Path, progress_callback=None) -> str:
         """OCR an entire PDF using docTR directly (bypasses pdfplumber).
-        
+
+        Pages go through the shared OCR batcher, which owns the docTR model,
+        so concurrent documents never call the predictor from several threads.
+
         Args:
             file_path: Path to PDF file
             progress_callback: Optional callback function(current, total, message)
         """
         try:
-            import torch
             from doctr.io import DocumentFile
-            from doctr.models import ocr_predictor
-
-            if not hasattr(self, "_doctr_model"):
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                logger.info("Initializing docTR model on %s (full-PDF fallback)", device)
-                self._doctr_model = ocr_predictor(pretrained=True).to(device)
 
             doc = DocumentFile.from_pdf(file_path)
             total_pages = len(doc)
-            
+
             if progress_callback:
                 progress_callback(0, total_pages, f"OCR starting ({total_pages} pages)...")
-            
-            result = self._doctr_model(doc)
+
+            batcher = get_ocr_batcher()
+            futures = [batcher.submit(page) for page in doc]
 
             text_parts = []
-            for page_idx, page in enumerate(result.pages, 1):
+            for page_idx, future in enumerate(futures, 1):
+                text_parts.append(future.result())
                 if progress_callback:
                     progress_callback(page_idx, total_pages, f"OCR page {page_idx}/{total_pages}...")
-                
-                for block in page.blocks:
-                    for line in block.lines:
-                        line_text = " ".join(word.value for word in line.words)
-                        text_parts.append(line_text)
-                text_parts.append("\n")
-
-            return "\n".join(text_parts)
+
+            return "\n\n".join(text_parts)
         except ImportError:
             logger.debug("docTR not available for full-PDF OCR")
+            _note_ocr_failure()
             return ""
         except Exception as e:  # pragma: no cover
             logger.debug("docTR full-PDF OCR failed: %s", e)
+            _note_ocr_failure()
             return ""
 
     # === OCR Rate Limiting ===
@@ -543,6 +754,38 @@ class SDSExtractor:
 
         return sections
 
+    def get_extraction_cache(self) -> ExtractionCache | None:
+        """Return the persistent extraction cache, or None when disabled."""
+        if not hasattr(self, "_extraction_cache"):
+            settings = get_settings()
+            processing = settings.processing
+            if not processing.extraction_cache_enabled:
+                self._extraction_cache = None
+            else:
+                # Settings that change extract_pdf output are part of the key
+                fingerprint = "|".join(
+                    str(v)
+                    for v in (
+                        processing.ocr_fallback_enabled,
+                        processing.ocr_page_selective,
+                        processing.ocr_page_min_chars,
+                        processing.ocr_page_image_coverage,
+                        processing.ocr_page_glyph_warnings,
+                        processing.ocr_min_avg_chars_per_page,
+                        processing.ocr_max_blank_page_ratio,
+                        processing.pdf_preprocess_enabled,
+                        processing.pdf_preprocess_engine,
+                        processing.pdf_graphics_warning_threshold,
+                    )
+                )
+                config_hash = hashlib.sha256(fingerprint.encode()).hexdigest()[:8]
+                self._extraction_cache = ExtractionCache(
+                    settings.paths.extraction_cache,
+                    max_bytes=processing.extraction_cache_max_mb * 1024 * 1024,
+                    version=f"v{EXTRACTOR_VERSION}-{config_hash}",
+                )
+        return self._extraction_cache
+
     def get_section_text(
         self,
         text: str,
@@ -576,12 +819,24 @@ class SDSExtractor:
 
         return ""
 
-    def extract_document(self, file_path: Path, progress_callback=None) -> dict[str, Any]:
+    def extract_document(
+        self,
+        file_path: Path,
+        progress_callback=None,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+    ) -> dict[str, Any]:
         """Extract all information from an SDS document.
 
+        PDF results are served from / stored in the persistent extraction
+        cache (see ``extraction_cache``) unless disabled. Results where OCR
+        was needed but failed are not stored, so the next run retries OCR.
+
         Args:
             file_path: Path to document
             progress_callback: Optional callback(current, total, message) for progress updates
+            use_cache: Read and write the extraction cache for PDFs
+            refresh_cache: Skip cached results and re-extract (the new result is stored)
 
         Returns:
             Dictionary with extracted data
@@ -596,7 +851,21 @@ class SDSExtractor:
         try:
             # Extract based on file type
             if file_path.suffix.lower() == ".pdf":
+                cache = self.get_extraction_cache() if use_cache else None
+                file_hash = file_sha256(file_path) if cache else None
+                if cache and file_hash and not refresh_cache:
+                    cached = cache.get(file_hash)
+                    if cached is not None:
+                        logger.info("Extraction cache hit: %s", file_path.name)
+                        return cached
+
                 result = self.extract_pdf(file_path, progress_callback=progress_callback)
+
+                if cache and file_hash:
+                    if (result.get("ocr") or {}).get("failed"):
+                        logger.info("Not caching extraction of %s: OCR failed", file_path.name)
+                    else:
+                        cache.put(file_hash, result)
             else:
                 # Treat as text file
                 text = file_path.read_text(encoding="utf-8")
@@ -5,13 +5,18 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
-from ..config.constants import EXTRACTION_FIELDS
+from ..config.constants import EXTRACTION_FIELDS, FieldDefinition
+from ..config.settings import get_settings
 from ..models import get_ollama_client
 from ..models.few_shot_examples import FewShotExamples
 from ..utils.logger import get_logger
+from .context_builder import FieldContextBuilder
 
 logger = get_logger(__name__)
 
+# Values that mean the LLM did not find a field
+EMPTY_VALUES = {"", "NOT_FOUND", "ERROR", "NONE", "N/A"}
+
 
 class LLMExtractor:
     """Extract fields using LLM (with prompt templates and advanced features)."""
@@ -31,12 +36,30 @@ class LLMExtractor:
         self.few_shot = FewShotExamples()
         self.use_few_shot = use_few_shot
         self.use_consensus = use_consensus
+        self.context_builder = FieldContextBuilder()
+
+    def get_context_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-field section hit rate and prompt-token statistics."""
+        return self.context_builder.get_stats()
+
+    def _field_prompt(
+        self,
+        field_def: Any,
+        text: str,
+        sections: dict[int, str] | None,
+    ) -> tuple[str, str]:
+        """Build (context, prompt) for a field from its SDS section."""
+        context = self.context_builder.build(field_def.name, text, sections).text
+        prompt = field_def.prompt_template.format(text=context)
+        self.context_builder.record_prompt(field_def.name, prompt)
+        return context, prompt
 
     def extract_field(
         self,
         field_name: str,
         text: str,
         section_num: int | None = None,
+        sections: dict[int, str] | None = None,
     ) -> dict[str, Any] | None:
         """Extract a field using LLM with optional advanced features.
 
@@ -44,6 +67,7 @@ class LLMExtractor:
             field_name: Field to extract
             text: Document text to analyze
             section_num: Relevant SDS section number
+            sections: Extracted SDS sections used to target the prompt context
 
         Returns:
             Dictionary with value, confidence, context
@@ -57,14 +81,14 @@ class LLMExtractor:
         if not field_def:
             return None
 
-        # Use field's prompt template
-        prompt = field_def.prompt_template.format(text=text[:3000])
+        # Use field's prompt template with the field's section as context
+        context, prompt = self._field_prompt(field_def, text, sections)
 
         try:
             # Use few-shot learning by default for better accuracy
             if self.use_few_shot:
                 result = self.ollama.extract_field_with_few_shot(
-                    text=text[:3000],
+                    text=context,
                     field_name=field_name,
                     prompt_template=prompt,
                 )
@@ -72,7 +96,7 @@ class LLMExtractor:
             # Use consensus for critical fields if enabled
             elif self.use_consensus and field_name in self.CRITICAL_FIELDS:
                 result = self.ollama.extract_field_with_consensus(
-                    text=text[:3000],
+                    text=context,
                     field_name=field_name,
                     prompt_template=prompt,
                     models=["qwen2.5", "llama3.1"],  # Use available models
@@ -81,7 +105,7 @@ class LLMExtractor:
             # Standard extraction as fallback
             else:
                 result = self.ollama.extract_field(
-                    text=text[:3000],
+                    text=context,
                     field_name=field_name,
                     prompt_template=prompt,
                     system_prompt=(
@@ -107,6 +131,7 @@ class LLMExtractor:
         self,
         fields: list[str],
         text: str,
+        sections: dict[int, str] | None = None,
     ) -> dict[str, dict[str, Any]]:
         """Extract multiple fields in parallel with few-shot learning.
 
@@ -116,6 +141,7 @@ class LLMExtractor:
         Args:
             fields: List of field names
             text: Document text
+            sections: Extracted SDS sections used to target each field's context
 
         Returns:
             Dictionary mapping field names to results
@@ -132,7 +158,7 @@ class LLMExtractor:
             # Submit all field extraction tasks
             future_to_field = {}
             for field_name in fields:
-                future = executor.submit(self._extract_single_field, field_name, text)
+                future = executor.submit(self._extract_single_field, field_name, text, sections)
                 future_to_field[future] = field_name
             
             # Collect results as they complete
@@ -149,16 +175,138 @@ class LLMExtractor:
         logger.debug("Parallel extraction completed for %d/%d fields", len(final_results), len(fields))
         return final_results
 
+    # Character budgets for structured (multi-field) prompts
+    STRUCTURED_SECTION_CHARS = 4000
+    STRUCTURED_DOCUMENT_CHARS = 6000
+
+    def extract_fields_structured(
+        self,
+        fields: list[str],
+        text: str,
+        sections: dict[int, str] | None = None,
+        mode: str | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """Extract many fields with one JSON-schema request per section or document.
+
+        Fields are grouped by ``FieldDefinition.section`` and each group is sent
+        with only that section's text. Fields that come back empty are retried
+        through the per-field path (``extract_multiple_fields``).
+
+        Args:
+            fields: Field names to extract
+            text: Full document text
+            sections: Extracted SDS sections (section number -> text)
+            mode: "section" or "document" (default: ProcessingConfig.llm_structured_mode)
+
+        Returns:
+            Dictionary mapping field names to results
+        """
+        mode = mode or get_settings().processing.llm_structured_mode
+        sections = sections or {}
+        wanted = set(fields)
+        field_defs = [f for f in EXTRACTION_FIELDS if f.name in wanted]
+        unknown = [name for name in fields if name not in {f.name for f in field_defs}]
+
+        groups: dict[int | None, list[FieldDefinition]] = {}
+        for field_def in field_defs:
+            key = field_def.section if mode == "section" else None
+            if key is not None and not (sections.get(key) or "").strip():
+                key = None  # section not found in this document: use document context
+            groups.setdefault(key, []).append(field_def)
+
+        def run_group(section: int | None, defs: list[FieldDefinition]):
+            context = self._structured_context(section, defs, text, sections)
+            descriptions = {f.name: self._describe_field(f) for f in defs}
+            return self.ollama.extract_fields_structured(context, descriptions)
+
+        results: dict[str, dict[str, Any]] = {}
+        empty: list[str] = list(unknown)
+
+        with ThreadPoolExecutor(max_workers=min(4, max(1, len(groups)))) as executor:
+            futures = {
+                executor.submit(run_group, section, defs): defs
+                for section, defs in groups.items()
+            }
+            for future in as_completed(futures):
+                defs = futures[future]
+                try:
+                    group_results = future.result()
+                except Exception as e:
+                    logger.error("Structured extraction failed: %s", e)
+                    group_results = {}
+                for field_def in defs:
+                    result = group_results.get(field_def.name)
+                    if result is None or str(result.value).strip().upper() in EMPTY_VALUES:
+                        empty.append(field_def.name)
+                        continue
+                    results[field_def.name] = {
+                        "value": result.value,
+                        "confidence": result.confidence,
+                        "context": result.context,
+                        "source": "llm",
+                    }
+
+        logger.info(
+            "Structured LLM extraction (%s): %d requests for %d fields, %d found, %d to per-field fallback",
+            mode,
+            len(groups),
+            len(field_defs),
+            len(results),
+            len(empty),
+        )
+
+        if empty:
+            results.update(self.extract_multiple_fields(empty, text, sections))
+
+        return results
+
+    def _structured_context(
+        self,
+        section: int | None,
+        defs: list[FieldDefinition],
+        text: str,
+        sections: dict[int, str],
+    ) -> str:
+        """Pick the text sent with a structured request."""
+        if section is not None:
+            return sections[section][: self.STRUCTURED_SECTION_CHARS]
+
+        # Document-level request: the sections the fields point to, in order
+        numbers = sorted({f.section for f in defs if f.section is not None and sections.get(f.section)})
+        if not numbers:
+            return text[: self.context_builder.max_chars]
+
+        parts: list[str] = []
+        remaining = self.STRUCTURED_DOCUMENT_CHARS
+        per_section = max(500, remaining // len(numbers))
+        for number in numbers:
+            chunk = f"[Section {number}]\n{sections[number][:per_section]}"
+            parts.append(chunk[:remaining])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _describe_field(field_def: FieldDefinition) -> str:
+        """Short description of a field for the multi-field prompt."""
+        first_line = field_def.prompt_template.strip().split("\n", 1)[0].strip()
+        if first_line and "{text}" not in first_line:
+            return f"{field_def.label_en}. {first_line}"
+        return field_def.label_en
+
     def _extract_single_field(
         self,
         field_name: str,
         text: str,
+        sections: dict[int, str] | None = None,
     ) -> dict[str, Any] | None:
         """Extract a single field (internal helper for parallel extraction).
 
         Args:
             field_name: Field to extract
             text: Document text
+            sections: Extracted SDS sections
 
         Returns:
             Dictionary with value, confidence, context, or None on error
@@ -174,19 +322,19 @@ class LLMExtractor:
                 logger.warning("Field definition not found: %s", field_name)
                 return None
 
-            # Use field's prompt template
-            prompt = field_def.prompt_template.format(text=text[:3000])
+            # Use field's prompt template with the field's section as context
+            context, prompt = self._field_prompt(field_def, text, sections)
 
             # Use few-shot learning by default
             if self.use_few_shot:
                 result = self.ollama.extract_field_with_few_shot(
-                    text=text[:3000],
+                    text=context,
                     field_name=field_name,
                     prompt_template=prompt,
                 )
             else:
                 result = self.ollama.extract_field(
-                    text=text[:3000],
+                    text=context,
                     field_name=field_name,
                     prompt_template=prompt,
                 )
@@ -206,6 +354,7 @@ class LLMExtractor:
         field_name: str,
         heuristic_result: dict[str, Any],
         text: str,
+        sections: dict[int, str] | None = None,
     ) -> dict[str, Any]:
         """Refine a heuristic extraction with LLM using few-shot learning.
 
@@ -213,16 +362,19 @@ class LLMExtractor:
             field_name: Field name
             heuristic_result: Result from heuristic extraction
             text: Document text
+            sections: Extracted SDS sections used to target the prompt context
 
         Returns:
             Refined result (or original if LLM confidence is lower)
         """
         # For critical fields, try consensus-based refinement if enabled
         if self.use_consensus and field_name in self.CRITICAL_FIELDS:
-            return self._refine_heuristic_with_consensus(field_name, heuristic_result, text)
+            return self._refine_heuristic_with_consensus(
+                field_name, heuristic_result, text, sections
+            )
 
         # Standard refinement with few-shot learning
-        llm_result = self.extract_field(field_name, text)
+        llm_result = self.extract_field(field_name, text, sections=sections)
 
         if not llm_result:
             return heuristic_result
@@ -247,6 +399,7 @@ class LLMExtractor:
         field_name: str,
         heuristic_result: dict[str, Any],
         text: str,
+        sections: dict[int, str] | None = None,
     ) -> dict[str, Any]:
         """Refine a heuristic extraction using consensus from multiple models.
 
@@ -254,6 +407,7 @@ class LLMExtractor:
             field_name: Field name
             heuristic_result: Result from heuristic extraction
             text: Document text
+            sections: Extracted SDS sections
 
         Returns:
             Consensus result or original if consensus is lower confidence
@@ -268,10 +422,10 @@ class LLMExtractor:
             if not field_def:
                 return heuristic_result
 
-            prompt = field_def.prompt_template.format(text=text[:3000])
+            context, prompt = self._field_prompt(field_def, text, sections)
 
             consensus_result = self.ollama.extract_field_with_consensus(
-                text=text[:3000],
+                text=context,
                 field_name=field_name,
                 prompt_template=prompt,
                 models=["qwen2.5", "llama3.1"],
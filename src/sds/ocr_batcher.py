@@ -0,0 +1,253 @@
+"""Batched docTR inference shared by all SDS extractions in a process.
+
+Page images submitted from any thread are queued and run through one docTR
+predictor in fixed-size batches. A batch is dispatched when it is full or
+when the oldest queued page has waited ``max_wait_ms``, so a lone document
+is not held back while concurrent documents share GPU/CPU batches.
+
+Each process has its own batcher (the batch engine's extraction workers
+each batch their own pages).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from ..config.settings import get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_doctr_model() -> Any:
+    """Load the pretrained docTR OCR predictor on GPU when available.
+
+    Raises:
+        ImportError: If docTR/torch are not installed
+    """
+    import torch
+    from doctr.models import ocr_predictor
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    logger.info("Initializing docTR model on %s (first use)", device)
+    return ocr_predictor(pretrained=True).to(device)
+
+
+def doctr_page_text(page: Any) -> str:
+    """Flatten a docTR result page into newline-separated lines."""
+    return "\n".join(
+        " ".join(word.value for word in line.words)
+        for block in page.blocks
+        for line in block.lines
+    )
+
+
+@dataclass
+class _Request:
+    image: Any
+    future: Future
+    queued_at: float
+
+
+class OCRBatcher:
+    """Collect page images from concurrent callers and OCR them in batches."""
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+        model_loader: Callable[[], Any] = load_doctr_model,
+    ) -> None:
+        """Initialize batcher.
+
+        Args:
+            batch_size: Pages per predictor call (default: ProcessingConfig.ocr_batch_size)
+            max_wait_ms: Max time the first queued page waits for a full batch
+                (default: ProcessingConfig.ocr_batch_max_wait_ms)
+            model_loader: Callable returning the docTR predictor
+        """
+        config = get_settings().processing
+        self.batch_size = max(1, batch_size or config.ocr_batch_size)
+        wait_ms = config.ocr_batch_max_wait_ms if max_wait_ms is None else max_wait_ms
+        self.max_wait = max(0.0, wait_ms) / 1000.0
+        self._model_loader = model_loader
+        self._model: Any = None
+        self._model_lock = threading.Lock()
+
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._pages = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._inference_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._first_batch_at: float | None = None
+        self._last_batch_at: float | None = None
+
+    @property
+    def model(self) -> Any:
+        """The shared docTR predictor (loaded on first access)."""
+        with self._model_lock:
+            if self._model is None:
+                self._model = self._model_loader()
+            return self._model
+
+    def submit(self, image: Any) -> Future:
+        """Queue one page image for OCR.
+
+        Args:
+            image: PIL image or HxWx3 uint8 array
+
+        Returns:
+            Future resolving to the page text
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put(_Request(_to_array(image), future, time.time()))
+        return future
+
+    def ocr(self, images: list[Any]) -> list[str]:
+        """OCR several page images and wait for all of them.
+
+        Args:
+            images: PIL images or arrays
+
+        Returns:
+            Text per image, in input order
+
+        Raises:
+            Exception: Whatever the model raised for the batch containing a page
+        """
+        futures = [self.submit(image) for image in images]
+        return [future.result() for future in futures]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return throughput and batch fill counters."""
+        with self._stats_lock:
+            span = (
+                self._last_batch_at - self._first_batch_at
+                if self._first_batch_at is not None and self._last_batch_at is not None
+                else 0.0
+            )
+            return {
+                "pages": self._pages,
+                "batches": self._batches,
+                "failed_batches": self._failed_batches,
+                "batch_size": self.batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "avg_batch_pages": self._pages / self._batches if self._batches else 0.0,
+                "avg_batch_fill": (
+                    self._pages / (self._batches * self.batch_size) if self._batches else 0.0
+                ),
+                "pages_per_second": (
+                    self._pages / self._inference_seconds if self._inference_seconds else 0.0
+                ),
+                "wall_pages_per_second": self._pages / span if span > 0 else 0.0,
+                "inference_seconds": self._inference_seconds,
+                "avg_queue_wait_ms": (
+                    self._wait_seconds / self._pages * 1000.0 if self._pages else 0.0
+                ),
+            }
+
+    def close(self) -> None:
+        """Stop the worker thread after draining queued pages."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="OCR_Batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first.queued_at + self.max_wait
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: list[_Request]) -> None:
+        started = time.time()
+        try:
+            result = self.model([request.image for request in batch])
+            texts = [doctr_page_text(page) for page in result.pages]
+        except Exception as exc:
+            logger.debug("docTR batch of %d pages failed: %s", len(batch), exc)
+            with self._stats_lock:
+                self._failed_batches += 1
+            if len(batch) == 1:
+                batch[0].future.set_exception(exc)
+                return
+            # Pages of other documents may share the batch: retry one by one
+            # so only the pages that fail on their own get the error
+            for request in batch:
+                self._run_batch([request])
+            return
+
+        finished = time.time()
+        texts += [""] * (len(batch) - len(texts))
+        for request, text in zip(batch, texts):
+            request.future.set_result(text)
+
+        with self._stats_lock:
+            self._pages += len(batch)
+            self._batches += 1
+            self._inference_seconds += finished - started
+            self._wait_seconds += sum(started - request.queued_at for request in batch)
+            if self._first_batch_at is None:
+                self._first_batch_at = started
+            self._last_batch_at = finished
+
+        logger.debug(
+            "docTR batch: %d/%d pages in %.2fs", len(batch), self.batch_size, finished - started
+        )
+
+
+def _to_array(image: Any) -> Any:
+    """Convert a PIL image to the RGB uint8 array docTR expects."""
+    if hasattr(image, "convert"):
+        import numpy as np
+
+        return np.asarray(image.convert("RGB"))
+    return image
+
+
+@lru_cache(maxsize=1)
+def get_ocr_batcher() -> OCRBatcher:
+    """Get the process-wide OCR batcher."""
+    return OCRBatcher()
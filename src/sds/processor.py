@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import re
 import time
-import threading
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
@@ -15,17 +15,43 @@ from ..database import get_db_manager
 from ..rag import RAGRetriever, TextChunker
 from ..utils.logger import get_logger
 from .confidence_scorer import ConfidenceScorer, FieldSource
+from .dedup_scan import DedupScanner, FileStatus, FolderScan
 from .extractor import SDSExtractor
 from .external_validator import ExternalValidator
 from .heuristics import HeuristicExtractor
 from .ingredient_extractor import IngredientExtractor
 from .llm_extractor import LLMExtractor
 from .pubchem_enrichment import PubChemEnricher
-from .validator import FieldValidator, validate_extraction_result, validate_full_consistency
+from .validator import (
+    FieldValidator,
+    validate_extraction_result,
+    validate_field_format,
+    validate_full_consistency,
+)
 from .profile_router import ProfileRouter, ManufacturerProfile
 
 logger = get_logger(__name__)
 
+# Fields Phase 3 completes from the knowledge base
+_RAG_FIELDS = ("un_number", "hazard_class", "incompatibilities", "h_statements")
+# Of those, the ones _index_document_in_rag stores in chunk metadata
+_CHUNK_METADATA_FIELDS = ("un_number", "hazard_class", "incompatibilities")
+# Confidence of RAG-completed values: curated hazard records and rules rank
+# above an LLM reading retrieved text, values copied from another SDS below it
+_RAG_RECORD_CONFIDENCE = 0.85
+_RAG_LLM_CONFIDENCE = 0.78
+_RAG_CHUNK_METADATA_CONFIDENCE = 0.7
+# Answers that mean "nothing found" however the model phrases them
+_RAG_EMPTY_ANSWERS = frozenset({"not_found", "error", "none", "no", "n/a", "na", "-", "unknown"})
+_H_CODE_RE = re.compile(r"\b(?:EUH|H)\d{3}\b", re.IGNORECASE)
+# Field descriptions for the batched (one request) RAG completion
+_RAG_FIELD_QUESTIONS = {
+    "un_number": "UN number of {chemical} (only the 4-digit number)",
+    "hazard_class": "transport hazard class of {chemical} (only the class number, e.g. 3, 8, 6.1)",
+    "incompatibilities": "materials {chemical} is incompatible with, separated by commas",
+    "h_statements": "H-statements (hazard codes) of {chemical}, separated by commas (e.g. H301, H315)",
+}
+
 
 @dataclass
 class ProcessingResult:
@@ -42,6 +68,111 @@ class ProcessingResult:
     error_message: str | None = None
 
 
+@dataclass
+class LocalExtraction:
+    """Output of the CPU-bound local phase (text, sections, heuristics).
+
+    Only plain data, so it can be returned from a worker process.
+    """
+
+    text: str
+    sections: dict[int, str]
+    page_count: int | None
+    extractions: dict[str, dict[str, Any]]
+    ingredients: list[dict[str, Any]] | None = None
+    profile_name: str | None = None
+    extraction_time: float = 0.0
+
+
+@dataclass
+class DocumentState:
+    """Per-document state handed between the post-extraction stages."""
+
+    doc_id: int
+    file_path: Path
+    start_time: float
+    text: str
+    sections: dict[int, str]
+    extractions: dict[str, dict[str, Any]]
+    completeness: float = 0.0
+    avg_confidence: float = 0.0
+    is_dangerous: bool = False
+
+
+def extract_local(
+    file_path: Path,
+    extractor: SDSExtractor,
+    heuristics: HeuristicExtractor,
+    ingredient_extractor: IngredientExtractor,
+    router: ProfileRouter,
+    progress_callback=None,
+    refresh_cache: bool = False,
+) -> LocalExtraction:
+    """Run Phase 1 (text/OCR extraction, ingredients, heuristics) for one file.
+
+    Args:
+        file_path: Path to SDS file
+        extractor: Text/OCR extractor
+        heuristics: Regex heuristic extractor
+        ingredient_extractor: Section 3 ingredient extractor
+        router: Manufacturer profile router
+        progress_callback: Optional callback(current, total, message) for OCR progress
+        refresh_cache: Re-extract even if the extraction cache holds the file
+
+    Returns:
+        LocalExtraction for the document
+    """
+    logger.debug("Phase 1: Multi-pass local extraction starting")
+
+    # Extract text and sections (with OCR progress callback)
+    ocr_start = time.time()
+    extracted = extractor.extract_document(
+        file_path, progress_callback=progress_callback, refresh_cache=refresh_cache
+    )
+    ocr_time = time.time() - ocr_start
+    logger.info(f"⏱️ OCR extraction completed in {ocr_time:.2f}s")
+
+    text = extracted["text"]
+    sections = extracted.get("sections", {})
+
+    # Extract full ingredient list from Section 3 (composition)
+    ingredients: list[dict[str, Any]] | None = None
+    try:
+        ingredients = [
+            {
+                "cas_number": ing.cas_number,
+                "chemical_name": ing.chemical_name,
+                "concentration_text": ing.concentration_text,
+                "concentration_min": ing.concentration_min,
+                "concentration_max": ing.concentration_max,
+                "concentration_unit": ing.concentration_unit,
+                "confidence": ing.confidence,
+                "evidence": ing.evidence,
+                "source": "heuristic",
+            }
+            for ing in ingredient_extractor.extract(text, sections)
+        ]
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.warning("Ingredient extraction failed: %s", exc)
+
+    # Detect Manufacturer Profile
+    profile = router.identify_profile(text)
+
+    # PASS 1: Heuristics (fast, high-precision fields)
+    logger.info("Phase 1a: Running heuristics extraction")
+    extractions = heuristics.extract_all_fields(text, sections, profile)
+
+    return LocalExtraction(
+        text=text,
+        sections=sections,
+        page_count=extracted.get("page_count"),
+        extractions=extractions,
+        ingredients=ingredients,
+        profile_name=getattr(profile, "name", None),
+        extraction_time=time.time() - ocr_start,
+    )
+
+
 class SDSProcessor:
     """Orchestrate SDS document processing pipeline."""
 
@@ -65,7 +196,14 @@ class SDSProcessor:
         # Thread pool for background operations
         self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="SDS_Background")
 
-    def process(self, file_path: Path, use_rag: bool = True, force_reprocess: bool = False, progress_callback=None) -> ProcessingResult:
+    def process(
+        self,
+        file_path: Path,
+        use_rag: bool = True,
+        force_reprocess: bool = False,
+        progress_callback=None,
+        prescanned: FileStatus | None = None,
+    ) -> ProcessingResult:
         """Process a single SDS document.
 
         Args:
@@ -73,6 +211,7 @@ class SDSProcessor:
             use_rag: Whether to use RAG enrichment for dangerous chemicals
             force_reprocess: If True, reprocess even if already processed. If False, use cache.
             progress_callback: Optional callback(current, total, message) for OCR progress
+            prescanned: The file's ``prescan`` entry, if the batch was pre-scanned
 
         Returns:
             ProcessingResult with extracted data
@@ -82,57 +221,91 @@ class SDSProcessor:
 
         logger.info("Processing SDS: %s", file_path.name)
 
-        # === EARLY DEDUPLICATION CHECK (OPTIMIZED) ===
-        # Step 1: Fast check by name+size (no I/O needed)
-        if not force_reprocess:
-            existing_doc_id = self.db.check_file_by_name_and_size(
-                file_path.name, file_path.stat().st_size
+        cached, doc_id = self.prepare_document(
+            file_path, force_reprocess=force_reprocess, prescanned=prescanned
+        )
+        if cached is not None:
+            return cached
+
+        try:
+            # === PHASE 1: MULTI-PASS LOCAL EXTRACTION ===
+            local = self.run_local_extraction(
+                file_path, progress_callback=progress_callback, refresh_cache=force_reprocess
             )
-            if existing_doc_id:
-                logger.info(
-                    "⚡ Skipping already processed file (by name+size): %s (id=%d) - using cached results",
-                    file_path.name,
-                    existing_doc_id,
-                )
-                existing_extractions = self.db.get_extractions_by_document(existing_doc_id)
-                existing_status = self.db.get_document_status(existing_doc_id)
-
-                return ProcessingResult(
-                    document_id=existing_doc_id,
-                    filename=file_path.name,
-                    status=existing_status.get("status", "completed"),
-                    extractions=existing_extractions,
-                    is_dangerous=existing_status.get("is_dangerous", False),
-                    completeness=existing_status.get("completeness", 0.0),
-                    avg_confidence=existing_status.get("avg_confidence", 0.0),
-                    processing_time=0.0,
-                    error_message=None,
-                )
+        except Exception as e:
+            return self._fail_document(doc_id, file_path, start_time, e)
+
+        return self.finish_processing(doc_id, file_path, local, start_time, use_rag=use_rag)
+
+    def prescan(self, file_paths: list[Path]) -> FolderScan:
+        """Hash a batch in parallel and resolve its processed status in one query.
+
+        Callers pass each file's entry to ``prepare_document`` (or ``process``),
+        which then skips reading the file and querying the database per file.
+
+        Args:
+            file_paths: Files about to be processed
 
-        # Step 2: Check by path (for files that may have been moved)
-        existing_doc = self.db.get_document_by_path(file_path)
-        if existing_doc and existing_doc.status in ("completed", "success") and not force_reprocess:
-            # Check if it has extractions
-            if self.db.is_document_already_processed(existing_doc.id):
+        Returns:
+            FolderScan of the batch
+        """
+        return DedupScanner(self.db).scan(file_paths)
+
+    def prepare_document(
+        self,
+        file_path: Path,
+        force_reprocess: bool = False,
+        prescanned: FileStatus | None = None,
+    ) -> tuple[ProcessingResult | None, int]:
+        """Run deduplication checks and register the document.
+
+        Args:
+            file_path: Path to SDS file
+            force_reprocess: If True, skip the already-processed shortcuts
+            prescanned: The file's ``prescan`` entry (hash and processed status)
+
+        Returns:
+            Tuple of (cached ProcessingResult or None, document ID)
+        """
+        file_path = Path(file_path)
+        existing_doc = None
+
+        if prescanned is not None:
+            # Hash and processed status already resolved by prescan()
+            if prescanned.processed and not force_reprocess:
                 logger.info(
-                    "⚡ Skipping already processed file (by path): %s (id=%d) - using cached results",
+                    "⚡ Skipping already processed file (by %s): %s (id=%d) - using cached results",
+                    prescanned.matched_by,
                     file_path.name,
-                    existing_doc.id,
+                    prescanned.document_id,
                 )
-                existing_extractions = self.db.get_extractions_by_document(existing_doc.id)
-                existing_status = self.db.get_document_status(existing_doc.id)
-
-                return ProcessingResult(
-                    document_id=existing_doc.id,
-                    filename=file_path.name,
-                    status=existing_status.get("status", "completed"),
-                    extractions=existing_extractions,
-                    is_dangerous=existing_status.get("is_dangerous", False),
-                    completeness=existing_status.get("completeness", 0.0),
-                    avg_confidence=existing_status.get("avg_confidence", 0.0),
-                    processing_time=0.0,
-                    error_message=None,
+                return self._cached_result(prescanned.document_id, file_path), prescanned.document_id
+        else:
+            # === EARLY DEDUPLICATION CHECK (OPTIMIZED) ===
+            # Step 1: Fast check by name+size (no I/O needed)
+            if not force_reprocess:
+                existing_doc_id = self.db.check_file_by_name_and_size(
+                    file_path.name, file_path.stat().st_size
                 )
+                if existing_doc_id:
+                    logger.info(
+                        "⚡ Skipping already processed file (by name+size): %s (id=%d) - using cached results",
+                        file_path.name,
+                        existing_doc_id,
+                    )
+                    return self._cached_result(existing_doc_id, file_path), existing_doc_id
+
+            # Step 2: Check by path (for files that may have been moved)
+            existing_doc = self.db.get_document_by_path(file_path)
+            if existing_doc and existing_doc.status in ("completed", "success") and not force_reprocess:
+                # Check if it has extractions
+                if self.db.is_document_already_processed(existing_doc.id):
+                    logger.info(
+                        "⚡ Skipping already processed file (by path): %s (id=%d) - using cached results",
+                        file_path.name,
+                        existing_doc.id,
+                    )
+                    return self._cached_result(existing_doc.id, file_path), existing_doc.id
 
         # Register document (will check hash as final deduplication if needed)
         try:
@@ -141,6 +314,7 @@ class SDSProcessor:
                 file_path=file_path,
                 file_size=file_path.stat().st_size,
                 file_type=file_path.suffix.lower(),
+                file_hash=prescanned.sha256 if prescanned is not None else None,
             )
             
             # If register_document found a duplicate by hash and we didn't catch it earlier,
@@ -155,215 +329,308 @@ class SDSProcessor:
                             file_path.name,
                             doc_id,
                         )
-                        existing_extractions = self.db.get_extractions_by_document(doc_id)
-                        existing_status = self.db.get_document_status(doc_id)
-
-                        return ProcessingResult(
-                            document_id=doc_id,
-                            filename=file_path.name,
-                            status=existing_status.get("status", "completed"),
-                            extractions=existing_extractions,
-                            is_dangerous=existing_status.get("is_dangerous", False),
-                            completeness=existing_status.get("completeness", 0.0),
-                            avg_confidence=existing_status.get("avg_confidence", 0.0),
-                            processing_time=0.0,
-                            error_message=None,
-                        )
+                        return self._cached_result(doc_id, file_path), doc_id
                 
         except Exception as e:
             logger.error("Failed to register document: %s", e)
             raise
 
+        return None, doc_id
+
+    def _cached_result(self, doc_id: int, file_path: Path) -> ProcessingResult:
+        """Build a ProcessingResult from previously stored extractions."""
+        existing_extractions = self.db.get_extractions_by_document(doc_id)
+        existing_status = self.db.get_document_status(doc_id)
+
+        return ProcessingResult(
+            document_id=doc_id,
+            filename=file_path.name,
+            status=existing_status.get("status", "completed"),
+            extractions=existing_extractions,
+            is_dangerous=existing_status.get("is_dangerous", False),
+            completeness=existing_status.get("completeness", 0.0),
+            avg_confidence=existing_status.get("avg_confidence", 0.0),
+            processing_time=0.0,
+            error_message=None,
+        )
+
+    def run_local_extraction(
+        self, file_path: Path, progress_callback=None, refresh_cache: bool = False
+    ) -> LocalExtraction:
+        """Phase 1 (CPU-bound): text/OCR extraction, ingredients and heuristics.
+
+        Touches neither the database nor any network service, so it can run in
+        a worker process (see ``batch_engine``).
+
+        Args:
+            file_path: Path to SDS file
+            progress_callback: Optional callback(current, total, message) for OCR progress
+            refresh_cache: Re-extract even if the extraction cache holds the file
+
+        Returns:
+            LocalExtraction with text, sections, ingredients and heuristic fields
+        """
+        return extract_local(
+            Path(file_path),
+            extractor=self.extractor,
+            heuristics=self.heuristics,
+            ingredient_extractor=self.ingredient_extractor,
+            router=self.router,
+            progress_callback=progress_callback,
+            refresh_cache=refresh_cache,
+        )
+
+    def finish_processing(
+        self,
+        doc_id: int,
+        file_path: Path,
+        local: LocalExtraction,
+        start_time: float,
+        use_rag: bool = True,
+    ) -> ProcessingResult:
+        """Run the LLM, enrichment and indexing stages on a local extraction.
+
+        Args:
+            doc_id: Registered document ID
+            file_path: Path to SDS file
+            local: Result of ``run_local_extraction``
+            start_time: Processing start timestamp (``time.time()``)
+            use_rag: Whether to use RAG enrichment for dangerous chemicals
+
+        Returns:
+            ProcessingResult with extracted data
+        """
         try:
-            # === PHASE 1: MULTI-PASS LOCAL EXTRACTION ===
-            phase1_start = time.time()
-            logger.debug("Phase 1: Multi-pass local extraction starting")
+            state = self.run_llm_stage(doc_id, file_path, local, start_time)
+            state = self.run_enrichment_stage(state, use_rag=use_rag)
+            return self.complete_document(state)
+        except Exception as e:
+            return self._fail_document(doc_id, file_path, start_time, e)
 
-            # Extract text and sections (with OCR progress callback)
-            ocr_start = time.time()
-            extracted = self.extractor.extract_document(file_path, progress_callback=progress_callback)
-            ocr_time = time.time() - ocr_start
-            logger.info(f"⏱️ OCR extraction completed in {ocr_time:.2f}s")
+    def run_llm_stage(
+        self,
+        doc_id: int,
+        file_path: Path,
+        local: LocalExtraction,
+        start_time: float,
+    ) -> DocumentState:
+        """Phase 1b: LLM pass, normalization, validation and first store.
 
-            text = extracted["text"]
-            sections = extracted.get("sections", {})
+        Args:
+            doc_id: Registered document ID
+            file_path: Path to SDS file
+            local: Result of ``run_local_extraction``
+            start_time: Processing start timestamp (``time.time()``)
 
-            # Extract full ingredient list from Section 3 (composition)
+        Returns:
+            DocumentState for the enrichment stage
+        """
+        text = local.text
+        sections = local.sections
+
+        if local.ingredients is not None:
             try:
-                ingredients = self.ingredient_extractor.extract(text, sections)
-                self.db.replace_document_ingredients(
-                    doc_id,
-                    [
-                        {
-                            "cas_number": ing.cas_number,
-                            "chemical_name": ing.chemical_name,
-                            "concentration_text": ing.concentration_text,
-                            "concentration_min": ing.concentration_min,
-                            "concentration_max": ing.concentration_max,
-                            "concentration_unit": ing.concentration_unit,
-                            "confidence": ing.confidence,
-                            "evidence": ing.evidence,
-                            "source": "heuristic",
-                        }
-                        for ing in ingredients
-                    ],
-                )
-                logger.info("Extracted %d ingredients from Section 3", len(ingredients))
+                self.db.replace_document_ingredients(doc_id, local.ingredients)
+                logger.info("Extracted %d ingredients from Section 3", len(local.ingredients))
             except Exception as exc:  # pragma: no cover - best effort
                 logger.warning("Ingredient extraction failed: %s", exc)
 
-            # Detect Manufacturer Profile
-            profile = self.router.identify_profile(text)
-
-            # PASS 1: Heuristics (fast, high-precision fields)
-            logger.info("Phase 1a: Running heuristics extraction")
-            extractions = self._extraction_pass_heuristics(text, sections, profile)
-
-            # PASS 2: LLM for uncertain/missing fields
-            llm_start = time.time()
-            logger.info("Phase 1b: Running LLM extraction (may take 10-30 seconds)...")
-            extractions = self._extraction_pass_llm(extractions, text, sections)
-            llm_time = time.time() - llm_start
-            logger.info(f"⏱️ LLM extraction completed in {llm_time:.2f}s")
+        extractions = dict(local.extractions)
+
+        # PASS 2: LLM for uncertain/missing fields
+        llm_start = time.time()
+        logger.info("Phase 1b: Running LLM extraction (may take 10-30 seconds)...")
+        extractions = self._extraction_pass_llm(extractions, text, sections)
+        llm_time = time.time() - llm_start
+        logger.info(f"⏱️ LLM extraction completed in {llm_time:.2f}s")
+
+        # PASS 2.5: Defensive normalization of field entries
+        extractions = self._defensive_normalize_extractions(extractions)
+
+        # PASS 3: Cross-field validation and normalization
+        extractions = self._validate_and_normalize_fields(extractions)
+
+        # Calculate metrics
+        completeness = self.validator.calculate_completeness(extractions)
+        avg_confidence = self.validator.get_overall_confidence(extractions)
+
+        # Determine if dangerous
+        hazard_class = extractions.get("hazard_class", {}).get("value")
+        is_dangerous = self.validator.is_dangerous(hazard_class)
+
+        # Store Phase 1 results using batch insert (faster than individual stores)
+        extraction_batch = [
+            (
+                field_name,
+                result.get("value", ""),
+                result.get("confidence", 0.0),
+                result.get("context", ""),
+                result.get("validation_status", "pending"),
+                result.get("validation_message"),
+                result.get("source", "heuristic"),
+            )
+            for field_name, result in extractions.items()
+        ]
+        self.db.store_extractions_batch(doc_id, extraction_batch)
+
+        return DocumentState(
+            doc_id=doc_id,
+            file_path=Path(file_path),
+            start_time=start_time,
+            text=text,
+            sections=sections,
+            extractions=extractions,
+            completeness=completeness,
+            avg_confidence=avg_confidence,
+            is_dangerous=is_dangerous,
+        )
 
-            # PASS 2.5: Defensive normalization of field entries
-            extractions = self._defensive_normalize_extractions(extractions)
+    def run_enrichment_stage(self, state: DocumentState, use_rag: bool = True) -> DocumentState:
+        """Phase 2 (PubChem) and Phase 3 (RAG field completion).
 
-            # PASS 3: Cross-field validation and normalization
-            extractions = self._validate_and_normalize_fields(extractions)
+        Args:
+            state: Output of ``run_llm_stage``
+            use_rag: Whether to use RAG enrichment for dangerous chemicals
 
-            # Calculate metrics
-            completeness = self.validator.calculate_completeness(extractions)
-            avg_confidence = self.validator.get_overall_confidence(extractions)
+        Returns:
+            The same DocumentState, updated in place
+        """
+        doc_id = state.doc_id
+        extractions = state.extractions
+        completeness = state.completeness
+        avg_confidence = state.avg_confidence
+
+        # === PHASE 2: PUBCHEM ENRICHMENT ===
+        pubchem_start = time.time()
+        logger.info("Phase 2: PubChem enrichment and validation (may take 5-10 seconds)...")
+        pubchem_enrichments = self.pubchem_enricher.enrich_extraction(
+            extractions,
+            aggressive=False  # Conservative by default
+        )
+        pubchem_time = time.time() - pubchem_start
+        logger.info(f"⏱️ PubChem enrichment completed in {pubchem_time:.2f}s")
+
+        # Apply enrichments to extractions
+        if pubchem_enrichments:
+            logger.info(f"Applied {len(pubchem_enrichments)} PubChem enrichments")
+            enrichment_report = self.pubchem_enricher.generate_enrichment_report(pubchem_enrichments)
+            logger.debug(f"\n{enrichment_report}")
+
+            # Update extractions with enriched data
+            for field_name, enrichment in pubchem_enrichments.items():
+                if enrichment.enriched_value and enrichment.validation_status == "enriched":
+                    # Add enriched field or update existing
+                    if field_name not in extractions:
+                        extractions[field_name] = {
+                            "value": enrichment.enriched_value,
+                            "confidence": enrichment.confidence,
+                            "source": "pubchem_enrichment",
+                            "context": "Enriched from PubChem API",
+                            "validation_status": "valid"
+                        }
+                    elif enrichment.confidence > extractions[field_name].get("confidence", 0):
+                        # Boost confidence for validated fields
+                        extractions[field_name]["confidence"] = min(
+                            extractions[field_name]["confidence"] + 0.10,
+                            0.95
+                        )
+                        extractions[field_name]["pubchem_validated"] = True
 
-            # Determine if dangerous
-            hazard_class = extractions.get("hazard_class", {}).get("value")
-            is_dangerous = self.validator.is_dangerous(hazard_class)
+                elif enrichment.validation_status == "warning":
+                    # Flag warnings in the extraction
+                    if field_name in extractions:
+                        extractions[field_name]["validation_status"] = "warning"
+                        extractions[field_name]["pubchem_issues"] = enrichment.issues
 
-            # Store Phase 1 results using batch insert (faster than individual stores)
-            extraction_batch = [
+            # Store enrichment metadata using batch insert
+            enrichment_batch = [
                 (
                     field_name,
-                    result.get("value", ""),
-                    result.get("confidence", 0.0),
-                    result.get("context", ""),
-                    result.get("validation_status", "pending"),
-                    result.get("validation_message"),
-                    result.get("source", "heuristic"),
+                    enrichment.enriched_value,
+                    enrichment.confidence,
+                    "PubChem enrichment",
+                    enrichment.validation_status,
+                    "; ".join(enrichment.issues) if enrichment.issues else None,
+                    "pubchem",
                 )
-                for field_name, result in extractions.items()
+                for field_name, enrichment in pubchem_enrichments.items()
+                if enrichment.enriched_value
             ]
-            self.db.store_extractions_batch(doc_id, extraction_batch)
-
-            # === PHASE 2: PUBCHEM ENRICHMENT ===
-            pubchem_start = time.time()
-            logger.info("Phase 2: PubChem enrichment and validation (may take 5-10 seconds)...")
-            pubchem_enrichments = self.pubchem_enricher.enrich_extraction(
-                extractions,
-                aggressive=False  # Conservative by default
+            if enrichment_batch:
+                self.db.store_extractions_batch(doc_id, enrichment_batch)
+
+        # === PHASE 3: RAG FIELD COMPLETION (if needed) ===
+        rag_start = time.time()
+        if use_rag and (state.is_dangerous or completeness < 0.8):
+            kb_stats = {}
+            logger.info("Phase 3: RAG field completion (may take 10-20 seconds)...")
+            try:
+                kb_stats = self.rag.get_knowledge_base_stats()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Failed to get knowledge base stats: %s", exc)
+
+            doc_count = (
+                kb_stats.get("document_count", 0)
+                if isinstance(kb_stats, dict)
+                else 0
             )
-            pubchem_time = time.time() - pubchem_start
-            logger.info(f"⏱️ PubChem enrichment completed in {pubchem_time:.2f}s")
-            
-            # Apply enrichments to extractions
-            if pubchem_enrichments:
-                logger.info(f"Applied {len(pubchem_enrichments)} PubChem enrichments")
-                enrichment_report = self.pubchem_enricher.generate_enrichment_report(pubchem_enrichments)
-                logger.debug(f"\n{enrichment_report}")
-                
-                # Update extractions with enriched data
-                for field_name, enrichment in pubchem_enrichments.items():
-                    if enrichment.enriched_value and enrichment.validation_status == "enriched":
-                        # Add enriched field or update existing
-                        if field_name not in extractions:
-                            extractions[field_name] = {
-                                "value": enrichment.enriched_value,
-                                "confidence": enrichment.confidence,
-                                "source": "pubchem_enrichment",
-                                "context": "Enriched from PubChem API",
-                                "validation_status": "valid"
-                            }
-                        elif enrichment.confidence > extractions[field_name].get("confidence", 0):
-                            # Boost confidence for validated fields
-                            extractions[field_name]["confidence"] = min(
-                                extractions[field_name]["confidence"] + 0.10,
-                                0.95
-                            )
-                            extractions[field_name]["pubchem_validated"] = True
-                    
-                    elif enrichment.validation_status == "warning":
-                        # Flag warnings in the extraction
-                        if field_name in extractions:
-                            extractions[field_name]["validation_status"] = "warning"
-                            extractions[field_name]["pubchem_issues"] = enrichment.issues
-                
-                # Store enrichment metadata using batch insert
-                enrichment_batch = [
-                    (
-                        field_name,
-                        enrichment.enriched_value,
-                        enrichment.confidence,
-                        "PubChem enrichment",
-                        enrichment.validation_status,
-                        "; ".join(enrichment.issues) if enrichment.issues else None,
-                        "pubchem",
-                    )
-                    for field_name, enrichment in pubchem_enrichments.items()
-                    if enrichment.enriched_value
-                ]
-                if enrichment_batch:
-                    self.db.store_extractions_batch(doc_id, enrichment_batch)
-
-            # === PHASE 3: RAG FIELD COMPLETION (if needed) ===
-            rag_start = time.time()
-            if use_rag and (is_dangerous or completeness < 0.8):
-                kb_stats = {}
-                logger.info("Phase 3: RAG field completion (may take 10-20 seconds)...")
+
+            if doc_count == 0 and isinstance(kb_stats, dict) and kb_stats.get("error"):
+                # Attempt self-healing reinit
                 try:
-                    kb_stats = self.rag.get_knowledge_base_stats()
-                except Exception as exc:  # pragma: no cover - defensive logging
-                    logger.warning("Failed to get knowledge base stats: %s", exc)
-
-                doc_count = (
-                    kb_stats.get("document_count", 0)
-                    if isinstance(kb_stats, dict)
-                    else 0
+                    if self.rag.vector_store.ensure_ready():
+                        kb_stats = self.rag.get_knowledge_base_stats()
+                        doc_count = (
+                            kb_stats.get("document_count", 0)
+                            if isinstance(kb_stats, dict)
+                            else 0
+                        )
+                except Exception:
+                    pass
+
+            if doc_count > 0:
+                logger.debug("Phase 2: RAG field completion (completeness: %.0f%%)", completeness * 100)
+                extractions = self._enrich_with_rag(doc_id, extractions, state.text)
+                # Recalculate metrics after RAG enrichment
+                completeness = self.validator.calculate_completeness(extractions)
+                avg_confidence = self.validator.get_overall_confidence(extractions)
+            elif kb_stats and isinstance(kb_stats, dict) and kb_stats.get("error"):
+                logger.warning(
+                    "Skipping RAG enrichment due to vector store error: %s",
+                    kb_stats.get("error"),
                 )
+            rag_time = time.time() - rag_start
+            logger.info(f"⏱️ RAG enrichment completed in {rag_time:.2f}s")
+        else:
+            # RAG not used - still log the skipped phase
+            logger.debug("Phase 3: Skipping RAG enrichment (not dangerous and completeness >= 0.8)")
+
+        state.extractions = extractions
+        state.completeness = completeness
+        state.avg_confidence = avg_confidence
+        return state
+
+    def complete_document(
+        self, state: DocumentState, index_in_background: bool = True
+    ) -> ProcessingResult:
+        """Index the document into RAG and mark it as processed.
 
-                if doc_count == 0 and isinstance(kb_stats, dict) and kb_stats.get("error"):
-                    # Attempt self-healing reinit
-                    try:
-                        if self.rag.vector_store.ensure_ready():
-                            kb_stats = self.rag.get_knowledge_base_stats()
-                            doc_count = (
-                                kb_stats.get("document_count", 0)
-                                if isinstance(kb_stats, dict)
-                                else 0
-                            )
-                    except Exception:
-                        pass
-
-                if doc_count > 0:
-                    logger.debug("Phase 2: RAG field completion (completeness: %.0f%%)", completeness * 100)
-                    extractions = self._enrich_with_rag(doc_id, extractions, text)
-                    # Recalculate metrics after RAG enrichment
-                    completeness = self.validator.calculate_completeness(extractions)
-                    avg_confidence = self.validator.get_overall_confidence(extractions)
-                elif kb_stats and isinstance(kb_stats, dict) and kb_stats.get("error"):
-                    logger.warning(
-                        "Skipping RAG enrichment due to vector store error: %s",
-                        kb_stats.get("error"),
-                    )
-                rag_time = time.time() - rag_start
-                logger.info(f"⏱️ RAG enrichment completed in {rag_time:.2f}s")
-            else:
-                # RAG not used - still log the skipped phase
-                logger.debug("Phase 3: Skipping RAG enrichment (not dangerous and completeness >= 0.8)")
+        Args:
+            state: Output of ``run_enrichment_stage``
+            index_in_background: Submit RAG indexing to the background executor
+                (True) or run it in the calling thread (False)
+
+        Returns:
+            ProcessingResult with extracted data
+        """
+        doc_id = state.doc_id
+        file_path = state.file_path
 
-            # Update document status
-            processing_time = time.time() - start_time
+        # Update document status
+        processing_time = time.time() - state.start_time
 
-            # Index raw SDS text + metadata into the RAG vector store
+        # Index raw SDS text + metadata into the RAG vector store
+        if index_in_background:
             # Run in background to not block response.
             # We use a ThreadPoolExecutor (not daemon) to ensure tasks complete on shutdown if needed,
             # but we don't wait for it here.
@@ -371,66 +638,71 @@ class SDSProcessor:
                 self._index_document_in_rag,
                 doc_id,
                 file_path,
-                text,
-                extractions
-            )
-
-            self.db.update_document_status(
-                doc_id,
-                status="success",
-                processing_time=processing_time,
-                is_dangerous=is_dangerous,
-                completeness=completeness,
-                avg_confidence=avg_confidence,
+                state.text,
+                state.extractions
             )
+        else:
+            self._index_document_in_rag(doc_id, file_path, state.text, state.extractions)
+
+        self.db.update_document_status(
+            doc_id,
+            status="success",
+            processing_time=processing_time,
+            is_dangerous=state.is_dangerous,
+            completeness=state.completeness,
+            avg_confidence=state.avg_confidence,
+        )
 
-            # Log LLM metrics if available
-            self._log_llm_metrics(file_path.name)
-
-            logger.info(
-                "Processed %s in %.2fs (completeness: %.0f%%, confidence: %.0f%%)",
-                file_path.name,
-                processing_time,
-                completeness * 100,
-                avg_confidence * 100,
-            )
+        # Log LLM metrics if available
+        self._log_llm_metrics(file_path.name)
 
-            return ProcessingResult(
-                document_id=doc_id,
-                filename=file_path.name,
-                status="success",
-                extractions=extractions,
-                is_dangerous=is_dangerous,
-                completeness=completeness,
-                avg_confidence=avg_confidence,
-                processing_time=processing_time,
-            )
+        logger.info(
+            "Processed %s in %.2fs (completeness: %.0f%%, confidence: %.0f%%)",
+            file_path.name,
+            processing_time,
+            state.completeness * 100,
+            state.avg_confidence * 100,
+        )
 
-        except Exception as e:
-            processing_time = time.time() - start_time
-            # Log full traceback for better diagnostics
-            import traceback
-            tb = traceback.format_exc()
-            logger.error("Processing failed: %s\n%s", e, tb)
+        return ProcessingResult(
+            document_id=doc_id,
+            filename=file_path.name,
+            status="success",
+            extractions=state.extractions,
+            is_dangerous=state.is_dangerous,
+            completeness=state.completeness,
+            avg_confidence=state.avg_confidence,
+            processing_time=processing_time,
+        )
 
-            self.db.update_document_status(
-                doc_id,
-                status="failed",
-                processing_time=processing_time,
-                error_message=str(e),
-            )
+    def _fail_document(
+        self, doc_id: int, file_path: Path, start_time: float, error: Exception
+    ) -> ProcessingResult:
+        """Mark a document as failed and build the failure result."""
+        processing_time = time.time() - start_time
+        # Log full traceback for better diagnostics
+        import traceback
+        tb = traceback.format_exc()
+        logger.error("Processing failed: %s\n%s", error, tb)
+
+        self.db.update_document_status(
+            doc_id,
+            status="failed",
+            processing_time=processing_time,
+            error_message=str(error),
+        )
 
-            return ProcessingResult(
-                document_id=doc_id,
-                filename=file_path.name,
-                status="failed",
-                extractions={},
-                is_dangerous=False,
-                completeness=0.0,
-                avg_confidence=0.0,
-                processing_time=processing_time,
-                error_message=str(e),
-            )
+        return ProcessingResult(
+            document_id=doc_id,
+            filename=Path(file_path).name,
+            status="failed",
+            extractions={},
+            is_dangerous=False,
+            completeness=0.0,
+            avg_confidence=0.0,
+            processing_time=processing_time,
+            error_message=str(error),
+        )
 
     def _defensive_normalize_extractions(
         self, extractions: dict[str, dict[str, Any]]
@@ -462,21 +734,6 @@ class SDSProcessor:
 
         return normalized
 
-    def _extraction_pass_heuristics(
-        self, text: str, sections: dict[int, str], profile: ManufacturerProfile
-    ) -> dict[str, dict[str, Any]]:
-        """Pass 1: Fast heuristic extraction with regex patterns.
-
-        Args:
-            text: Full document text
-            sections: Extracted sections
-            profile: Manufacturer Profile
-
-        Returns:
-            Dictionary of extracted fields
-        """
-        return self.heuristics.extract_all_fields(text, sections, profile)
-
     def _extraction_pass_llm(
         self,
         extractions: dict[str, dict[str, Any]],
@@ -518,15 +775,20 @@ class SDSProcessor:
         # Refine uncertain fields
         for field_name in uncertain_fields:
             heur_result = extractions[field_name]
-            refined = self.llm.refine_heuristic(field_name, heur_result, text)
+            refined = self.llm.refine_heuristic(field_name, heur_result, text, sections=sections)
             # Normalize LLM output to dict schema
             normalized = self._normalize_llm_result(refined)
             if normalized["confidence"] > heur_result.get("confidence", 0.0):
                 extractions[field_name] = normalized
 
-        # Extract missing fields
+        # Extract missing fields (one structured request per section when supported)
         if missing_fields:
-            llm_results = self.llm.extract_multiple_fields(missing_fields, text)
+            if self.settings.processing.llm_structured_mode != "off" and hasattr(
+                self.llm, "extract_fields_structured"
+            ):
+                llm_results = self.llm.extract_fields_structured(missing_fields, text, sections)
+            else:
+                llm_results = self.llm.extract_multiple_fields(missing_fields, text, sections=sections)
             for field_name, result in llm_results.items():
                 if field_name not in extractions:
                     extractions[field_name] = self._normalize_llm_result(result)
@@ -729,6 +991,12 @@ class SDSProcessor:
     ) -> dict[str, dict[str, Any]]:
         """Use RAG to complete missing or low-confidence fields.
 
+        Fields are first resolved by CAS/UN against structured knowledge
+        (hazard records, incompatibility rules, metadata of indexed SDS
+        chunks); only the fields still missing go through vector search, in
+        one structured LLM request over the retrieved context
+        (``processing.rag_batch_fields``). Results are stored in one batch.
+
         Args:
             doc_id: Document ID
             extractions: Current extractions
@@ -737,56 +1005,170 @@ class SDSProcessor:
         Returns:
             Updated extractions with RAG-enriched fields
         """
+        enriched: dict[str, tuple[str, float, str]] = {}
         try:
-            # Get chemical identifier
-            chemical_id = self._get_chemical_identifier(extractions)
-            if not chemical_id:
+            fields_to_enrich = [f for f in _RAG_FIELDS if self._should_enrich_field(f, extractions)]
+            if not fields_to_enrich:
                 return extractions
 
-            # Query knowledge base
-            query = f"Chemical: {chemical_id}. Provide UN number, hazard class, incompatibilities, H-statements"
-            rag_docs = self.rag.retrieve(query, k=5)
-
-            if not rag_docs:
-                return extractions
+            structured = self._lookup_structured_fields(doc_id, extractions, fields_to_enrich)
+            enriched.update(structured)
+            fields_to_enrich = [f for f in fields_to_enrich if f not in structured]
 
-            # Combine RAG context
-            context = "\n\n".join([doc.content for doc in rag_docs[:3]])
-
-            # Complete missing/weak fields
-            fields_to_enrich = ["un_number", "hazard_class", "incompatibilities", "h_statements"]
-
-            for field_name in fields_to_enrich:
-                if self._should_enrich_field(field_name, extractions):
-                    enriched = self._extract_field_from_rag(field_name, chemical_id, context)
-                    if enriched:
-                        extractions[field_name] = validate_extraction_result(
-                            field_name,
-                            {
-                                "value": enriched,
-                                "confidence": 0.78,
-                                "source": "rag",
-                                "context": "Knowledge base enrichment",
-                            },
-                        )
-                        logger.debug("RAG enriched %s: %s", field_name, enriched)
-
-                        # Store enrichment
-                        self.db.store_extraction(
-                            document_id=doc_id,
-                            field_name=field_name,
-                            value=enriched,
-                            confidence=0.78,
-                            context="RAG knowledge base",
-                            validation_status="valid",
-                            source="rag",
-                        )
+            # Get chemical identifier
+            chemical_id = self._get_chemical_identifier(extractions)
+            if fields_to_enrich and chemical_id:
+                # Query knowledge base
+                query = f"Chemical: {chemical_id}. Provide UN number, hazard class, incompatibilities, H-statements"
+                rag_docs = self.rag.retrieve(query, k=5)
+
+                if rag_docs:
+                    # Combine RAG context
+                    context = "\n\n".join([doc.content for doc in rag_docs[:3]])
+
+                    # Complete missing/weak fields
+                    if self.settings.processing.rag_batch_fields:
+                        answers = self._extract_fields_from_rag(fields_to_enrich, chemical_id, context)
+                    else:
+                        answers = {
+                            field_name: self._extract_field_from_rag(field_name, chemical_id, context)
+                            for field_name in fields_to_enrich
+                        }
+                    for field_name, value in answers.items():
+                        if value:
+                            enriched[field_name] = (value, _RAG_LLM_CONFIDENCE, "RAG knowledge base")
 
         except Exception as e:
             logger.warning("RAG field completion failed: %s", e)
 
+        if enriched:
+            self._store_rag_fields(doc_id, extractions, enriched)
         return extractions
 
+    def _store_rag_fields(
+        self,
+        doc_id: int,
+        extractions: dict[str, dict[str, Any]],
+        enriched: dict[str, tuple[str, float, str]],
+    ) -> None:
+        """Validate RAG-enriched fields into ``extractions`` and store them in one batch.
+
+        Args:
+            doc_id: Document ID
+            extractions: Current extractions (updated in place)
+            enriched: Field name -> (value, confidence, stored context)
+        """
+        rows = []
+        for field_name, (value, confidence, context) in enriched.items():
+            extractions[field_name] = validate_extraction_result(
+                field_name,
+                {
+                    "value": value,
+                    "confidence": confidence,
+                    "source": "rag",
+                    "context": "Knowledge base enrichment",
+                },
+            )
+            logger.debug("RAG enriched %s: %s", field_name, value)
+            rows.append(
+                (
+                    field_name,
+                    value,
+                    confidence,
+                    context,
+                    extractions[field_name].get("validation_status", "pending"),
+                    extractions[field_name].get("validation_message"),
+                    "rag",
+                )
+            )
+
+        try:
+            self.db.store_extractions_batch(doc_id, rows)
+        except Exception as e:
+            logger.warning("Failed to store RAG enrichment: %s", e)
+
+    def _lookup_structured_fields(
+        self,
+        doc_id: int,
+        extractions: dict[str, dict[str, Any]],
+        fields: list[str],
+    ) -> dict[str, tuple[str, float, str]]:
+        """Resolve RAG fields by CAS/UN without an embedding or LLM call.
+
+        Looks at, in order: the ``rag_hazards`` record of the CAS (fields named
+        in its hazard flags or metadata), the ``rag_incompatibilities`` rules
+        involving the CAS, and the metadata of other SDS chunks indexed with
+        the same CAS (or UN number). Values from other SDS get a lower
+        confidence than LLM answers, since they describe another document.
+
+        Args:
+            doc_id: Document ID (its own chunks are ignored)
+            extractions: Current extractions
+            fields: Fields to resolve
+
+        Returns:
+            Dictionary of resolved field -> (value, confidence, stored context)
+        """
+        cas = self._structured_value(extractions.get("cas_number", {}).get("value"))
+        un = self._structured_value(extractions.get("un_number", {}).get("value"))
+        found: dict[str, tuple[str, float, str]] = {}
+        record_source = (_RAG_RECORD_CONFIDENCE, "RAG structured lookup")
+        if not cas and not un:
+            return found
+
+        try:
+            if cas:
+                hazard = self.db.get_hazard_record(cas) or {}
+                for record in (hazard.get("hazard_flags"), hazard.get("metadata")):
+                    if isinstance(record, dict):
+                        for field_name in fields:
+                            value = self._structured_value(record.get(field_name))
+                            if value and field_name not in found:
+                                found[field_name] = (value, *record_source)
+
+                if "incompatibilities" in fields and "incompatibilities" not in found:
+                    partners = []
+                    for rule in self.db.get_incompatibility_rules_for_cas(cas):
+                        if rule["rule"] not in ("I", "R"):
+                            continue
+                        if rule["cas_a"] == cas:
+                            other, group = rule["cas_b"], rule["group_b"]
+                        else:
+                            other, group = rule["cas_a"], rule["group_a"]
+                        partners.append(f"{group} ({other})" if group else other)
+                    if partners:
+                        found["incompatibilities"] = (", ".join(dict.fromkeys(partners)), *record_source)
+
+            remaining = [f for f in fields if f not in found and f in _CHUNK_METADATA_FIELDS]
+            get_chunk_metadata = getattr(getattr(self.rag, "vector_store", None), "get_chunk_metadata", None)
+            if remaining and get_chunk_metadata is not None:
+                where = {"cas_number": cas} if cas else {"un_number": un}
+                for metadata in get_chunk_metadata(where):
+                    if metadata.get("document_id") == doc_id:
+                        continue
+                    for field_name in remaining:
+                        value = self._structured_value(metadata.get(field_name))
+                        if value and field_name not in found:
+                            found[field_name] = (value, _RAG_CHUNK_METADATA_CONFIDENCE, "RAG chunk metadata")
+        except Exception as e:
+            logger.debug("Structured RAG lookup failed: %s", e)
+
+        if found:
+            logger.debug("RAG fields resolved from structured knowledge: %s", sorted(found))
+        return found
+
+    @staticmethod
+    def _structured_value(value: Any) -> str | None:
+        """Normalize a stored value (string or list) to a field value; None if unknown."""
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(item).strip() for item in value if str(item).strip())
+        if value is None:
+            return None
+        value = str(value).strip()
+        if not value or value.upper() == "NOT_FOUND":
+            return None
+        return value
+
     def _get_chemical_identifier(self, extractions: dict[str, dict[str, Any]]) -> str | None:
         """Get best chemical identifier for RAG query.
 
@@ -903,6 +1285,60 @@ class SDSProcessor:
             or len(str(value).strip()) < 3
         )
 
+    def _extract_fields_from_rag(
+        self, fields: list[str], chemical_id: str, context: str
+    ) -> dict[str, str | None]:
+        """Extract several fields from RAG context in one structured LLM request.
+
+        Args:
+            fields: Fields to extract
+            chemical_id: Chemical identifier
+            context: RAG retrieved context
+
+        Returns:
+            Dictionary of field -> extracted value (None when not found)
+        """
+        descriptions = {
+            field_name: _RAG_FIELD_QUESTIONS[field_name].format(chemical=chemical_id)
+            for field_name in fields
+            if field_name in _RAG_FIELD_QUESTIONS
+        }
+        if not descriptions:
+            return {}
+
+        try:
+            results = self.rag.ollama.extract_fields_structured(context[:2000], descriptions)
+        except Exception as e:
+            logger.debug("Batched RAG extraction failed: %s", e)
+            return {}
+
+        return {
+            field_name: self._clean_rag_answer(field_name, getattr(results.get(field_name), "value", None))
+            for field_name in descriptions
+        }
+
+    @staticmethod
+    def _clean_rag_answer(field_name: str, answer: Any) -> str | None:
+        """Normalize an LLM answer from RAG context; None unless it is a valid value for the field.
+
+        Answers are checked per field rather than by length, so short values
+        such as hazard class "3" are kept.
+        """
+        value = str(answer or "").strip().rstrip(".")
+        if not value or value.lower() in _RAG_EMPTY_ANSWERS or "NOT_FOUND" in value.upper():
+            return None
+        if field_name == "un_number":
+            match = re.search(r"\b(?:UN\s?)?(\d{4})\b", value, re.IGNORECASE)
+            value = match.group(1) if match else value
+        elif field_name == "hazard_class":
+            match = re.search(r"\b\d(?:\.\d)?\b", value)
+            value = match.group(0) if match else value
+        elif field_name == "h_statements":
+            return value if _H_CODE_RE.search(value) else None
+        if validate_field_format(field_name, value):
+            return None
+        return value
+
     def _extract_field_from_rag(
         self, field_name: str, chemical_id: str, context: str
     ) -> str | None:
@@ -932,8 +1368,7 @@ class SDSProcessor:
 
         try:
             answer = self.rag.ollama.chat(message=full_prompt, context=context[:2000])
-            if answer and "NOT_FOUND" not in answer.upper() and len(answer.strip()) > 2:
-                return answer.strip()
+            return self._clean_rag_answer(field_name, answer)
         except Exception as e:
             logger.debug("RAG extraction failed for %s: %s", field_name, e)
 
@@ -1135,6 +1570,16 @@ class SDSProcessor:
                 cache_stats.get("hits", 0),
                 cache_stats.get("hit_rate", 0) * 100 if cache_stats else 0,
             )
+
+            if hasattr(self.llm, "get_context_stats"):
+                for field_name, stats in sorted(self.llm.get_context_stats().items()):
+                    logger.debug(
+                        "LLM context %s: requests=%d section_hit=%.0f%% avg_prompt_tokens=%.0f",
+                        field_name,
+                        stats["requests"],
+                        stats["section_hit_rate"] * 100,
+                        stats["avg_prompt_tokens"],
+                    )
         except Exception as e:
             logger.debug("Failed to log LLM metrics: %s", e)
 
@@ -1162,46 +1607,48 @@ class SDSProcessor:
                 "cache_hits": cache_stats.get("hits", 0),
                 "cache_misses": cache_stats.get("misses", 0),
                 "cache_hit_rate": cache_stats.get("hit_rate", 0),
+                "cache_tiers": cache_stats.get("tiers", {}),
+                "context": (
+                    self.llm.get_context_stats() if hasattr(self.llm, "get_context_stats") else {}
+                ),
             }
         except Exception as e:
             logger.debug("Failed to get LLM metrics summary: %s", e)
             return None
 
     def process_batch(
-        self, file_paths: list[Path], use_rag: bool = True
+        self,
+        file_paths: list[Path],
+        use_rag: bool = True,
+        max_workers: int | None = None,
+        force_reprocess: bool = False,
     ) -> list[ProcessingResult]:
         """Process multiple SDS files.
 
+        Files are processed sequentially unless more than one worker is
+        requested (``max_workers`` or ``ProcessingConfig.batch_workers``). Then
+        documents flow through a staged pipeline
+        (extract -> LLM -> enrichment -> indexing) where each stage has its own
+        pool, so OCR of one document overlaps the LLM pass of another
+        (see ``ParallelBatchEngine``).
+
         Args:
             file_paths: List of file paths
             use_rag: Whether to use RAG enrichment
+            max_workers: Extraction workers (default: ProcessingConfig.batch_workers;
+                1 processes files sequentially)
+            force_reprocess: Reprocess files even if already processed
 
         Returns:
-            List of ProcessingResult objects
+            List of ProcessingResult objects, in input order
         """
-        results = []
-
-        for i, file_path in enumerate(file_paths, 1):
-            logger.info("Processing file %d/%d", i, len(file_paths))
-
-            try:
-                result = self.process(file_path, use_rag=use_rag)
-                results.append(result)
-            except Exception as e:
-                logger.error("Failed to process %s: %s", file_path, e)
-                results.append(
-                    ProcessingResult(
-                        document_id=-1,
-                        filename=file_path.name,
-                        status="failed",
-                        extractions={},
-                        is_dangerous=False,
-                        completeness=0.0,
-                        avg_confidence=0.0,
-                        processing_time=0.0,
-                        error_message=str(e),
-                    )
-                )
+        workers = max_workers or self.settings.processing.batch_workers
+        if workers > 1 and len(file_paths) > 1:
+            results = self._process_batch_parallel(
+                file_paths, use_rag, workers, force_reprocess
+            )
+        else:
+            results = self._process_batch_sequential(file_paths, use_rag, force_reprocess)
 
         # Log final LLM metrics for the batch
         self._log_llm_metrics(f"batch of {len(results)} files")
@@ -1213,3 +1660,120 @@ class SDSProcessor:
         )
 
         return results
+
+    def iter_batch(
+        self,
+        file_paths: list[Path],
+        use_rag: bool = True,
+        max_workers: int | None = None,
+        force_reprocess: bool = False,
+        progress_callback=None,
+    ):
+        """Process files, yielding each result as it completes.
+
+        Workers are chosen as in ``process_batch``: with one worker files are
+        processed sequentially, in input order; with more they go through the
+        staged ``ParallelBatchEngine``.
+
+        Args:
+            file_paths: List of file paths
+            use_rag: Whether to use RAG enrichment
+            max_workers: Extraction workers (default: ProcessingConfig.batch_workers;
+                1 processes files sequentially)
+            force_reprocess: Reprocess files even if already processed
+            progress_callback: Optional callback(completed, total, result)
+
+        Yields:
+            ProcessingResult objects in completion order
+        """
+        from .batch_engine import ParallelBatchEngine
+
+        workers = max_workers or self.settings.processing.batch_workers
+        if workers <= 1 or len(file_paths) <= 1:
+            yield from self._iter_batch_sequential(
+                file_paths, use_rag, force_reprocess, progress_callback=progress_callback
+            )
+            return
+
+        engine = ParallelBatchEngine(self, max_workers=workers)
+        yield from engine.run(
+            file_paths,
+            use_rag=use_rag,
+            force_reprocess=force_reprocess,
+            progress_callback=progress_callback,
+        )
+
+    def _process_batch_parallel(
+        self,
+        file_paths: list[Path],
+        use_rag: bool,
+        max_workers: int,
+        force_reprocess: bool,
+    ) -> list[ProcessingResult]:
+        """Run the parallel engine and restore input order.
+
+        Files the engine never reported (a stage worker died, or the engine
+        stopped early) come back as failed results.
+        """
+        from .batch_engine import ParallelBatchEngine, _failed_result
+
+        engine = ParallelBatchEngine(self, max_workers=max_workers)
+        slots: list[ProcessingResult | None] = [None] * len(file_paths)
+        for index, result in engine.run_indexed(
+            file_paths, use_rag=use_rag, force_reprocess=force_reprocess
+        ):
+            slots[index] = result
+        return [
+            result if result is not None else _failed_result(Path(path), RuntimeError("not processed"))
+            for path, result in zip(file_paths, slots)
+        ]
+
+    def _process_batch_sequential(
+        self,
+        file_paths: list[Path],
+        use_rag: bool,
+        force_reprocess: bool,
+    ) -> list[ProcessingResult]:
+        """Process files one after another in the calling thread."""
+        return list(self._iter_batch_sequential(file_paths, use_rag, force_reprocess))
+
+    def _iter_batch_sequential(
+        self,
+        file_paths: list[Path],
+        use_rag: bool,
+        force_reprocess: bool,
+        progress_callback=None,
+    ):
+        """Yield the result of each file, processed one after another in the calling thread."""
+        prescanned: dict[Path, FileStatus] = {}
+        try:
+            prescanned = self.prescan(file_paths).by_path()
+        except Exception as e:
+            logger.warning("Dedup pre-scan failed, checking files one by one: %s", e)
+
+        for i, file_path in enumerate(file_paths, 1):
+            logger.info("Processing file %d/%d", i, len(file_paths))
+
+            try:
+                result = self.process(
+                    file_path,
+                    use_rag=use_rag,
+                    force_reprocess=force_reprocess,
+                    prescanned=prescanned.get(Path(file_path)),
+                )
+            except Exception as e:
+                logger.error("Failed to process %s: %s", file_path, e)
+                result = ProcessingResult(
+                    document_id=-1,
+                    filename=Path(file_path).name,
+                    status="failed",
+                    extractions={},
+                    is_dangerous=False,
+                    completeness=0.0,
+                    avg_confidence=0.0,
+                    processing_time=0.0,
+                    error_message=str(e),
+                )
+            if progress_callback:
+                progress_callback(i, len(file_paths), result)
+            yield result
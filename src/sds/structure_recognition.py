@@ -4,7 +4,7 @@ Chemical structure recognition from images in SDS documents.
 Extracts chemical structures from diagrams and converts to machine-readable formats
 (SMILES, InChI) with validation against PubChem.
 """
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
@@ -12,7 +12,7 @@ from PIL import Image
 import numpy as np
 
 from ..utils.logger import get_logger
-from ..utils.cache import SimpleCache
+from ..utils.cache import create_cache
 
 logger = get_logger(__name__)
 
@@ -143,7 +143,13 @@ class StructureRecognizer:
     
     def __init__(self, cache_ttl: int = 3600):
         """Initialize recognizer with caching."""
-        self.cache = SimpleCache(ttl_seconds=cache_ttl, max_size=100)
+        self.cache = create_cache(
+            "structure",
+            ttl_seconds=cache_ttl,
+            max_size=100,
+            encode=asdict,
+            decode=lambda data: StructureRecognitionResult(**data),
+        )
         self.image_extractor = StructureImageExtractor()
         logger.info("Structure recognizer initialized")
     
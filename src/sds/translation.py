@@ -4,12 +4,13 @@ Translation support for multi-language SDS processing.
 Supports automatic language detection and translation to English for extraction,
 while preserving original text.
 """
+import hashlib
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 from ..utils.logger import get_logger
-from ..utils.cache import SimpleCache
+from ..utils.cache import create_cache
 
 logger = get_logger(__name__)
 
@@ -148,7 +149,7 @@ class Translator:
     
     def __init__(self, cache_ttl: int = 3600):
         """Initialize translator with caching."""
-        self.cache = SimpleCache(ttl_seconds=cache_ttl, max_size=1000)
+        self.cache = create_cache("translation", ttl_seconds=cache_ttl, max_size=1000, max_bytes=32 * 1024 * 1024)
         self.detector = LanguageDetector()
         logger.info("Translator initialized with caching")
     
@@ -196,8 +197,10 @@ class Translator:
                 confidence=1.0,
             )
         
-        # Check cache
-        cache_key = f"{source_language.value}:{target_language.value}:{hash(text)}"
+        # Check cache (content digest: hash() is salted per process, which would
+        # defeat the persistent tier)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        cache_key = f"{source_language.value}:{target_language.value}:{digest}"
         cached = self.cache.get(cache_key)
         if cached is not None:
             logger.debug(f"Translation cache hit for {source_language} -> {target_language}")
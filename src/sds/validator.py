@@ -249,6 +249,19 @@ def validate_extraction_result(
     return result
 
 
+def validate_field_format(field_name: str, value: str) -> str | None:
+    """Check a value against the format rules of its field, ignoring confidence.
+
+    Args:
+        field_name: Field name
+        value: Value to check
+
+    Returns:
+        Error message or None if the value has a valid format
+    """
+    return FieldValidator()._validate_field_specific(field_name, value)
+
+
 def validate_full_consistency(extractions: dict[str, dict[str, Any]]) -> dict[str, Any] | None:
     """
     Perform cross-field consistency checks on the full extraction set.
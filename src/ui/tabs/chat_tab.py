@@ -6,10 +6,15 @@ with RAG (Retrieval-Augmented Generation) and LLM responses.
 
 from __future__ import annotations
 
-from PySide6 import QtWidgets
+from PySide6 import QtGui, QtWidgets
 
 from . import BaseTab, TabContext
 from ..components import TaskRunner, WorkerSignals
+from ...rag.query_tracker import QueryTracker
+from ...rag.retriever import RAGRetriever
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class ChatTab(BaseTab):
@@ -17,8 +22,25 @@ class ChatTab(BaseTab):
 
     def __init__(self, context: TabContext) -> None:
         super().__init__(context)
+        self._streamed_answer = False
+        self._retriever: RAGRetriever | None = None
         self._build_ui()
 
+    def _get_retriever(self) -> RAGRetriever:
+        """RAG retriever over the knowledge base, logging answers to the query tracker."""
+        if self._retriever is None:
+            try:
+                tracker = QueryTracker(self.context.db)
+            except Exception as e:
+                logger.warning("Query tracking unavailable for chat: %s", e)
+                tracker = None
+            self._retriever = RAGRetriever(
+                vector_store=self.context.ingestion.vector_store,
+                ollama_client=self.context.ollama,
+                query_tracker=tracker,
+            )
+        return self._retriever
+
     def _build_ui(self) -> None:
         """Build the chat tab UI."""
         layout = QtWidgets.QVBoxLayout(self)
@@ -93,41 +115,66 @@ class ChatTab(BaseTab):
         self.chat_status.setText("🤔 Thinking...")
         self._style_label(self.chat_status, color=self.colors.get("accent", "#4fd1c5"))
 
-        # Run in background thread
-        self._start_task(self._chat_task, text, on_result=self._on_chat_response, on_progress=None)
+        # Run in background thread; tokens arrive through on_data as they stream
+        self._streamed_answer = False
+        self._start_task(
+            self._chat_task,
+            text,
+            on_result=self._on_chat_response,
+            on_progress=None,
+            on_data=self._on_chat_token,
+        )
 
     def _chat_task(self, text: str, *, signals: WorkerSignals | None = None) -> object:
         """Execute chat task in background."""
         try:
-            # Get RAG context from vector store
-            vector_store = self.context.ingestion.vector_store
-            results = vector_store.search_with_context(text, k=3)
-
-            context = ""
-            if results:
-                context = results  # search_with_context returns a formatted string
-                if signals and context:
-                    signals.message.emit("Found relevant documents for context")
-            else:
-                if signals:
-                    signals.message.emit("No relevant documents found in knowledge base")
-
-            # Get Ollama response with context
-            response = self.context.ollama.chat(message=text, context=context)
-            return response
+            # Retrieval, streamed generation and query logging (see RAGRetriever.answer_stream)
+            for event in self._get_retriever().answer_stream(text, k=3):
+                kind = event["type"]
+                if kind == "retrieval":
+                    if signals:
+                        signals.message.emit(
+                            "Found relevant documents for context"
+                            if event["result_count"]
+                            else "No relevant documents found in knowledge base"
+                        )
+                elif kind == "token":
+                    if signals:
+                        signals.data.emit({"type": "chat_token", "text": event["text"]})
+                elif kind == "error":
+                    if signals:
+                        signals.error.emit(event["message"])
+                    return None
+                elif kind == "done":
+                    return event["answer"]
+            return None
         except Exception as e:
             if signals:
                 signals.error.emit(str(e))
             return None
 
+    def _on_chat_token(self, data: dict) -> None:
+        """Append a streamed answer chunk to the chat display."""
+        if data.get("type") != "chat_token":
+            return
+        if not self._streamed_answer:
+            self._streamed_answer = True
+            self.chat_display.append("<b>Assistant:</b> ")
+            self.chat_status.setText("✍️ Answering...")
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        cursor.insertText(data.get("text", ""))
+        self.chat_display.setTextCursor(cursor)
+
     def _on_chat_response(self, response: object) -> None:
         """Handle chat response from Ollama."""
         self.chat_input.setEnabled(True)
 
         if response:
-            # Format the response nicely
-            response_text = str(response).strip()
-            self.chat_display.append(f"<b>Assistant:</b> {response_text}")
+            if not self._streamed_answer:
+                # Format the response nicely
+                response_text = str(response).strip()
+                self.chat_display.append(f"<b>Assistant:</b> {response_text}")
             self.chat_status.setText("✓ Response received")
             self._style_label(self.chat_status, color=self.colors.get("success", "#22c55e"))
             self._set_status("Chat response received")
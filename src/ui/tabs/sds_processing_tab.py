@@ -15,6 +15,7 @@ from PySide6 import QtCore, QtGui, QtWidgets
 
 from . import BaseTab, TabContext
 from ...config.constants import SUPPORTED_FORMATS
+from ...sds.dedup_scan import DedupScanner
 from ...sds.regex_catalog import get_regex_catalog
 from ...sds.profile_router import ProfileRouter
 from ..components import WorkerSignals
@@ -416,25 +417,32 @@ class SDSProcessingTab(BaseTab):
         if not self.selected_folder:
             return
         
-        files: list[Path] = []
-        for suffix in SUPPORTED_FORMATS:
-            files.extend(self.selected_folder.rglob(f"*{suffix}"))
+        # One query resolves the whole folder; files are only matched against
+        # cached hashes (or by name+size), never read, so large shares list fast
+        try:
+            scan = DedupScanner(self.context.db).scan_folder(
+                self.selected_folder, SUPPORTED_FORMATS, hash_missing=False
+            )
+        except Exception as exc:
+            logger.warning("Dedup pre-scan failed: %s", exc)
+            scan = DedupScanner().scan_folder(
+                self.selected_folder, SUPPORTED_FORMATS, hash_missing=False
+            )
+        files = [status.path for status in scan.files]
 
         # Clear table and populate
         self.batch_table.clearContents()
         self.batch_table.setRowCount(len(files))
 
-        # Get processed files metadata with timestamps
-        try:
-            processed_metadata = self.context.db.get_processed_files_metadata()
-            processed_names = {name for (name, _size) in processed_metadata.keys()}
-            processed_timestamps = self.context.db.get_processed_files_with_timestamps()
-        except Exception:
-            processed_names = set()
-            processed_timestamps = {}
-
-        for idx, file_path in enumerate(files):
-            is_processed = file_path.name in processed_names
+        processed_timestamps = {
+            status.path: status.processed_at.strftime("%Y-%m-%d %H:%M:%S")
+            for status in scan.processed
+            if status.processed_at
+        }
+
+        for idx, status in enumerate(scan.files):
+            file_path = status.path
+            is_processed = status.processed
             is_failed = file_path.name in self.failed_files
 
             # Column 0: Checkbox (centered)
@@ -479,7 +487,7 @@ class SDSProcessingTab(BaseTab):
                 status_text = f"❌ Process attempt failed on {self.failed_files[file_path.name]}"
                 status_color = self.colors.get("error", "#f38ba8")
             elif is_processed:
-                timestamp = processed_timestamps.get(file_path.name, "")
+                timestamp = processed_timestamps.get(file_path, "")
                 if timestamp:
                     if self.process_all_checkbox.isChecked():
                         status_text = f"↻ Will reprocess (Processed at {timestamp})"
@@ -495,7 +503,7 @@ class SDSProcessingTab(BaseTab):
                 status_color = self.colors.get("text", "#ffffff")
             status_item = QtWidgets.QTableWidgetItem(status_text)
             # Store the timestamp in UserRole for later reference
-            timestamp = processed_timestamps.get(file_path.name, "")
+            timestamp = processed_timestamps.get(file_path, "")
             status_item.setData(QtCore.Qt.ItemDataRole.UserRole, timestamp)
             status_item.setForeground(QtGui.QColor(status_color))
             status_item.setFlags(status_item.flags() & ~QtCore.Qt.ItemFlag.ItemIsEditable)  # Make read-only
@@ -926,12 +934,12 @@ class SDSProcessingTab(BaseTab):
     def _build_matrix_task(self, *, signals: WorkerSignals | None = None) -> dict:
         """Build compatibility matrix in background."""
         try:
-            from ...matrix.builder import MatrixBuilder
-            builder = MatrixBuilder(self.context.db)
-            matrix = builder.build()
+            from ...matrix.incremental import IncrementalMatrixService
+            service = IncrementalMatrixService(self.context.db)
+            result, delta = service.refresh()
             if signals:
-                signals.message.emit("Matrix built successfully")
-            return {"success": True, "matrix": matrix}
+                signals.message.emit(delta.summary())
+            return {"success": True, "matrix": result.to_frame(), "delta": delta}
         except Exception as e:
             if signals:
                 signals.error.emit(str(e))
@@ -940,7 +948,12 @@ class SDSProcessingTab(BaseTab):
     def _on_matrix_done(self, result: object) -> None:
         """Handle matrix building completion."""
         if isinstance(result, dict) and result.get("success"):
-            self._set_status("Compatibility matrix built successfully")
+            delta = result.get("delta")
+            self._set_status(
+                f"Compatibility matrix built successfully ({delta.summary()})"
+                if delta
+                else "Compatibility matrix built successfully"
+            )
         else:
             self._set_status("Matrix building failed", error=True)
 
@@ -385,12 +385,12 @@ class SDSTab(BaseTab):
     def _build_matrix_task(self, *, signals: WorkerSignals | None = None) -> dict:
         """Build compatibility matrix in background."""
         try:
-            from ...matrix.builder import MatrixBuilder
-            builder = MatrixBuilder(self.context.db)
-            matrix = builder.build()
+            from ...matrix.incremental import IncrementalMatrixService
+            service = IncrementalMatrixService(self.context.db)
+            result, delta = service.refresh()
             if signals:
-                signals.message.emit("Matrix built successfully")
-            return {"success": True, "matrix": matrix}
+                signals.message.emit(delta.summary())
+            return {"success": True, "matrix": result.to_frame(), "delta": delta}
         except Exception as e:
             if signals:
                 signals.error.emit(str(e))
@@ -399,7 +399,12 @@ class SDSTab(BaseTab):
     def _on_matrix_done(self, result: object) -> None:
         """Handle matrix building completion."""
         if isinstance(result, dict) and result.get("success"):
-            self._set_status("Compatibility matrix built successfully")
+            delta = result.get("delta")
+            self._set_status(
+                f"Compatibility matrix built successfully ({delta.summary()})"
+                if delta
+                else "Compatibility matrix built successfully"
+            )
         else:
             self._set_status(f"Matrix building failed", error=True)
 
@@ -1,209 +1,564 @@
+"""In-memory TTL/LRU cache for API responses, with an optional persistent tier.
+
+``TTLCache`` backs the PubChem, translation and structure-recognition
+caches. Keys are spread over lock-striped shards so concurrent lookups
+(batch validation runs several threads) rarely wait on each other. Each
+shard keeps two ordered dicts:
+
+- entries in LRU order, for O(1) hits (``move_to_end``) and O(1) eviction
+  of the least recently used entry (``popitem(last=False)``);
+- keys in insertion order, which with a single TTL is also expiry order,
+  so expired entries are dropped from the front in O(1) each (entries read
+  back from the persistent tier may expire earlier; lookups still check).
+
+Limits are per shard (the totals divided evenly) and count both entries and
+estimated bytes. Hits, misses, evictions and expirations are counted per
+shard under the shard's lock and summed by ``get_stats``.
+
+With ``API_CACHE_PERSISTENT`` enabled, caches created through
+``create_cache`` also write through to ``SQLiteCacheBackend`` (one SQLite
+file in WAL mode, one namespace per cache, as ``PersistentLLMCache``) and
+read through it on a memory miss, so they survive restarts.
 """
-Simple in-memory cache with TTL support for API responses.
-"""
-import time
-from dataclasses import dataclass
-from typing import Any, Optional, Dict
+
+from __future__ import annotations
+
 import hashlib
 import json
+import math
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable
 
+from ..config.settings import get_settings
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+_DEFAULT_SHARDS = 16
+# Shards are only added while each one keeps at least this many entries, so
+# small caches stay one exact LRU
+_MIN_SHARD_ENTRIES = 64
 
-@dataclass
-class CacheEntry:
-    """Cache entry with value and expiration."""
-    value: Any
-    expires_at: float
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_api_cache_accessed ON api_cache(accessed_at);
+"""
 
 
-class SimpleCache:
-    """
-    Thread-safe in-memory cache with TTL support.
-    
-    Features:
-    - Time-to-live (TTL) expiration
-    - LRU-style eviction when max size reached
-    - Thread-safe operations
-    - Hit/miss statistics
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory footprint of a value in bytes (containers up to 4 levels deep)."""
+    size = sys.getsizeof(value)
+    if _depth >= 4 or isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class _Shard:
+    __slots__ = (
+        "lock",
+        "entries",
+        "expiry",
+        "bytes",
+        "hits",
+        "persistent_hits",
+        "misses",
+        "evictions",
+        "expirations",
+    )
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()  # LRU order, oldest first
+        self.expiry: OrderedDict[str, None] = OrderedDict()  # insertion (= expiry) order
+        self.bytes = 0
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class SQLiteCacheBackend:
+    """SQLite persistent tier shared by several caches (one namespace each).
+
+    SQLite rather than DuckDB for the same reason as ``PersistentLLMCache``:
+    several processes (batch-engine workers) may write to the same file.
     """
-    
-    def __init__(self, ttl_seconds: int = 3600, max_size: int = 1000):
+
+    def __init__(self, path: Path, max_bytes: int = 0, evict_every: int = 100) -> None:
+        """Initialize backend.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Budget for stored values over all namespaces (0 disables size eviction)
+            evict_every: Run eviction after this many writes from this process
         """
-        Initialize cache.
-        
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # sqlite3 connections are per-thread; each process opens its own
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> tuple[str, float] | None:
+        """Return ``(json_value, expires_at)`` of a live entry (0 = no expiry), or None."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at FROM api_cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] and row[1] <= now:
+                conn.execute("DELETE FROM api_cache WHERE namespace = ? AND key = ?", (namespace, key))
+                return None
+            conn.execute(
+                "UPDATE api_cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+            )
+            return row[0], row[1]
+        except sqlite3.Error as exc:
+            logger.warning("API cache read failed: %s", exc)
+            return None
+
+    def set(self, namespace: str, key: str, value: str, expires_at: float) -> None:
+        """Store a JSON-encoded value (``expires_at`` 0 = no expiry)."""
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO api_cache (namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, value, expires_at, time.time()),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("API cache write failed: %s", exc)
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._connect().execute("DELETE FROM api_cache WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error as exc:
+            logger.warning("API cache delete failed: %s", exc)
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to the size budget (least recently read first).
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            conn = self._connect()
+            removed = conn.execute(
+                "DELETE FROM api_cache WHERE expires_at > 0 AND expires_at <= ?", (time.time(),)
+            ).rowcount
+            if self.max_bytes:
+                removed += conn.execute(
+                    """
+                    DELETE FROM api_cache WHERE (namespace, key) IN (
+                        SELECT namespace, key FROM (
+                            SELECT namespace, key, SUM(LENGTH(value)) OVER (
+                                ORDER BY accessed_at DESC, namespace, key
+                            ) AS running_bytes
+                            FROM api_cache
+                        ) WHERE running_bytes > ?
+                    )
+                    """,
+                    (self.max_bytes,),
+                ).rowcount
+        except sqlite3.Error as exc:
+            logger.warning("API cache eviction failed: %s", exc)
+            return 0
+        if removed:
+            logger.debug("API cache evicted %d entries", removed)
+        return removed
+
+    def clear(self, namespace: str) -> int:
+        """Delete all entries of a namespace."""
+        try:
+            return self._connect().execute("DELETE FROM api_cache WHERE namespace = ?", (namespace,)).rowcount
+        except sqlite3.Error as exc:
+            logger.warning("Failed to clear API cache: %s", exc)
+            return 0
+
+    def get_stats(self, namespace: str) -> dict[str, Any]:
+        """Entries and stored bytes of a namespace."""
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM api_cache WHERE namespace = ?",
+                (namespace,),
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = 0, 0
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes}
+
+
+class TTLCache:
+    """Thread-safe, lock-striped in-memory cache with TTL, LRU eviction and size limits."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_size: int = 1000,
+        max_bytes: int = 0,
+        shards: int | None = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        backend: SQLiteCacheBackend | None = None,
+        namespace: str = "default",
+        encode: Callable[[Any], Any] | None = None,
+        decode: Callable[[Any], Any] | None = None,
+    ) -> None:
+        """Initialize cache.
+
         Args:
-            ttl_seconds: Time-to-live for cache entries (default 1 hour)
-            max_size: Maximum number of entries (default 1000)
+            ttl_seconds: Time-to-live for entries (0 keeps entries until evicted)
+            max_size: Maximum number of entries
+            max_bytes: Maximum estimated size of the values (0 disables the byte limit)
+            shards: Lock stripes (default: up to 16, at least 64 entries each)
+            sizeof: Value size estimator for ``max_bytes``
+            backend: Optional persistent tier (write-through, read on memory miss)
+            namespace: Namespace of this cache in the backend
+            encode: Turns a value into JSON-serializable data for the backend
+            decode: Inverse of ``encode``
         """
-        self._cache: Dict[str, CacheEntry] = {}
+        if shards is None:
+            shards = min(_DEFAULT_SHARDS, max_size // _MIN_SHARD_ENTRIES)
+        self._shards = [_Shard() for _ in range(max(1, shards))]
         self._ttl = ttl_seconds
         self._max_size = max_size
-        self._hits = 0
-        self._misses = 0
-        self._evictions = 0
-    
+        self._max_bytes = max_bytes
+        self._shard_max_size = max(1, math.ceil(max_size / len(self._shards)))
+        self._shard_max_bytes = math.ceil(max_bytes / len(self._shards)) if max_bytes else 0
+        self._sizeof = sizeof
+        self._backend = backend
+        self._namespace = namespace
+        self._encode = encode
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
     def _make_key(self, *args, **kwargs) -> str:
-        """
-        Generate cache key from arguments.
-        
-        Args:
-            *args: Positional arguments
-            **kwargs: Keyword arguments
-        
-        Returns:
-            Hash-based cache key
-        """
-        # Serialize arguments to JSON for consistent hashing
-        key_data = {
-            "args": args,
-            "kwargs": kwargs
-        }
-        key_str = json.dumps(key_data, sort_keys=True)
+        """Generate a hash-based cache key from arguments (JSON-serialized)."""
+        key_str = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True)
         return hashlib.sha256(key_str.encode()).hexdigest()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """
-        Get value from cache.
-        
+
+    def get(self, key: str) -> Any | None:
+        """Get a value from cache.
+
         Args:
             key: Cache key
-        
+
         Returns:
             Cached value or None if not found/expired
         """
-        entry = self._cache.get(key)
-        
-        if entry is None:
-            self._misses += 1
-            return None
-        
-        # Check if expired
-        if time.time() > entry.expires_at:
-            del self._cache[key]
-            self._misses += 1
-            return None
-        
-        self._hits += 1
-        return entry.value
-    
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    shard.entries.move_to_end(key)
+                    shard.hits += 1
+                    return entry.value
+                self._remove(shard, key)
+                shard.expirations += 1
+            if self._backend is None:
+                shard.misses += 1
+                return None
+
+        value = self._load(key)
+        with shard.lock:
+            if value is None:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                shard.persistent_hits += 1
+        return value
+
     def set(self, key: str, value: Any) -> None:
-        """
-        Set value in cache.
-        
+        """Set a value in cache (and the persistent tier, when configured).
+
         Args:
             key: Cache key
             value: Value to cache
         """
-        # Evict oldest entries if at max size
-        if len(self._cache) >= self._max_size:
-            self._evict_oldest()
-        
-        expires_at = time.time() + self._ttl
-        self._cache[key] = CacheEntry(value=value, expires_at=expires_at)
-    
-    def _evict_oldest(self) -> None:
-        """Evict oldest (first expired or earliest expiration) entry."""
-        if not self._cache:
-            return
-        
-        # Find entry with earliest expiration
-        oldest_key = min(self._cache.items(), key=lambda x: x[1].expires_at)[0]
-        del self._cache[oldest_key]
-        self._evictions += 1
-    
+        expires_at = time.time() + self._ttl if self._ttl else math.inf
+        self._store(key, value, expires_at)
+        if self._backend is not None and value is not None:
+            try:
+                data = json.dumps(self._encode(value) if self._encode else value, ensure_ascii=False)
+            except (TypeError, ValueError) as exc:
+                logger.debug("Not persisting %s cache entry: %s", self._namespace, exc)
+                return
+            self._backend.set(self._namespace, key, data, 0.0 if math.isinf(expires_at) else expires_at)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from cache (both tiers)."""
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.entries:
+                self._remove(shard, key)
+        if self._backend is not None:
+            self._backend.delete(self._namespace, key)
+
     def clear(self) -> None:
-        """Clear all cache entries."""
-        count = len(self._cache)
-        self._cache.clear()
-        logger.info(f"Cache cleared ({count} entries removed)")
-    
-    def get_stats(self) -> Dict[str, Any]:
+        """Clear all cache entries (both tiers)."""
+        count = 0
+        for shard in self._shards:
+            with shard.lock:
+                count += len(shard.entries)
+                shard.entries.clear()
+                shard.expiry.clear()
+                shard.bytes = 0
+        if self._backend is not None:
+            count += self._backend.clear(self._namespace)
+        logger.info("Cache cleared (%d entries removed)", count)
+
+    def cleanup_expired(self) -> int:
+        """Remove expired entries from memory.
+
+        Returns:
+            Number of entries removed
         """
-        Get cache statistics.
-        
+        now = time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += self._expire(shard, now)
+        if removed:
+            logger.debug("Cleaned up %d expired cache entries", removed)
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
         Returns:
-            Dictionary with cache stats
+            Dictionary with size, limits, hit/miss/eviction counters and hit rate
         """
-        total_requests = self._hits + self._misses
-        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0.0
-        
+        totals = dict.fromkeys(("size", "bytes", "hits", "persistent_hits", "misses", "evictions", "expirations"), 0)
+        for shard in self._shards:
+            with shard.lock:
+                totals["size"] += len(shard.entries)
+                totals["bytes"] += shard.bytes
+                totals["hits"] += shard.hits
+                totals["persistent_hits"] += shard.persistent_hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+        lookups = totals["hits"] + totals["misses"]
         return {
-            "size": len(self._cache),
+            **totals,
             "max_size": self._max_size,
-            "hits": self._hits,
-            "misses": self._misses,
-            "evictions": self._evictions,
-            "hit_rate": hit_rate,
+            "max_bytes": self._max_bytes,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
             "ttl_seconds": self._ttl,
+            "shards": len(self._shards),
+            "persistent": self._backend.get_stats(self._namespace) if self._backend is not None else None,
         }
-    
-    def cleanup_expired(self) -> int:
-        """
-        Remove expired entries.
-        
-        Returns:
-            Number of entries removed
-        """
-        now = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if now > entry.expires_at
-        ]
-        
-        for key in expired_keys:
-            del self._cache[key]
-        
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-        
-        return len(expired_keys)
+
+    # === Private Methods ===
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        size = self._sizeof(value) if self._shard_max_bytes else 0
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.entries:
+                self._remove(shard, key)
+            if self._shard_max_bytes and size > self._shard_max_bytes:
+                return  # larger than the shard budget: persistent tier only
+            shard.entries[key] = _Entry(value, expires_at, size)
+            shard.expiry[key] = None
+            shard.bytes += size
+            self._expire(shard, time.time())
+            while len(shard.entries) > self._shard_max_size or (
+                self._shard_max_bytes and shard.bytes > self._shard_max_bytes
+            ):
+                oldest, entry = shard.entries.popitem(last=False)
+                del shard.expiry[oldest]
+                shard.bytes -= entry.size
+                shard.evictions += 1
+
+    def _load(self, key: str) -> Any | None:
+        """Read a key from the persistent tier into memory."""
+        stored = self._backend.get(self._namespace, key)
+        if stored is None:
+            return None
+        data, expires_at = stored
+        try:
+            value = json.loads(data)
+            if self._decode:
+                value = self._decode(value)
+        except Exception as exc:
+            logger.debug("Dropping unreadable %s cache entry: %s", self._namespace, exc)
+            self._backend.delete(self._namespace, key)
+            return None
+        self._store(key, value, expires_at or math.inf)
+        return value
+
+    @staticmethod
+    def _remove(shard: _Shard, key: str) -> None:
+        entry = shard.entries.pop(key)
+        del shard.expiry[key]
+        shard.bytes -= entry.size
+
+    @staticmethod
+    def _expire(shard: _Shard, now: float) -> int:
+        """Drop expired entries from the front of the expiry order."""
+        removed = 0
+        while shard.expiry:
+            key = next(iter(shard.expiry))
+            if shard.entries[key].expires_at > now:
+                break
+            TTLCache._remove(shard, key)
+            shard.expirations += 1
+            removed += 1
+        return removed
+
+
+# Former name of TTLCache, kept for compatibility
+SimpleCache = TTLCache
+
+
+@lru_cache(maxsize=1)
+def get_cache_backend() -> SQLiteCacheBackend | None:
+    """Get the shared persistent cache tier, or None when disabled."""
+    settings = get_settings()
+    if not settings.processing.api_cache_persistent:
+        return None
+    try:
+        return SQLiteCacheBackend(
+            settings.paths.api_cache, max_bytes=settings.processing.api_cache_max_mb * 1024 * 1024
+        )
+    except Exception as exc:
+        logger.warning("Persistent API cache unavailable: %s", exc)
+        return None
+
+
+def create_cache(
+    namespace: str,
+    ttl_seconds: float = 3600,
+    max_size: int = 1000,
+    max_bytes: int = 0,
+    encode: Callable[[Any], Any] | None = None,
+    decode: Callable[[Any], Any] | None = None,
+) -> TTLCache:
+    """Create a cache backed by the shared persistent tier when it is enabled.
+
+    Args:
+        namespace: Name of the cache in the persistent tier
+        ttl_seconds: Time-to-live for entries
+        max_size: Maximum number of in-memory entries
+        max_bytes: Maximum estimated in-memory size (0 disables the byte limit)
+        encode: Turns a value into JSON-serializable data for the persistent tier
+        decode: Inverse of ``encode``
+
+    Returns:
+        TTLCache instance
+    """
+    return TTLCache(
+        ttl_seconds=ttl_seconds,
+        max_size=max_size,
+        max_bytes=max_bytes,
+        backend=get_cache_backend(),
+        namespace=namespace,
+        encode=encode,
+        decode=decode,
+    )
 
 
 class CachedFunction:
     """
     Decorator for caching function results.
-    
+
     Example:
         @CachedFunction(ttl_seconds=3600)
         def expensive_api_call(param1, param2):
             return fetch_data(param1, param2)
     """
-    
+
     def __init__(self, ttl_seconds: int = 3600, max_size: int = 1000):
         """
         Initialize cached function decorator.
-        
+
         Args:
             ttl_seconds: Time-to-live for cached results
             max_size: Maximum cache size
         """
-        self.cache = SimpleCache(ttl_seconds=ttl_seconds, max_size=max_size)
-    
+        self.cache = TTLCache(ttl_seconds=ttl_seconds, max_size=max_size)
+
     def __call__(self, func):
         """Wrap function with caching."""
         def wrapper(*args, **kwargs):
             # Generate cache key
             cache_key = self.cache._make_key(*args, **kwargs)
-            
+
             # Try to get from cache
             result = self.cache.get(cache_key)
             if result is not None:
-                logger.debug(f"Cache hit for {func.__name__}")
+                logger.debug("Cache hit for %s", func.__name__)
                 return result
-            
+
             # Call function and cache result
-            logger.debug(f"Cache miss for {func.__name__}, calling function")
+            logger.debug("Cache miss for %s, calling function", func.__name__)
             result = func(*args, **kwargs)
             self.cache.set(cache_key, result)
-            
+
             return result
-        
+
         # Attach cache instance for stats access
         wrapper.cache = self.cache
         wrapper.__name__ = func.__name__
         wrapper.__doc__ = func.__doc__
-        
+
         return wrapper
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -5,3 +6,6 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Keep test runs hermetic: don't read or write the on-disk LLM response cache
+os.environ.setdefault("LLM_CACHE_PERSISTENT", "false")
@@ -0,0 +1,96 @@
+"""Tests for the pooled asyncio Ollama client."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.models.async_ollama import AsyncOllamaClient
+from src.models.ollama_client import OllamaClient
+
+
+class _SlowServer:
+    """MockTransport handler that tracks how many requests overlap."""
+
+    def __init__(self, delay=0.02, status=200):
+        self.delay = delay
+        self.status = status
+        self.active = 0
+        self.peak = 0
+        self.bodies = []
+
+    async def __call__(self, request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        body = json.loads(request.content)
+        self.bodies.append(body)
+        content = body["messages"][-1]["content"]
+        return httpx.Response(self.status, json={"message": {"content": f"echo:{content}"}})
+
+
+def _payload(text):
+    return {"model": "m", "messages": [{"role": "user", "content": text}], "stream": False}
+
+
+def test_sync_callers_share_pool_and_respect_concurrency_limit():
+    server = _SlowServer()
+    client = AsyncOllamaClient("http://ollama", max_concurrency=2, transport=httpx.MockTransport(server))
+    results = {}
+
+    def caller(i):
+        results[i] = client.chat_sync(_payload(str(i)))
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: f"echo:{i}" for i in range(6)}
+    assert server.peak == 2
+    stats = client.get_stats()
+    assert stats["requests"] == 6
+    assert stats["peak_in_flight"] == 2
+    assert stats["avg_queue_wait_s"] > 0
+    client.close()
+
+
+def test_coroutines_work_from_another_event_loop_and_keep_order():
+    server = _SlowServer(delay=0.0)
+    client = AsyncOllamaClient("http://ollama", max_concurrency=4, transport=httpx.MockTransport(server))
+
+    single = asyncio.run(client.chat(_payload("a")))
+    many = client.chat_many_sync([_payload("x"), _payload("y"), _payload("z")])
+
+    assert single == "echo:a"
+    assert many == ["echo:x", "echo:y", "echo:z"]
+    client.close()
+
+
+def test_http_errors_propagate_and_are_counted():
+    server = _SlowServer(delay=0.0, status=500)
+    client = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(server))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.chat_sync(_payload("boom"))
+    assert client.get_stats()["errors"] == 1
+    client.close()
+
+
+def test_ollama_client_routes_chat_completion_through_shared_client():
+    server = _SlowServer(delay=0.0)
+    pooled = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(server))
+    client = OllamaClient(base_url="http://ollama")
+
+    with patch("src.models.ollama_client.get_async_ollama_client", return_value=pooled):
+        answer = client._chat_completion(model="m", system="sys", user="hello")
+
+    assert answer == "echo:hello"
+    assert server.bodies[0]["messages"][0] == {"role": "system", "content": "sys"}
+    assert server.bodies[0]["options"]["temperature"] == client.temperature
+    pooled.close()
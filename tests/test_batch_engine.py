@@ -0,0 +1,221 @@
+import threading
+import time
+from pathlib import Path
+
+from src.sds.batch_engine import ParallelBatchEngine
+from src.sds.dedup_scan import FileStatus, FolderScan
+from src.sds.processor import DocumentState, LocalExtraction, ProcessingResult, SDSProcessor
+
+
+def _result(file_path, doc_id, status="success", error=None):
+    return ProcessingResult(
+        document_id=doc_id,
+        filename=Path(file_path).name,
+        status=status,
+        extractions={},
+        is_dangerous=False,
+        completeness=1.0,
+        avg_confidence=1.0,
+        processing_time=0.0,
+        error_message=error,
+    )
+
+
+class _StubProcessor:
+    def __init__(self, cached=(), fail_extract=(), fail_enrich=(), extract_delay=None, llm_delay=0.0):
+        self.cached = set(cached)
+        self.fail_extract = set(fail_extract)
+        self.fail_enrich = set(fail_enrich)
+        self.extract_delay = extract_delay or {}
+        self.llm_delay = llm_delay
+        self.in_flight = 0
+        self.max_seen = 0
+        self.indexed_in_background = []
+        self._lock = threading.Lock()
+
+    def prescan(self, file_paths):
+        self.prescanned = list(file_paths)
+        return FolderScan(files=[])
+
+    def prepare_document(self, file_path, force_reprocess=False, prescanned=None):
+        name = Path(file_path).name
+        doc_id = int(name.split(".")[0][1:])
+        if name in self.cached and not force_reprocess:
+            return _result(file_path, doc_id, status="cached"), doc_id
+        with self._lock:
+            self.in_flight += 1
+            self.max_seen = max(self.max_seen, self.in_flight)
+        return None, doc_id
+
+    def run_local_extraction(self, file_path, progress_callback=None, refresh_cache=False):
+        name = Path(file_path).name
+        time.sleep(self.extract_delay.get(name, 0.01))
+        if name in self.fail_extract:
+            raise RuntimeError("broken pdf")
+        return LocalExtraction(text=name, sections={}, page_count=1, extractions={})
+
+    def run_llm_stage(self, doc_id, file_path, local, start_time):
+        time.sleep(self.llm_delay)
+        return DocumentState(
+            doc_id=doc_id,
+            file_path=Path(file_path),
+            start_time=start_time,
+            text=local.text,
+            sections={},
+            extractions={},
+        )
+
+    def run_enrichment_stage(self, state, use_rag=True):
+        if state.file_path.name in self.fail_enrich:
+            raise RuntimeError("pubchem down")
+        return state
+
+    def complete_document(self, state, index_in_background=True):
+        self.indexed_in_background.append(index_in_background)
+        with self._lock:
+            self.in_flight -= 1
+        return _result(state.file_path, state.doc_id)
+
+    def _fail_document(self, doc_id, file_path, start_time, error):
+        with self._lock:
+            self.in_flight -= 1
+        return _result(file_path, doc_id, status="failed", error=str(error))
+
+
+def _paths(n):
+    return [Path(f"d{i}.pdf") for i in range(1, n + 1)]
+
+
+def _engine(processor, **kwargs):
+    options = {"max_workers": 2, "llm_workers": 1, "enrich_workers": 2, "index_workers": 1}
+    options.update(kwargs)
+    return ParallelBatchEngine(processor, use_processes=False, **options)
+
+
+def test_engine_processes_all_files_and_reports_progress():
+    processor = _StubProcessor(cached={"d2.pdf"}, fail_extract={"d3.pdf"}, fail_enrich={"d4.pdf"})
+    engine = _engine(processor)
+    progress = []
+
+    results = list(engine.run(_paths(5), progress_callback=lambda c, t, r: progress.append((c, t))))
+
+    by_name = {r.filename: r for r in results}
+    assert sorted(by_name) == ["d1.pdf", "d2.pdf", "d3.pdf", "d4.pdf", "d5.pdf"]
+    assert by_name["d2.pdf"].status == "cached"
+    assert by_name["d3.pdf"].error_message == "broken pdf"
+    assert by_name["d4.pdf"].error_message == "pubchem down"
+    assert by_name["d1.pdf"].status == "success"
+    assert progress == [(i, 5) for i in range(1, 6)]
+    assert processor.in_flight == 0
+    assert processor.indexed_in_background == [False, False]
+
+
+def test_engine_bounds_documents_in_flight_with_queues():
+    processor = _StubProcessor(llm_delay=0.02)
+    engine = _engine(processor, queue_size=1)
+
+    results = list(engine.run(_paths(12)))
+
+    assert len(results) == 12
+    # Each stage holds at most its queue plus its workers (+1 job blocked on put)
+    bound = sum(1 + workers + 1 for workers in (2, 1, 2, 1))
+    assert processor.max_seen <= bound
+    assert processor.in_flight == 0
+
+
+def test_engine_streams_results_in_completion_order():
+    processor = _StubProcessor(extract_delay={"d1.pdf": 0.3})
+    engine = _engine(processor)
+
+    names = [r.filename for r in engine.run(_paths(3))]
+
+    assert names[-1] == "d1.pdf"
+
+
+def test_engine_reports_stage_stats():
+    processor = _StubProcessor(fail_extract={"d2.pdf"})
+    engine = _engine(processor)
+
+    list(engine.run(_paths(4)))
+
+    stats = {s["name"]: s for s in engine.get_stage_stats()}
+    assert list(stats) == ["extract", "llm", "enrich", "index"]
+    assert stats["extract"]["processed"] == 3
+    assert stats["extract"]["failed"] == 1
+    assert stats["index"]["processed"] == 3
+    assert stats["llm"]["throughput_per_s"] > 0
+    assert stats["llm"]["queue_capacity"] == 1
+    assert all(s["queue_depth"] == 0 for s in stats.values())
+
+
+def test_engine_stops_cleanly_when_consumer_breaks_early():
+    processor = _StubProcessor(llm_delay=0.02)
+    engine = _engine(processor, queue_size=1)
+
+    for _ in engine.run(_paths(20)):
+        break
+
+    stage_threads = ("SDS_Feed", "SDS_extract", "SDS_llm", "SDS_enrich", "SDS_index")
+    assert not [t for t in threading.enumerate() if t.name.startswith(stage_threads)]
+
+
+def test_engine_finishes_when_failure_cannot_be_recorded():
+    class _BrokenStore(_StubProcessor):
+        def _fail_document(self, doc_id, file_path, start_time, error):
+            raise RuntimeError("database is locked")
+
+    processor = _BrokenStore(fail_extract={"d2.pdf"})
+    engine = _engine(processor)
+
+    results = list(engine.run(_paths(3)))
+
+    by_name = {r.filename: r for r in results}
+    assert sorted(by_name) == ["d1.pdf", "d2.pdf", "d3.pdf"]
+    assert by_name["d2.pdf"].status == "failed"
+    assert by_name["d2.pdf"].error_message == "broken pdf"
+
+
+def test_engine_indexes_results_by_input_position():
+    class _SameNames(_StubProcessor):
+        def prepare_document(self, file_path, force_reprocess=False, prescanned=None):
+            return None, int(Path(file_path).parent.name[1:])
+
+        def complete_document(self, state, index_in_background=True):
+            return _result(state.file_path, state.doc_id)
+
+    processor = _SameNames()
+    engine = _engine(processor)
+    paths = [Path("x3/sds.pdf"), Path("x1/sds.pdf"), Path("x2/sds.pdf")]
+
+    pairs = dict(engine.run_indexed(paths))
+
+    assert {index: result.document_id for index, result in pairs.items()} == {0: 3, 1: 1, 2: 2}
+
+
+def test_parallel_batch_fails_files_the_engine_never_reported(monkeypatch):
+    def run_indexed(self, file_paths, use_rag=True, force_reprocess=False, progress_callback=None):
+        yield 1, _result(file_paths[1], 2)
+
+    monkeypatch.setattr(ParallelBatchEngine, "run_indexed", run_indexed)
+
+    results = SDSProcessor._process_batch_parallel(_StubProcessor(), _paths(3), True, 2, False)
+
+    assert [r.status for r in results] == ["failed", "success", "failed"]
+    assert results[0].filename == "d1.pdf" and results[0].error_message == "not processed"
+
+
+def test_engine_passes_each_file_its_prescan_entry():
+    seen = {}
+
+    class _Prescanning(_StubProcessor):
+        def prescan(self, file_paths):
+            return FolderScan(files=[FileStatus(path=p, size=1, mtime_ns=0, sha256=p.name) for p in file_paths])
+
+        def prepare_document(self, file_path, force_reprocess=False, prescanned=None):
+            seen[file_path.name] = prescanned.sha256
+            return super().prepare_document(file_path, force_reprocess)
+
+    processor = _Prescanning()
+    list(_engine(processor).run(_paths(3)))
+
+    assert seen == {"d1.pdf": "d1.pdf", "d2.pdf": "d2.pdf", "d3.pdf": "d3.pdf"}
@@ -0,0 +1,88 @@
+"""Tests for the TTL/LRU API cache and its persistent tier."""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from src.utils.cache import SQLiteCacheBackend, TTLCache
+
+
+@dataclass
+class _Result:
+    smiles: str
+    confidence: float
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = TTLCache(ttl_seconds=0, max_size=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # a becomes most recently used
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["A", "C", "D"]
+    stats = cache.get_stats()
+    assert stats["size"] == 3 and stats["evictions"] == 1 and stats["shards"] == 1
+    assert stats["hits"] == 4 and stats["misses"] == 1 and stats["hit_rate"] == 0.8
+
+
+def test_ttl_expiry_and_byte_limit():
+    cache = TTLCache(ttl_seconds=0.05, max_size=100)
+    cache.set("old", 1)
+    time.sleep(0.06)
+    cache.set("new", 2)  # expired entries are dropped on insert
+    assert cache.get_stats()["expirations"] == 1
+    assert cache.get("old") is None and cache.get("new") == 2
+
+    sized = TTLCache(ttl_seconds=0, max_size=100, max_bytes=10, sizeof=len)
+    sized.set("a", "xxxx")
+    sized.set("b", "yyyy")
+    sized.set("c", "zzzz")
+    assert sized.get("a") is None and sized.get_stats()["bytes"] == 8
+    sized.set("huge", "z" * 11)  # over budget: not kept in memory
+    assert sized.get("huge") is None and sized.get("c") == "zzzz"
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    path = tmp_path / "api_cache.sqlite"
+    options = {"namespace": "structure", "encode": asdict, "decode": lambda d: _Result(**d)}
+    first = TTLCache(ttl_seconds=60, max_size=10, backend=SQLiteCacheBackend(path), **options)
+    first.set("img", _Result("CCO", 0.9))
+    first.set("unserializable", object())  # memory only
+
+    second = TTLCache(ttl_seconds=60, max_size=10, backend=SQLiteCacheBackend(path), **options)
+    assert second.get("img") == _Result("CCO", 0.9)
+    assert second.get("unserializable") is None
+    assert second.get("img") == _Result("CCO", 0.9)
+    stats = second.get_stats()
+    assert stats["persistent_hits"] == 1 and stats["hits"] == 2
+    assert stats["persistent"]["entries"] == 1
+
+    other = TTLCache(ttl_seconds=60, backend=SQLiteCacheBackend(path), namespace="pubchem")
+    other.set("cas:64-17-5", {"CID": 702})
+    second.clear()
+    assert other.get_stats()["persistent"]["entries"] == 1
+    assert TTLCache(backend=SQLiteCacheBackend(path), **options).get("img") is None
+
+
+def test_concurrent_access_is_consistent():
+    cache = TTLCache(ttl_seconds=0, max_size=256)
+    assert cache.get_stats()["shards"] == 4
+
+    def worker(offset):
+        for i in range(2000):
+            key = f"k{(i * 7 + offset) % 512}"
+            if cache.get(key) is None:
+                cache.set(key, i)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    assert stats["hits"] + stats["misses"] == 16000
+    assert stats["size"] == len(cache) <= 256
+    assert stats["evictions"] > 0
@@ -0,0 +1,73 @@
+"""Tests for section-targeted LLM prompt context."""
+
+from src.models.ollama_client import ExtractionResult
+from src.sds.context_builder import FieldContextBuilder, estimate_tokens
+from src.sds.llm_extractor import LLMExtractor
+
+FILLER = "Lorem ipsum dolor sit amet. " * 200
+
+SECTIONS = {
+    1: "Product name: Acetone\nSupplier: ACME",
+    10: "Incompatible materials: strong oxidizers, acids.",
+    14: FILLER + "UN number: UN1090 Proper shipping name: ACETONE " + FILLER,
+}
+
+
+def test_uses_field_section_when_it_fits_budget():
+    builder = FieldContextBuilder(token_budget=200)
+
+    context = builder.build("incompatibilities", FILLER, SECTIONS)
+
+    assert context.strategy == "section"
+    assert context.section == 10
+    assert context.text == SECTIONS[10]
+    assert context.tokens == estimate_tokens(SECTIONS[10])
+
+
+def test_long_section_is_windowed_around_the_pattern():
+    builder = FieldContextBuilder(token_budget=100)
+
+    context = builder.build("un_number", FILLER, SECTIONS)
+
+    assert context.strategy == "section_window"
+    assert "UN1090" in context.text
+    assert len(context.text) <= builder.max_chars
+
+
+def test_missing_section_searches_full_text_then_falls_back():
+    builder = FieldContextBuilder(token_budget=100)
+    text = FILLER + " CAS No. 67-64-1 " + FILLER
+
+    located = builder.build("cas_number", text, {})
+    fallback = builder.build("cas_number", FILLER, {})
+
+    assert located.strategy == "pattern_window"
+    assert "67-64-1" in located.text
+    assert fallback.strategy == "fallback"
+    assert fallback.text == FILLER[: builder.max_chars]
+
+    stats = builder.get_stats()["cas_number"]
+    assert stats["requests"] == 2
+    assert stats["section_hit_rate"] == 0.0
+
+
+class _RecordingOllama:
+    def __init__(self):
+        self.texts = {}
+
+    def extract_field_with_few_shot(self, text, field_name, prompt_template):
+        self.texts[field_name] = text
+        return ExtractionResult(value="x", confidence=0.7)
+
+
+def test_llm_extractor_sends_section_context_and_tracks_prompt_tokens():
+    ollama = _RecordingOllama()
+    extractor = LLMExtractor(ollama_client=ollama)
+
+    extractor.extract_multiple_fields(["product_name", "incompatibilities"], FILLER, SECTIONS)
+
+    assert ollama.texts["product_name"] == SECTIONS[1]
+    assert ollama.texts["incompatibilities"] == SECTIONS[10]
+    stats = extractor.get_context_stats()
+    assert stats["product_name"]["section_hit_rate"] == 1.0
+    assert 0 < stats["incompatibilities"]["avg_prompt_tokens"] < estimate_tokens(FILLER[:3000])
@@ -0,0 +1,125 @@
+"""Tests for DatabaseManager's pooled reads and group-committing writer."""
+
+import threading
+import time
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+
+
+def _hold_writer(db):
+    """Occupy the writer thread until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(conn):
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=db._write, args=("block", block))
+    thread.start()
+    assert started.wait(5)
+    return release, thread
+
+
+def _wait_for_queue(db, size):
+    deadline = time.time() + 5
+    while db._write_queue.qsize() < size and time.time() < deadline:
+        time.sleep(0.005)
+
+
+def test_queued_writes_are_group_committed(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    release, blocker = _hold_writer(db)
+
+    writers = [
+        threading.Thread(
+            target=db.register_hazard_record, args=(f"50-00-{i}",), kwargs={"source": "test"}
+        )
+        for i in range(10)
+    ]
+    for thread in writers:
+        thread.start()
+    _wait_for_queue(db, 10)
+    release.set()
+    for thread in [blocker, *writers]:
+        thread.join()
+
+    for i in range(10):
+        assert db.get_hazard_record(f"50-00-{i}")["source"] == "test"
+    stats = db.get_concurrency_stats()
+    assert stats["writer"]["writes"] == 11
+    assert stats["writer"]["max_group_size"] == 10
+    assert stats["methods"]["register_hazard_record"]["kind"] == "write"
+    assert stats["methods"]["register_hazard_record"]["max_wait_ms"] > 0
+    assert stats["methods"]["get_hazard_record"]["kind"] == "read"
+    db.close()
+
+
+def test_failing_write_only_fails_its_own_caller(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    release, blocker = _hold_writer(db)
+    errors = []
+
+    def bad_write():
+        try:
+            db._write("bad", lambda conn: conn.execute("INSERT INTO missing_table VALUES (1)"))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=db.register_hazard_record, args=("64-17-5",)),
+        threading.Thread(target=bad_write),
+        threading.Thread(target=db.register_hazard_record, args=("67-64-1",)),
+    ]
+    for thread in threads:
+        thread.start()
+        _wait_for_queue(db, threads.index(thread) + 1)
+    release.set()
+    for thread in [blocker, *threads]:
+        thread.join()
+
+    assert len(errors) == 1
+    assert db.get_hazard_record("64-17-5") is not None
+    assert db.get_hazard_record("67-64-1") is not None
+    db.close()
+
+
+def test_reads_run_on_pooled_cursors_while_writes_continue(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb", read_pool_size=2)
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            db.fetch_results()
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for i in range(20):
+        db.register_incompatibility_rule("64-17-5", f"7722-84-{i}", "I", "test")
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    stats = db.get_concurrency_stats()
+    assert stats["read_pool"] == {"size": 2, "open": 2}
+    assert stats["methods"]["fetch_results"]["calls"] >= 4
+    assert stats["methods"]["register_incompatibility_rule"]["calls"] == 20
+    assert db.get_incompatibility_rule("7722-84-19", "64-17-5")["rule"] == "I"
+    db.close()
+
+
+def test_nested_write_from_writer_thread_does_not_deadlock(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+
+    def outer(conn):
+        db.register_snapshot("test", "/tmp/a.csv", "hash-a")
+        return "ok"
+
+    assert db._write("outer", outer) == "ok"
+    assert db.snapshot_exists("hash-a")
+    db.close()
+    with pytest.raises(Exception):
+        db.conn.execute("SELECT 1")
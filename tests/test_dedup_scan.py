@@ -0,0 +1,67 @@
+"""Tests for the dedup pre-scan (parallel cached hashing, bulk status lookup)."""
+
+import hashlib
+import os
+
+from src.database.db_manager import DatabaseManager
+from src.sds.dedup_scan import DedupScanner
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return path
+
+
+def _process(db, path):
+    doc_id = db.register_document(path.name, path, path.stat().st_size, ".pdf")
+    db.store_extractions_batch(doc_id, [("product_name", "X", 0.9, "", "valid", None, "heuristic")])
+    db.update_document_status(doc_id, "success")
+    return doc_id
+
+
+def test_scan_resolves_folder_in_one_pass(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "scan.duckdb")
+    folder = tmp_path / "share"
+    (folder / "sub").mkdir(parents=True)
+    done = _write(folder / "done.pdf", b"processed " * 1000)
+    doc_id = _process(db, done)
+    renamed = _write(folder / "sub" / "renamed.pdf", done.read_bytes())
+    new = _write(folder / "new.PDF", b"new")
+    copy = _write(folder / "sub" / "new_copy.pdf", b"new")
+    empty = _write(folder / "empty.pdf", b"")
+    _write(folder / "notes.md", b"ignored")
+
+    scan = DedupScanner(db, workers=4).scan_folder(folder, [".pdf"])
+    by_path = scan.by_path()
+    assert set(by_path) == {done, renamed, new, copy, empty}
+    assert by_path[renamed].document_id == doc_id and by_path[renamed].matched_by == "hash"
+    assert by_path[new].sha256 == hashlib.sha256(b"new").hexdigest()
+    assert by_path[empty].sha256 == hashlib.sha256(b"").hexdigest()
+    assert {s.path for s in scan.pending} == {new, empty}
+    assert [s.path for s in scan.duplicates] == [copy, renamed] and by_path[copy].duplicate_of == new
+    # done.pdf was hashed when it was registered
+    assert scan.summary()["cache_hits"] == 1 and scan.hashed == 4
+
+    db.reset_concurrency_stats()
+    rescan = DedupScanner(db).scan_folder(folder, [".pdf"])
+    assert rescan.hashed == 0 and rescan.cache_hits == 5
+    methods = db.get_concurrency_stats()["methods"]
+    assert methods["resolve_processed_files"]["calls"] == 1
+    db.close()
+
+
+def test_hash_cache_tracks_size_and_mtime(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "scan.duckdb")
+    path = _write(tmp_path / "a.pdf", b"one")
+    scanner = DedupScanner(db)
+    assert scanner.hash_files([path]) == {path: hashlib.sha256(b"one").hexdigest()}
+
+    _write(path, b"two")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert scanner.hash_files([path, tmp_path / "missing.pdf"]) == {path: hashlib.sha256(b"two").hexdigest()}
+
+    # Unhashed files are matched by name and size without being read
+    listing = scanner.scan([path, _write(tmp_path / "b.pdf", b"bbb")], hash_missing=False)
+    assert [s.sha256 is None for s in listing.files] == [False, True] and listing.hashed == 0
+    db.close()
@@ -0,0 +1,80 @@
+"""Tests for the materialized document_results table behind fetch_results."""
+
+from src.database.db_manager import DatabaseManager
+
+
+def _add_document(db, tmp_path, name, status="success", fields=None, is_dangerous=False):
+    path = tmp_path / name
+    path.write_bytes(name.encode())
+    doc_id = db.register_document(name, path, path.stat().st_size, ".pdf")
+    if fields:
+        db.store_extractions_batch(
+            doc_id,
+            [(field, value, 0.8, "", "valid", None, "heuristic") for field, value in fields.items()],
+        )
+    db.update_document_status(doc_id, status, is_dangerous=is_dangerous)
+    return doc_id
+
+
+def test_fetch_results_tracks_extraction_and_status_updates(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    doc_id = _add_document(
+        db, tmp_path, "acetone.pdf", fields={"product_name": "Acetone", "cas_number": "67-64-1"}
+    )
+
+    row = db.fetch_results()[0]
+    assert row["id"] == doc_id
+    assert row["product_name"] == "Acetone"
+    assert row["cas_number"] == "67-64-1"
+    assert row["un_number"] is None
+    assert row["avg_confidence"] == 0.8
+    assert row["quality_tier"] == "unknown"
+    assert row["validated"] is False
+
+    db.store_extraction(doc_id, "un_number", "UN1090", 0.9)
+    db.update_document_status(doc_id, "partial", completeness=0.5)
+    row = db.fetch_results()[0]
+    assert row["un_number"] == "UN1090"
+    assert row["status"] == "partial"
+    assert row["completeness"] == 0.5
+    db.close()
+
+
+def test_fetch_results_filters_and_paginates(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    for i in range(5):
+        _add_document(
+            db,
+            tmp_path,
+            f"doc{i}.pdf",
+            fields={"product_name": f"Product {i}"},
+            is_dangerous=i % 2 == 0,
+        )
+    _add_document(db, tmp_path, "failed.pdf", status="failed")
+    _add_document(db, tmp_path, "queued.pdf", status="pending")
+
+    assert db.count_results() == 6
+    assert db.count_results(statuses=["pending"]) == 1
+    assert db.count_results(is_dangerous=True) == 3
+    assert [r["product_name"] for r in db.fetch_results(search="product 3")] == ["Product 3"]
+
+    pages = [db.fetch_results(limit=2, offset=offset) for offset in (0, 2, 4)]
+    ids = [row["id"] for page in pages for row in page]
+    assert len(ids) == 6 and len(set(ids)) == 6
+    db.close()
+
+
+def test_existing_documents_are_backfilled_on_open(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    _add_document(db, tmp_path, "legacy.pdf", fields={"product_name": "Legacy"})
+    # Simulate a database created before document_results existed
+    db.conn.execute("DROP TABLE document_results")
+    db.close()
+
+    reopened = DatabaseManager(db_path=tmp_path / "test.duckdb")
+    assert [r["product_name"] for r in reopened.fetch_results()] == ["Legacy"]
+
+    reopened.conn.execute("UPDATE extractions SET value = 'Edited'")
+    reopened.rebuild_document_results()
+    assert reopened.fetch_results()[0]["product_name"] == "Edited"
+    reopened.close()
@@ -0,0 +1,82 @@
+"""Tests for the persistent embedding cache."""
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5, -1.25] for t in texts]
+
+    def embed_query(self, text):
+        return [0.0, 0.0, 1.0]
+
+
+def test_only_unseen_texts_reach_the_model(tmp_path):
+    model = _CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingCache(tmp_path, "qwen3-embedding:4b"))
+
+    first = embeddings.embed_documents(["acid", "base", "acid"])
+    assert model.calls == [["acid", "base"]]
+    assert first[0] == first[2] == [4.0, 0.5, -1.25]
+
+    # Whitespace/Unicode-normalized text hits the cache
+    second = embeddings.embed_documents(["  acid\n", "oxidizer", "base"])
+    assert model.calls[-1] == ["oxidizer"]
+    assert second[0] == first[0] and second[2] == first[1]
+
+    stats = embeddings.cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["dim"]) == (2, 4, 3, 3)
+    assert stats["hit_rate"] == 2 / 6
+    assert embeddings.embed_query("acid") == [0.0, 0.0, 1.0]
+
+
+def test_cache_persists_and_recovers_from_torn_append(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model-a")
+    vectors = np.random.default_rng(0).normal(size=(4, 8)).tolist()
+    assert cache.put_many(["a", "b", "c"], vectors[:3], seconds=0.3) == 3
+    assert EmbeddingCache(tmp_path, "model-b").get_many(["a"]) == [None]
+
+    # Simulate a writer that died mid-append, before committing its index rows
+    with open(cache.directory / "vectors-0.f16", "ab") as f:
+        f.write(b"\0" * 21)
+    reopened = EmbeddingCache(tmp_path, "model-a")
+    assert len(reopened) == 3
+    hit = reopened.get_many(["b", "zzz"])
+    assert hit[1] is None
+    assert np.allclose(hit[0], vectors[1], atol=1e-2)
+    assert reopened.get_stats()["seconds_saved"] == 0.1
+
+    assert reopened.put_many(["d"], [vectors[3]]) == 1
+    assert np.allclose(reopened.get_many(["d"])[0], vectors[3], atol=1e-2)
+    assert reopened.put_many(["e"], [[1.0] * 4]) == 0  # wrong dimension is not cached
+    reopened.clear()
+    assert len(EmbeddingCache(tmp_path, "model-a")) == 0
+    assert cache.get_many(["a"]) == [None]
+
+
+def test_caches_sharing_a_directory_stay_aligned(tmp_path):
+    # Two instances stand in for two processes appending to the same directory
+    first = EmbeddingCache(tmp_path, "model-a")
+    second = EmbeddingCache(tmp_path, "model-a")
+    rng = np.random.default_rng(1)
+    expected = {}
+    for i in range(6):
+        writer = first if i % 2 else second
+        texts = [f"chunk {i}-{j}" for j in range(3)]
+        vectors = rng.normal(size=(3, 4)).tolist()
+        assert writer.put_many(texts, vectors) == 3
+        expected.update(zip(texts, vectors))
+
+    for reader in (first, second):
+        found = reader.get_many(list(expected))
+        for vector, want in zip(found, expected.values()):
+            assert np.allclose(vector, want, atol=1e-2)
+    assert len(first) == len(second) == 18
+    assert second.put_many(["chunk 0-0"], [[0.0] * 4]) == 0  # already cached by the other writer
@@ -0,0 +1,135 @@
+"""Tests for batched, concurrent embedding requests."""
+
+import asyncio
+import json
+
+import httpx
+from langchain_core.documents import Document
+
+from src.models.async_ollama import AsyncOllamaClient
+from src.models.embedding_scheduler import EmbeddingScheduler, ScheduledEmbeddings
+from src.rag.vector_store import VectorStore
+
+
+class _EmbedServer:
+    """MockTransport handler for /api/embed that can fail selected inputs."""
+
+    def __init__(self, fail_once=(), always_fail=(), delay=0.02):
+        self.fail_once = set(fail_once)
+        self.always_fail = set(always_fail)
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.batches = []
+
+    async def __call__(self, request):
+        body = json.loads(request.content)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        self.batches.append(body["input"])
+        failing = set(body["input"]) & (self.fail_once | self.always_fail)
+        if failing:
+            self.fail_once -= failing
+            return httpx.Response(500, json={"error": "boom"})
+        return httpx.Response(200, json={"embeddings": [[float(len(t)), 1.0] for t in body["input"]]})
+
+
+def _scheduler(server, **kwargs):
+    client = AsyncOllamaClient("http://ollama", max_concurrency=8, transport=httpx.MockTransport(server))
+    options = {"batch_size": 4, "batch_chars": 1000, "concurrency": 3, "max_retries": 1, "retry_delay": 0.01}
+    options.update(kwargs)
+    return EmbeddingScheduler("embed-model", client=client, **options)
+
+
+def test_batches_run_concurrently_in_input_order():
+    server = _EmbedServer()
+    scheduler = _scheduler(server)
+    texts = [f"text {i}" * (i % 3 + 1) for i in range(20)]
+
+    assert scheduler.embed(texts) == [[float(len(t)), 1.0] for t in texts]
+    assert len(server.batches) == 5 and max(len(b) for b in server.batches) == 4
+    assert server.peak == 3
+    assert scheduler.split(["a" * 600, "b" * 600, "c"]) == [(0, 1), (1, 3)]
+
+
+def test_failed_batches_are_retried_then_halved():
+    server = _EmbedServer(fail_once={"t1"}, always_fail={"t6"})
+    scheduler = _scheduler(server)
+    vectors = scheduler.embed([f"t{i}" for i in range(8)])
+
+    assert vectors[6] == [] and all(vectors[i] == [2.0, 1.0] for i in range(8) if i != 6)
+    stats = scheduler.get_stats()
+    assert stats["failed_texts"] == 1 and stats["retries"] >= 2
+
+
+def test_vector_store_embeds_outside_lock_and_skips_failures(tmp_path):
+    server = _EmbedServer(always_fail={"bad"})
+    store = VectorStore(persist_directory=tmp_path / "chroma")
+    store._embeddings = ScheduledEmbeddings(None, _scheduler(server))
+    store._embeddings_initialized = True
+
+    docs = [Document(page_content=t, metadata={"source": "s"} if t != "plain" else {}) for t in ("good", "bad", "plain")]
+    assert store.add_documents(docs, batch_size=1) == 2
+    assert sorted(store.db._collection.get()["documents"]) == ["good", "plain"]
+
+
+def test_rejected_batches_are_halved_without_retries():
+    server = _EmbedServer()
+    calls = []
+
+    async def reject_long(request):
+        body = json.loads(request.content)
+        calls.append(body["input"])
+        if "long" in body["input"]:
+            return httpx.Response(400, json={"error": "input exceeds context length"})
+        return httpx.Response(200, json={"embeddings": [[1.0] for _ in body["input"]]})
+
+    scheduler = _scheduler(server, max_retries=3)
+    scheduler.client = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(reject_long))
+
+    vectors = scheduler.embed(["a", "long", "b", "c"])
+
+    assert vectors == [[1.0], [], [1.0], [1.0]]
+    assert scheduler.get_stats()["retries"] == 0
+    assert len(calls) == 5
+
+
+def test_transport_errors_open_the_circuit_instead_of_splitting():
+    calls = []
+
+    async def down(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    scheduler = _scheduler(None, concurrency=1, max_retries=3)
+    scheduler.client = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(down))
+
+    assert scheduler.embed([f"t{i}" for i in range(32)]) == [[] for _ in range(32)]
+    assert len(calls) == 1
+    assert scheduler.embed(["again"]) == [[]] and len(calls) == 1
+    stats = scheduler.get_stats()
+    assert stats["circuit_trips"] == 1 and stats["circuit_open"]
+
+    scheduler._open_until = 0.0
+    scheduler.client = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(_EmbedServer()))
+    assert scheduler.embed(["back"]) == [[4.0, 1.0]]
+
+
+def test_vector_store_embeds_one_batch_at_a_time(tmp_path):
+    server = _EmbedServer(always_fail={"d3"})
+    store = VectorStore(persist_directory=tmp_path / "chroma")
+    store._embeddings = ScheduledEmbeddings(None, _scheduler(server, max_retries=0))
+    store._embeddings_initialized = True
+    sizes = []
+    embed = store._embeddings.embed_documents
+    store._embeddings.embed_documents = lambda texts: sizes.append(len(texts)) or embed(texts)
+
+    docs = [Document(page_content=f"d{i}", metadata={"source": "s"}) for i in range(5)]
+    ids = store.index_documents(docs, batch_size=2)
+    assert [chunk_id is not None for chunk_id in ids] == [True, True, True, False, True]
+    assert sizes == [2, 2, 1]
+    assert store.delete_ids(ids[:2]) == 2
+    assert sorted(store.db._collection.get()["documents"]) == ["d2", "d4"]
+    assert store.lexical.count() == 2
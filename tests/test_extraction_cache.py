@@ -0,0 +1,97 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.sds.extraction_cache import ExtractionCache, file_sha256
+from src.sds.extractor import SDSExtractor
+
+
+def _result(text):
+    return {
+        "text": text,
+        "page_count": 1,
+        "sections": {1: "Identification", 3: "Composition"},
+        "pages": [f"\n--- Page 1 ---\n{text}"],
+        "ocr": {"mode": None, "pages": []},
+    }
+
+
+def test_cache_round_trip_restores_int_section_keys(tmp_path: Path):
+    cache = ExtractionCache(tmp_path, max_bytes=10_000_000, version="v1")
+
+    assert cache.get("abc") is None
+    cache.put("abc", _result("hello"))
+
+    cached = cache.get("abc")
+    assert cached["text"] == "hello"
+    assert cached["sections"] == {1: "Identification", 3: "Composition"}
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+    # Different extractor version does not see the entry
+    assert ExtractionCache(tmp_path, max_bytes=0, version="v2").get("abc") is None
+
+
+def test_cache_evicts_least_recently_used_by_size(tmp_path: Path):
+    cache = ExtractionCache(tmp_path, max_bytes=10_000_000, version="v1")
+    payload = os.urandom(3000).hex()  # incompressible
+    for key in ("a", "b", "c"):
+        cache.put(key, _result(payload))
+    entry_size = cache.get_stats()["size_bytes"] // 3
+
+    old = time.time() - 100
+    for key, age in (("a", 10), ("b", 20), ("c", 30)):
+        os.utime(cache._entry_path(key), (old + age, old + age))
+    cache.get("a")  # refresh: "b" is now the least recently used
+
+    cache.max_bytes = entry_size * 3 + entry_size // 2
+    cache.put("d", _result(payload))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_extract_document_skips_parsing_on_cache_hit(tmp_path: Path):
+    fpdf = pytest.importorskip("fpdf")
+    pdf = fpdf.FPDF()
+    pdf.set_font("Helvetica", size=10)
+    pdf.add_page()
+    pdf.multi_cell(0, 5, "SECTION 1: Identification of the substance and company. " * 10)
+    pdf_path = tmp_path / "doc.pdf"
+    pdf.output(str(pdf_path))
+
+    extractor = SDSExtractor()
+    extractor._extraction_cache = ExtractionCache(tmp_path / "cache", 10_000_000, "test")
+
+    first = extractor.extract_document(pdf_path)
+    extractor.extract_pdf = lambda *a, **k: pytest.fail("PDF should not be re-parsed")
+    second = extractor.extract_document(pdf_path)
+
+    assert second["text"] == first["text"]
+    assert second["sections"] == first["sections"]
+    assert second["pages"] == first["pages"]
+    assert (tmp_path / "cache" / f"{file_sha256(pdf_path)}-test.json.gz").exists()
+
+
+def test_extract_document_does_not_cache_failed_ocr_and_refreshes(tmp_path: Path):
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 scanned")
+    extractor = SDSExtractor()
+    extractor._extraction_cache = ExtractionCache(tmp_path / "cache", 10_000_000, "test")
+
+    failed = _result("")
+    failed["ocr"] = {"mode": None, "pages": [], "failed": True}
+    extractor.extract_pdf = lambda *a, **k: failed
+    extractor.extract_document(pdf_path)
+    assert extractor._extraction_cache.get_stats()["entries"] == 0
+
+    extractor.extract_pdf = lambda *a, **k: _result("first")
+    assert extractor.extract_document(pdf_path)["text"] == "first"
+    extractor.extract_pdf = lambda *a, **k: _result("second")
+    assert extractor.extract_document(pdf_path)["text"] == "first"
+    assert extractor.extract_document(pdf_path, refresh_cache=True)["text"] == "second"
+    assert extractor.extract_document(pdf_path)["text"] == "second"
@@ -1,7 +1,9 @@
 import json
 from pathlib import Path
 
-from src.rag.ingestion_service import KnowledgeIngestionService
+from langchain_core.documents import Document
+
+from src.rag.ingestion_service import IngestionSummary, KnowledgeIngestionService
 
 
 class _StubDb:
@@ -25,7 +27,7 @@ def test_ingest_snapshot_counts_invalid_json(monkeypatch, tmp_path: Path):
     service = KnowledgeIngestionService()
 
     # Avoid running full ingestion pipeline
-    def _fake_ingest_text_blob(text: str, metadata: dict, summary):
+    def _fake_ingest_text_blob(text: str, metadata: dict, summary, pending=None):
         summary.processed += 1
         summary.chunks_added += 1
 
@@ -43,3 +45,40 @@ def test_ingest_snapshot_counts_invalid_json(monkeypatch, tmp_path: Path):
     assert summary.processed == 1
     assert summary.chunks_added == 1
     assert summary.skipped == ["invalid_json"]
+
+
+def test_flush_pending_registers_only_fully_indexed_records(monkeypatch):
+    registered = []
+
+    class _Db(_StubDb):
+        def register_rag_document(self, **kwargs):
+            registered.append(kwargs["title"])
+            return 1
+
+    class _PartialVectorStore:
+        deleted = []
+
+        def index_documents(self, docs):
+            return [None if doc.page_content == "lost" else f"id-{doc.page_content}" for doc in docs]
+
+        def delete_ids(self, ids):
+            self.deleted.extend(ids)
+            return len(ids)
+
+    monkeypatch.setattr("src.rag.ingestion_service.get_db_manager", lambda: _Db())
+    monkeypatch.setattr("src.rag.ingestion_service.get_vector_store", lambda: _PartialVectorStore())
+    service = KnowledgeIngestionService()
+    summary = IngestionSummary(source_type="snapshot")
+    pending = [
+        ([Document(page_content="a"), Document(page_content="b")], {"title": "complete"}),
+        ([Document(page_content="c"), Document(page_content="lost")], {"title": "partial"}),
+    ]
+
+    service._flush_pending(pending, summary)
+
+    assert registered == ["complete"]
+    assert summary.processed == 1 and summary.chunks_added == 2
+    assert summary.errors == ["partial: chunks not indexed"]
+    # The partial blob's indexed chunk is removed, so re-ingesting it adds no duplicate
+    assert _PartialVectorStore.deleted == ["id-c"]
+    assert pending == []
@@ -0,0 +1,138 @@
+"""Tests for the BM25 index and hybrid retrieval."""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.rag.lexical_index import (
+    LexicalIndex,
+    identifier_terms,
+    is_identifier_query,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from src.rag.retriever import RAGRetriever
+from src.rag.vector_store import SearchResult, VectorStore
+
+_CHUNKS = [
+    ("a1", "Acetone, CAS 67-64-1, UN 1090. H225 Highly flammable liquid and vapour.", "acetone.pdf"),
+    ("a2", "Acetone is incompatible with strong oxidizers and strong acids.", "acetone.pdf"),
+    ("e1", "Ethanol, CAS 64-17-5, UN1170. H225 H319 Causes serious eye irritation.", "ethanol.pdf"),
+    ("s1", "Sodium hydroxide, CAS 1310-73-2. H314 Causes severe skin burns.", "naoh.pdf"),
+]
+
+
+def _docs():
+    return [Document(page_content=text, metadata={"source": source}) for _id, text, source in _CHUNKS]
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.queries = 0
+
+    def embed_documents(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.queries += 1
+        return [float(len(text)), 1.0]
+
+
+def test_tokenizer_keeps_identifiers_whole():
+    assert tokenize("CAS 64-17-5, UN 1170; H319 / EUH066 P301+P310") == [
+        "cas", "64-17-5", "un1170", "h319", "euh066", "p301", "p310"
+    ]
+    assert identifier_terms("Is UN1090 the same as CAS 67-64-1?") == ["un1090", "67-64-1"]
+    assert is_identifier_query("CAS 64-17-5")
+    assert is_identifier_query("UN number 1170") is False
+    assert is_identifier_query("un 1170")
+    assert not is_identifier_query("Which PPE is needed for 64-17-5?")
+
+
+def test_bm25_ranks_reindexes_and_persists(tmp_path):
+    index = LexicalIndex(tmp_path / "lexical.sqlite")
+    assert index.add([c[0] for c in _CHUNKS], _docs()) == 4
+
+    results = index.search("ethanol eye irritation", k=2)
+    assert results[0].source == "ethanol.pdf" and results[0].score > 0
+    assert [r.source for r in index.search("", terms=["67-64-1"])] == ["acetone.pdf"]
+    assert {r.source for r in index.search("h225")} == {"acetone.pdf", "ethanol.pdf"}
+
+    # Re-adding an id replaces its postings
+    index.add(["a1"], [Document(page_content="Acetone replaced", metadata={"source": "acetone.pdf"})])
+    assert index.count() == 4
+    assert index.search("", terms=["67-64-1"]) == []
+
+    reopened = LexicalIndex(tmp_path / "lexical.sqlite")
+    assert reopened.count() == 4
+    assert reopened.delete_by_source("acetone.pdf") == 2
+    assert reopened.count() == 2 and reopened.search("acetone") == []
+
+
+def test_search_drops_stopwords_and_common_terms(tmp_path):
+    index = LexicalIndex(tmp_path / "lexical.sqlite")
+    index.add([c[0] for c in _CHUNKS], _docs())
+
+    assert index.search("what is the") == []
+    # "cas" is in three of four chunks: only "ethanol" is scored
+    assert [r.source for r in index.search("what is the CAS of ethanol")] == ["ethanol.pdf"]
+    # ...unless nothing rarer is left
+    assert len(index.search("cas", k=5)) == 3
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a, b, c = (SearchResult(content=t, metadata={"source": t}, score=1.0) for t in "abc")
+    fused = reciprocal_rank_fusion([[a, b], [c, b]], k=2)
+    assert [r.content for r in fused] == ["b", "a"]
+    assert fused[0].score == 1 / 62 + 1 / 62
+
+
+def test_retriever_answers_identifier_queries_without_embedding(tmp_path):
+    store = VectorStore(persist_directory=tmp_path / "chroma")
+    embeddings = _CountingEmbeddings()
+    store._embeddings = embeddings
+    store._embeddings_initialized = True
+    assert store.add_documents(_docs()) == 4
+    retriever = RAGRetriever(vector_store=store, ollama_client=object())
+
+    results = retriever.retrieve("CAS 1310-73-2", k=3)
+    assert [r.source for r in results] == ["naoh.pdf"]
+    assert embeddings.queries == 0
+
+    results = retriever.retrieve("acetone incompatible oxidizers", k=3)
+    assert embeddings.queries == 1
+    assert results[0].content == _CHUNKS[1][1]
+
+
+def test_lexical_index_is_backfilled_from_existing_collection(tmp_path):
+    store = VectorStore(persist_directory=tmp_path / "chroma")
+    store._embeddings = _CountingEmbeddings()
+    store._embeddings_initialized = True
+    store._upsert(_docs(), store.embeddings.embed_documents([d.page_content for d in _docs()]))
+
+    assert [r.source for r in store.lexical_search("", terms=["un1170"])] == ["ethanol.pdf"]
+    assert store.lexical.count() == 4
+
+
+def test_failed_backfill_is_retried_and_partial_index_rebuilt(tmp_path):
+    store = VectorStore(persist_directory=tmp_path / "chroma")
+    store._embeddings = _CountingEmbeddings()
+    store._embeddings_initialized = True
+    store._upsert(_docs(), store.embeddings.embed_documents([d.page_content for d in _docs()]))
+
+    add = store.lexical.add
+    calls = []
+
+    def flaky_add(ids, documents):
+        calls.append(len(ids))
+        if len(calls) == 2:
+            raise OSError("disk full")
+        return add(ids, documents)
+
+    store.lexical.add = flaky_add
+    with pytest.raises(OSError):
+        store._sync_lexical(page_size=2)
+    assert store.lexical.count() == 2 and not store._lexical_synced
+
+    assert [r.source for r in store.lexical_search("", terms=["1310-73-2"])] == ["naoh.pdf"]
+    assert store.lexical.count() == 4 and store._lexical_synced
@@ -0,0 +1,75 @@
+"""Tests for the persistent cross-process LLM response cache."""
+
+import time
+from unittest.mock import patch
+
+from src.models.llm_cache import PersistentLLMCache
+from src.models.ollama_client import OllamaClient
+
+RESPONSE = '{"value": "Acetone", "confidence": 0.9, "context": "Product: Acetone"}'
+
+
+def _client(cache):
+    client = OllamaClient()
+    client._persistent_cache = cache
+    return client
+
+
+def test_new_client_is_served_from_persistent_tier(tmp_path):
+    cache = PersistentLLMCache(tmp_path / "llm.sqlite")
+    first = _client(cache)
+    with patch.object(first, "_chat_completion", return_value=RESPONSE) as chat:
+        first.extract_field("Product: Acetone", "product_name", "Extract: {text}")
+    assert chat.call_count == 1
+
+    # A fresh client (e.g. another process) has an empty LRU but shares the file
+    second = _client(PersistentLLMCache(tmp_path / "llm.sqlite"))
+    with patch.object(second, "_chat_completion", return_value=RESPONSE) as chat:
+        result = second.extract_field("Product: Acetone", "product_name", "Extract: {text}")
+        second.extract_field("Product: Acetone", "product_name", "Extract: {text}")
+
+    assert chat.call_count == 0
+    assert result.value == "Acetone"
+    tiers = second.get_cache_stats()["tiers"]
+    assert tiers["persistent"] == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+    assert tiers["memory"]["hits"] == 1  # second lookup promoted into the LRU
+
+
+def test_key_includes_temperature_and_structured_results_round_trip(tmp_path):
+    cache = PersistentLLMCache(tmp_path / "llm.sqlite")
+    structured = '{"cas_number": {"value": "67-64-1", "confidence": 0.95}}'
+
+    client = _client(cache)
+    with patch.object(client, "_chat_completion", return_value=structured):
+        client.extract_fields_structured("CAS 67-64-1", {"cas_number": "CAS Number"})
+
+    warm = _client(cache)
+    with patch.object(warm, "_chat_completion", return_value=structured) as chat:
+        results = warm.extract_fields_structured("CAS 67-64-1", {"cas_number": "CAS Number"})
+    assert chat.call_count == 0
+    assert results["cas_number"].value == "67-64-1"
+
+    hotter = _client(cache)
+    hotter.temperature = 0.7
+    with patch.object(hotter, "_chat_completion", return_value=structured) as chat:
+        hotter.extract_fields_structured("CAS 67-64-1", {"cas_number": "CAS Number"})
+    assert chat.call_count == 1
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = PersistentLLMCache(tmp_path / "llm.sqlite", ttl_seconds=60, max_bytes=100)
+    cache.put("old", {"v": "x" * 40}, model="m", temperature=0.1)
+    cache._connect().execute("UPDATE llm_cache SET created_at = ?", (time.time() - 120,))
+    assert cache.get("old") is None
+
+    for i in range(5):
+        cache.put(f"k{i}", {"v": "x" * 40}, model="m", temperature=0.1)
+        time.sleep(0.01)
+    cache.get("k0")  # refresh k0 so it survives size eviction
+    removed = cache.evict()
+
+    stats = cache.get_stats()
+    assert removed == 3
+    assert stats["size_bytes"] <= 100
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
@@ -0,0 +1,117 @@
+"""Tests for single-call structured multi-field LLM extraction."""
+
+import json
+from unittest.mock import patch
+
+from src.models.ollama_client import ExtractionResult, OllamaClient
+from src.sds.llm_extractor import LLMExtractor
+
+
+class _FakeOllama:
+    def __init__(self, answers):
+        self.answers = answers
+        self.structured_calls = []
+        self.per_field_calls = []
+
+    def extract_fields_structured(self, text, fields):
+        self.structured_calls.append((text, sorted(fields)))
+        return {
+            name: ExtractionResult(value=self.answers.get(name, "NOT_FOUND"), confidence=0.9)
+            for name in fields
+        }
+
+    def extract_field_with_few_shot(self, text, field_name, prompt_template):
+        self.per_field_calls.append(field_name)
+        return ExtractionResult(value=f"fallback-{field_name}", confidence=0.6)
+
+
+SECTIONS = {
+    1: "Product name: Acetone. Supplier: ACME Chemicals",
+    9: "Flash point: -20 C. Boiling point: 56 C",
+}
+
+
+def test_section_mode_sends_one_request_per_section_with_section_text():
+    ollama = _FakeOllama({"product_name": "Acetone", "manufacturer": "ACME", "flash_point": "-20 C"})
+    extractor = LLMExtractor(ollama_client=ollama)
+
+    results = extractor.extract_fields_structured(
+        ["product_name", "manufacturer", "flash_point"], "full text", SECTIONS, mode="section"
+    )
+
+    assert sorted(fields for _, fields in ollama.structured_calls) == [
+        ["flash_point"],
+        ["manufacturer", "product_name"],
+    ]
+    contexts = {tuple(fields): text for text, fields in ollama.structured_calls}
+    assert contexts[("flash_point",)] == SECTIONS[9]
+    assert results["product_name"]["value"] == "Acetone"
+    assert results["flash_point"]["source"] == "llm"
+    assert ollama.per_field_calls == []
+
+
+def test_empty_fields_fall_back_to_per_field_path():
+    ollama = _FakeOllama({"product_name": "Acetone"})
+    extractor = LLMExtractor(ollama_client=ollama)
+
+    results = extractor.extract_fields_structured(
+        ["product_name", "boiling_point"], "full text", SECTIONS, mode="section"
+    )
+
+    assert results["product_name"]["value"] == "Acetone"
+    assert results["boiling_point"]["value"] == "fallback-boiling_point"
+    assert ollama.per_field_calls == ["boiling_point"]
+
+
+def test_document_mode_uses_single_request_and_missing_sections_use_document_text():
+    ollama = _FakeOllama({"product_name": "Acetone", "un_number": "1090", "flash_point": "-20 C"})
+    extractor = LLMExtractor(ollama_client=ollama)
+
+    extractor.extract_fields_structured(
+        ["product_name", "un_number", "flash_point"], "full text", SECTIONS, mode="document"
+    )
+
+    assert len(ollama.structured_calls) == 1
+    context, fields = ollama.structured_calls[0]
+    assert fields == ["flash_point", "product_name", "un_number"]
+    assert "[Section 1]" in context and "[Section 9]" in context
+
+
+def test_ollama_structured_request_sends_schema_and_parses_fields():
+    client = OllamaClient()
+    response = json.dumps(
+        {
+            "cas_number": {"value": "67-64-1", "confidence": 0.95, "context": "CAS 67-64-1"},
+            "un_number": {"value": "NOT_FOUND", "confidence": 0.0},
+        }
+    )
+
+    with patch.object(client, "_chat_completion", return_value=response) as chat:
+        results = client.extract_fields_structured(
+            "CAS 67-64-1", {"cas_number": "CAS Number", "un_number": "UN Number"}
+        )
+        # Second call is served from the cache
+        client.extract_fields_structured(
+            "CAS 67-64-1", {"cas_number": "CAS Number", "un_number": "UN Number"}
+        )
+
+    assert chat.call_count == 1
+    schema = chat.call_args.kwargs["response_format"]
+    assert schema["required"] == ["cas_number", "un_number"]
+    assert results["cas_number"].value == "67-64-1"
+    assert results["un_number"].value == "NOT_FOUND"
+    assert client.get_metrics_stats("cas_number")["cache_hits"] == 1
+
+
+def test_ollama_structured_garbled_response_is_an_error_and_not_cached():
+    client = OllamaClient()
+    fields = {"cas_number": "CAS Number", "un_number": "UN Number"}
+    good = json.dumps({"cas_number": {"value": "7664-93-9", "confidence": 0.9}})
+
+    with patch.object(client, "_chat_completion", side_effect=['{"cas_number": {"val', good]) as chat:
+        first = client.extract_fields_structured("Sulfuric acid, truncated reply", fields)
+        second = client.extract_fields_structured("Sulfuric acid, truncated reply", fields)
+
+    assert chat.call_count == 2
+    assert first["cas_number"].value == "ERROR" and first["un_number"].value == "ERROR"
+    assert second["cas_number"].value == "7664-93-9"
@@ -6,7 +6,7 @@ from src.matrix.builder import MatrixBuilder
 class _FakeDb:
     """Minimal fake database for matrix tests."""
 
-    def fetch_results(self, limit: int = 500):
+    def fetch_results(self, limit: int = 500, offset: int = 0):
         return [
             {
                 "id": 1,
@@ -33,3 +33,23 @@ def test_build_incompatibility_matrix_uses_id_key(monkeypatch):
     assert matrix.loc["Acido Forte", "Acido Forte"] == "Self"
     assert matrix.loc["Acido Forte", "Base Forte"] == "Incompatible"
     assert matrix.loc["Base Forte", "Acido Forte"] == "Incompatible"
+
+
+def test_inventory_pages_past_fetch_limit(monkeypatch):
+    class _PagedDb:
+        def __init__(self):
+            self.rows = [{"id": i, "product_name": f"P{i}", "hazard_class": "3"} for i in range(5)]
+            self.calls = []
+
+        def fetch_results(self, limit: int = 500, offset: int = 0):
+            self.calls.append((limit, offset))
+            return self.rows[offset : offset + limit]
+
+    monkeypatch.setattr("src.matrix.builder._INVENTORY_PAGE_SIZE", 2)
+    builder = MatrixBuilder()
+    builder.db = _PagedDb()
+
+    products = builder.inventory_products()
+
+    assert [p["name"] for p in products] == [f"P{i}" for i in range(5)]
+    assert builder.db.calls == [(2, 0), (2, 2), (2, 4)]
@@ -2,7 +2,7 @@ from src.matrix.builder import MatrixBuilder
 
 
 class _DbWithRules:
-    def fetch_results(self, limit: int = 500):
+    def fetch_results(self, limit: int = 500, offset: int = 0):
         return [
             {
                 "id": 1,
@@ -0,0 +1,107 @@
+"""Tests for buffered, build-tagged matrix decision logging."""
+
+from src.database.db_manager import DatabaseManager
+from src.matrix.builder import MatrixBuilder
+from src.matrix.decisions import DecisionSink
+
+
+class _InventoryDb(DatabaseManager):
+    """Real database whose inventory comes from a mutable list."""
+
+    inventory: list[dict] = []
+
+    def fetch_results(self, limit: int = 500, **filters):
+        return self.inventory
+
+
+def test_bulk_flush_matches_single_inserts(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "decisions.duckdb")
+    decision = dict(
+        product_a="Acid",
+        product_b="Base",
+        cas_a="7664-93-9",
+        cas_b=None,
+        decision="I",
+        source_layer="text_incompatibility",
+        rule_source=None,
+        justification="Name match from SDS incompatibilities",
+    )
+    db.store_matrix_decision(**decision)
+
+    sink = DecisionSink(db, build_id="b1")
+    sink.add(**decision)
+    sink.extend([{**decision, "product_b": "Oxidizer", "rule_source": "UNIFAL"}])
+    assert len(sink) == 2
+    assert sink.flush() == 2
+    assert len(sink) == 0
+
+    hashes = db.conn.execute(
+        "SELECT build_id, decision_hash FROM matrix_decisions WHERE product_b = 'Base' ORDER BY id"
+    ).fetchall()
+    assert hashes[0][0] is None and hashes[1][0] == "b1"
+    assert hashes[0][1] == hashes[1][1]
+    db.close()
+
+
+def test_builds_are_tagged_diffed_and_pruned(tmp_path):
+    db = _InventoryDb(db_path=tmp_path / "decisions.duckdb")
+    builder = MatrixBuilder(db)
+    db.inventory = [
+        {"id": 1, "product_name": "Acid", "incompatibilities": "Base"},
+        {"id": 2, "product_name": "Base", "incompatibilities": ""},
+        {"id": 3, "product_name": "Water", "incompatibilities": ""},
+    ]
+    builder.build_incompatibility_matrix()
+    first = builder.last_build_id
+
+    db.inventory[1]["incompatibilities"] = "Acid"
+    db.inventory[2]["incompatibilities"] = "Acid"
+    builder.build_incompatibility_matrix()
+    second = builder.last_build_id
+
+    builds = db.get_matrix_builds()
+    assert [b["build_id"] for b in builds] == [second, first]
+    assert builds[0]["decisions"] == 3 and builds[0]["incompatible"] == 3
+
+    diff = db.diff_matrix_builds(first, second)
+    assert [(d["product_a"], d["product_b"], d["old_decision"], d["new_decision"]) for d in diff] == [
+        ("Base", "Acid", None, "I"),
+        ("Water", "Acid", None, "I"),
+    ]
+
+    assert db.prune_matrix_builds(keep=1) == 1
+    assert [b["build_id"] for b in db.get_matrix_builds()] == [second]
+    db.close()
+
+
+def test_sparse_build_removes_partial_audit_log(tmp_path):
+    db = _InventoryDb(db_path=tmp_path / "decisions.duckdb")
+    db.inventory = [
+        {"id": 1, "product_name": "Acid", "incompatibilities": "Base"},
+        {"id": 2, "product_name": "Base", "incompatibilities": "Acid"},
+        {"id": 3, "product_name": "Water", "incompatibilities": "Acid"},
+    ]
+    builder = MatrixBuilder(db)
+    builder.block_rows = 1
+    store = db.store_matrix_decisions
+    calls = []
+
+    def flaky_store(decisions, build_id):
+        calls.append(build_id)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return store(decisions, build_id)
+
+    db.store_matrix_decisions = flaky_store
+    matrix = builder.build_sparse_matrix()
+
+    assert matrix is not None and matrix.size == 3
+    assert len(calls) == 2
+    assert db.get_matrix_builds() == [] and builder.last_build_id is None
+
+    db.store_matrix_decisions = store
+    builder.build_sparse_matrix()
+    builds = db.get_matrix_builds()
+    assert [b["build_id"] for b in builds] == [builder.last_build_id]
+    assert builds[0]["decisions"] == 3
+    db.close()
@@ -0,0 +1,75 @@
+"""Tests for the vectorized incompatibility matrix engine."""
+
+import random
+
+from src.database.db_manager import DatabaseManager
+from src.matrix.engine import MATRIX_LABELS, MatrixEngine, MultiPatternMatcher, hazard_elevates
+
+
+def test_multi_pattern_matcher_reports_overlapping_patterns():
+    matcher = MultiPatternMatcher(["acid", "acido forte", "forte", "cid", "base"])
+
+    assert matcher.find("acido forte") == {0, 1, 2, 3}
+    assert matcher.find("base fraca") == {4}
+    assert matcher.find("water") == set()
+
+
+def _reference_matrix(products, db, threshold):
+    """The original pair-by-pair algorithm."""
+    labels, decisions = {}, []
+    for a in products:
+        tokens = [t.strip() for t in (a["incompatibilities"] or "").split(",") if t.strip()]
+        for b in products:
+            key = (a["name"], b["name"])
+            if a is b:
+                labels[key] = "Self"
+                continue
+            rule = db.get_incompatibility_rule(a["cas"], b["cas"])
+            if rule and rule["rule"] == "I":
+                labels[key] = "Incompatible"
+            elif rule and rule["rule"] == "R":
+                labels[key] = "Restricted"
+                decisions.append((*key, "R", "structured_rule"))
+            elif any(t.lower() in b["name"].lower() for t in tokens):
+                labels[key] = "Incompatible"
+                decisions.append((*key, "I", "text_incompatibility"))
+            elif any(
+                hazard_elevates(db.get_hazard_record(cas), threshold)
+                for cas in (a["cas"], b["cas"])
+                if cas
+            ):
+                labels[key] = "Restricted"
+                decisions.append((*key, "R", "hazard_flags"))
+            else:
+                labels[key] = "Compatible"
+    return labels, decisions
+
+
+def test_engine_matches_pairwise_algorithm(tmp_path):
+    rng = random.Random(7)
+    db = DatabaseManager(db_path=tmp_path / "matrix.duckdb")
+    cas_pool = [f"{100 + i}-00-{i % 10}" for i in range(12)]
+    words = ["acid", "base", "oxidizer", "peroxide", "amine", "chlor"]
+
+    products = []
+    for i in range(40):
+        name = f"{rng.choice(words)} {rng.choice(words)} product {i}"
+        tokens = ", ".join(rng.sample(words, rng.randint(0, 2)))
+        cas = rng.choice(cas_pool + [None])
+        products.append({"name": name, "cas": cas, "incompatibilities": tokens})
+
+    for cas_a, cas_b in {tuple(rng.sample(cas_pool, 2)) for _ in range(15)}:
+        db.register_incompatibility_rule(cas_a, cas_b, rng.choice("IRC"), "test", "why")
+    for cas in rng.sample(cas_pool, 4):
+        db.register_hazard_record(cas, idlh=rng.choice([10.0, 500.0]), env_risk=rng.random() < 0.3)
+
+    result = MatrixEngine(db, hazard_idlh_threshold=50).build(products)
+    expected, expected_decisions = _reference_matrix(products, db, 50)
+
+    frame = result.to_frame()
+    for (row, col), label in expected.items():
+        assert frame.loc[row, col] == label, (row, col)
+    assert {MATRIX_LABELS[c] for c in result.codes.ravel()} <= set(MATRIX_LABELS)
+    decisions = result.decisions[["product_a", "product_b", "decision", "source_layer"]]
+    assert list(decisions.itertuples(index=False, name=None)) == expected_decisions
+    db.close()
@@ -0,0 +1,122 @@
+"""Tests for incremental matrix recomputation."""
+
+import random
+
+import numpy as np
+
+from src.database.db_manager import DatabaseManager
+from src.matrix.engine import MatrixEngine
+from src.matrix.incremental import IncrementalMatrixService
+
+
+class _InventoryDb(DatabaseManager):
+    """Real database whose inventory comes from a mutable list."""
+
+    inventory: list[dict] = []
+
+    def fetch_results(self, limit: int = 500, **filters):
+        return self.inventory
+
+
+def test_update_matches_full_build(tmp_path):
+    rng = random.Random(11)
+    db = DatabaseManager(db_path=tmp_path / "matrix.duckdb")
+    cas_pool = [f"{200 + i}-00-{i % 10}" for i in range(10)]
+    words = ["acid", "base", "oxidizer", "peroxide", "amine"]
+
+    def product(i):
+        return {
+            "name": f"{rng.choice(words)} product {i}",
+            "cas": rng.choice(cas_pool + [None]),
+            "incompatibilities": ", ".join(rng.sample(words, rng.randint(0, 2))),
+        }
+
+    for cas_a, cas_b in {tuple(rng.sample(cas_pool, 2)) for _ in range(10)}:
+        db.register_incompatibility_rule(cas_a, cas_b, rng.choice("IR"), "test", "why")
+    db.register_hazard_record(cas_pool[0], idlh=10.0)
+
+    engine = MatrixEngine(db, hazard_idlh_threshold=50)
+    products = [product(i) for i in range(30)]
+    previous = engine.build(products)
+
+    # Edit, drop and add products, and change the rules/hazards of two CAS numbers
+    products[3] = {**products[3], "incompatibilities": "amine"}
+    del products[7]
+    products += [product(i) for i in range(30, 34)]
+    db.register_incompatibility_rule(cas_pool[1], cas_pool[2], "I", "test", "new")
+    db.register_hazard_record(cas_pool[3], env_risk=True)
+    changed = {products[3]["name"]} | {
+        p["name"] for p in products if p["cas"] in (cas_pool[1], cas_pool[2], cas_pool[3])
+    }
+
+    updated = engine.update(previous, products, changed)
+    expected = engine.build(products)
+
+    assert updated.names == expected.names
+    assert np.array_equal(updated.codes, expected.codes)
+    assert np.array_equal(updated.elevated, expected.elevated)
+    assert updated.decisions.equals(expected.decisions)
+    db.close()
+
+
+def test_service_recomputes_only_changed_products(tmp_path):
+    db = _InventoryDb(db_path=tmp_path / "matrix.duckdb")
+    db.inventory = [
+        {"product_name": "Acid", "cas_number": "7664-93-9", "incompatibilities": ""},
+        {"product_name": "Base", "cas_number": "1310-73-2", "incompatibilities": ""},
+        {"product_name": "Water", "cas_number": "7732-18-5", "incompatibilities": ""},
+        {"product_name": "Ethanol", "cas_number": "64-17-5", "incompatibilities": ""},
+        {"product_name": "Salt", "cas_number": "7647-14-5", "incompatibilities": ""},
+    ]
+    snapshot = tmp_path / "snapshot.npz"
+    service = IncrementalMatrixService(db, snapshot_path=snapshot)
+
+    result, delta = service.refresh()
+    assert delta.full_rebuild and delta.from_version is None and delta.to_version == 1
+    assert result.to_frame().loc["Acid", "Base"] == "Compatible"
+
+    _, delta = service.refresh()
+    assert not delta.has_changes and delta.to_version == 1
+
+    db.register_incompatibility_rule("7664-93-9", "1310-73-2", "I", "test", "neutralization")
+    pending = IncrementalMatrixService(db, snapshot_path=snapshot).pending_changes()
+    assert pending.recomputed == ["Acid", "Base"] and pending.changed_cas == ["1310-73-2", "7664-93-9"]
+
+    result, delta = IncrementalMatrixService(db, snapshot_path=snapshot).refresh()
+    assert (delta.from_version, delta.to_version, delta.full_rebuild) == (1, 2, False)
+    assert delta.recomputed == ["Acid", "Base"]
+    assert sorted(delta.cells.itertuples(index=False, name=None)) == [
+        ("Acid", "Base", "Compatible", "Incompatible"),
+        ("Base", "Acid", "Compatible", "Incompatible"),
+    ]
+
+    db.inventory = [row for row in db.inventory if row["product_name"] != "Water"] + [
+        {"product_name": "Bleach", "cas_number": "7681-52-9", "incompatibilities": "acid"}
+    ]
+    result, delta = service.refresh()
+    assert delta.added == ["Bleach"] and delta.removed == ["Water"] and delta.recomputed == []
+    assert result.to_frame().loc["Bleach", "Acid"] == "Incompatible"
+    assert db.get_matrix_builds()[0]["build_id"] == delta.build_id
+    db.close()
+
+
+def test_incremental_refresh_logs_only_recomputed_decisions(tmp_path):
+    db = _InventoryDb(db_path=tmp_path / "matrix.duckdb")
+    db.inventory = [
+        {"product_name": "Acid", "cas_number": "7664-93-9", "incompatibilities": ""},
+        {"product_name": "Base", "cas_number": "1310-73-2", "incompatibilities": ""},
+        {"product_name": "Water", "cas_number": "7732-18-5", "incompatibilities": ""},
+        {"product_name": "Ethanol", "cas_number": "64-17-5", "incompatibilities": ""},
+    ]
+    db.register_incompatibility_rule("7732-18-5", "64-17-5", "R", "test", "unchanged pair")
+    service = IncrementalMatrixService(db, snapshot_path=tmp_path / "snapshot.npz")
+    _, first = service.refresh()
+
+    db.register_incompatibility_rule("7664-93-9", "1310-73-2", "R", "test", "neutralization")
+    result, second = service.refresh()
+
+    assert not second.full_rebuild
+    assert len(result.decisions) == 4
+    builds = {build["build_id"]: build["decisions"] for build in db.get_matrix_builds()}
+    assert builds == {first.build_id: 2, second.build_id: 2}
+    db.close()
@@ -0,0 +1,93 @@
+"""Tests for the sparse matrix representation and streaming exports."""
+
+import csv
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.matrix.engine import MatrixEngine
+from src.matrix.exporter import MatrixExporter
+from src.matrix.sparse import CELL_COLUMNS, SparseMatrix
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    rng = random.Random(3)
+    db = DatabaseManager(db_path=tmp_path / "matrix.duckdb")
+    cas_pool = [f"{300 + i}-00-{i % 10}" for i in range(8)]
+    words = ["acid", "base", "oxidizer", "amine"]
+    products = [
+        {
+            "name": f"{rng.choice(words)} product {i}",
+            "cas": rng.choice(cas_pool + [None]),
+            "incompatibilities": ", ".join(rng.sample(words, rng.randint(0, 1))),
+        }
+        for i in range(25)
+    ]
+    for cas_a, cas_b in {tuple(rng.sample(cas_pool, 2)) for _ in range(6)}:
+        db.register_incompatibility_rule(cas_a, cas_b, rng.choice("IR"), "test", "why")
+    db.register_hazard_record(cas_pool[0], idlh=10.0)
+    yield db, products
+    db.close()
+
+
+def _records(frame):
+    return frame.astype(object).where(frame.notna(), None).values.tolist()
+
+
+def test_sparse_build_matches_dense(inventory):
+    db, products = inventory
+    engine = MatrixEngine(db, hazard_idlh_threshold=50)
+    dense = engine.build(products)
+    sparse = engine.build_sparse(products, block_rows=4)
+
+    assert np.array_equal(sparse.band(0, sparse.size), dense.codes)
+    assert _records(sparse.decisions) == _records(dense.decisions)
+    assert sparse.nnz == np.count_nonzero(dense.codes)
+    assert sparse.get(0, 0) == "Self"
+    assert sparse.to_frame().equals(dense.to_frame())
+
+    converted = SparseMatrix.from_result(dense)
+    assert np.array_equal(converted.rows, sparse.rows) and np.array_equal(converted.codes, sparse.codes)
+    assert np.array_equal(sparse.band(5, 9, 3, 11), dense.codes[5:9, 3:11])
+
+
+def test_streaming_exports(inventory, tmp_path):
+    db, products = inventory
+    sparse = MatrixEngine(db, hazard_idlh_threshold=50).build_sparse(products, block_rows=7)
+    frame = sparse.to_frame()
+    exporter = MatrixExporter(db)
+
+    assert exporter.export_sparse_csv(sparse, tmp_path / "long.csv")
+    long_df = pd.read_csv(tmp_path / "long.csv")
+    assert list(long_df.columns) == CELL_COLUMNS and len(long_df) == sparse.nnz
+
+    assert exporter.export_sparse_csv(sparse, tmp_path / "wide.csv", layout="wide")
+    with open(tmp_path / "wide.csv", encoding="utf-8", newline="") as f:
+        wide = list(csv.reader(f))
+    assert wide[0][1:] == sparse.names
+    assert wide[3][1:] == [str(v) for v in frame.iloc[2]]
+
+    assert exporter.export_sparse_xlsx(sparse, tmp_path / "matrix.xlsx")
+    sheets = pd.read_excel(tmp_path / "matrix.xlsx", sheet_name=None, index_col=0)
+    assert list(sheets) == ["Matriz", "Celulas", "Resumo"]
+    assert sheets["Matriz"].astype(str).equals(frame.astype(str))
+    assert len(sheets["Celulas"]) == sparse.nnz
+
+    pytest.importorskip("pyarrow")
+    assert exporter.export_sparse_parquet(sparse, tmp_path / "cells.parquet")
+    cells = pd.read_parquet(tmp_path / "cells.parquet")
+    assert cells["label"].astype(str).tolist() == long_df["label"].tolist()
+
+
+def test_html_tiles(inventory, tmp_path):
+    db, products = inventory
+    sparse = MatrixEngine(db, hazard_idlh_threshold=50).build_sparse(products)
+
+    assert MatrixExporter(db).export_html_tiles(sparse, tmp_path / "html", tile_size=10)
+    pages = sorted(p.name for p in (tmp_path / "html").iterdir())
+    assert len(pages) == 1 + 3 * 3 and "tile_2_2.html" in pages
+    assert 'href="tile_1_2.html"' in (tmp_path / "html" / "tile_2_2.html").read_text(encoding="utf-8")
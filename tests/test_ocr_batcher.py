@@ -0,0 +1,126 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.sds.ocr_batcher import OCRBatcher
+
+
+class _FakePredictor:
+    """Mimics docTR: returns one page per input whose text is the image's fill value."""
+
+    def __init__(self, delay=0.0):
+        self.batch_sizes = []
+        self.delay = delay
+
+    def __call__(self, images):
+        self.batch_sizes.append(len(images))
+        time.sleep(self.delay)
+        pages = []
+        for image in images:
+            word = SimpleNamespace(value=f"page-{int(image[0, 0, 0])}")
+            line = SimpleNamespace(words=[word])
+            pages.append(SimpleNamespace(blocks=[SimpleNamespace(lines=[line])]))
+        return SimpleNamespace(pages=pages)
+
+
+def _image(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_batcher_routes_results_from_concurrent_callers():
+    model = _FakePredictor(delay=0.01)
+    batcher = OCRBatcher(batch_size=4, max_wait_ms=50, model_loader=lambda: model)
+    results = {}
+
+    def caller(doc):
+        values = [doc * 10 + page for page in range(3)]
+        results[doc] = (values, batcher.ocr([_image(v) for v in values]))
+
+    threads = [threading.Thread(target=caller, args=(doc,)) for doc in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for values, texts in results.values():
+        assert texts == [f"page-{v}" for v in values]
+    assert max(model.batch_sizes) <= 4
+    assert sum(model.batch_sizes) == 24
+
+    stats = batcher.get_stats()
+    assert stats["pages"] == 24
+    assert stats["batches"] == len(model.batch_sizes)
+    assert 0 < stats["avg_batch_fill"] <= 1.0
+    assert stats["pages_per_second"] > 0
+
+
+def test_batcher_dispatches_partial_batch_after_max_wait():
+    model = _FakePredictor()
+    batcher = OCRBatcher(batch_size=16, max_wait_ms=20, model_loader=lambda: model)
+
+    started = time.time()
+    assert batcher.ocr([_image(7)]) == ["page-7"]
+
+    assert time.time() - started < 1.0
+    assert model.batch_sizes == [1]
+    assert batcher.get_stats()["avg_batch_fill"] == pytest.approx(1 / 16)
+    batcher.close()
+
+
+def test_batcher_propagates_model_errors():
+    def broken_loader():
+        raise ImportError("doctr missing")
+
+    batcher = OCRBatcher(batch_size=2, max_wait_ms=0, model_loader=broken_loader)
+
+    with pytest.raises(ImportError):
+        batcher.ocr([_image(1), _image(2)])
+    assert batcher.get_stats()["failed_batches"] >= 1
+    batcher.close()
+
+
+def test_failed_batch_is_retried_page_by_page():
+    class _Flaky(_FakePredictor):
+        def __call__(self, images):
+            if any(int(image[0, 0, 0]) == 13 for image in images):
+                self.batch_sizes.append(len(images))
+                raise RuntimeError("bad page")
+            return super().__call__(images)
+
+    model = _Flaky()
+    batcher = OCRBatcher(batch_size=4, max_wait_ms=1000, model_loader=lambda: model)
+    futures = [batcher.submit(_image(v)) for v in (11, 12, 13, 14)]
+
+    assert futures[0].result() == "page-11" and futures[3].result() == "page-14"
+    with pytest.raises(RuntimeError, match="bad page"):
+        futures[2].result()
+    assert futures[1].result() == "page-12"
+    assert model.batch_sizes == [4, 1, 1, 1, 1]
+    batcher.close()
+
+
+def test_full_pdf_ocr_goes_through_batcher(monkeypatch):
+    import sys
+
+    from src.sds import extractor as extractor_module
+    from src.sds.extractor import SDSExtractor
+
+    pages = [_image(1), _image(2), _image(3)]
+    doctr_io = SimpleNamespace(DocumentFile=SimpleNamespace(from_pdf=lambda path: pages))
+    monkeypatch.setitem(sys.modules, "doctr", SimpleNamespace(io=doctr_io))
+    monkeypatch.setitem(sys.modules, "doctr.io", doctr_io)
+    model = _FakePredictor()
+    batcher = OCRBatcher(batch_size=8, max_wait_ms=20, model_loader=lambda: model)
+    monkeypatch.setattr(extractor_module, "get_ocr_batcher", lambda: batcher)
+    progress = []
+
+    text = SDSExtractor()._ocr_pdf_doctr("scan.pdf", progress_callback=lambda c, t, m: progress.append(c))
+
+    assert text == "page-1\n\npage-2\n\npage-3"
+    assert model.batch_sizes == [3]
+    assert progress == [0, 1, 2, 3]
+    batcher.close()
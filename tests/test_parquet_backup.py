@@ -0,0 +1,96 @@
+"""Tests for the Parquet backup and restore of the extraction database."""
+
+import duckdb
+import pandas as pd
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.database.parquet_backup import MANIFEST_NAME, PARQUET_TABLES, read_manifest
+
+
+def _populate(db, tmp_path):
+    for i, status in enumerate(["success", "success", "failed"]):
+        path = tmp_path / f"doc{i}.pdf"
+        path.write_bytes(f"doc {i}".encode())
+        doc_id = db.register_document(path.name, path, path.stat().st_size, ".pdf")
+        db.store_extractions_batch(
+            doc_id,
+            [
+                ("product_name", f"Product {i}", 0.9, "", "valid", None, "heuristic"),
+                ("cas_number", f"{100 + i}-00-0", 0.8, "", "valid", None, "heuristic"),
+            ],
+        )
+        db.update_document_status(doc_id, status)
+    db.register_incompatibility_rule("100-00-0", "101-00-0", "I", "NFPA/ERG 2024", "why")
+    db.register_hazard_record("100-00-0", hazard_flags={"dangerous": True}, idlh=10.0, source="NIOSH")
+    db.store_matrix_decisions(
+        pd.DataFrame(
+            [["Product 0", "Product 1", "100-00-0", "101-00-0", "R", "hazard_flags", None, None]],
+            columns=["product_a", "product_b", "cas_a", "cas_b", "decision", "source_layer",
+                     "rule_source", "justification"],
+        ),
+        "build-1",
+    )
+
+
+def test_backup_is_partitioned_and_queryable(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "source.duckdb")
+    _populate(db, tmp_path)
+
+    manifest = db.export_parquet(tmp_path / "backup")
+    assert manifest == read_manifest(tmp_path / "backup")
+    assert set(manifest["tables"]) == set(PARQUET_TABLES)
+    assert manifest["tables"]["extractions"] == {"rows": 6, "partition_by": "field_name"}
+    assert (tmp_path / "backup" / "extractions" / "field_name=cas_number").is_dir()
+    assert (tmp_path / "backup" / MANIFEST_NAME).exists()
+
+    files = str(tmp_path / "backup" / "rag_incompatibilities" / "**" / "*.parquet")
+    rows = duckdb.sql(f"SELECT cas_a, source FROM read_parquet('{files}')").fetchall()
+    assert rows == [("100-00-0", "NFPA/ERG 2024")]
+    db.close()
+
+
+def test_restore_round_trips_and_advances_sequences(tmp_path):
+    source = DatabaseManager(db_path=tmp_path / "source.duckdb")
+    _populate(source, tmp_path)
+    source.export_parquet(tmp_path / "backup")
+    expected = {
+        table: source.conn.execute(f"SELECT * FROM {table} ORDER BY ALL").fetchall()
+        for table in PARQUET_TABLES
+    }
+    source.close()
+
+    target = DatabaseManager(db_path=tmp_path / "target.duckdb")
+    restored = target.import_parquet(tmp_path / "backup")
+    assert restored == {table: len(rows) for table, rows in expected.items()}
+    for table, rows in expected.items():
+        assert target.conn.execute(f"SELECT * FROM {table} ORDER BY ALL").fetchall() == rows
+    assert [r["product_name"] for r in target.fetch_results()] == ["Product 2", "Product 1", "Product 0"]
+
+    path = tmp_path / "new.pdf"
+    path.write_bytes(b"new")
+    assert target.register_document(path.name, path, 3, ".pdf") == 4
+
+    with pytest.raises(ValueError, match="not supported"):
+        target.import_parquet(tmp_path / "backup", tables=["harvester_downloads"])
+    target.close()
+
+
+def test_failed_export_rolls_back(tmp_path):
+    from src.database.parquet_backup import export_tables
+
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE documents (id INTEGER, status VARCHAR)")
+    statements = []
+
+    class _Recording:
+        def execute(self, sql, *args):
+            statements.append(sql)
+            return conn.execute(sql, *args)
+
+    with pytest.raises(duckdb.CatalogException):
+        export_tables(_Recording(), tmp_path / "backup", tables=["documents", "extractions"])
+
+    assert statements[-1] == "ROLLBACK" and "COMMIT" not in statements
+    assert not (tmp_path / "backup" / MANIFEST_NAME).exists()
+    conn.close()
@@ -0,0 +1,84 @@
+"""Tests for streamed RAG answers and time-to-first-token tracking."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+
+from src.database.db_manager import DatabaseManager
+from src.models.async_ollama import AsyncOllamaClient
+from src.models.ollama_client import OllamaClient
+from src.rag.query_tracker import QueryTracker
+from src.rag.retriever import RAGRetriever
+from src.rag.vector_store import SearchResult
+
+
+class _FakeVectorStore:
+    def search(self, query, k=5):
+        return [
+            SearchResult(
+                content="Acetone is incompatible with oxidizers.",
+                metadata={"source": "acetone.pdf", "document_id": 7, "chunk_index": 2},
+                score=0.91,
+            )
+        ]
+
+
+class _FakeOllama:
+    def __init__(self):
+        self.prompts = []
+
+    def chat_stream(self, message, context=None, system_prompt=None):
+        self.prompts.append(message)
+        yield from ["Avoid ", "oxidizers", "."]
+
+
+def test_answer_stream_emits_retrieval_then_tokens_and_logs_query(tmp_path):
+    tracker = QueryTracker(DatabaseManager(db_path=tmp_path / "rag.duckdb"))
+    retriever = RAGRetriever(
+        vector_store=_FakeVectorStore(), ollama_client=_FakeOllama(), query_tracker=tracker
+    )
+
+    events = list(retriever.answer_stream("What is acetone incompatible with?"))
+
+    assert events[0]["type"] == "retrieval"
+    assert events[0]["sources"][0]["source"] == "acetone.pdf"
+    assert events[0]["search_time"] >= 0
+    assert [e["text"] for e in events if e["type"] == "token"] == ["Avoid ", "oxidizers", "."]
+    done = events[-1]
+    assert done["type"] == "done"
+    assert done["answer"] == "Avoid oxidizers."
+    assert done["time_to_first_token"] is not None
+    assert done["query_id"] > 0
+
+    row = tracker.db.conn.execute(
+        "SELECT result_count, time_to_first_token FROM query_logs WHERE id = ?", [done["query_id"]]
+    ).fetchone()
+    assert row[0] == 1
+    assert row[1] == done["time_to_first_token"]
+    assert tracker.db.conn.execute("SELECT document_id, chunk_index FROM query_results").fetchall() == [(7, 2)]
+
+
+def test_ollama_chat_stream_yields_chunks_and_records_time_to_first_token():
+    lines = [
+        {"message": {"content": "Hel"}, "done": False},
+        {"message": {"content": "lo"}, "done": False},
+        {"message": {"content": ""}, "done": True},
+    ]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        body = "\n".join(json.dumps(line) for line in lines) + "\n"
+        return httpx.Response(200, content=body.encode())
+
+    pooled = AsyncOllamaClient("http://ollama", transport=httpx.MockTransport(handler))
+    client = OllamaClient(base_url="http://ollama")
+    with patch("src.models.ollama_client.get_async_ollama_client", return_value=pooled):
+        chunks = list(client.chat_stream("Say hello"))
+
+    assert chunks == ["Hel", "lo"]
+    stats = client.get_stream_stats()
+    assert stats["total_streams"] == 1
+    assert stats["failed_streams"] == 0
+    assert stats["time_to_first_token"]["avg"] >= 0
+    pooled.close()
@@ -0,0 +1,61 @@
+"""Tests for batched incompatibility rule lookups and the rule cache."""
+
+from src.database.db_manager import DatabaseManager
+
+
+def test_pair_lookup_is_batched_and_cached(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "rules.duckdb")
+    db.register_incompatibility_rule("7664-93-9", "1310-73-2", "I", "NFPA", "neutralization")
+    db.register_incompatibility_rule("7722-84-1", "64-17-5", "R", "ERG", None)
+
+    pairs = [("1310-73-2", "7664-93-9"), ("64-17-5 ", "7722-84-1"), ("67-64-1", "7664-93-9"), (None, "x")]
+    rules = db.get_incompatibility_rules_for_pairs(pairs)
+    assert set(rules) == {("1310-73-2", "7664-93-9"), ("64-17-5", "7722-84-1")}
+    assert rules[("1310-73-2", "7664-93-9")]["justification"] == "neutralization"
+    assert db.get_rule_cache_stats() == {"hits": 0, "misses": 3, "pairs": 3, "sets": 0}
+
+    # Second lookup (including the cached "no rule" pair) never reaches DuckDB
+    db.reset_concurrency_stats()
+    assert db.get_incompatibility_rule("7664-93-9", "1310-73-2")["rule"] == "I"
+    assert db.get_incompatibility_rule("7664-93-9", "67-64-1") is None
+    assert "get_incompatibility_rules_for_pairs" not in db.get_concurrency_stats()["methods"]
+
+    # Registering a rule invalidates the cache
+    db.register_incompatibility_rule("67-64-1", "7664-93-9", "R", "NFPA", "exothermic")
+    assert db.get_incompatibility_rule("7664-93-9", "67-64-1")["rule"] == "R"
+
+    table = db.get_incompatibility_rules_for_pairs(pairs, as_arrow=True)
+    assert table.num_rows == 3 and "metadata" in table.column_names
+    db.close()
+
+
+def test_set_lookup_is_cached_until_rules_change(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "rules.duckdb")
+    db.register_incompatibility_rule("7664-93-9", "1310-73-2", "I", "NFPA")
+    db.register_incompatibility_rule("7664-93-9", "50-00-0", "R", "NFPA")
+    inventory = ["7664-93-9", "1310-73-2", "67-64-1", None, ""]
+
+    assert list(db.get_incompatibility_rules(inventory)) == [("1310-73-2", "7664-93-9")]
+    first = db.get_rule_cache_stats()
+    db.get_incompatibility_rules(reversed(inventory))
+    assert db.get_rule_cache_stats()["hits"] == first["hits"] + 1
+
+    db.register_incompatibility_rule("67-64-1", "1310-73-2", "R", "ERG")
+    assert len(db.get_incompatibility_rules(inventory)) == 2
+    assert db.get_incompatibility_rules(inventory, as_arrow=True).num_rows == 2
+    db.close()
+
+
+def test_rules_for_one_cas_cover_both_sides(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / "rules.duckdb")
+    db.register_incompatibility_rule("7664-93-9", "1310-73-2", "I", "NFPA")
+    db.register_incompatibility_rule("1310-73-2", "50-00-0", "R", "NFPA")
+    db.register_incompatibility_rule("67-64-1", "50-00-0", "R", "ERG")
+
+    rules = db.get_incompatibility_rules_for_cas(" 1310-73-2 ")
+    assert [(r["cas_a"], r["cas_b"], r["rule"]) for r in rules] == [
+        ("1310-73-2", "7664-93-9", "I"),
+        ("1310-73-2", "50-00-0", "R"),
+    ]
+    assert db.get_incompatibility_rules_for_cas("") == []
+    db.close()
@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from src.models.ollama_client import ExtractionResult
 from src.sds.processor import SDSProcessor
 
 
@@ -28,7 +29,7 @@ class _StubDb:
     def get_document_status(self, document_id: int):
         return {}
 
-    def register_document(self, filename, file_path, file_size, file_type, num_pages=None):
+    def register_document(self, filename, file_path, file_size, file_type, num_pages=None, file_hash=None):
         return 1
 
     def store_extractions_batch(self, document_id: int, extractions):
@@ -95,7 +96,7 @@ class _StubDb:
 
 
 class _StubExtractor:
-    def extract_document(self, file_path: Path, progress_callback=None):
+    def extract_document(self, file_path: Path, progress_callback=None, refresh_cache=False):
         return {"text": "Sample SDS text", "sections": {}}
 
 
@@ -107,10 +108,10 @@ class _StubHeuristics:
 
 
 class _StubLLM:
-    def refine_heuristic(self, field_name, heur_result, text):
+    def refine_heuristic(self, field_name, heur_result, text, sections=None):
         return heur_result
 
-    def extract_multiple_fields(self, fields, text):
+    def extract_multiple_fields(self, fields, text, sections=None):
         return {}
 
 
@@ -217,11 +218,11 @@ def test_missing_fields_trigger_llm_calls(monkeypatch, tmp_path: Path):
             self.refine_called = []
             self.multi_called = False
 
-        def refine_heuristic(self, field_name, heur_result, text):
+        def refine_heuristic(self, field_name, heur_result, text, sections=None):
             self.refine_called.append(field_name)
             return heur_result
 
-        def extract_multiple_fields(self, fields, text):
+        def extract_multiple_fields(self, fields, text, sections=None):
             self.multi_called = True
             # Return dummy values for required fields
             return {name: {"value": f"VAL_{name}", "confidence": 0.5, "context": "", "source": "llm"} for name in fields}
@@ -259,11 +260,11 @@ def test_refine_heuristic_invoked_on_low_confidence(monkeypatch, tmp_path: Path)
         def __init__(self):
             self.refined = False
 
-        def refine_heuristic(self, field_name, heur_result, text):
+        def refine_heuristic(self, field_name, heur_result, text, sections=None):
             self.refined = True
             return heur_result
 
-        def extract_multiple_fields(self, fields, text):
+        def extract_multiple_fields(self, fields, text, sections=None):
             return {}
 
     tracker = _LLMTracker()
@@ -318,7 +319,7 @@ def test_processor_output_feeds_matrix(monkeypatch, tmp_path: Path):
         )
 
     class _DbForMatrix:
-        def fetch_results(self, limit: int = 500):
+        def fetch_results(self, limit: int = 500, offset: int = 0):
             return records
 
     from src.matrix.builder import MatrixBuilder
@@ -330,3 +331,228 @@ def test_processor_output_feeds_matrix(monkeypatch, tmp_path: Path):
 
     assert not matrix.empty
     assert matrix.loc["Produto A", "Produto A"] == "Self"
+
+
+class _KnowledgeDb(_StubDb):
+    def __init__(self, hazards=None, rules=None):
+        super().__init__()
+        self.hazards = hazards or {}
+        self.rules = rules or []
+        self.batches = 0
+
+    def store_extractions_batch(self, document_id, extractions):
+        self.batches += 1
+        super().store_extractions_batch(document_id, extractions)
+
+    def get_hazard_record(self, cas):
+        return self.hazards.get(cas)
+
+    def get_incompatibility_rules_for_cas(self, cas):
+        return [r for r in self.rules if cas in (r["cas_a"], r["cas_b"])]
+
+
+class _KnowledgeRag:
+    def __init__(self, chunk_metadata=(), docs=()):
+        self.chunk_metadata = list(chunk_metadata)
+        self.docs = list(docs)
+        self.queries = []
+        self.prompts = []
+        self.structured = []
+        self.vector_store = self
+        self.ollama = self
+
+    def get_chunk_metadata(self, where, limit=20):
+        key, value = next(iter(where.items()))
+        return [m for m in self.chunk_metadata if m.get(key) == value][:limit]
+
+    def retrieve(self, query, k=5):
+        self.queries.append(query)
+        return self.docs
+
+    def chat(self, message, context=None):
+        self.prompts.append(message)
+        if "UN number" in message:
+            return "UN 1170"
+        if "hazard class" in message:
+            return "3"
+        return "H225, H319"
+
+    def extract_fields_structured(self, text, fields):
+        from src.models.ollama_client import ExtractionResult
+
+        self.structured.append(fields)
+        answers = {"h_statements": "H225, H319", "hazard_class": "NOT_FOUND"}
+        return {name: ExtractionResult(value=answers.get(name, "Oxidizers"), confidence=0.8) for name in fields}
+
+
+def _ethanol_extractions():
+    return {
+        "cas_number": {"value": "64-17-5", "confidence": 0.95},
+        "product_name": {"value": "Ethanol 96%", "confidence": 0.9},
+    }
+
+
+def test_rag_fields_resolved_from_structured_knowledge(monkeypatch):
+    processor = SDSProcessor()
+    processor.db = _KnowledgeDb(
+        hazards={"64-17-5": {"hazard_flags": {"h_statements": ["H225", "H319"]}, "metadata": None}},
+        rules=[
+            {"cas_a": "64-17-5", "cas_b": "7722-84-1", "rule": "I", "group_a": None, "group_b": "Peroxides"},
+            {"cas_a": "50-00-0", "cas_b": "64-17-5", "rule": "C", "group_a": None, "group_b": None},
+        ],
+    )
+    processor.rag = _KnowledgeRag(
+        chunk_metadata=[
+            {"document_id": 1, "cas_number": "64-17-5", "un_number": "NOT_FOUND"},
+            {"document_id": 2, "cas_number": "64-17-5", "un_number": "1170", "hazard_class": "3"},
+        ]
+    )
+    monkeypatch.setattr("src.sds.processor.validate_extraction_result", _patched_validate)
+
+    extractions = processor._rag_complete_missing_fields(1, _ethanol_extractions(), "text")
+
+    assert processor.rag.queries == [] and processor.rag.prompts == []
+    assert extractions["un_number"]["value"] == "1170"
+    assert extractions["hazard_class"]["value"] == "3"
+    assert extractions["h_statements"]["value"] == "H225, H319"
+    assert extractions["incompatibilities"]["value"] == "Peroxides (7722-84-1)"
+    assert {s["field_name"] for s in processor.db.stored} == set(extractions) - {"cas_number", "product_name"}
+
+
+def test_rag_values_from_other_sds_rank_below_llm_answers_and_keep_validation():
+    processor = SDSProcessor()
+    processor.db = _KnowledgeDb(hazards={"64-17-5": {"hazard_flags": {"h_statements": ["H225"]}, "metadata": None}})
+    processor.rag = _KnowledgeRag(
+        chunk_metadata=[{"document_id": 2, "cas_number": "64-17-5", "un_number": "1170", "hazard_class": "banana"}]
+    )
+
+    extractions = processor._rag_complete_missing_fields(1, _ethanol_extractions(), "text")
+
+    stored = {s["field_name"]: s for s in processor.db.stored}
+    assert stored["h_statements"]["confidence"] == 0.85
+    assert stored["un_number"]["confidence"] < 0.78
+    assert stored["hazard_class"]["validation_status"] == "warning"
+    assert stored["hazard_class"]["validation_message"] == "Unknown hazard class: banana"
+    assert all(s["validation_status"] == extractions[name]["validation_status"] for name, s in stored.items())
+
+
+def test_rag_falls_back_to_one_batched_request_for_unresolved_fields(monkeypatch):
+    from src.rag.vector_store import SearchResult
+
+    processor = SDSProcessor()
+    processor.db = _KnowledgeDb()
+    processor.rag = _KnowledgeRag(
+        chunk_metadata=[{"document_id": 2, "cas_number": "64-17-5", "un_number": "1170"}],
+        docs=[SearchResult(content="Ethanol: H225, H319", metadata={"source": "kb"}, score=0.9)],
+    )
+    monkeypatch.setattr("src.sds.processor.validate_extraction_result", _patched_validate)
+
+    extractions = processor._rag_complete_missing_fields(1, _ethanol_extractions(), "text")
+
+    assert extractions["un_number"]["value"] == "1170"
+    assert len(processor.rag.queries) == 1
+    # Only the fields the structured lookup could not resolve reach the LLM, in one request
+    assert processor.rag.prompts == []
+    assert [sorted(fields) for fields in processor.rag.structured] == [
+        ["h_statements", "hazard_class", "incompatibilities"]
+    ]
+    assert extractions["h_statements"]["value"] == "H225, H319"
+    assert extractions["incompatibilities"]["value"] == "Oxidizers"
+    assert "hazard_class" not in extractions
+    assert processor.db.batches == 1
+    assert {s["field_name"]: s["context"] for s in processor.db.stored} == {
+        "un_number": "RAG chunk metadata",
+        "h_statements": "RAG knowledge base",
+        "incompatibilities": "RAG knowledge base",
+    }
+
+
+def test_rag_per_field_questions_when_batching_disabled(monkeypatch):
+    from dataclasses import replace
+
+    from src.rag.vector_store import SearchResult
+
+    processor = SDSProcessor()
+    processor.settings = replace(
+        processor.settings, processing=replace(processor.settings.processing, rag_batch_fields=False)
+    )
+    processor.db = _KnowledgeDb()
+    processor.rag = _KnowledgeRag(
+        docs=[SearchResult(content="Ethanol: H225, H319", metadata={"source": "kb"}, score=0.9)],
+    )
+    monkeypatch.setattr("src.sds.processor.validate_extraction_result", _patched_validate)
+
+    processor._rag_complete_missing_fields(1, _ethanol_extractions(), "text")
+
+    assert len(processor.rag.prompts) == 4 and processor.rag.structured == []
+    assert processor.db.batches == 1 and len(processor.db.stored) == 4
+    assert {s["field_name"]: s["value"] for s in processor.db.stored}["un_number"] == "1170"
+
+
+def test_batched_rag_answers_are_validated_per_field():
+    processor = SDSProcessor()
+    processor.rag = _KnowledgeRag()
+    answers = {"un_number": "UN1170", "hazard_class": "3", "h_statements": "none listed", "incompatibilities": "no"}
+    processor.rag.extract_fields_structured = lambda text, fields: {
+        name: ExtractionResult(value=answers[name], confidence=0.8) for name in fields
+    }
+
+    assert processor._extract_fields_from_rag(list(answers), "CAS 64-17-5", "context") == {
+        "un_number": "1170",
+        "hazard_class": "3",
+        "h_statements": None,
+        "incompatibilities": None,
+    }
+
+
+def test_sequential_batch_passes_prescan_entries_without_keeping_them(monkeypatch, tmp_path: Path):
+    from src.sds.batch_engine import _failed_result
+    from src.sds.dedup_scan import FileStatus, FolderScan
+
+    paths = [tmp_path / "a.pdf", tmp_path / "b.pdf"]
+    processor = SDSProcessor()
+    monkeypatch.setattr(
+        processor,
+        "prescan",
+        lambda file_paths: FolderScan(files=[FileStatus(path=paths[0], size=1, mtime_ns=0, sha256="aa")]),
+    )
+    seen = []
+
+    def _process(file_path, use_rag=True, force_reprocess=False, prescanned=None):
+        seen.append(prescanned.sha256 if prescanned else None)
+        return _failed_result(Path(file_path), RuntimeError("stub"))
+
+    monkeypatch.setattr(processor, "process", _process)
+
+    processor._process_batch_sequential(paths, use_rag=False, force_reprocess=False)
+
+    assert seen == ["aa", None]
+
+
+def test_iter_batch_defaults_to_batch_workers(monkeypatch, tmp_path: Path):
+    from src.sds import batch_engine
+    from src.sds.batch_engine import _failed_result
+    from src.sds.dedup_scan import FolderScan
+
+    processor = SDSProcessor()
+    monkeypatch.setattr(processor, "prescan", lambda file_paths: FolderScan())
+    monkeypatch.setattr(
+        processor,
+        "process",
+        lambda file_path, use_rag=True, force_reprocess=False, prescanned=None: _failed_result(
+            Path(file_path), RuntimeError("stub")
+        ),
+    )
+    monkeypatch.setattr(
+        batch_engine, "ParallelBatchEngine", lambda *a, **k: pytest.fail("batch_workers=1 runs sequentially")
+    )
+    progress = []
+
+    results = list(
+        processor.iter_batch(
+            [tmp_path / "a.pdf", tmp_path / "b.pdf"], progress_callback=lambda c, t, r: progress.append((c, t))
+        )
+    )
+
+    assert [r.filename for r in results] == ["a.pdf", "b.pdf"]
+    assert progress == [(1, 2), (2, 2)]
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from src.sds.extractor import PageQuality, SDSExtractor
+
+LINE = "SECTION 2: Hazards identification - flammable liquid and vapour, category 2. "
+
+
+def _make_pdf(path: Path, pages: list[str]) -> Path:
+    fpdf = pytest.importorskip("fpdf")
+    pdf = fpdf.FPDF()
+    pdf.set_font("Helvetica", size=10)
+    for text in pages:
+        pdf.add_page()
+        if text:
+            pdf.multi_cell(0, 5, text)
+    pdf.output(str(path))
+    return path
+
+
+def test_page_quality_ocr_reason():
+    def reason(**kw):
+        base = {"page_number": 1, "char_count": 900, "glyph_warnings": 0, "image_coverage": 0.0}
+        base.update(kw)
+        return PageQuality(**base).ocr_reason(80, 0.5, 10, 400)
+
+    assert reason() is None
+    assert reason(char_count=10) == "low_text"
+    assert reason(glyph_warnings=25) == "glyph_warnings"
+    assert reason(image_coverage=0.9, char_count=200) == "image_page"
+    assert reason(image_coverage=0.9, char_count=900) is None
+
+
+def test_selective_ocr_only_touches_bad_pages(tmp_path: Path):
+    pdf_path = _make_pdf(tmp_path / "mixed.pdf", [LINE * 10, "", LINE * 10])
+    extractor = SDSExtractor()
+    calls = []
+
+    def fake_batch(images):
+        calls.append(len(images))
+        return ["Scanned page text recovered by OCR"] * len(images)
+
+    extractor._ocr_images_doctr = fake_batch
+    extractor._ocr_image_ollama = lambda img: pytest.fail("Ollama fallback not expected")
+    extractor._ocr_pdf_doctr = lambda *a, **k: pytest.fail("full-document OCR not expected")
+
+    result = extractor.extract_pdf(pdf_path)
+
+    assert calls == [1]
+    assert result["page_count"] == 3
+    text = result["text"]
+    assert "--- Page 2 (OCR) ---\nScanned page text recovered by OCR" in text
+    assert text.index("--- Page 1 ---") < text.index("--- Page 2 (OCR)") < text.index("--- Page 3 ---")
+
+
+def test_selective_ocr_keeps_text_layer_when_ocr_is_empty(tmp_path: Path):
+    pdf_path = _make_pdf(tmp_path / "short.pdf", [LINE * 10, "Short note"])
+    extractor = SDSExtractor()
+    extractor._ocr_images_doctr = lambda images: [""] * len(images)
+    extractor._ocr_pdf_doctr = lambda *a, **k: ""
+
+    result = extractor.extract_pdf(pdf_path)
+
+    assert "--- Page 2 ---\nShort note" in result["text"]
+    assert "(OCR)" not in result["text"]